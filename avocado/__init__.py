@@ -26,16 +26,33 @@ __all__ = [
     "TestCancel",
 ]
 
+#: The modules where the names above come from.  They are only imported
+#: when the names are used, so that importing a module within the
+#: "avocado" package (such as a runner) doesn't import them all.
+_MODULES = {
+    "Test": "avocado.core.test",
+    "VERSION": "avocado.core.version",
+    "fail_on": "avocado.core.decorators",
+    "cancel_on": "avocado.core.decorators",
+    "skip": "avocado.core.decorators",
+    "skipIf": "avocado.core.decorators",
+    "skipUnless": "avocado.core.decorators",
+    "TestError": "avocado.core.exceptions",
+    "TestFail": "avocado.core.exceptions",
+    "TestCancel": "avocado.core.exceptions",
+}
 
-from avocado.core import initialize_plugins, register_core_options
-from avocado.core.settings import settings
 
-register_core_options()
-settings.merge_with_configs()
-initialize_plugins()
-settings.merge_with_configs()
+def __getattr__(name):
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # pylint: disable=C0415
+    import importlib
 
-from avocado.core.decorators import cancel_on, fail_on, skip, skipIf, skipUnless
-from avocado.core.exceptions import TestCancel, TestError, TestFail
-from avocado.core.test import Test
-from avocado.core.version import VERSION
+    value = getattr(importlib.import_module(_MODULES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -15,9 +15,7 @@
 
 import os
 
-import pkg_resources
-
-from avocado.core.dispatcher import InitDispatcher
+from avocado.core import entry_points
 from avocado.core.settings import settings as stgs
 from avocado.core.streams import BUILTIN_STREAM_SETS, BUILTIN_STREAMS_DESCRIPTION
 from avocado.core.utils.path import prepend_base_path
@@ -201,6 +199,34 @@ def register_core_options():
         section="runner", key="identifier_format", default="{uri}", help_msg=help_msg
     )
 
+    help_msg = (
+        "Whether to keep the capabilities of runner commands in a persistent "
+        "registry, so that they are not probed (by running them) again "
+        "until the runner, or the Avocado version, changes.  Changes to "
+        "other modules used by the runners are not noticed, so it should "
+        "not be enabled when changing Avocado itself"
+    )
+    stgs.register_option(
+        section="runner",
+        key="capabilities_registry",
+        key_type=bool,
+        default=False,
+        help_msg=help_msg,
+    )
+
+    help_msg = (
+        "Whether to pick the runner commands based on the runners registered "
+        "as entry points (both as console scripts and runner classes), "
+        "without running the commands to probe their capabilities"
+    )
+    stgs.register_option(
+        section="runner",
+        key="capabilities_from_entry_points",
+        key_type=bool,
+        default=False,
+        help_msg=help_msg,
+    )
+
     help_msg = "List of test references (aliases or paths)"
     stgs.register_option(
         section="resolver",
@@ -210,6 +236,45 @@ def register_core_options():
         help_msg=help_msg,
     )
 
+    help_msg = (
+        "Whether to keep the resolutions of test references to files in a "
+        "persistent cache, reusing them until the files (or the Python "
+        "modules they depend on) change"
+    )
+    stgs.register_option(
+        section="resolver",
+        key="cache",
+        key_type=bool,
+        default=False,
+        help_msg=help_msg,
+    )
+
+    help_msg = (
+        "Whether to keep the variants produced by the varianter plugins in a "
+        "persistent cache, reusing them until the files they are produced "
+        "from (or the varianter options) change.  Cached variants are shown "
+        "as loaded ones, without the plugin specific representations"
+    )
+    stgs.register_option(
+        section="variants",
+        key="cache",
+        key_type=bool,
+        default=False,
+        help_msg=help_msg,
+    )
+
+    help_msg = (
+        "Number of processes used to resolve test references in parallel. "
+        "Use 0 for the number of CPUs, and 1 to resolve them serially"
+    )
+    stgs.register_option(
+        section="resolver",
+        key="processes",
+        key_type=int,
+        default=1,
+        help_msg=help_msg,
+    )
+
     help_msg = (
         "Selects the runner implementation from one of the "
         "installed and active implementations.  You can run "
@@ -229,7 +294,18 @@ def initialize_plugin_infrastructure():
         section="plugins", key="disable", key_type=list, default=[], help_msg=help_msg
     )
 
-    kinds = list(pkg_resources.get_entry_map("avocado-framework").keys())
+    help_msg = (
+        "Whether plugins are only loaded (and instantiated) when used. "
+        "The names and priorities of plugins are kept on an index, along "
+        "with their entry points, when they are first loaded, so that "
+        "they don't need to be loaded again just to be ordered, or to be "
+        'described (such as subcommands on "avocado --help")'
+    )
+    stgs.register_option(
+        section="plugins", key="lazy", key_type=bool, default=False, help_msg=help_msg
+    )
+
+    kinds = entry_points.get_index().get_groups("avocado-framework")
     plugin_types = [kind[8:] for kind in kinds if kind.startswith("avocado.plugins.")]
     for plugin_type in plugin_types:
         help_msg = f'Execution order for "{plugin_type}" plugins'
@@ -243,5 +319,21 @@ def initialize_plugin_infrastructure():
 
 
 def initialize_plugins():
+    # pylint: disable=C0415
+    from avocado.core.dispatcher import InitDispatcher
+
     initialize_plugin_infrastructure()
     InitDispatcher().map_method("initialize")
+
+
+def initialize():
+    """
+    Registers the core options, and the ones of the Init plugins
+
+    The values from the configuration files are applied to them.  This
+    happens on the first use of :data:`avocado.core.settings.settings`.
+    """
+    register_core_options()
+    stgs.merge_with_configs()
+    initialize_plugins()
+    stgs.merge_with_configs()
@@ -80,9 +80,10 @@ class AvocadoApp:
 
     def _configure_cli_plugins(self):
         if self._cli_cmd_dispatcher.extensions:
-            self._cli_cmd_dispatcher.map_method("configure", self.parser)
+            self._cli_cmd_dispatcher.configure(self.parser)
         if self._cli_dispatcher.extensions:
             self._cli_dispatcher.map_method("configure", self.parser)
+        self._cli_cmd_dispatcher.configure_placeholders(self.parser)
 
     def _run_cli_plugins(self):
         if self._cli_dispatcher.extensions:
@@ -21,8 +21,18 @@ import sqlite3
 
 from avocado.core.data_dir import get_datafile_path
 
-#: The location of the requirements cache database
-CACHE_DATABASE_PATH = get_datafile_path("cache", "requirements.sqlite")
+#: The location of the requirements cache database, if not the default one
+#: (which is not computed on import, as it depends on the settings, whose
+#: initialization loads the plugins, which may be importing this module)
+CACHE_DATABASE_PATH = None
+
+
+def get_database_path():
+    """Returns the location of the requirements cache database."""
+    if CACHE_DATABASE_PATH is not None:
+        return CACHE_DATABASE_PATH
+    return get_datafile_path("cache", "requirements.sqlite")
+
 
 sqlite3.register_adapter(bool, int)
 sqlite3.register_converter("BOOLEAN", lambda v: bool(int(v)))
@@ -63,8 +73,9 @@ SCHEMA = [
 
 
 def _create_requirement_cache_db():
-    os.makedirs(os.path.dirname(CACHE_DATABASE_PATH), exist_ok=True)
-    with sqlite3.connect(CACHE_DATABASE_PATH) as conn:
+    database_path = get_database_path()
+    os.makedirs(os.path.dirname(database_path), exist_ok=True)
+    with sqlite3.connect(database_path) as conn:
         cursor = conn.cursor()
         for entry in SCHEMA:
             _ = cursor.execute(entry)
@@ -74,10 +85,11 @@ def _create_requirement_cache_db():
 def set_requirement(
     environment_type, environment, requirement_type, requirement, saved=True
 ):
-    if not os.path.exists(CACHE_DATABASE_PATH):
+    database_path = get_database_path()
+    if not os.path.exists(database_path):
         _create_requirement_cache_db()
 
-    with sqlite3.connect(CACHE_DATABASE_PATH) as conn:
+    with sqlite3.connect(database_path) as conn:
         cursor = conn.cursor()
         sql = "INSERT OR IGNORE INTO environment_type VALUES (?)"
         cursor.execute(sql, (environment_type,))
@@ -101,7 +113,8 @@ def is_requirement_in_cache(
             False if requirement is not in cache
             None if requirement is in cache but it is not saved yet.
     """
-    if not os.path.exists(CACHE_DATABASE_PATH):
+    database_path = get_database_path()
+    if not os.path.exists(database_path):
         return False
 
     sql = (
@@ -112,7 +125,7 @@ def is_requirement_in_cache(
         "requirement = ?)"
     )
 
-    with sqlite3.connect(CACHE_DATABASE_PATH) as conn:
+    with sqlite3.connect(database_path) as conn:
         cursor = conn.cursor()
         result = cursor.execute(
             sql, (environment_type, environment, requirement_type, requirement)
@@ -128,7 +141,9 @@ def is_requirement_in_cache(
 def is_environment_prepared(environment):
     """Checks if environment has all requirements saved."""
 
-    if not os.path.exists(CACHE_DATABASE_PATH):
+    database_path = get_database_path()
+
+    if not os.path.exists(database_path):
         return False
 
     sql = (
@@ -138,9 +153,7 @@ def is_environment_prepared(environment):
         "r.saved = 0)"
     )
 
-    with sqlite3.connect(
-        CACHE_DATABASE_PATH, detect_types=sqlite3.PARSE_DECLTYPES
-    ) as conn:
+    with sqlite3.connect(database_path, detect_types=sqlite3.PARSE_DECLTYPES) as conn:
         cursor = conn.cursor()
         result = cursor.execute(sql, (environment,))
 
@@ -163,10 +176,11 @@ def update_environment(environment_type, old_environment, new_environment):
                             old one.
     :type environment: str
     """
-    if not os.path.exists(CACHE_DATABASE_PATH):
+    database_path = get_database_path()
+    if not os.path.exists(database_path):
         return False
 
-    with sqlite3.connect(CACHE_DATABASE_PATH) as conn:
+    with sqlite3.connect(database_path) as conn:
         cursor = conn.cursor()
         sql = "INSERT OR IGNORE INTO environment VALUES (?, ?)"
         cursor.execute(sql, (environment_type, new_environment))
@@ -208,7 +222,9 @@ def update_requirement_status(
     :type new_status: bool
     """
 
-    if not os.path.exists(CACHE_DATABASE_PATH):
+    database_path = get_database_path()
+
+    if not os.path.exists(database_path):
         return False
 
     sql = (
@@ -219,7 +235,7 @@ def update_requirement_status(
         "requirement = ?)"
     )
 
-    with sqlite3.connect(CACHE_DATABASE_PATH) as conn:
+    with sqlite3.connect(database_path) as conn:
         cursor = conn.cursor()
         cursor.execute(
             sql,
@@ -239,10 +255,12 @@ def delete_environment(environment_type, environment):
     :type environment: str
     """
 
-    if not os.path.exists(CACHE_DATABASE_PATH):
+    database_path = get_database_path()
+
+    if not os.path.exists(database_path):
         return False
 
-    with sqlite3.connect(CACHE_DATABASE_PATH) as conn:
+    with sqlite3.connect(database_path) as conn:
         sql = (
             "DELETE FROM requirement WHERE ("
             "environment_type = ? AND "
@@ -272,10 +290,12 @@ def delete_requirement(environment_type, environment, requirement_type, requirem
     :type requirement: str
     """
 
-    if not os.path.exists(CACHE_DATABASE_PATH):
+    database_path = get_database_path()
+
+    if not os.path.exists(database_path):
         return False
 
-    with sqlite3.connect(CACHE_DATABASE_PATH) as conn:
+    with sqlite3.connect(database_path) as conn:
         sql = (
             "DELETE FROM requirement WHERE ("
             "environment_type = ? AND "
@@ -304,8 +324,9 @@ def get_all_environments_with_requirement(
     :return: Dict with all environments which has selected requirements.
 
     """
+    database_path = get_database_path()
     requirements = {}
-    if not os.path.exists(CACHE_DATABASE_PATH):
+    if not os.path.exists(database_path):
         return requirements
 
     environment_select = (
@@ -321,9 +342,7 @@ def get_all_environments_with_requirement(
         f"WHERE r.environment = e.environment"
     )
 
-    with sqlite3.connect(
-        CACHE_DATABASE_PATH, detect_types=sqlite3.PARSE_DECLTYPES
-    ) as conn:
+    with sqlite3.connect(database_path, detect_types=sqlite3.PARSE_DECLTYPES) as conn:
         cursor = conn.cursor()
         result = cursor.execute(sql, (environment_type, requirement_type, requirement))
 
@@ -341,15 +360,14 @@ def get_all_requirements():
     :return: Dict with all environments which has requirements.
 
     """
+    database_path = get_database_path()
     requirements = {}
-    if not os.path.exists(CACHE_DATABASE_PATH):
+    if not os.path.exists(database_path):
         return requirements
 
     sql = "SELECT * FROM requirement"
 
-    with sqlite3.connect(
-        CACHE_DATABASE_PATH, detect_types=sqlite3.PARSE_DECLTYPES
-    ) as conn:
+    with sqlite3.connect(database_path, detect_types=sqlite3.PARSE_DECLTYPES) as conn:
         cursor = conn.cursor()
         result = cursor.execute(sql)
 
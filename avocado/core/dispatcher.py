@@ -24,6 +24,7 @@ import inspect
 import sys
 
 from avocado.core.enabled_extension_manager import EnabledExtensionManager
+from avocado.core.extension_manager import LazyExtension
 
 
 def get_dispatchers(module_name):
@@ -78,6 +79,79 @@ class CLICmdDispatcher(EnabledExtensionManager):
 
     def __init__(self):
         super().__init__("avocado.plugins.cli.cmd")
+        self._placeholders = []
+        self._order = []
+
+    @staticmethod
+    def _get_placeholder_name(ext, requested_subcommand):
+        """
+        Returns the name of a command that does not need to be loaded
+
+        That is, a command whose plugin is loaded lazily, and that is not
+        the one requested on the command line, or None otherwise.
+        """
+        if isinstance(ext, LazyExtension) and not ext.loaded:
+            name = ext.metadata.get("name")
+            if name != requested_subcommand:
+                return name
+        return None
+
+    def configure(self, parser):
+        """
+        Configures the parsers of the commands
+
+        Commands that do not need to be loaded are left out, to be added
+        by :meth:`configure_placeholders`.
+
+        :param parser: the application parser
+        :type parser: :class:`avocado.core.parser.Parser`
+        """
+        self._placeholders = []
+        self._order = []
+        for ext in self.extensions:
+            name = self._get_placeholder_name(ext, parser.requested_subcommand)
+            if name is not None:
+                self._placeholders.append((name, ext.metadata.get("description")))
+                self._order.append(name)
+                continue
+            known = set(parser.subcommands.choices)
+            self.map_method_on_extension(ext, "configure", parser)
+            self._order.extend(
+                name for name in parser.subcommands.choices if name not in known
+            )
+
+    def configure_placeholders(self, parser):
+        """
+        Adds parsers for the commands left out by :meth:`configure`
+
+        They get the description recorded on the metadata of the plugins,
+        so that they are still listed as valid subcommands, in the same
+        order as if they were loaded.  This should happen after other
+        plugins (such as :class:`CLIDispatcher` ones) extend the parsers
+        of the commands, as they can not extend these ones.
+
+        :param parser: the application parser
+        :type parser: :class:`avocado.core.parser.Parser`
+        """
+        if not self._placeholders:
+            return
+        subcommands = parser.subcommands
+        for name, help_msg in self._placeholders:
+            if help_msg is None:
+                help_msg = f"Runs the {name} command"
+            subcommands.add_parser(name, help=help_msg)
+
+        def position(name):
+            return self._order.index(name) if name in self._order else len(self._order)
+
+        choices = sorted(
+            subcommands.choices.items(), key=lambda item: position(item[0])
+        )
+        subcommands.choices.clear()
+        subcommands.choices.update(choices)
+        subcommands._choices_actions.sort(  # pylint: disable=W0212
+            key=lambda action: position(action.dest)
+        )
 
 
 class JobPrePostDispatcher(EnabledExtensionManager):
@@ -22,7 +22,9 @@ from avocado.core.settings import settings
 
 class EnabledExtensionManager(ExtensionManager):
     def __init__(self, namespace, invoke_kwds=None):
-        super().__init__(namespace, invoke_kwds)
+        super().__init__(
+            namespace, invoke_kwds, lazy=settings.as_dict().get("plugins.lazy", False)
+        )
         namespace = f"{self.settings_section()}.order"
         configured_order = settings.as_dict().get(namespace)
         ordered = []
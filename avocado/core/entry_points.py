@@ -0,0 +1,347 @@
+"""
+Index of the entry points of Avocado plugins and runners.
+
+Looking up entry points with :mod:`pkg_resources` means importing it,
+which is costly, and loading them with it also checks the requirements
+of their distributions.  Instead, the entry points of interest (the
+ones on "avocado.*" groups, and the "avocado*" console scripts) are read
+with :mod:`importlib.metadata`, and kept on an index file, reused while
+the installed distributions (as found on :data:`sys.path`) don't change.
+
+Along with the entry points, the index keeps some metadata of the
+plugins that have been loaded (such as their names, priorities and
+descriptions), so that they don't have to be loaded again just to be
+ordered or described.
+"""
+
+import atexit
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sys
+import tempfile
+
+LOG = logging.getLogger(__name__)
+
+#: Version of the format of the index, to be changed whenever the
+#: format of the entries changes
+INDEX_VERSION = 1
+
+#: The number of indexes (for different sets of installed
+#: distributions, such as seen by different Python interpreters) kept
+MAX_INDEXES = 8
+
+#: The prefix of the groups indexed
+GROUP_PREFIX = "avocado."
+
+#: The console scripts indexed are the ones whose names have this prefix
+CONSOLE_SCRIPTS_PREFIX = "avocado"
+
+#: The plugin attributes kept as metadata
+PLUGIN_METADATA = ("name", "priority", "description")
+
+#: The index of the current installed distributions, loaded on first use
+_INDEX = None
+
+
+class EntryPoint:
+    """An entry point, as found on the index.
+
+    It has the attributes of :class:`pkg_resources.EntryPoint` used
+    within Avocado.
+    """
+
+    __slots__ = ("name", "group", "value", "dist_name", "version")
+
+    def __init__(self, name, group, value, dist_name=None, version=None):
+        self.name = name
+        self.group = group
+        #: The "module:attributes" reference to the object
+        self.value = value
+        self.dist_name = dist_name
+        self.version = version
+
+    @property
+    def module_name(self):
+        return self.value.split(":", 1)[0].strip()
+
+    @property
+    def attrs(self):
+        if ":" not in self.value:
+            return ()
+        return tuple(self.value.split(":", 1)[1].strip().split("."))
+
+    @property
+    def key(self):
+        return f"{self.group}:{self.name}"
+
+    def load(self):
+        """Imports the module and returns the object referenced."""
+        obj = importlib.import_module(self.module_name)
+        for attr in self.attrs:
+            obj = getattr(obj, attr)
+        return obj
+
+    def __str__(self):
+        return f"{self.name} = {self.value}"
+
+    def __repr__(self):
+        return f"EntryPoint({str(self)!r}, group={self.group!r})"
+
+
+def get_index_path():
+    """Returns the location of the index file."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "avocado", "entry_points.json")
+
+
+def _get_file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _get_metadata_signature(metadata_dir):
+    return [
+        _get_file_signature(os.path.join(metadata_dir, name))
+        for name in ("entry_points.txt", "METADATA", "PKG-INFO")
+    ]
+
+
+def get_distributions_signature():
+    """Returns a digest of the distributions installed on :data:`sys.path`.
+
+    It changes when distributions are installed, removed, or when their
+    entry points (or versions) change.
+
+    :rtype: str
+    """
+    signature = [sys.version]
+    for path in sys.path:
+        entries = []
+        if path.endswith(".egg"):
+            entries.append(_get_metadata_signature(os.path.join(path, "EGG-INFO")))
+            entries.append(_get_file_signature(path))
+        else:
+            try:
+                names = sorted(os.listdir(path or "."))
+            except OSError:
+                continue
+            for name in names:
+                if name.endswith((".dist-info", ".egg-info")):
+                    entries.append(
+                        [name, _get_metadata_signature(os.path.join(path or ".", name))]
+                    )
+        if entries:
+            signature.append([os.path.abspath(path or "."), entries])
+    return hashlib.sha256(json.dumps(signature).encode()).hexdigest()
+
+
+def _normalize(dist_name):
+    return dist_name.lower().replace("_", "-")
+
+
+def _is_indexed(group, name):
+    if group.startswith(GROUP_PREFIX):
+        return True
+    return group == "console_scripts" and name.startswith(CONSOLE_SCRIPTS_PREFIX)
+
+
+def _build_index():
+    # pylint: disable=C0415
+    from importlib import metadata
+
+    groups = {}
+    versions = {}
+    dist_groups = {}
+    seen = set()
+    for dist in metadata.distributions():
+        dist_name = dist.metadata["Name"]
+        # the same distribution may be found more than once on sys.path,
+        # and just like on imports, the first one takes precedence
+        if dist_name is None or _normalize(dist_name) in seen:
+            continue
+        dist_name = _normalize(dist_name)
+        seen.add(dist_name)
+        versions[dist_name] = dist.version
+        dist_groups[dist_name] = []
+        for entry_point in dist.entry_points:
+            if entry_point.group not in dist_groups[dist_name]:
+                dist_groups[dist_name].append(entry_point.group)
+            if not _is_indexed(entry_point.group, entry_point.name):
+                continue
+            groups.setdefault(entry_point.group, []).append(
+                [entry_point.name, entry_point.value, dist_name]
+            )
+    return {
+        "groups": groups,
+        "versions": versions,
+        "dist_groups": dist_groups,
+        "plugins": {},
+    }
+
+
+class Index:
+    """The entry points of the installed distributions, kept on a file."""
+
+    def __init__(self, path=None):
+        """
+        :param path: the location of the index file, defaults to
+                     :func:`get_index_path`
+        :type path: str
+        """
+        if path is None:
+            path = get_index_path()
+        self.path = path
+        self.signature = get_distributions_signature()
+        self._data = None
+        self._dirty = False
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as index_file:
+                data = json.load(index_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as details:
+            LOG.debug(
+                'Failed to load the entry points index "%s": %s', self.path, details
+            )
+            return {}
+        if data.get("version") != INDEX_VERSION:
+            return {}
+        return data.get("indexes", {})
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = self._read().get(self.signature)
+            if self._data is None:
+                self._data = _build_index()
+                self._set_dirty()
+        return self._data
+
+    def _set_dirty(self):
+        if not self._dirty:
+            self._dirty = True
+            atexit.register(self.save)
+
+    def save(self):
+        """Writes the index, along with the ones for other distributions."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        indexes = self._read()
+        indexes.pop(self.signature, None)
+        indexes[self.signature] = self.data
+        indexes = dict(list(indexes.items())[-MAX_INDEXES:])
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=directory, prefix=".entry_points-", delete=False
+            ) as index_file:
+                json.dump({"version": INDEX_VERSION, "indexes": indexes}, index_file)
+            os.replace(index_file.name, self.path)
+        except OSError as details:
+            LOG.debug(
+                'Failed to save the entry points index "%s": %s', self.path, details
+            )
+
+    def iter_entry_points(self, group, name=None):
+        """Yields the entry points on a group, optionally with a given name.
+
+        :rtype: iterator of :class:`EntryPoint`
+        """
+        if name is not None and not _is_indexed(group, name):
+            return
+        for ep_name, value, dist_name in self.data["groups"].get(group, []):
+            if name is not None and ep_name != name:
+                continue
+            yield EntryPoint(
+                ep_name, group, value, dist_name, self.data["versions"].get(dist_name)
+            )
+
+    def get_groups(self, dist_name):
+        """Returns the entry point groups of a distribution.
+
+        :rtype: list
+        """
+        return list(self.data["dist_groups"].get(_normalize(dist_name), []))
+
+    def get_version(self, dist_name):
+        """Returns the version of a distribution, or None if not installed."""
+        return self.data["versions"].get(_normalize(dist_name))
+
+    def get_plugin_metadata(self, entry_point):
+        """Returns the metadata of the plugin an entry point refers to.
+
+        :returns: the attributes listed on :data:`PLUGIN_METADATA`, or
+                  None if the plugin has not been recorded, or if its
+                  module has changed since
+        :rtype: dict
+        """
+        entry = self.data["plugins"].get(entry_point.key)
+        if entry is None or entry["value"] != entry_point.value:
+            return None
+        if _get_file_signature(entry["path"]) != entry["signature"]:
+            return None
+        return entry["metadata"]
+
+    def record_plugin_metadata(self, entry_point, plugin):
+        """Records the metadata of a (loaded) plugin.
+
+        :param entry_point: the entry point the plugin was loaded from
+        :type entry_point: :class:`EntryPoint`
+        :param plugin: the plugin class
+        """
+        path = getattr(sys.modules.get(plugin.__module__), "__file__", None)
+        if path is None:
+            return
+        metadata = {}
+        for attr in PLUGIN_METADATA:
+            value = getattr(plugin, attr, None)
+            if isinstance(value, (str, int, float, bool)) or value is None:
+                metadata[attr] = value
+        entry = {
+            "value": entry_point.value,
+            "path": path,
+            "signature": _get_file_signature(path),
+            "metadata": metadata,
+        }
+        if self.data["plugins"].get(entry_point.key) != entry:
+            self.data["plugins"][entry_point.key] = entry
+            self._set_dirty()
+
+
+def get_index():
+    """Returns the index of the current installed distributions.
+
+    :rtype: :class:`Index`
+    """
+    global _INDEX  # pylint: disable=W0603
+    if _INDEX is None:
+        _INDEX = Index()
+    return _INDEX
+
+
+def iter_entry_points(group, name=None):
+    """Yields the entry points on a group, optionally with a given name.
+
+    This is a replacement for :func:`pkg_resources.iter_entry_points`,
+    for the groups of Avocado plugins and the Avocado console scripts.
+
+    :rtype: iterator of :class:`EntryPoint`
+    """
+    return get_index().iter_entry_points(group, name)
+
+
+def get_version(dist_name):
+    """Returns the version of a distribution, or None if not installed."""
+    return get_index().get_version(dist_name)
@@ -24,16 +24,22 @@ import enum
 import logging
 import sys
 
-import pkg_resources
-
+from avocado.core import entry_points
 from avocado.core.exceptions import JobBaseException
-from avocado.utils import stacktrace
 
 # This is also defined in avocado.core.output, but this avoids a
 # circular import
 LOG_UI = logging.getLogger("avocado.app")
 
 
+def _log_exc_info():
+    # the stack trace utilities are only needed (and imported) on errors
+    # pylint: disable=C0415
+    from avocado.utils import stacktrace
+
+    stacktrace.log_exc_info(sys.exc_info(), logger=LOG_UI)
+
+
 class PluginPriority(enum.IntEnum):
     VERY_HIGH = 100
     HIGH = 70
@@ -77,12 +83,64 @@ class Extension:
         return self.priority < other.priority
 
 
+class LazyExtension(Extension):
+    """
+    An extension whose plugin is only loaded, and instantiated, when used
+
+    Its priority comes from the metadata recorded when the plugin was
+    last loaded.
+    """
+
+    def __init__(
+        self, name, entry_point, metadata, invoke_kwds
+    ):  # pylint: disable=W0231
+        self.name = name
+        self.entry_point = entry_point
+        #: The metadata recorded when the plugin was last loaded, as
+        #: given by :meth:`avocado.core.entry_points.Index.get_plugin_metadata`
+        self.metadata = metadata
+        self.priority = metadata.get("priority")
+        if self.priority is None:
+            self.priority = PluginPriority.NORMAL
+        self._invoke_kwds = invoke_kwds
+        self._plugin = None
+        self._obj = None
+
+    @property
+    def plugin(self):
+        if self._plugin is None:
+            self._plugin = self.entry_point.load()
+        return self._plugin
+
+    @property
+    def obj(self):
+        if self._obj is None:
+            self._obj = self.plugin(**self._invoke_kwds)
+            entry_points.get_index().record_plugin_metadata(self.entry_point, self._obj)
+        return self._obj
+
+    @property
+    def loaded(self):
+        """Whether the plugin has already been loaded and instantiated"""
+        return self._obj is not None
+
+
 class ExtensionManager:
 
     #: Default namespace prefix for Avocado extensions
     NAMESPACE_PREFIX = "avocado.plugins."
 
-    def __init__(self, namespace, invoke_kwds=None):
+    def __init__(self, namespace, invoke_kwds=None, lazy=False):
+        """
+        :param namespace: the entry points group of the plugins
+        :type namespace: str
+        :param invoke_kwds: the keyword arguments given to the plugins
+        :type invoke_kwds: dict
+        :param lazy: whether the plugins whose metadata is known (from
+                     previous loads) are only loaded when used, with
+                     :class:`LazyExtension`
+        :type lazy: bool
+        """
         self.namespace = namespace
         self.extensions = []
         self.load_failures = []
@@ -90,16 +148,22 @@ class ExtensionManager:
             invoke_kwds = {}
 
         # load plugins
-        for ep in pkg_resources.iter_entry_points(self.namespace):
-            try:
-                plugin = ep.load()
-                obj = plugin(**invoke_kwds)
-            except ImportError as exception:
-                self.load_failures.append((ep, exception))
+        index = entry_points.get_index()
+        for ep in index.iter_entry_points(self.namespace):
+            metadata = index.get_plugin_metadata(ep) if lazy else None
+            if metadata is not None:
+                ext = LazyExtension(ep.name, ep, metadata, invoke_kwds)
             else:
+                try:
+                    plugin = ep.load()
+                    obj = plugin(**invoke_kwds)
+                except ImportError as exception:
+                    self.load_failures.append((ep, exception))
+                    continue
+                index.record_plugin_metadata(ep, obj)
                 ext = Extension(ep.name, ep, plugin, obj)
-                if self.enabled(ext):  # lgtm [py/init-calls-subclass]
-                    self.extensions.append(ext)
+            if self.enabled(ext):  # lgtm [py/init-calls-subclass]
+                self.extensions.append(ext)
         self.extensions = sorted(self.extensions)
 
     def enabled(self, extension):  # pylint: disable=W0613,R0201
@@ -198,7 +262,7 @@ class ExtensionManager:
                     ext.name,
                     sys.exc_info()[1],
                 )
-                stacktrace.log_exc_info(sys.exc_info(), logger=LOG_UI)
+                _log_exc_info()
         return ret
 
     def map_method(self, method_name, *args):
@@ -209,24 +273,36 @@ class ExtensionManager:
         :param args: Arguments to be passed to all called functions
         """
         for ext in self.extensions:
-            try:
-                if hasattr(ext.obj, method_name):
-                    method = getattr(ext.obj, method_name)
-                    method(*args)
-            except SystemExit:
-                raise
-            except KeyboardInterrupt:
-                raise
-            except JobBaseException:
-                raise
-            except:  # catch any exception pylint: disable=W0702
-                LOG_UI.error(
-                    'Error running method "%s" of plugin "%s": %s',
-                    method_name,
-                    ext.name,
-                    sys.exc_info()[1],
-                )
-                stacktrace.log_exc_info(sys.exc_info(), logger=LOG_UI)
+            self.map_method_on_extension(ext, method_name, *args)
+
+    @staticmethod
+    def map_method_on_extension(ext, method_name, *args):
+        """
+        Calls method_name on a single extension in case it has the attr
+
+        :param ext: the extension
+        :type ext: :class:`Extension`
+        :param method_name: Name of the method to be called
+        :param args: Arguments to be passed to the called function
+        """
+        try:
+            if hasattr(ext.obj, method_name):
+                method = getattr(ext.obj, method_name)
+                method(*args)
+        except SystemExit:
+            raise
+        except KeyboardInterrupt:
+            raise
+        except JobBaseException:
+            raise
+        except:  # catch any exception pylint: disable=W0702
+            LOG_UI.error(
+                'Error running method "%s" of plugin "%s": %s',
+                method_name,
+                ext.name,
+                sys.exc_info()[1],
+            )
+            _log_exc_info()
 
     def __getitem__(self, name):
         for ext in self.extensions:
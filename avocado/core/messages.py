@@ -12,16 +12,111 @@
 # Copyright: Red Hat Inc. 2021
 # Authors: Jan Richter <jarichte@redhat.com>
 
+import collections
+import locale
 import logging
 import os
 import time
 
 from avocado.core.nrunner.task import TASK_DEFAULT_CATEGORY
-from avocado.core.output import LOG_UI
+from avocado.core.output import LOG_JOB, LOG_UI
 from avocado.core.test_id import TestID
 
 DEFAULT_LOG_FILE = "debug.log"
 
+#: Maximum number of task files kept open, across all tasks, at any time
+MAX_OPEN_TASK_FILES = 256
+
+#: Maximum size (in bytes) read at once from files referenced by messages
+LOG_FILE_CHUNK_SIZE = 64 * 1024
+
+#: Maximum time (in seconds) that written data may stay in memory before
+#: being flushed to the task files
+TASK_FILES_FLUSH_INTERVAL = 1.0
+
+
+class TaskFiles:
+    """
+    Cache of open, buffered, task files.
+
+    Running messages are usually small and frequent, so instead of opening
+    and closing a task file for each one of them, the files are kept open
+    (in append mode) until the task finishes.  The number of open files is
+    bounded, and the least recently used ones are closed when the limit is
+    reached.  Buffered data is flushed at least every `flush_interval`
+    seconds, so that the files can be followed while the tasks run.
+    """
+
+    def __init__(
+        self, max_open=MAX_OPEN_TASK_FILES, flush_interval=TASK_FILES_FLUSH_INTERVAL
+    ):
+        """
+        :param max_open: maximum number of files kept open
+        :type max_open: int
+        :param flush_interval: maximum time, in seconds, between flushes
+        :type flush_interval: float
+        """
+        self.max_open = max_open
+        self.flush_interval = flush_interval
+        self._files = collections.OrderedDict()
+        self._paths_by_task = {}
+        self._last_flush = time.monotonic()
+
+    def __len__(self):
+        return len(self._files)
+
+    def _open(self, path, task_key):
+        while len(self._files) >= self.max_open:
+            _, fp = self._files.popitem(last=False)
+            fp.close()
+        fp = open(path, "ab")  # pylint: disable=R1732
+        self._files[path] = fp
+        self._paths_by_task.setdefault(task_key, set()).add(path)
+        return fp
+
+    def write(self, path, data, task_key):
+        """
+        Appends data to a task file.
+
+        :param path: path of the file
+        :type path: str
+        :param data: data to be saved
+        :type data: bytes
+        :param task_key: identifies the task that owns the file
+        """
+        fp = self._files.get(path)
+        if fp is None:
+            fp = self._open(path, task_key)
+        else:
+            self._files.move_to_end(path)
+        fp.write(data)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Writes all buffered data to the task files."""
+        for fp in self._files.values():
+            fp.flush()
+        self._last_flush = time.monotonic()
+
+    def close_task(self, task_key):
+        """
+        Closes all the files of a task, writing their buffered data.
+
+        :param task_key: identifies the task that owns the files
+        """
+        for path in self._paths_by_task.pop(task_key, ()):
+            fp = self._files.pop(path, None)
+            if fp is not None:
+                fp.close()
+
+    def close(self):
+        """Closes all the files, writing their buffered data."""
+        while self._files:
+            _, fp = self._files.popitem()
+            fp.close()
+        self._paths_by_task.clear()
+
 
 class BaseMessageHandler:
     """
@@ -57,31 +152,52 @@ class BaseMessageHandler:
 
 
 class MessageHandler(BaseMessageHandler):
-    """Entry point for handling messages."""
+    """Entry point for handling messages.
+
+    Task files are written through a :class:`TaskFiles` cache, so users
+    should call :meth:`flush` when idle, and :meth:`close` when done.
+    """
 
     def __init__(self):
+        self._files = TaskFiles()
         self._handlers = {
             "started": [StartMessageHandler()],
             "finished": [FinishMessageHandler()],
-            "running": [RunningMessageHandler()],
+            "running": [RunningMessageHandler(self._files)],
         }
 
     def process_message(self, message, task, job):
+        if message.get("status") == "finished":
+            # the task files may be read by the result plugins
+            self._files.close_task(task.identifier)
         for handler in self._handlers.get(message.get("status"), []):
             handler.process_message(message, task, job)
 
+    def flush(self):
+        """Writes all buffered data to the task files."""
+        self._files.flush()
+
+    def close(self):
+        """Closes all the task files, writing their buffered data."""
+        self._files.close()
+
 
 class RunningMessageHandler(BaseMessageHandler):
     """Entry point for handling running messages."""
 
-    def __init__(self):
+    def __init__(self, files=None):
+        """
+        :param files: cache of open task files, shared with all the
+                      handlers, or None to open a file on every write
+        :type files: :class:`TaskFiles`
+        """
         self._handlers = {
-            "log": [LogMessageHandler()],
-            "stdout": [StdoutMessageHandler()],
-            "stderr": [StderrMessageHandler()],
-            "whiteboard": [WhiteboardMessageHandler()],
-            "output": [OutputMessageHandler()],
-            "file": [FileMessageHandler()],
+            "log": [LogMessageHandler(files)],
+            "stdout": [StdoutMessageHandler(files)],
+            "stderr": [StderrMessageHandler(files)],
+            "whiteboard": [WhiteboardMessageHandler(files)],
+            "output": [OutputMessageHandler(files)],
+            "file": [FileMessageHandler(files)],
         }
 
     def process_message(self, message, task, job):
@@ -217,8 +333,14 @@ class BaseRunningMessageHandler(BaseMessageHandler):
 
     _tag = b""
 
-    def __init__(self):
+    def __init__(self, files=None):
+        """
+        :param files: cache of open task files, or None to open a file on
+                      every write
+        :type files: :class:`TaskFiles`
+        """
         self.line_buffer = b""
+        self._files = files
 
     def _split_complete_lines(self, data):
         """
@@ -257,16 +379,56 @@ class BaseRunningMessageHandler(BaseMessageHandler):
         :param task: runtime_task which message is related to
         :type task: :class:`avocado.core.nrunner.Task`
         """
+        for log in self._get_logs(message, task):
+            if message.get("encoding"):
+                data = log.splitlines(True)
+            else:
+                data = self._split_complete_lines(log)
+
+            if data:
+                data = self._tag + self._tag.join(data)
+                self._save_message_to_file(
+                    DEFAULT_LOG_FILE, data, task, message.get("encoding")
+                )
+
+    @staticmethod
+    def _get_logs(message, task):
+        """
+        Produces the message log, in chunks.
 
-        if message.get("encoding"):
-            data = message.get("log", b"").splitlines(True)
-        else:
-            data = self._split_complete_lines(message.get("log", b""))
+        Instead of carrying the log itself, a message may reference
+        content that the runner has already written to a file in the task
+        directory, with the "log_file", "log_offset" and "log_size" keys.
+        Such content is read in chunks of at most `LOG_FILE_CHUNK_SIZE`.
 
-        if data:
-            data = self._tag + self._tag.join(data)
-            self._save_message_to_file(
-                DEFAULT_LOG_FILE, data, task, message.get("encoding")
+        :param message: message from runner
+        :type message: dict
+        :param task: runtime_task which message is related to
+        :type task: :class:`avocado.core.nrunner.Task`
+        :rtype: iterator of bytes
+        """
+        log_file = message.get("log_file")
+        if log_file is None:
+            yield message.get("log", b"")
+            return
+        filename = os.path.relpath(os.path.join("/", log_file), "/")
+        path = os.path.join(task.metadata["task_path"], filename)
+        remaining = message.get("log_size", 0)
+        try:
+            with open(path, "rb") as log:
+                log.seek(message.get("log_offset", 0))
+                while remaining > 0:
+                    chunk = log.read(min(remaining, LOG_FILE_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+        except FileNotFoundError:
+            LOG_JOB.warning(
+                'Task "%s": could not read the output referenced in "%s" (is '
+                "the task output directory shared with the job?)",
+                task.identifier,
+                path,
             )
 
     @staticmethod
@@ -288,8 +450,7 @@ class BaseRunningMessageHandler(BaseMessageHandler):
             message = f"{message}\n"
         return message
 
-    @staticmethod
-    def _save_message_to_file(filename, buff, task, encoding=None):
+    def _save_message_to_file(self, filename, buff, task, encoding=None):
         """
         Method for saving messages into the file
 
@@ -307,17 +468,16 @@ class BaseRunningMessageHandler(BaseMessageHandler):
         :param encoding: encoding of buff, default is None
         :type encoding: str
         """
-
-        def _save_to_file(file_name, mode):
-            with open(file_name, mode) as fp:  # pylint: disable=W1514
-                fp.write(buff)
-
         file = os.path.join(task.metadata["task_path"], filename)
         if encoding:
-            buff = BaseRunningMessageHandler._message_to_line(buff, encoding)
-            _save_to_file(file, "a")
+            buff = self._message_to_line(buff, encoding).encode(
+                locale.getpreferredencoding(False)
+            )
+        if self._files is None:
+            with open(file, "ab") as fp:
+                fp.write(buff)
         else:
-            _save_to_file(file, "ab")
+            self._files.write(file, buff, task.identifier)
 
 
 class LogMessageHandler(BaseRunningMessageHandler):
@@ -375,16 +535,18 @@ class LogMessageHandler(BaseRunningMessageHandler):
             logger = logging.getLogger(log_name)
             level = logging.getLevelName(message.get("log_levelname"))
             log_message = f"{task.identifier}: {message.get('log').decode(message.get('encoding'))}"
-            logger_level = logger.level
-            try:
-                logger.setLevel(level)
-            except ValueError:
+            if not isinstance(level, int):
                 logging.addLevelName(
                     message.get("log_level"), message.get("log_levelname")
                 )
                 level = logging.getLevelName(message.get("log_levelname"))
-            logger.log(level, log_message)
-            logger.setLevel(logger_level)
+            # the record is handled regardless of the logger level, which
+            # is cheaper than temporarily changing it, as that clears the
+            # caches of all loggers
+            record = logger.makeRecord(
+                log_name, level, "(unknown file)", 0, log_message, None, None
+            )
+            logger.handle(record)
 
 
 class StdoutMessageHandler(BaseRunningMessageHandler):
@@ -401,6 +563,14 @@ class StdoutMessageHandler(BaseRunningMessageHandler):
     :param log_only: whether to save the "log" message only to the standard
                      test log (and not to the "stdout" file)
     :type log_only: bool
+    :param log_file: instead of the content in "log", the name of the file,
+                     relative to the task directory, with the content
+                     [Optional]
+    :type log_file: str
+    :param log_offset: offset of the content in "log_file" [Optional]
+    :type log_offset: int
+    :param log_size: size of the content in "log_file" [Optional]
+    :type log_size: int
     :param encoding: optional value for decoding messages
     :type encoding: str
     :param time: Time stamp of the message
@@ -434,6 +604,14 @@ class StderrMessageHandler(BaseRunningMessageHandler):
     :param log_only: whether to save the "log" message only to the standard
                      test log (and not to the "stderr" file)
     :type log_only: bool
+    :param log_file: instead of the content in "log", the name of the file,
+                     relative to the task directory, with the content
+                     [Optional]
+    :type log_file: str
+    :param log_offset: offset of the content in "log_file" [Optional]
+    :type log_offset: int
+    :param log_size: size of the content in "log_file" [Optional]
+    :type log_size: int
     :param encoding: optional value for decoding messages
     :type encoding: str
     :param time: Time stamp of the message
@@ -1,12 +1,11 @@
 import argparse
-import inspect
 import json
 import os
 import re
 import sys
+import types
 
-import pkg_resources
-
+from avocado.core import entry_points
 from avocado.core.nrunner.runnable import Runnable
 from avocado.core.nrunner.task import TASK_DEFAULT_CATEGORY, Task
 
@@ -153,9 +152,10 @@ class BaseRunnerApp:
     def _get_commands_method(self):
         prefix = "command_"
         return {
-            c[0][len(prefix) :].replace("_", "-"): getattr(self, c[0])
-            for c in inspect.getmembers(self, inspect.ismethod)
-            if c[0].startswith(prefix)
+            name[len(prefix) :].replace("_", "-"): getattr(self, name)
+            for name in dir(self)
+            if name.startswith(prefix)
+            and isinstance(getattr(self, name), types.MethodType)
         }
 
     @staticmethod
@@ -227,7 +227,7 @@ class BaseRunnerApp:
         """
         config_used = []
         for kind in self.RUNNABLE_KINDS_CAPABLE:
-            for ep in pkg_resources.iter_entry_points(
+            for ep in entry_points.iter_entry_points(
                 "avocado.plugins.runnable.runner", kind
             ):
                 try:
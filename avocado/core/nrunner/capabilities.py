@@ -0,0 +1,173 @@
+"""
+Persistent registry of the capabilities of runner commands.
+
+Finding the runner command for a kind of runnable means launching the
+candidate commands with the "capabilities" argument.  To avoid doing
+that on every job (and on every "avocado list"), the capabilities
+obtained are kept on a file in the data directory, and reused while the
+runner executable (and the Python module implementing it, if known),
+the Avocado version and the Python path are the same.  As changes to
+other modules the runners use are not noticed, it is only used when the
+"runner.capabilities_registry" option is enabled.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+from avocado.core import entry_points
+from avocado.core.version import VERSION
+
+LOG = logging.getLogger(__name__)
+
+#: Version of the format of the registry, to be changed whenever the
+#: format of the entries changes
+REGISTRY_VERSION = 1
+
+
+def get_registry_path():
+    """Returns the location of the runner capabilities registry."""
+    # pylint: disable=C0415
+    from avocado.core.data_dir import get_datafile_path
+
+    return get_datafile_path("cache", "runners.json")
+
+
+def _get_file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [path, stat.st_mtime_ns, stat.st_size]
+
+
+def _get_module_name(runner_command):
+    if len(runner_command) == 3 and runner_command[1] == "-m":
+        return runner_command[2]
+    for ep in entry_points.iter_entry_points("console_scripts", runner_command[0]):
+        return ep.module_name
+    return None
+
+
+def get_command_signature(runner_command, env=None):
+    """Returns what identifies the current version of a runner command.
+
+    :param runner_command: the runner command, as given by
+                           :meth:`avocado.core.nrunner.runnable.Runnable.pick_runner_command`
+    :type runner_command: list of str
+    :param env: the environment the command would be run with
+    :type env: dict
+    :returns: the signatures of the executable, and of the Python module
+              implementing it (for "python -m" commands and console
+              scripts), or None if they are not found
+    :rtype: list
+    """
+    executable = shutil.which(runner_command[0])
+    if executable is None:
+        return None
+    signature = [VERSION, _get_file_signature(os.path.realpath(executable))]
+    module_name = _get_module_name(runner_command)
+    if module_name is not None:
+        # pylint: disable=C0415
+        import importlib.util
+
+        try:
+            spec = importlib.util.find_spec(module_name)
+        except (ImportError, ValueError):
+            spec = None
+        if spec is None or spec.origin is None:
+            return None
+        signature.append(_get_file_signature(spec.origin))
+    signature.append((env if env is not None else os.environ).get("PYTHONPATH"))
+    return signature
+
+
+class CapabilitiesRegistry:
+    """Runner capabilities, kept on a file across jobs."""
+
+    def __init__(self, path=None):
+        """
+        :param path: the location of the registry file, defaults to
+                     :func:`get_registry_path`
+        :type path: str
+        """
+        if path is None:
+            path = get_registry_path()
+        self.path = path
+        self._entries = None
+
+    def _load(self):
+        self._entries = {}
+        try:
+            with open(self.path, encoding="utf-8") as registry_file:
+                data = json.load(registry_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as details:
+            LOG.warning(
+                'Failed to load the runners registry "%s": %s', self.path, details
+            )
+            return
+        if data.get("version") == REGISTRY_VERSION:
+            self._entries = data.get("runners", {})
+
+    @property
+    def entries(self):
+        """The registered capabilities, and signatures, by command."""
+        if self._entries is None:
+            self._load()
+        return self._entries
+
+    def get(self, runner_command, env=None):
+        """Returns the registered capabilities of a runner command.
+
+        :returns: the capabilities, or None if they are not registered, or
+                  if the command changed since they were
+        :rtype: dict
+        """
+        entry = self.entries.get(" ".join(runner_command))
+        if entry is None:
+            return None
+        if entry.get("signature") != get_command_signature(runner_command, env):
+            return None
+        return entry.get("capabilities")
+
+    def put(self, runner_command, capabilities, env=None):
+        """Registers the capabilities of a runner command, and saves them.
+
+        Commands whose executable can not be found are not registered.
+        """
+        signature = get_command_signature(runner_command, env)
+        if signature is None:
+            return
+        self.entries[" ".join(runner_command)] = {
+            "signature": signature,
+            "capabilities": capabilities,
+        }
+        self.save()
+
+    def save(self):
+        """Writes the registry, replacing the file atomically."""
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=directory, prefix=".runners-", delete=False
+            ) as registry_file:
+                json.dump(
+                    {"version": REGISTRY_VERSION, "runners": self.entries},
+                    registry_file,
+                )
+            os.replace(registry_file.name, self.path)
+        except OSError as details:
+            LOG.warning(
+                'Failed to save the runners registry "%s": %s', self.path, details
+            )
+
+    def clear(self):
+        """Removes all entries, and the registry file."""
+        self._entries = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
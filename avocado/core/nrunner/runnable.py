@@ -4,12 +4,11 @@ import copy
 import json
 import logging
 import os
+import shutil
 import subprocess
 import sys
 import warnings
 
-import pkg_resources
-
 try:
     import jsonschema
 
@@ -17,10 +16,13 @@ try:
 except ImportError:
     JSONSCHEMA_AVAILABLE = False
 
+from avocado.core import entry_points
 from avocado.core.dependencies.dependency import Dependency
+from avocado.core.nrunner.capabilities import CapabilitiesRegistry
 from avocado.core.nrunner.config import ConfigDecoder, ConfigEncoder
 from avocado.core.settings import settings
 from avocado.core.utils.eggenv import get_python_path_env_if_egg
+from avocado.core.utils.path import prepend_base_path
 
 LOG = logging.getLogger(__name__)
 
@@ -31,6 +33,13 @@ RUNNERS_REGISTRY_STANDALONE_EXECUTABLE = {}
 #: The configuration that is known to be used by standalone runners
 STANDALONE_EXECUTABLE_CONFIG_USED = {}
 
+#: The configuration used by the runner classes, found on entry points,
+#: by kind
+_CONFIGURATION_USED_BY_RUNNER_CLASS = {}
+
+#: The persistent registry of runner capabilities, created on first use
+_CAPABILITIES_REGISTRY = None
+
 #: Location used for schemas when packaged (as in RPMs)
 SYSTEM_WIDE_SCHEMA_PATH = "/usr/share/avocado/schemas"
 
@@ -100,8 +109,10 @@ class Runnable:
         self.uri = uri
         #: This attributes holds default configuration values that the
         #: runner has determined that has interest in by setting it in
-        #: attr:`avocado.core.nrunner.runner.BaseRunner.CONFIGURATION_USED`
-        self._default_config = self.filter_runnable_config(kind, {})
+        #: attr:`avocado.core.nrunner.runner.BaseRunner.CONFIGURATION_USED`.
+        #: It's only materialized when first used, and it may be shared
+        #: by many runnables of the same kind, so it must not be modified
+        self._default_config = None
         #: This attributes holds configuration from Avocado proper
         #: that is passed to runners, as long as a runner declares
         #: its interest in using them with
@@ -112,6 +123,9 @@ class Runnable:
         self.dependencies = self.read_dependencies(kwargs.pop("dependencies", None))
         self.variant = kwargs.pop("variant", None)
         self.output_dir = kwargs.pop("output_dir", None)
+        #: Whether the output directory is shared with the job, that is,
+        #: whether the job can read the files that the runner writes to it
+        self.output_dir_shared = kwargs.pop("output_dir_shared", False)
         #: list of (:class:`ReferenceResolutionAssetType`, str) tuples
         #: expressing assets that the test will require in order to run.
         self.assets = kwargs.pop("assets", None)
@@ -187,16 +201,27 @@ class Runnable:
     @property
     def config(self):
         if not self._config:
-            return self._default_config
-        config_with_defaults = copy.copy(self._default_config)
+            return self.default_config
+        # the defaults are not needed (and getting them is costly, as it
+        # needs the whole configuration) if the values are all given
+        if self._default_config is None and all(
+            key in self._config
+            for key in self.get_configuration_used_by_kind(self.kind)
+        ):
+            return copy.copy(self._config)
+        config_with_defaults = copy.copy(self.default_config)
         config_with_defaults.update(self._config)
         return config_with_defaults
 
     @property
     def default_config(self):
+        if self._default_config is None:
+            self._default_config = self.filter_runnable_config(self.kind, {})
         return self._default_config
 
     def _config_setter_warning(self, config, default_config=False):
+        if not (config or default_config):
+            return
         configuration_used = Runnable.get_configuration_used_by_kind(self.kind)
         if default_config:
             if set(configuration_used) == (set(config.keys())):
@@ -234,7 +259,8 @@ class Runnable:
         describes essential configuration values for each runner kind.
 
         These values are used as convenience if other values are not set
-        in the actual :attr:`config` itself.
+        in the actual :attr:`config` itself.  The same values may be set
+        on many runnables, so they must not be modified.
 
         :param config: A config dict with default values for this Runnable.
         :type config: dict
@@ -268,9 +294,7 @@ class Runnable:
         if not JSONSCHEMA_AVAILABLE:
             return False
         schema_filename = "runnable-recipe.schema.json"
-        schema_path = pkg_resources.resource_filename(
-            "avocado", os.path.join("schemas", schema_filename)
-        )
+        schema_path = prepend_base_path(os.path.join("schemas", schema_filename))
         if not os.path.exists(schema_path):
             schema_path = os.path.join(SYSTEM_WIDE_SCHEMA_PATH, schema_filename)
             if not os.path.exists(schema_path):
@@ -355,10 +379,14 @@ class Runnable:
         :returns: the configuration used by a runner of a given kind
         :rtype: list
         """
+        configuration_used = _CONFIGURATION_USED_BY_RUNNER_CLASS.get(kind)
+        if configuration_used is not None:
+            return configuration_used + CONFIGURATION_USED
         configuration_used = []
         klass = cls.pick_runner_class_from_entry_point_kind(kind)
         if klass is not None:
             configuration_used = klass.CONFIGURATION_USED
+            _CONFIGURATION_USED_BY_RUNNER_CLASS[kind] = configuration_used
         else:
             command = Runnable.pick_runner_command(kind)
             if command is not None:
@@ -384,13 +412,18 @@ class Runnable:
                   based on STANDALONE_EXECUTABLE_CONFIG_USED
         :rtype: dict
         """
-        whole_config = settings.as_dict()
+        whole_config = None
         filtered_config = {}
         config_items = cls.get_configuration_used_by_kind(kind)
         for config_item in config_items:
-            filtered_config[config_item] = config.get(
-                config_item, whole_config.get(config_item)
-            )
+            if config_item in config:
+                filtered_config[config_item] = config[config_item]
+                continue
+            # getting the whole configuration is costly, so it's only
+            # done if needed, and once
+            if whole_config is None:
+                whole_config = settings.as_dict()
+            filtered_config[config_item] = whole_config.get(config_item)
         return filtered_config
 
     def read_dependencies(self, dependencies_dict):
@@ -446,6 +479,9 @@ class Runnable:
         if self.output_dir is not None:
             args.append(f"output_dir={self.output_dir}")
 
+        if self.output_dir_shared:
+            args.append("output_dir_shared=json:true")
+
         for key, val in self.kwargs.items():
             if not isinstance(val, str) or isinstance(val, int):
                 val = f"json:{json.dumps(val)}"
@@ -476,6 +512,8 @@ class Runnable:
             kwargs["variant"] = self.variant
         if self.output_dir is not None:
             kwargs["output_dir"] = self.output_dir
+        if self.output_dir_shared:
+            kwargs["output_dir_shared"] = True
         if kwargs:
             recipe["kwargs"] = kwargs
         return recipe
@@ -542,6 +580,62 @@ class Runnable:
             )
         return capabilities
 
+    @staticmethod
+    def get_registered_capabilities_from_runner_command(runner_command, env=None):
+        """Returns the capabilities of a runner command, probing it if needed.
+
+        If the "runner.capabilities_registry" configuration is enabled,
+        the capabilities are looked up on (and, when probed, added to) the
+        persistent :class:`avocado.core.nrunner.capabilities.CapabilitiesRegistry`.
+        Otherwise, this is the same as :meth:`get_capabilities_from_runner_command`.
+        """
+        global _CAPABILITIES_REGISTRY  # pylint: disable=W0603
+        if not settings.as_dict().get("runner.capabilities_registry"):
+            return Runnable.get_capabilities_from_runner_command(runner_command, env)
+        if _CAPABILITIES_REGISTRY is None:
+            _CAPABILITIES_REGISTRY = CapabilitiesRegistry()
+        capabilities = _CAPABILITIES_REGISTRY.get(runner_command, env)
+        if capabilities is None:
+            capabilities = Runnable.get_capabilities_from_runner_command(
+                runner_command, env
+            )
+            if capabilities:
+                _CAPABILITIES_REGISTRY.put(runner_command, capabilities, env)
+            return capabilities
+        STANDALONE_EXECUTABLE_CONFIG_USED.setdefault(
+            " ".join(runner_command), capabilities.get("configuration_used", [])
+        )
+        return capabilities
+
+    @staticmethod
+    def pick_runner_command_from_entry_points(kind):
+        """Selects a runner command based on entry points, without running it.
+
+        A runner for a kind is assumed to exist when both a console script
+        named after the kind, and a runner class for the kind, are
+        registered, and its configuration used is taken from the class.
+
+        :param kind: runners' kind
+        :type kind: str
+        :returns: command line arguments to execute the runner
+        :rtype: list of str or None
+        """
+        module_name = Runnable.pick_runner_module_from_entry_point_kind(kind)
+        if module_name is None:
+            return None
+        klass = Runnable.pick_runner_class_from_entry_point_kind(kind)
+        if klass is None:
+            return None
+        standalone_executable_cmd = [f"avocado-runner-{kind}"]
+        if shutil.which(standalone_executable_cmd[0]) is not None:
+            runner_cmd = standalone_executable_cmd
+        else:
+            runner_cmd = [sys.executable, "-m", module_name]
+        STANDALONE_EXECUTABLE_CONFIG_USED.setdefault(
+            " ".join(runner_cmd), list(klass.CONFIGURATION_USED)
+        )
+        return runner_cmd
+
     @staticmethod
     def is_kind_supported_by_runner_command(
         kind, runner_cmd, capabilities=None, env=None
@@ -582,9 +676,18 @@ class Runnable:
         if runner_cmd is not None:
             return runner_cmd
 
+        if settings.as_dict().get("runner.capabilities_from_entry_points"):
+            runner_cmd = Runnable.pick_runner_command_from_entry_points(kind)
+            if runner_cmd is not None:
+                runners_registry[kind] = runner_cmd
+                return runner_cmd
+
         standalone_executable_cmd = [f"avocado-runner-{kind}"]
+        capabilities = Runnable.get_registered_capabilities_from_runner_command(
+            standalone_executable_cmd
+        )
         if Runnable.is_kind_supported_by_runner_command(
-            kind, standalone_executable_cmd
+            kind, standalone_executable_cmd, capabilities
         ):
             runners_registry[kind] = standalone_executable_cmd
             return standalone_executable_cmd
@@ -596,8 +699,12 @@ class Runnable:
         module_name = Runnable.pick_runner_module_from_entry_point_kind(kind)
         if module_name is not None:
             candidate_cmd = [sys.executable, "-m", module_name]
+            env = get_python_path_env_if_egg()
+            capabilities = Runnable.get_registered_capabilities_from_runner_command(
+                candidate_cmd, env
+            )
             if Runnable.is_kind_supported_by_runner_command(
-                kind, candidate_cmd, env=get_python_path_env_if_egg()
+                kind, candidate_cmd, capabilities, env
             ):
                 runners_registry[kind] = candidate_cmd
                 return candidate_cmd
@@ -639,7 +746,7 @@ class Runnable:
         :returns: a module that can be run with "python -m" or None"""
         namespace = "console_scripts"
         section = f"avocado-runner-{kind}"
-        for ep in pkg_resources.iter_entry_points(namespace, section):
+        for ep in entry_points.iter_entry_points(namespace, section):
             return ep.module_name
 
     @staticmethod
@@ -653,7 +760,7 @@ class Runnable:
         :returns: a class that inherits from :class:`BaseRunner` or None
         """
         namespace = "avocado.plugins.runnable.runner"
-        for ep in pkg_resources.iter_entry_points(namespace, kind):
+        for ep in entry_points.iter_entry_points(namespace, kind):
             try:
                 obj = ep.load()
                 return obj
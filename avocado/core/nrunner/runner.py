@@ -66,11 +66,16 @@ class BaseRunner(RunnableRunner):
         status.update({"status": status_type, "time": time.monotonic()})
         return status
 
-    def running_loop(self, condition):
+    def running_loop(self, condition, pending=None):
         """Produces timely running messages until end condition is found.
 
         :param condition: a callable that will be evaluated as a
                           condition for continuing the loop
+        :param pending: an optional callable, evaluated on every check,
+                        that returns the (running) messages that are
+                        ready to be produced, such as the output of a
+                        process.  The loop does not pause while it
+                        returns messages.
         """
         most_current_execution_state_time = None
         next_execution_state_mark = 0
@@ -86,4 +91,10 @@ class BaseRunner(RunnableRunner):
             ):
                 most_current_execution_state_time = now
                 yield self.prepare_status("running")
-            time.sleep(RUNNER_RUN_CHECK_INTERVAL)
+            produced = False
+            if pending is not None:
+                for message in pending():
+                    produced = True
+                    yield message
+            if not produced:
+                time.sleep(RUNNER_RUN_CHECK_INTERVAL)
@@ -3,6 +3,7 @@ import json
 import logging
 import socket
 import tempfile
+import threading
 import time
 from uuid import uuid1
 
@@ -10,6 +11,7 @@ from avocado.core.nrunner.runnable import (
     RUNNERS_REGISTRY_STANDALONE_EXECUTABLE,
     Runnable,
 )
+from avocado.core.status import protocol
 
 LOG = logging.getLogger(__name__)
 
@@ -35,12 +37,35 @@ class TaskStatusService:
     """
     Implementation of interface that a task can use to post status updates
 
+    On connection, the framed protocol described on
+    :mod:`avocado.core.status.protocol` is negotiated, and if the status
+    server does not support it, messages are sent as JSON lines.  With
+    the framed protocol, "running" messages are queued (and coalesced
+    when possible) for up to :attr:`coalesce_window` seconds, and sent
+    in batches.
+
     TODO: make the interface generic and this just one of the implementations
     """
 
-    def __init__(self, uri):
+    #: Time (in seconds) to wait for a status server to accept the
+    #: framed protocol, before falling back to JSON lines
+    NEGOTIATION_TIMEOUT = 0.5
+
+    #: Amount of queued log data (in bytes) that causes an immediate flush
+    MAX_QUEUED_SIZE = 2**20
+
+    def __init__(self, uri, coalesce_window=0.05):
         self.uri = uri
         self._connection = None
+        #: Whether the framed protocol has been negotiated
+        self.framed = False
+        #: Maximum time (in seconds) a message will be queued
+        self.coalesce_window = coalesce_window
+        self._queue = []
+        self._queued_size = 0
+        self._queue_lock = threading.Lock()
+        self._flush_timer = None
+        self._flush_failed = False
 
     @property
     def connection(self):
@@ -67,23 +92,99 @@ class TaskStatusService:
         else:
             self._connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
             self._connection.connect(self.uri)
+        self.framed = self._negotiate()
 
-    def post(self, status):
-        data = json_dumps(status)
+    def _negotiate(self):
+        """Attempts to switch the connection to the framed protocol.
+
+        :returns: whether the status server accepted the framed protocol
+        :rtype: bool
+        """
+        reply = b""
+        try:
+            self._connection.sendall(protocol.HELLO)
+            self._connection.settimeout(self.NEGOTIATION_TIMEOUT)
+            while not reply.endswith(b"\n"):
+                data = self._connection.recv(len(protocol.ACK) - len(reply))
+                if not data:
+                    break
+                reply += data
+        except OSError:
+            return False
+        finally:
+            self._connection.settimeout(None)
+        return reply == protocol.ACK
+
+    def _send(self, data):
         try:
-            self.connection.send(data.encode("ascii") + "\n".encode("ascii"))
+            self.connection.sendall(data)
         except BrokenPipeError:
             try:
                 self._create_connection()
-                self.connection.send(data.encode("ascii") + "\n".encode("ascii"))
+                self.connection.sendall(data)
             except ConnectionRefusedError:
                 LOG.warning(f"Connection with {self.uri} has been lost.")
                 return False
         return True
 
+    def _queue_message(self, status):
+        """Queues a message, coalescing it with the previous if possible."""
+        log = status.get("log")
+        if isinstance(log, bytes):
+            self._queued_size += len(log)
+        if self._queue and protocol.can_coalesce(self._queue[-1], status):
+            self._queue[-1]["log"] += log
+            return
+        self._queue.append(dict(status))
+
+    def flush(self):
+        """Sends all the queued messages.
+
+        :returns: whether the messages could be sent
+        :rtype: bool
+        """
+        with self._queue_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._queue:
+                return not self._flush_failed
+            data = protocol.encode_frame(self._queue)
+            self._queue = []
+            self._queued_size = 0
+            if not self._send(data):
+                self._flush_failed = True
+            return not self._flush_failed
+
+    def post(self, status):
+        if self.connection is not None and self.framed:
+            with self._queue_lock:
+                self._queue_message(status)
+                must_flush = (
+                    status.get("status") != "running"
+                    or self._queued_size >= self.MAX_QUEUED_SIZE
+                    or not self.coalesce_window
+                )
+                if not must_flush and self._flush_timer is None:
+                    self._flush_timer = threading.Timer(
+                        self.coalesce_window, self.flush
+                    )
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+                failed = self._flush_failed
+            if must_flush:
+                return self.flush()
+            return not failed
+
+        data = json_dumps(status)
+        return self._send(data.encode("ascii") + "\n".encode("ascii"))
+
     def close(self):
-        if self.connection is not None:
-            self.connection.close()
+        if self._connection is not None:
+            if self.framed:
+                self.flush()
+            self._connection.close()
+            self._connection = None
 
     def __repr__(self):
         return f'<TaskStatusService uri="{self.uri}">'
@@ -240,3 +341,5 @@ class Task:
                 )
                 damaged_status_services.clear()
             yield status
+        for status_service in running_status_services:
+            status_service.close()
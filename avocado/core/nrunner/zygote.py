@@ -0,0 +1,337 @@
+"""
+Pre-forked ("zygote") runner processes
+
+A zygote is a long lived Python process that has already imported a
+runner application (and with it, the bulk of :mod:`avocado.core`).  It
+receives the command line arguments of tasks over its standard input,
+and forks a new child for every task, sparing the child of the Python
+interpreter startup and import costs.
+
+The protocol is made of JSON documents, one per line.  Requests, sent
+to the zygote's standard input, look like::
+
+  {"args": ["task-run", "-i", "1-test", ...]}
+
+And for each request, a reply is sent on the zygote's standard output,
+in the same order, containing either ``{"pid": PID}`` or
+``{"error": MESSAGE}``.  Additionally, whenever a child finishes, the
+zygote sends ``{"exited": PID, "returncode": RETURNCODE}``.
+
+Once its standard input is closed, the zygote stops accepting tasks,
+and exits as soon as all of its children have finished.
+"""
+
+import asyncio
+import collections
+import importlib
+import json
+import logging
+import os
+import select
+import signal
+import subprocess
+import sys
+
+LOG = logging.getLogger(__name__)
+
+#: The time (in seconds) a retired zygote is given to exit, after its
+#: children have finished, before being killed when stopped
+STOP_TIMEOUT = 10
+
+
+def _send(data):
+    os.write(1, json.dumps(data).encode() + b"\n")
+
+
+def _run_child(entry_point, argv):
+    """Runs the runner application on the forked child, never returns."""
+    returncode = 0
+    try:
+        for fileno in (0, 1, 2):
+            devnull = os.open(os.devnull, os.O_RDWR)
+            os.dup2(devnull, fileno)
+            os.close(devnull)
+        sys.argv = argv
+        entry_point()
+    except SystemExit as details:
+        if isinstance(details.code, int):
+            returncode = details.code
+        elif details.code is not None:
+            returncode = 1
+    except BaseException:  # pylint: disable=W0703
+        returncode = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(returncode)  # pylint: disable=W0212
+
+
+def _reap_children():
+    """Reaps all finished children, notifying about each one of them.
+
+    :returns: the number of children reaped
+    :rtype: int
+    """
+    reaped = 0
+    while True:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return reaped
+        if pid == 0:
+            return reaped
+        if os.WIFSIGNALED(status):
+            returncode = -os.WTERMSIG(status)
+        else:
+            returncode = os.WEXITSTATUS(status)
+        _send({"exited": pid, "returncode": returncode})
+        reaped += 1
+
+
+def serve(prog, entry_point):
+    """Serves fork requests until the standard input is closed.
+
+    :param prog: the program name, given to the runner application as
+                 the first item of :data:`sys.argv`
+    :type prog: str
+    :param entry_point: the callable that runs the runner application
+    """
+    wakeup_read, wakeup_write = os.pipe()
+    os.set_blocking(wakeup_write, False)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    signal.set_wakeup_fd(wakeup_write)
+
+    accepting = True
+    children = 0
+    buffered = b""
+    while accepting or children:
+        readers = [wakeup_read]
+        if accepting:
+            readers.append(0)
+        ready, _, _ = select.select(readers, [], [])
+        if wakeup_read in ready:
+            os.read(wakeup_read, 4096)
+        if 0 in ready:
+            data = os.read(0, 65536)
+            if not data:
+                accepting = False
+            buffered += data
+            while b"\n" in buffered:
+                line, buffered = buffered.split(b"\n", 1)
+                args = json.loads(line)["args"]
+                try:
+                    pid = os.fork()
+                except OSError as details:
+                    _send({"error": str(details)})
+                    continue
+                if pid == 0:
+                    signal.set_wakeup_fd(-1)
+                    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                    os.close(wakeup_read)
+                    os.close(wakeup_write)
+                    _run_child(entry_point, [prog] + args)
+                children += 1
+                _send({"pid": pid})
+        children -= _reap_children()
+
+
+def main():
+    """Starts a zygote for the runner given as "PROG MODULE:CALLABLE"."""
+    prog, entry_point = sys.argv[1:3]
+    module_name, attr = entry_point.split(":", 1)
+    module = importlib.import_module(module_name)
+    serve(prog, getattr(module, attr))
+
+
+class ZygoteChild:
+    """A task process forked by a zygote.
+
+    This mimics the relevant parts of :class:`asyncio.subprocess.Process`,
+    so that it can be used by spawners in place of one.
+    """
+
+    def __init__(self, pid, loop):
+        self.pid = pid
+        self.returncode = None
+        self._exited = loop.create_future()
+
+    def _set_returncode(self, returncode):
+        self.returncode = returncode
+        if not self._exited.done():
+            self._exited.set_result(returncode)
+
+    async def wait(self):
+        return await asyncio.shield(self._exited)
+
+    def send_signal(self, signum):
+        if self.returncode is not None:
+            raise ProcessLookupError(self.pid)
+        os.kill(self.pid, signum)
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+
+class Zygote:
+    """Client side of a zygote process, used from an asyncio event loop."""
+
+    def __init__(self, kind, entry_point, env=None):
+        """Instantiates a new, not yet started, Zygote.
+
+        :param kind: the kind of runnables handled by the zygote
+        :type kind: str
+        :param entry_point: the runner application entry point, in the
+                            "module:callable" format
+        :type entry_point: str
+        :param env: the environment for the zygote process
+        :type env: dict
+        """
+        self.kind = kind
+        self.entry_point = entry_point
+        self._env = env
+        self._process = None
+        self._loop = None
+        self._buffer = b""
+        self._pending = collections.deque()
+        self._children = {}
+        self._early_exits = {}
+        #: The number of tasks spawned by this zygote
+        self.spawned = 0
+
+    def __repr__(self):
+        return (
+            f'<Zygote kind="{self.kind}" entry_point="{self.entry_point}" '
+            f"spawned={self.spawned}>"
+        )
+
+    @property
+    def is_alive(self):
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        prog = f"avocado-runner-{self.kind}"
+        # pylint: disable=R1732
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", __name__, prog, self.entry_point],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=self._env,
+        )
+        os.set_blocking(self._process.stdout.fileno(), False)
+
+    def _watch(self):
+        """Makes sure the zygote output is read by the current event loop."""
+        loop = asyncio.get_event_loop()
+        if loop is self._loop:
+            return
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.remove_reader(self._process.stdout.fileno())
+        self._loop = loop
+        loop.add_reader(self._process.stdout.fileno(), self._on_readable)
+
+    def _on_readable(self):
+        try:
+            data = os.read(self._process.stdout.fileno(), 65536)
+        except BlockingIOError:
+            return
+        if not data:
+            self._on_eof()
+            return
+        self._buffer += data
+        while b"\n" in self._buffer:
+            line, self._buffer = self._buffer.split(b"\n", 1)
+            self._on_message(json.loads(line))
+
+    def _on_message(self, message):
+        if "exited" in message:
+            child = self._children.pop(message["exited"], None)
+            if child is None:
+                self._early_exits[message["exited"]] = message["returncode"]
+            else:
+                child._set_returncode(message["returncode"])
+            return
+        future = self._pending.popleft()
+        if "pid" in message:
+            future.set_result(message["pid"])
+        else:
+            future.set_exception(OSError(message.get("error")))
+
+    def _on_eof(self):
+        self._loop.remove_reader(self._process.stdout.fileno())
+        while self._pending:
+            self._pending.popleft().set_exception(
+                OSError(f"{self} exited unexpectedly")
+            )
+        # children that were not reported as finished can not be waited
+        # upon anymore, so they are given an unknown (failure) status
+        for child in self._children.values():
+            child._set_returncode(-1)
+        self._children.clear()
+
+    async def spawn(self, args):
+        """Forks a new child running the runner with the given arguments.
+
+        :param args: the command line arguments to the runner application,
+                     such as the "task-run" command and its arguments
+        :type args: list
+        :rtype: :class:`ZygoteChild`
+        :raises: OSError if the zygote could not fork a new child
+        """
+        if not self.is_alive:
+            raise OSError(f"{self} is not running")
+        self._watch()
+        future = self._loop.create_future()
+        self._pending.append(future)
+        try:
+            self._process.stdin.write(json.dumps({"args": args}).encode() + b"\n")
+            self._process.stdin.flush()
+        except BrokenPipeError as details:
+            self._pending.remove(future)
+            raise OSError(f"{self} is not running") from details
+        pid = await future
+        self.spawned += 1
+        child = ZygoteChild(pid, self._loop)
+        if pid in self._early_exits:
+            child._set_returncode(self._early_exits.pop(pid))
+        else:
+            self._children[pid] = child
+        return child
+
+    def retire(self):
+        """Stops accepting new tasks, letting the zygote exit after them."""
+        if self._process.stdin.closed:
+            return
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """Retires the zygote, and waits for it to exit.
+
+        :param timeout: the time (in seconds) to wait for the zygote (and
+                        so, for its children) to exit, before killing it
+        :type timeout: float
+        """
+        if self._process is None:
+            return
+        self.retire()
+        try:
+            self._process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            LOG.warning("%s did not exit in %ss, killing it", self, timeout)
+            self._process.kill()
+            self._process.wait()
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.remove_reader(self._process.stdout.fileno())
+        self._process.stdout.close()
+
+
+if __name__ == "__main__":
+    main()
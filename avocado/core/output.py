@@ -15,6 +15,7 @@
 """
 Manages output and logging in avocado applications.
 """
+
 import errno
 import logging
 import logging.handlers
@@ -218,34 +219,63 @@ class TermSupport:
         return f"{move}{self.WARN}{msg}{self.ENDC}"
 
 
-#: Transparently handles colored terminal, when one is used
-TERM_SUPPORT = TermSupport()
+def _set_up_term_support():
+    """
+    Sets up the terminal support, and the mappings that depend on it.
 
+    The terminal support depends on the configuration, so it is only set
+    up when first used, instead of when this module is imported.  The
+    first use of the configuration initializes the plugins, which in
+    turn import this module.
+    """
+    term_support = TermSupport()
+    globals().update(
+        {
+            # Transparently handles colored terminal, when one is used
+            "TERM_SUPPORT": term_support,
+            # A collection of mapping from test statuses to colors to be
+            # used consistently across the various plugins
+            "TEST_STATUS_MAPPING": {
+                "PASS": term_support.PASS,
+                "ERROR": term_support.ERROR,
+                "FAIL": term_support.FAIL,
+                "SKIP": term_support.SKIP,
+                "WARN": term_support.WARN,
+                "INTERRUPTED": term_support.INTERRUPT,
+                "CANCEL": term_support.CANCEL,
+            },
+            # A collection of mapping from test status to formatting
+            # functions to be used consistently across the various plugins
+            "TEST_STATUS_DECORATOR_MAPPING": {
+                "PASS": term_support.pass_str,
+                "ERROR": term_support.error_str,
+                "FAIL": term_support.fail_str,
+                "SKIP": term_support.skip_str,
+                "WARN": term_support.warn_str,
+                "INTERRUPTED": term_support.interrupt_str,
+                "CANCEL": term_support.skip_str,
+            },
+        }
+    )
+    return term_support
 
-#: A collection of mapping from test statuses to colors to be used
-#: consistently across the various plugins
-TEST_STATUS_MAPPING = {
-    "PASS": TERM_SUPPORT.PASS,
-    "ERROR": TERM_SUPPORT.ERROR,
-    "FAIL": TERM_SUPPORT.FAIL,
-    "SKIP": TERM_SUPPORT.SKIP,
-    "WARN": TERM_SUPPORT.WARN,
-    "INTERRUPTED": TERM_SUPPORT.INTERRUPT,
-    "CANCEL": TERM_SUPPORT.CANCEL,
-}
 
+def __getattr__(name):
+    if name not in (
+        "TERM_SUPPORT",
+        "TEST_STATUS_MAPPING",
+        "TEST_STATUS_DECORATOR_MAPPING",
+    ):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    _set_up_term_support()
+    return globals()[name]
 
-#: A collection of mapping from test status to formatting functions
-#: to be used consistently across the various plugins
-TEST_STATUS_DECORATOR_MAPPING = {
-    "PASS": TERM_SUPPORT.pass_str,
-    "ERROR": TERM_SUPPORT.error_str,
-    "FAIL": TERM_SUPPORT.fail_str,
-    "SKIP": TERM_SUPPORT.skip_str,
-    "WARN": TERM_SUPPORT.warn_str,
-    "INTERRUPTED": TERM_SUPPORT.interrupt_str,
-    "CANCEL": TERM_SUPPORT.skip_str,
-}
+
+def _get_term_support():
+    term_support = globals().get("TERM_SUPPORT")
+    if term_support is None:
+        term_support = _set_up_term_support()
+    return term_support
 
 
 class _StdOutputFile:
@@ -500,7 +530,7 @@ def reconfigure(args):
     # TODO: Avocado relies on stdout/stderr on some places, re-log them here
     # for now. This should be removed once we replace them with logging.
     if enabled:
-        if args.get("core.paginator") is True and TERM_SUPPORT.enabled:
+        if args.get("core.paginator") is True and _get_term_support().enabled:
             STD_OUTPUT.enable_paginator()
         STD_OUTPUT.enable_outputs()
     else:
@@ -585,11 +615,11 @@ class ProgressStreamHandler(logging.StreamHandler):
             if record.levelno < logging.INFO:  # Most messages are INFO
                 pass
             elif record.levelno < logging.WARNING:
-                msg = TERM_SUPPORT.header_str(msg)
+                msg = _get_term_support().header_str(msg)
             elif record.levelno < logging.ERROR:
-                msg = TERM_SUPPORT.warn_header_str(msg)
+                msg = _get_term_support().warn_header_str(msg)
             else:
-                msg = TERM_SUPPORT.fail_header_str(msg)
+                msg = _get_term_support().fail_header_str(msg)
             stream = self.stream
             skip_newline = False
             if hasattr(record, "skip_newline"):
@@ -732,19 +762,15 @@ class Throbber:
     """
 
     STEPS = ["-", "\\", "|", "/"]
-    # Only print a throbber when we're on a terminal
-    if TERM_SUPPORT.enabled:
-        MOVES = [
-            f"{TERM_SUPPORT.MOVE_BACK}{STEPS[0]}",
-            f"{TERM_SUPPORT.MOVE_BACK}{STEPS[1]}",
-            f"{TERM_SUPPORT.MOVE_BACK}{STEPS[2]}",
-            f"{TERM_SUPPORT.MOVE_BACK}{STEPS[3]}",
-        ]
-    else:
-        MOVES = ["", "", "", ""]
 
     def __init__(self):
         self.position = 0
+        term_support = _get_term_support()
+        # Only print a throbber when we're on a terminal
+        if term_support.enabled:
+            self.MOVES = [f"{term_support.MOVE_BACK}{step}" for step in self.STEPS]
+        else:
+            self.MOVES = ["", "", "", ""]
 
     def _update_position(self):
         if self.position == (len(self.MOVES) - 1):
@@ -15,6 +15,7 @@
 Module related to test parameters
 """
 
+import functools
 import logging
 import re
 
@@ -35,6 +36,9 @@ class AvocadoParams:
     You can also iterate through all keys, but this can generate quite a lot
     of duplicate entries inherited from ancestor nodes.  It shouldn't produce
     false values, though.
+
+    The params of a variant are compiled into an index of the values of
+    each key, and the values found for each key and path are kept.
     """
 
     def __init__(self, leaves, paths, logger_name=None):
@@ -53,7 +57,9 @@ class AvocadoParams:
         # Don't use non-mux-path params for relative paths
         path_leaves = self._get_matching_leaves("/*", leaves)
         self._abs_path = AvocadoParam(path_leaves, "*: *")
-        self._cache = {}  # TODO: Implement something more efficient
+        #: The values found, by key and path (whatever the default)
+        self._cache = {}
+        self._logged = set()
         self._logger_name = logger_name
 
     def __eq__(self, other):
@@ -93,6 +99,7 @@ class AvocadoParams:
         return path_leaves
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def _greedy_path_to_re(path):
         """
         Converts user-friendly path with asterisk to a regex and compiles it
@@ -130,12 +137,20 @@ class AvocadoParams:
         if path is None:  # default path is any relative path
             path = "*"
         try:
-            return self._cache[(key, path, default)]
-        except (KeyError, TypeError):
-            # KeyError - first query
-            # TypeError - unable to hash
-            value = self._get(key, path, default)
-            if self._logger_name is not None:
+            found, value = self._cache[(key, path)]
+        except KeyError:  # first query
+            found, value = self._cache[(key, path)] = self._get(key, path)
+        except TypeError:  # unable to hash
+            found, value = self._get(key, path)
+        if not found:
+            value = default
+        if self._logger_name is not None:
+            try:
+                logged = (key, path, default) in self._logged
+                self._logged.add((key, path, default))
+            except TypeError:  # unable to hash
+                logged = False
+            if not logged:
                 logger = logging.getLogger(self._logger_name)
                 logger.debug(
                     "PARAMS (key=%s, path=%s, default=%s) => %r",
@@ -144,32 +159,29 @@ class AvocadoParams:
                     default,
                     value,
                 )
-            try:
-                self._cache[(key, path, default)] = value
-            except TypeError:
-                pass
-            return value
+        return value
 
-    def _get(self, key, path, default):
+    def _get(self, key, path):
         """
         Actual params retrieval
         :param key: key you're looking for
         :param path: namespace
-        :param default: default value when not found
+        :return: whether the key was found, and its value
+        :rtype: tuple
         :raise KeyError: In case of multiple different values (params clash)
         """
         path_re = self._greedy_path_to_re(path)
         for param in self._rel_paths:
             try:
-                return param.get_or_die(path_re, key)
+                return True, param.get_or_die(path_re, key)
             except NoMatchError:
                 pass
         if self._is_abspath(path_re):
             try:
-                return self._abs_path.get_or_die(path_re, key)
+                return True, self._abs_path.get_or_die(path_re, key)
             except NoMatchError:
                 pass
-        return default
+        return False, None
 
     def objects(self, key, path=None):
         """
@@ -213,6 +225,16 @@ class AvocadoParam:
         # names cache (leaf.path is quite expensive)
         self._leaf_names = [leaf.path + "/" for leaf in leaves]
         self.name = name
+        #: (index of the leaf, value, origin) of each key, in leaves order
+        self._index = {}
+        for i, leaf in enumerate(leaves):
+            environment = leaf.environment
+            for key, value in environment.items():
+                self._index.setdefault(key, []).append(
+                    (i, value, environment.origin[key])
+                )
+        #: indexes of the leaves matching each path
+        self._matching = {}
 
     def __eq__(self, other):
         if self.__dict__ == other.__dict__:
@@ -228,15 +250,17 @@ class AvocadoParam:
         """String with identifier and all params"""
         return f"{self.name} ({self._leaf_names})"
 
-    def _get_leaves(self, path):
+    def _get_matching(self, path):
         """
-        Get all leaves matching the path
+        Get the indexes of the leaves matching the path
         """
-        return [
-            self._leaves[i]
-            for i in range(len(self._leaf_names))
-            if path.search(self._leaf_names[i])
-        ]
+        try:
+            return self._matching[path.pattern]
+        except KeyError:
+            matching = self._matching[path.pattern] = frozenset(
+                i for i, name in enumerate(self._leaf_names) if path.search(name)
+            )
+            return matching
 
     def get_or_die(self, path, key):
         """
@@ -244,19 +268,18 @@ class AvocadoParam:
         :raise NoMatchError: When no matches
         :raise KeyError: When value is not certain (multiple matches)
         """
-        leaves = self._get_leaves(path)
-        ret = [
-            (leaf.environment[key], leaf.environment.origin[key])
-            for leaf in leaves
-            if key in leaf.environment
-        ]
+        ret = []
+        entries = self._index.get(key)
+        if entries:
+            matching = self._get_matching(path)
+            ret = [(value, origin) for i, value, origin in entries if i in matching]
         if not ret:
             raise NoMatchError(
                 f"No matches to {path.pattern} => "
                 f" {key} in {self.str_leaves_variant}"
             )
         # make sure all params come from the same origin
-        if len(set([_[1].path for _ in ret])) == 1:
+        if len(ret) == 1 or len(set([_[1].path for _ in ret])) == 1:
             return ret[0][0]
         else:
             raise ValueError(
@@ -80,6 +80,9 @@ class Parser:
         self.args = argparse.Namespace()
         self.config = {}
         self.subcommands = None
+        #: The subcommand given on the command line, as found by
+        #: :meth:`start`, before the subcommands are added
+        self.requested_subcommand = None
         self.application = ArgumentParser(
             prog=PROG, add_help=False, description=DESCRIPTION  # see parent parsing
         )
@@ -131,7 +134,10 @@ class Parser:
         At the end of this method, the support for subparsers is activated.
         Side effect: update attribute `args` (the namespace).
         """
-        self.args, _ = self.application.parse_known_args()
+        self.args, extra = self.application.parse_known_args()
+        self.requested_subcommand = next(
+            (arg for arg in extra if not arg.startswith("-")), None
+        )
 
         # Load settings from file, if user provides one
         if self.args.config is not None:
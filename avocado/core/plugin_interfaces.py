@@ -251,6 +251,31 @@ class Varianter(Plugin):
         :rtype: str
         """
 
+    def get_cache_key(self, config):  # pylint: disable=W0613,R0201
+        """Identifies the variants produced from a configuration.
+
+        This is called before the plugin is initialized, to look for the
+        variants in the persistent varianter cache.  Plugins supporting
+        the cache should return everything in the configuration the
+        variants depend on, such as the input files and options.
+
+        :param config: the configuration
+        :type config: dict
+        :returns: json-serializable data, or None if the variants can
+                  not be cached (the default)
+        """
+        return None
+
+    def get_cache_files(self):  # pylint: disable=R0201
+        """Reports the files the variants were produced from.
+
+        This is called after the plugin is initialized, so that the
+        cached variants are produced again when any of them changes.
+
+        :rtype: list of str
+        """
+        return []
+
 
 class ResolverMixin:
     """Common utilities for Resolver implementations."""
@@ -264,6 +289,13 @@ class ResolverMixin:
 class Resolver(Plugin, ResolverMixin):
     """Base plugin interface for resolving test references into resolutions."""
 
+    #: Whether the resolutions depend only on the configuration, the
+    #: referenced file (and its ".data" directory) and the Python modules
+    #: parsed by the safeloader, so that they can be cached until any of
+    #: those change.  Resolvers that, for instance, run the referenced
+    #: file should set this to False.
+    cacheable = True
+
     @abc.abstractmethod
     def resolve(self, reference):
         """Resolves the given reference into a reference resolution.
@@ -360,6 +392,13 @@ class Spawner(Plugin):
         :type runtime_task: :class:`avocado.core.task.runtime.RuntimeTask`
         """
 
+    def shutdown(self):
+        """Releases what the spawner keeps across tasks.
+
+        This is called once the tasks of a suite are done (including
+        when they were interrupted), and the spawner is not used after.
+        """
+
     @abc.abstractmethod
     async def wait_task(self, runtime_task):
         """Waits for a task to finish.
@@ -17,13 +17,23 @@ Test resolver module.
 """
 
 import glob
+import math
+import multiprocessing
 import os
+import pickle
 import stat
 from enum import Enum
 
 from avocado.core.enabled_extension_manager import EnabledExtensionManager
 from avocado.core.exceptions import JobTestSuiteReferenceResolutionError
 from avocado.core.output import LOG_UI
+from avocado.core.safeloader.memo import memoize
+from avocado.core.safeloader.module import record_parsed_paths
+from avocado.core.settings import settings
+
+#: The resolver used by the processes of the pool resolving references
+#: in parallel, inherited from the process creating the pool
+_POOL_RESOLVER = None
 
 
 class ReferenceResolutionAssetType(Enum):
@@ -37,7 +47,18 @@ class ReferenceResolutionAssetType(Enum):
     DATA_FILE = "data_file"
 
 
-class ReferenceResolutionResult(Enum):
+class _UniqueValueEnum(Enum):
+    """Enum whose members are pickled by name.
+
+    The values of the members are unique objects, that would not be
+    the same (and thus not be found) after unpickling.
+    """
+
+    def __reduce_ex__(self, proto):
+        return getattr, (self.__class__, self.name)
+
+
+class ReferenceResolutionResult(_UniqueValueEnum):
     #: Given test reference was properly resolved
     SUCCESS = object()
     #: Given test reference might be resolved, but it is corrupted.
@@ -48,7 +69,7 @@ class ReferenceResolutionResult(Enum):
     ERROR = object()
 
 
-class ReferenceResolutionAction(Enum):
+class ReferenceResolutionAction(_UniqueValueEnum):
     #: Stop trying to resolve the reference
     RETURN = object()
     #: Continue to resolve the given reference
@@ -259,6 +280,102 @@ def _extend_directory(path):
     return paths
 
 
+def _resolve_recording(resolver, reference):
+    with record_parsed_paths() as parsed_paths:
+        resolutions = resolver.resolve(reference)
+    return resolutions, parsed_paths
+
+
+def _resolve_in_pool(reference):
+    resolutions, parsed_paths = _resolve_recording(_POOL_RESOLVER, reference)
+    for resolution in resolutions:
+        # the exceptions given as information on errors may not be
+        # able to make it back to the main process
+        if resolution.result == ReferenceResolutionResult.ERROR:
+            try:
+                pickle.dumps(resolution.info)
+            except Exception:  # pylint: disable=W0703
+                resolution.info = str(resolution.info)
+    return resolutions, parsed_paths
+
+
+def get_resolver_processes(config):
+    """Returns the number of processes to resolve references with.
+
+    :param config: the configuration, with the "resolver.processes" key
+                   (where 0 means the number of CPUs)
+    :type config: dict
+    :rtype: int
+    """
+    processes = config.get("resolver.processes")
+    if processes is None:
+        return 1
+    if processes <= 0:
+        processes = os.cpu_count() or 1
+    return processes
+
+
+def _map_resolve(resolver, references, processes):
+    """Resolves references, using a pool of processes if possible.
+
+    :returns: the resolutions, and the Python modules parsed to get them,
+              for each reference, in order
+    :rtype: list of tuple
+    """
+    processes = min(processes, len(references))
+    if processes <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return [_resolve_recording(resolver, reference) for reference in references]
+    # the pool processes are forked, so that they inherit the resolver
+    # (and its plugins) instead of loading them again
+    global _POOL_RESOLVER  # pylint: disable=W0603
+    _POOL_RESOLVER = resolver
+    chunksize = math.ceil(len(references) / (processes * 4))
+    try:
+        with multiprocessing.get_context("fork").Pool(processes) as pool:
+            return pool.map(_resolve_in_pool, references, chunksize)
+    finally:
+        _POOL_RESOLVER = None
+
+
+def _resolve_parallel(resolver, references, hint_references, cache, processes):
+    """Resolves references on a pool of processes.
+
+    References that are given by the hint, or found on the cache, are not
+    sent to the pool.  The resolutions are returned in the same order as
+    they would be if resolved serially.
+    """
+    by_index = {}
+    pending = []
+    for index, reference in enumerate(references):
+        if reference in hint_references:
+            by_index[index] = [hint_references[reference]]
+            continue
+        if cache is not None:
+            cached = cache.get(reference)
+            if cached is not None:
+                cache.hits += 1
+                by_index[index] = cached
+                continue
+            cache.misses += 1
+        pending.append(index)
+
+    dependencies = {}
+    if cache is not None:
+        dependencies = {
+            index: cache.get_dependencies(references[index]) for index in pending
+        }
+    resolved = _map_resolve(
+        resolver, [references[index] for index in pending], processes
+    )
+    for index, (resolutions, parsed_paths) in zip(pending, resolved):
+        by_index[index] = resolutions
+        if cache is not None:
+            cache.put(references[index], dependencies[index], parsed_paths, resolutions)
+    return [
+        resolution for index in range(len(references)) for resolution in by_index[index]
+    ]
+
+
 def resolve(references, hint=None, ignore_missing=True, config=None):
     resolutions = []
     hint_references = {}
@@ -273,29 +390,48 @@ def resolve(references, hint=None, ignore_missing=True, config=None):
         # should be initialized with args, to define the behavior
         # of this instance as a whole
         resolver = Resolver(config)
+        cache = None
+        if (config or settings.as_dict()).get("resolver.cache"):
+            # pylint: disable=C0415
+            from avocado.core.resolver_cache import ResolutionCache
+
+            cache = ResolutionCache(resolver, config or settings.as_dict())
         extended_references = []
         for reference in references:
             # a reference extender is not (yet?) an extensible feature
             # here it walks directories if one is given, and extends
             # the original reference into final file paths
             extended_references.extend(_extend_directory(reference))
-        for reference in extended_references:
-            if reference in hint_references:
-                resolutions.append(hint_references[reference])
+        processes = get_resolver_processes(config or settings.as_dict())
+        # modules (such as the ones with base classes) shared by many
+        # references are parsed only once
+        with memoize():
+            if processes > 1:
+                resolutions.extend(
+                    _resolve_parallel(
+                        resolver,
+                        extended_references,
+                        hint_references,
+                        cache,
+                        processes,
+                    )
+                )
             else:
-                resolutions.extend(resolver.resolve(reference))
+                for reference in extended_references:
+                    if reference in hint_references:
+                        resolutions.append(hint_references[reference])
+                    elif cache is not None:
+                        resolutions.extend(cache.resolve(reference))
+                    else:
+                        resolutions.extend(resolver.resolve(reference))
+        if cache is not None:
+            cache.save()
     else:
         discoverer = Discoverer(config)
         resolutions.extend(discoverer.discover())
 
     for res in resolutions:
-        if res.result == ReferenceResolutionResult.CORRUPT:
-            LOG_UI.warning(
-                "Reference %s might be resolved by %s resolver, but the file is corrupted: %s",
-                res.reference,
-                res.origin,
-                res.info or "",
-            )
+        _warn_if_corrupt(res)
     # This came up from a previous method and can be refactored to improve
     # performance since that we could merge with the loop above.
     if not ignore_missing:
@@ -309,10 +445,85 @@ def resolve(references, hint=None, ignore_missing=True, config=None):
         # resolution process
         missing = [_ for _ in missing if not os.path.isdir(_)]
         if missing:
-            msg = (
-                f"No tests found for given test references: {', '.join(missing)}\n"
-                f"Try 'avocado -V list {' '.join(missing)}' for details"
-            )
-            raise JobTestSuiteReferenceResolutionError(msg)
+            raise _missing_references_error(missing)
 
     return resolutions
+
+
+def iter_resolve(references, hint=None, ignore_missing=True, config=None):
+    """Resolves references one at a time, as the resolutions are consumed.
+
+    This is the streaming counterpart of :func:`resolve`, which gives the
+    same resolutions, in the same order, but without resolving a
+    reference (or a file within a directory given as reference) before
+    the resolutions of the previous ones are consumed.  References are
+    always resolved on this process, one at a time, and the resolution
+    cache is saved when all references are resolved.
+
+    :raises JobTestSuiteReferenceResolutionError: when getting to a
+            reference that could not be resolved, unless ignore_missing
+            is set
+    """
+    hint_references = {}
+    if hint:
+        hint_references = {r.reference: r for r in hint.get_resolutions()}
+
+    if not references and hint_references:
+        references = list(hint_references.keys())
+
+    if not references:
+        for res in Discoverer(config).discover():
+            _warn_if_corrupt(res)
+            yield res
+        return
+
+    resolver = Resolver(config)
+    cache = None
+    if (config or settings.as_dict()).get("resolver.cache"):
+        # pylint: disable=C0415
+        from avocado.core.resolver_cache import ResolutionCache
+
+        cache = ResolutionCache(resolver, config or settings.as_dict())
+    for reference in references:
+        found = False
+        for extended_reference in _extend_directory(reference):
+            if extended_reference in hint_references:
+                resolutions = [hint_references[extended_reference]]
+            else:
+                # the parsed modules are not kept while the resolutions
+                # are consumed, which may take as long as running them
+                with memoize():
+                    if cache is not None:
+                        resolutions = cache.resolve(extended_reference)
+                    else:
+                        resolutions = resolver.resolve(extended_reference)
+            for res in resolutions:
+                _warn_if_corrupt(res)
+                if res.result == ReferenceResolutionResult.SUCCESS:
+                    found = True
+                yield res
+        # directories are automatically expanded, and thus they can
+        # not be considered a reference that needs to exist after the
+        # resolution process
+        if not (found or ignore_missing or os.path.isdir(reference)):
+            raise _missing_references_error([reference])
+    if cache is not None:
+        cache.save()
+
+
+def _warn_if_corrupt(resolution):
+    if resolution.result == ReferenceResolutionResult.CORRUPT:
+        LOG_UI.warning(
+            "Reference %s might be resolved by %s resolver, but the file is corrupted: %s",
+            resolution.reference,
+            resolution.origin,
+            resolution.info or "",
+        )
+
+
+def _missing_references_error(missing):
+    msg = (
+        f"No tests found for given test references: {', '.join(missing)}\n"
+        f"Try 'avocado -V list {' '.join(missing)}' for details"
+    )
+    return JobTestSuiteReferenceResolutionError(msg)
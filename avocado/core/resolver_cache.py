@@ -0,0 +1,311 @@
+"""
+Persistent cache of test reference resolutions.
+
+Resolving a reference to a file means trying each of the resolver
+plugins, and for Python files, parsing the module (and the modules
+defining its base classes).  For unchanged files, the resolutions are
+kept on a database in the data directory, along with the files they
+depend on, so that they can be reused until any of those files change.
+
+The cache is only used with the same avocado version, resolver plugins,
+resolver configuration and working directory that produced the cached
+resolutions.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+
+from avocado.core.data_dir import get_datafile_path
+from avocado.core.references import reference_split
+from avocado.core.resolver import ReferenceResolutionResult
+from avocado.core.safeloader.module import record_parsed_paths
+from avocado.core.version import VERSION
+
+LOG = logging.getLogger(__name__)
+
+#: Version of the format of the cache, to be changed whenever the
+#: format of the entries (or the meaning of the context) changes
+CACHE_VERSION = 3
+
+#: The definition of the database schema
+SCHEMA = [
+    (
+        "CREATE TABLE IF NOT EXISTS resolution ("
+        "context TEXT,"
+        "reference TEXT,"
+        "dependencies TEXT,"
+        "resolutions BLOB,"
+        "PRIMARY KEY (context, reference)"
+        ")"
+    ),
+]
+
+
+def get_database_path():
+    """Returns the location of the resolver cache database."""
+    return get_datafile_path("cache", "resolver.sqlite")
+
+
+def get_file_signature(path):
+    """Returns what identifies the current version of a file.
+
+    The mode is included because, besides the content, resolvers also
+    depend on permissions (such as whether the file is executable).
+
+    :returns: the modification time, size and mode, or None if the file
+              does not exist
+    :rtype: list
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size, stat.st_mode]
+
+
+def get_reference_path(reference):
+    """Returns the path of the file a reference points to, if any.
+
+    :rtype: str
+    """
+    if os.path.isfile(reference):
+        return reference
+    path, _ = reference_split(reference)
+    if path != reference and os.path.isfile(path):
+        return path
+    return None
+
+
+def get_context(resolver, config):
+    """Returns a digest of everything, besides files, resolutions depend on.
+
+    :param resolver: the resolver whose (enabled and ordered) extensions
+                     produce the resolutions
+    :type resolver: :class:`avocado.core.resolver.Resolver`
+    :param config: the configuration
+    :type config: dict
+    :rtype: str
+    """
+    extensions = []
+    for ext in resolver.extensions:
+        module = sys.modules.get(ext.plugin.__module__)
+        module_file = getattr(module, "__file__", None)
+        extensions.append(
+            [
+                ext.name,
+                str(ext.entry_point),
+                getattr(ext.entry_point, "version", None),
+                module_file and get_file_signature(module_file),
+            ]
+        )
+    resolver_config = sorted(
+        (key, value)
+        for key, value in config.items()
+        if key.startswith("resolver.")
+        and key not in ("resolver.references", "resolver.processes")
+    )
+    context = [CACHE_VERSION, VERSION, os.getcwd(), extensions, resolver_config]
+    return hashlib.sha256(
+        json.dumps(context, default=str, sort_keys=True).encode()
+    ).hexdigest()
+
+
+class ResolutionCache:
+    """Resolves references using, and saving to, the persistent cache."""
+
+    def __init__(self, resolver, config, path=None):
+        """
+        :param resolver: the resolver used on cache misses
+        :type resolver: :class:`avocado.core.resolver.Resolver`
+        :param config: the configuration
+        :type config: dict
+        :param path: the location of the cache database, defaults to
+                     :func:`get_database_path`
+        :type path: str
+        """
+        self._resolver = resolver
+        self._cacheable = {
+            ext.name: getattr(ext.obj, "cacheable", True) for ext in resolver.extensions
+        }
+        self._context = get_context(resolver, config)
+        if path is None:
+            path = get_database_path()
+        self.path = path
+        self._entries = None
+        self._pending = []
+        #: The number of references resolved from the cache
+        self.hits = 0
+        #: The number of references resolved by the resolver
+        self.misses = 0
+
+    def _load(self):
+        self._entries = {}
+        if not os.path.exists(self.path):
+            return
+        try:
+            with sqlite3.connect(self.path) as conn:
+                rows = conn.execute(
+                    "SELECT reference, dependencies, resolutions FROM resolution "
+                    "WHERE context = ?",
+                    (self._context,),
+                )
+                for reference, dependencies, resolutions in rows:
+                    self._entries[reference] = (dependencies, resolutions)
+        except sqlite3.Error as details:
+            LOG.warning(
+                'Failed to load the resolver cache "%s": %s', self.path, details
+            )
+
+    def get(self, reference):
+        """Returns the cached resolutions for a reference.
+
+        :returns: the resolutions, or None if they are not in the cache, or
+                  if any of the files they depend on has changed
+        :rtype: list of :class:`avocado.core.resolver.ReferenceResolution`
+        """
+        if self._entries is None:
+            self._load()
+        entry = self._entries.get(reference)
+        if entry is None:
+            return None
+        dependencies, resolutions = entry
+        for path, signature in json.loads(dependencies):
+            if get_file_signature(path) != signature:
+                return None
+        try:
+            return pickle.loads(resolutions)
+        except Exception:  # pylint: disable=W0703
+            return None
+
+    def _is_cacheable(self, resolutions):
+        for resolution in resolutions:
+            if not self._cacheable.get(resolution.origin, False):
+                return False
+            if resolution.result == ReferenceResolutionResult.ERROR:
+                return False
+        return True
+
+    def get_dependencies(self, reference):
+        """Returns the current signatures of the files a reference depends on.
+
+        Those are the file the reference points to, and its data
+        directory.  They should be taken before resolving the reference,
+        so that changes while resolving invalidate the entry.
+
+        :returns: the signatures by path, or None if the reference does
+                  not point to a file (and thus can not be cached)
+        :rtype: dict
+        """
+        path = get_reference_path(reference)
+        if path is None:
+            return None
+        return {
+            dependency: get_file_signature(dependency)
+            for dependency in (os.path.abspath(path), os.path.abspath(f"{path}.data"))
+        }
+
+    def put(self, reference, dependencies, parsed_paths, resolutions):
+        """Adds the resolutions of a reference to be saved to the cache.
+
+        :param dependencies: the signatures given by
+                             :meth:`get_dependencies` before resolving
+        :type dependencies: dict
+        :param parsed_paths: the paths of the Python modules parsed while
+                             resolving, as recorded by
+                             :func:`avocado.core.safeloader.module.record_parsed_paths`
+        :type parsed_paths: iterable
+        :param resolutions: the resolutions of the reference
+        :type resolutions: list of :class:`avocado.core.resolver.ReferenceResolution`
+        """
+        if dependencies is None or not self._is_cacheable(resolutions):
+            return
+        dependencies = dict(dependencies)
+        for parsed_path in parsed_paths:
+            if parsed_path not in dependencies:
+                dependencies[parsed_path] = get_file_signature(parsed_path)
+        try:
+            data = pickle.dumps(resolutions)
+        except Exception:  # pylint: disable=W0703
+            return
+        self._pending.append(
+            (
+                self._context,
+                reference,
+                json.dumps(sorted(dependencies.items())),
+                data,
+            )
+        )
+
+    def resolve(self, reference):
+        """Resolves a reference, from the cache if possible.
+
+        :returns: the same as :meth:`avocado.core.resolver.Resolver.resolve`
+        :rtype: list of :class:`avocado.core.resolver.ReferenceResolution`
+        """
+        resolutions = self.get(reference)
+        if resolutions is not None:
+            self.hits += 1
+            return resolutions
+        self.misses += 1
+        dependencies = self.get_dependencies(reference)
+        with record_parsed_paths() as parsed_paths:
+            resolutions = self._resolver.resolve(reference)
+        self.put(reference, dependencies, parsed_paths, resolutions)
+        return resolutions
+
+    def save(self):
+        """Saves the resolutions not found in the cache to it."""
+        LOG.debug(
+            "Resolver cache: %u references resolved from the cache, %u resolved",
+            self.hits,
+            self.misses,
+        )
+        if not self._pending:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with sqlite3.connect(self.path) as conn:
+                for entry in SCHEMA:
+                    conn.execute(entry)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO resolution "
+                    "(context, reference, dependencies, resolutions) "
+                    "VALUES (?, ?, ?, ?)",
+                    self._pending,
+                )
+        except (OSError, sqlite3.Error) as details:
+            LOG.warning(
+                'Failed to save the resolver cache "%s": %s', self.path, details
+            )
+        self._pending = []
+
+
+def clear(path=None):
+    """Removes the resolver cache database."""
+    if path is None:
+        path = get_database_path()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def list_entries(path=None):
+    """Returns the references on the resolver cache, by context.
+
+    :rtype: dict
+    """
+    if path is None:
+        path = get_database_path()
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+    with sqlite3.connect(path) as conn:
+        for context, reference in conn.execute(
+            "SELECT context, reference FROM resolution ORDER BY context, reference"
+        ):
+            entries.setdefault(context, []).append(reference)
+    return entries
@@ -1,8 +1,8 @@
 import ast
 import collections
 import sys
-from importlib.machinery import PathFinder
 
+from avocado.core.safeloader import memo
 from avocado.core.safeloader.docstring import (
     check_docstring_directive,
     get_docstring_directives,
@@ -201,7 +201,7 @@ def _get_attributes_for_further_examination(parent, module):
 def _find_import_match(parent_path, parent_module):
     """Attempts to find an importable module."""
     modules_paths = [parent_path] + sys.path
-    found_spec = PathFinder.find_spec(parent_module, modules_paths)
+    found_spec = memo.find_spec(parent_module, modules_paths)
     if found_spec is None:
         raise ClassNotSuitable
     return found_spec
@@ -263,8 +263,10 @@ def _examine_class(
             get_docstring_directives_dependencies(docstring),
         )
 
-        # Getting the list of parents of the current class
-        parents = klass.bases
+        # Getting the list of parents of the current class (a copy, as
+        # the ones found in the same module are removed from it, and the
+        # parsed module may be shared)
+        parents = list(klass.bases)
 
         match = _examine_same_module(
             parents,
@@ -406,8 +408,10 @@ def find_python_tests(target_module, target_class, determine_match, path):
             class_tags,
             get_docstring_directives_dependencies(docstring),
         )
-        # Getting the list of parents of the current class
-        parents = klass.bases
+        # Getting the list of parents of the current class (a copy, as
+        # the ones found in the same module are removed from it, and the
+        # parsed module may be shared)
+        parents = list(klass.bases)
 
         match = _examine_same_module(
             parents,
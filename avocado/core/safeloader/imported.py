@@ -1,8 +1,8 @@
 import ast
 import os
 import sys
-from importlib.machinery import PathFinder
 
+from avocado.core.safeloader import memo
 from avocado.core.safeloader.utils import get_statement_import_as
 
 
@@ -91,15 +91,14 @@ class ImportedSymbol:
                                  an importable spec
         :type symbol_is_module: bool
         """
-        modules_paths = sys.path
-        modules_paths.insert(0, self.get_relative_module_fs_path())
+        modules_paths = [self.get_relative_module_fs_path()] + sys.path
         spec = None
         for component, previous in self._walk_importable_components(symbol_is_module):
             if previous:
                 modules_paths = [
                     os.path.join(mod, previous) for mod in modules_paths[:]
                 ]
-            spec = PathFinder.find_spec(component, modules_paths)
+            spec = memo.find_spec(component, modules_paths)
             if spec is None:
                 break
         return spec
@@ -0,0 +1,87 @@
+"""
+Memoization of the parsing of modules and lookup of imports.
+
+Finding the tests in a module means following the parent classes of
+its classes into the modules they come from.  When resolving many
+references, the same modules (such as a library with a base test class)
+and imports are looked at again and again.  Within :func:`memoize`, the
+parsed modules and the import lookups are shared by all of them.
+"""
+
+import ast
+import contextlib
+import os
+from importlib.machinery import PathFinder
+
+#: The parsed modules, by path, along with the signature of the file
+#: they were parsed from, while memoization is enabled
+_MODULES = None
+
+#: The import specs, by module name and search paths, while memoization
+#: is enabled
+_SPECS = None
+
+
+@contextlib.contextmanager
+def memoize():
+    """Shares the parsing of modules and lookup of imports within the context.
+
+    Modules are parsed again if their files change, but import lookups
+    are kept for the whole context, so it should not outlive a single
+    resolution of references.  Nested contexts share the outermost one.
+    """
+    global _MODULES, _SPECS  # pylint: disable=W0603
+    if _MODULES is not None:
+        yield
+        return
+    _MODULES = {}
+    _SPECS = {}
+    try:
+        yield
+    finally:
+        _MODULES = None
+        _SPECS = None
+
+
+def _parse(path):
+    with open(path, encoding="utf-8") as source_file:
+        return ast.parse(source_file.read(), path)
+
+
+def parse(path):
+    """Parses a Python source code file.
+
+    The resulting tree must not be modified, as it may be shared with
+    other users while memoization is enabled.
+
+    :param path: path to a Python source code file
+    :type path: str
+    :rtype: :class:`ast.Module`
+    """
+    if _MODULES is None:
+        return _parse(path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    entry = _MODULES.get(path)
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+    tree = _parse(path)
+    _MODULES[path] = (signature, tree)
+    return tree
+
+
+def find_spec(name, paths):
+    """Finds the spec of a module on the given paths.
+
+    :param name: the name of a (single level) module
+    :type name: str
+    :param paths: the paths where the module is looked for
+    :type paths: list
+    :rtype: :class:`importlib.machinery.ModuleSpec` or None
+    """
+    if _SPECS is None:
+        return PathFinder.find_spec(name, paths)
+    key = (name, tuple(paths))
+    if key not in _SPECS:
+        _SPECS[key] = PathFinder.find_spec(name, paths)
+    return _SPECS[key]
@@ -1,9 +1,33 @@
 import ast
+import contextlib
 import os
 
+from avocado.core.safeloader import memo
 from avocado.core.safeloader.imported import ImportedSymbol
 from avocado.core.safeloader.utils import get_statement_import_as
 
+#: Sets that, while registered by :func:`record_parsed_paths`, receive
+#: the path of every module parsed
+_PARSED_PATHS_RECORDERS = []
+
+
+@contextlib.contextmanager
+def record_parsed_paths():
+    """Records the paths of all Python modules parsed within the context.
+
+    This allows users of the safeloader to know which files a result
+    depends on, such as the modules in which base classes are defined.
+
+    :returns: the (absolute) paths of the parsed modules
+    :rtype: set
+    """
+    paths = set()
+    _PARSED_PATHS_RECORDERS.append(paths)
+    try:
+        yield paths
+    finally:
+        _PARSED_PATHS_RECORDERS.remove(paths)
+
 
 class PythonModule:
     """
@@ -46,8 +70,9 @@ class PythonModule:
         self.module = module
         self.klass = klass
         self.imported_symbols = {}
-        with open(self.path, encoding="utf-8") as source_file:
-            self.mod = ast.parse(source_file.read(), self.path)
+        for recorder in _PARSED_PATHS_RECORDERS:
+            recorder.add(os.path.abspath(self.path))
+        self.mod = memo.parse(self.path)
         self.interesting_klass_found = False
 
     def is_matching_klass(self, klass):
@@ -43,9 +43,9 @@ import json
 import os
 import platform
 import re
-from importlib.resources import files
 
 from avocado.core.settings_dispatcher import SettingsDispatcher
+from avocado.core.utils.path import prepend_base_path
 
 
 def sorted_dict(dict_object):
@@ -368,12 +368,20 @@ class Settings:
     public methods and attributes should be used outside this module.
     """
 
-    def __init__(self):
-        """Constructor. Tries to find the main settings files and load them."""
+    def __init__(self, initializer=None):
+        """Constructor. Tries to find the main settings files and load them.
+
+        :param initializer: called (once) when the settings are first used,
+                            other than to register options, usually to
+                            register the options that should always be
+                            available
+        :type initializer: callable
+        """
         self.config = AvocadoConfigParser()
         self.all_config_paths = []
         self.config_paths = []
         self._namespaces = {}
+        self._initializer = initializer
 
         # 1. Prepare config paths
         self._prepare_base_dirs()
@@ -382,6 +390,11 @@ class Settings:
         # 2. Parse/read all config paths
         self.config_paths = self.config.read(self.all_config_paths)
 
+    def _initialize(self):
+        initializer, self._initializer = self._initializer, None
+        if initializer is not None:
+            initializer()
+
     def _append_config_paths(self):
         # Override with system config
         self._append_system_config()
@@ -418,9 +431,9 @@ class Settings:
             user_dir = os.environ["VIRTUAL_ENV"]
 
         config_file_name = "avocado.conf"
-        conf_file = files("avocado") / "etc" / "avocado" / config_file_name
-        if conf_file.is_file():
-            self._config_path_pkg = str(conf_file)
+        conf_file = prepend_base_path(os.path.join("etc", "avocado", config_file_name))
+        if os.path.isfile(conf_file):
+            self._config_path_pkg = conf_file
         else:
             self._config_path_pkg = None
         self._config_dir_system = os.path.join(cfg_dir, "avocado")
@@ -517,6 +530,7 @@ class Settings:
             the command line usage and the original help message do not make
             sense together.
         """
+        self._initialize()
         if not any([long_arg, short_arg, positional_arg]):
             raise SettingsError(
                 "To add an argument parser to an option, it "
@@ -557,6 +571,7 @@ class Settings:
 
         :param regex: A regular expression to be used on the filter.
         """
+        self._initialize()
         result = {}
         for namespace, option in sorted_dict(self._namespaces):
             result[namespace] = option.value
@@ -564,6 +579,7 @@ class Settings:
         return self.filter_config(result, regex) if regex else result
 
     def as_full_dict(self):
+        self._initialize()
         result = {}
         for namespace, option in sorted_dict(self._namespaces):
             result[namespace] = {
@@ -608,6 +624,7 @@ class Settings:
         :param arg_parse_config: argparse.config dictionary with all
                                  command-line parsed arguments.
         """
+        self._initialize()
         for namespace, value in arg_parse_config.items():
             # This check is important! For argparse when an option is
             # not passed will return None, except for positional arguments
@@ -627,6 +644,7 @@ class Settings:
         After parsing config file options this method should be executed to
         have an unified settings.
         """
+        self._initialize()
         for namespace in self.config:
             value = self.config[namespace]
             path = value[1]
@@ -833,10 +851,18 @@ class Settings:
             If Avocado should try to convert the value and store it as the
             'key_type' specified during the register. Default is False.
         """
+        self._initialize()
         if namespace not in self._namespaces:
             return
 
         self._namespaces[namespace].set_value(value, convert)
 
 
-settings = Settings()  # pylint: disable-msg=invalid-name
+def _register_avocado_options():
+    # pylint: disable=C0415
+    from avocado.core import initialize
+
+    initialize()
+
+
+settings = Settings(_register_avocado_options)  # pylint: disable-msg=invalid-name
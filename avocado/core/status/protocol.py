@@ -0,0 +1,131 @@
+"""
+Framed, binary safe, protocol for status messages
+
+The original protocol between tasks and the status server sends one
+JSON document per line, with bytes values encoded in base64 (see
+:class:`avocado.core.nrunner.task.StatusEncoder`).  That is still the
+default, and the fallback, but a task may negotiate the framed protocol
+by sending :data:`HELLO` as its first line.  If the status server
+answers with :data:`ACK`, the rest of the connection is made of frames,
+each one containing a batch of messages:
+
+* 4 bytes, network order, with the size of the remaining of the frame
+* 4 bytes, network order, with the size of the header
+* the header: a JSON list with the messages, in which bytes values are
+  replaced by ``{"__blob__": [OFFSET, SIZE]}`` references
+* the blobs: the raw bytes values, one after the other
+
+Status servers that do not know about the framed protocol will treat
+:data:`HELLO` as a message destined to a different job, and ignore it.
+"""
+
+import json
+import struct
+
+#: The name of the framed protocol
+FRAMED = "framed/1"
+
+#: First line sent by a client wanting to use the framed protocol.  It
+#: includes empty "id" and "job_id" so that status servers that do not
+#: know about the framed protocol ignore it.
+HELLO = (
+    json.dumps({"status_protocols": [FRAMED], "id": "", "job_id": ""}).encode() + b"\n"
+)
+
+#: Prefix used by status servers to identify a :data:`HELLO` line
+HELLO_PREFIX = HELLO[: HELLO.index(b":")]
+
+#: Line sent by status servers accepting the framed protocol
+ACK = json.dumps({"status_protocol": FRAMED}).encode() + b"\n"
+
+#: Struct used for the sizes of frames and headers
+SIZE = struct.Struct("!I")
+
+#: The types of running messages whose logs may be concatenated
+COALESCING_TYPES = ("log", "stdout", "stderr")
+
+
+class _BlobEncoder(json.JSONEncoder):
+    """JSON encoder that takes bytes values out of the document."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.blobs = []
+        self.blobs_size = 0
+
+    # pylint: disable=E0202
+    def default(self, o):
+        if isinstance(o, (bytes, bytearray)):
+            reference = {"__blob__": [self.blobs_size, len(o)]}
+            self.blobs.append(o)
+            self.blobs_size += len(o)
+            return reference
+        return json.JSONEncoder.default(self, o)
+
+
+def encode_frame(messages):
+    """Encodes a batch of messages into a frame.
+
+    :param messages: the status messages
+    :type messages: list of dict
+    :rtype: bytes
+    """
+    encoder = _BlobEncoder(ensure_ascii=True)
+    header = encoder.encode(messages).encode("ascii")
+    size = SIZE.size + len(header) + encoder.blobs_size
+    return b"".join([SIZE.pack(size), SIZE.pack(len(header)), header] + encoder.blobs)
+
+
+def decode_frame_payload(payload):
+    """Decodes the payload of a frame (without its size) into messages.
+
+    :param payload: the frame contents, after the frame size
+    :type payload: bytes
+    :rtype: list of dict
+    """
+    (header_size,) = SIZE.unpack_from(payload)
+    blobs_start = SIZE.size + header_size
+    view = memoryview(payload)
+
+    def object_hook(dct):
+        reference = dct.get("__blob__")
+        if reference is not None and len(dct) == 1:
+            offset, size = reference
+            start = blobs_start + offset
+            return bytes(view[start : start + size])
+        return dct
+
+    header = bytes(view[SIZE.size : blobs_start])
+    return json.loads(header, object_hook=object_hook)
+
+
+def can_coalesce(previous, message):
+    """Checks if a message can be appended to the previous one.
+
+    Only running messages that carry logs may be coalesced, and only if
+    concatenating their logs is equivalent to handling them separately.
+
+    :param previous: the message that has been queued before
+    :type previous: dict
+    :param message: the new message
+    :type message: dict
+    :rtype: bool
+    """
+    if message.get("status") != "running":
+        return False
+    if message.get("type") not in COALESCING_TYPES:
+        return False
+    if "log_name" in message:
+        return False
+    if previous.keys() != message.keys():
+        return False
+    for key, value in message.items():
+        if key not in ("log", "time") and previous[key] != value:
+            return False
+    previous_log = previous.get("log")
+    if not isinstance(previous_log, bytes) or not isinstance(message["log"], bytes):
+        return False
+    # encoded logs are handled one line per message
+    if message.get("encoding") and not previous_log.endswith(b"\n"):
+        return False
+    return True
@@ -1,3 +1,4 @@
+import asyncio
 import heapq
 import logging
 
@@ -35,6 +36,17 @@ class StatusRepo:
         self._status_journal_summary = []
         #: Contains the task IDs keyed by the result received
         self._by_result = {}
+        #: Contains the results received keyed by the task ID, the
+        #: reverse of :attr:`_by_result`
+        self._results_by_task = {}
+        #: Contains the number of tasks keyed by the result received
+        self._result_stats = {}
+        #: Contains events, keyed by task ID, that are set once a
+        #: "finished" message is received for the given task
+        self._finished_events = {}
+        #: Queues that receive status updates, as an alternative to
+        #: the status journal summary
+        self._subscribers = []
 
     def _handle_task_finished(self, message):
         task_id = message["id"]
@@ -56,6 +68,7 @@ class StatusRepo:
 
         self._set_by_result(message)
         self._set_task_data(message)
+        self._get_finished_event(task_id).set()
         LOG.debug('Task "%s" finished message: "%s"', task_id, message)
 
     def _handle_task_started(self, message):
@@ -72,10 +85,13 @@ class StatusRepo:
         from a "finished" status message, this will allow users to query
         for tasks with a given result."""
         result = message.get("result")
-        if result not in self._by_result:
-            self._by_result[result] = []
-        if message["id"] not in self._by_result[result]:
-            self._by_result[result].append(message["id"])
+        task_id = message["id"]
+        task_results = self._results_by_task.setdefault(task_id, [])
+        if result in task_results:
+            return
+        task_results.append(result)
+        self._by_result.setdefault(result, []).append(task_id)
+        self._result_stats[result] = self._result_stats.get(result, 0) + 1
 
     def _set_task_data(self, message):
         """Appends all data on message to an entry keyed by the task's ID."""
@@ -100,19 +116,90 @@ class StatusRepo:
             return None
         return task_data[-1]
 
+    def _get_finished_event(self, task_id):
+        event = self._finished_events.get(task_id)
+        if event is None:
+            event = asyncio.Event()
+            self._finished_events[task_id] = event
+        return event
+
+    async def wait_task_finished(self, task_id):
+        """Waits until a "finished" message is received for a given task.
+
+        :param task_id: the identification of the task
+        :type task_id: str
+        :returns: the data on the "finished" message for the task
+        :rtype: dict
+        """
+        await self._get_finished_event(task_id).wait()
+        for data in reversed(self._all_data.get(task_id, [])):
+            if data.get("status") == "finished":
+                return data
+        return {}
+
+    async def wait_tasks_finished(self, task_ids, timeout=None):
+        """Waits until the tasks that have started are finished.
+
+        :param task_ids: the identification of the tasks.  Those that have
+                         not started, or that have already finished, are
+                         not waited upon.
+        :type task_ids: list
+        :param timeout: maximum amount of time, in seconds, to wait
+        :type timeout: float
+        :returns: whether all the started tasks have finished
+        :rtype: bool
+        """
+        unfinished = [
+            self.wait_task_finished(task_id)
+            for task_id in task_ids
+            if self.get_task_status(task_id) not in (None, "finished")
+        ]
+        if not unfinished:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*unfinished), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
     def status_journal_summary_pop(self):
         return heapq.heappop(self._status_journal_summary)
 
+    def subscribe(self):
+        """Returns a queue that will receive all status updates.
+
+        Each status update is put on the queue, in the order they were
+        received, as a tuple with the task ID and the message.  While
+        there are subscribers, the status journal summary is not kept.
+
+        :rtype: :class:`asyncio.Queue`
+        """
+        queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        """Stops sending status updates to a queue given by :meth:`subscribe`."""
+        self._subscribers.remove(queue)
+
+    def _journal_push(self, entry):
+        if not self._subscribers:
+            heapq.heappush(self._status_journal_summary, entry)
+
     def _update_status(self, message):
-        """Update the latest status of a task (by message)."""
+        """Update the latest status of a task (by message).
+
+        :returns: whether the message is a status update
+        :rtype: bool
+        """
         task_id = message.get("id")
         status = message.get("status")
         time = message.get("time")
         if not all((task_id, status, time)):
-            return
+            return False
         if task_id not in self._status:
             self._status[task_id] = (status, time)
-            heapq.heappush(self._status_journal_summary, (time, task_id, status, 0))
+            self._journal_push((time, task_id, status, 0))
         else:
             current_status, _ = self._status[task_id]
             if current_status == "finished":
@@ -128,7 +215,8 @@ class StatusRepo:
             else:
                 self._status[task_id] = (status, time)
             index = len(self.get_all_task_data(task_id))
-            heapq.heappush(self._status_journal_summary, (time, task_id, status, index))
+            self._journal_push((time, task_id, status, index))
+        return True
 
     def process_message(self, message):
         for required_field in ("id", "job_id"):
@@ -141,13 +229,17 @@ class StatusRepo:
             return
         message.pop("job_id")
 
-        self._update_status(message)
+        task_id = message["id"]
+        is_status_update = self._update_status(message)
         handlers = {
             "started": self._handle_task_started,
             "finished": self._handle_task_finished,
         }
         meth = handlers.get(message.get("status"), self._set_task_data)
         meth(message)
+        if is_status_update:
+            for queue in self._subscribers:
+                queue.put_nowait((task_id, message))
 
     def process_raw_message(self, raw_message):
         raw_message = raw_message.strip()
@@ -156,21 +248,19 @@ class StatusRepo:
 
     @property
     def result_stats(self):
-        return {key: len(value) for key, value in self._by_result.items()}
+        return dict(self._result_stats)
 
     def get_task_status(self, task_id):
         return self._status.get(task_id, (None, None))[0]
 
-    @staticmethod
-    def _is_in_task(tasks, task_ids):
-        """Returns True if any of the tasks is in task_ids."""
-        return any([True for task_id in task_ids if task_id in tasks])
-
     def get_result_set_for_tasks(self, task_ids):
-        """Returns a set of results for the given tasks."""
-        results = [
-            key
-            for key, value in self._by_result.items()
-            if self._is_in_task(value, task_ids)
-        ]
-        return set(results)
+        """Returns a set of results for the given tasks.
+
+        :param task_ids: the identifiers of the tasks, either as
+                         :class:`avocado.core.test_id.TestID` or as their
+                         string representation (as in the messages)
+        """
+        results = set()
+        for task_id in task_ids:
+            results.update(self._results_by_task.get(str(task_id), ()))
+        return results
@@ -2,6 +2,8 @@ import asyncio
 import os
 
 from avocado.core.settings import settings
+from avocado.core.status import protocol
+from avocado.core.status.utils import json_loads
 
 
 class StatusServer:
@@ -48,7 +50,8 @@ class StatusServer:
         if os.path.exists(self._uri):
             os.unlink(self._uri)
 
-    async def cb(self, reader, _):
+    async def cb(self, reader, writer):
+        first_line = True
         while True:
             try:
                 raw_message = await reader.readline()
@@ -56,4 +59,35 @@ class StatusServer:
                 continue
             if not raw_message:
                 return
+            if first_line:
+                first_line = False
+                if raw_message.startswith(protocol.HELLO_PREFIX):
+                    if await self._negotiate(raw_message, writer):
+                        await self._read_frames(reader)
+                        return
+                    continue
             self._repo.process_raw_message(raw_message)
+
+    @staticmethod
+    async def _negotiate(raw_message, writer):
+        """Accepts the framed protocol, if requested by the client.
+
+        :returns: whether the rest of the connection uses the framed protocol
+        :rtype: bool
+        """
+        hello = json_loads(raw_message)
+        if protocol.FRAMED not in hello.get("status_protocols", []):
+            return False
+        writer.write(protocol.ACK)
+        await writer.drain()
+        return True
+
+    async def _read_frames(self, reader):
+        while True:
+            try:
+                size = await reader.readexactly(protocol.SIZE.size)
+                payload = await reader.readexactly(protocol.SIZE.unpack(size)[0])
+            except (asyncio.IncompleteReadError, ConnectionResetError):
+                return
+            for message in protocol.decode_frame_payload(payload):
+                self._repo.process_message(message)
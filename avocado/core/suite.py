@@ -23,7 +23,7 @@ from avocado.core.exceptions import (
     OptionValidationError,
 )
 from avocado.core.parser import HintParser
-from avocado.core.resolver import ReferenceResolutionResult, resolve
+from avocado.core.resolver import ReferenceResolutionResult, iter_resolve, resolve
 from avocado.core.settings import settings
 from avocado.core.tags import filter_tags_on_runnables
 from avocado.core.tree import TreeNode
@@ -64,23 +64,84 @@ def resolutions_to_runnables(resolutions, config):
     :returns: the resolutions converted to runnables
     :rtype: list of :class:`avocado.core.nrunner.Runnable`
     """
+    return list(iter_runnables(resolutions, config))
+
+
+def iter_runnables(resolutions, config):
+    """
+    Same as :func:`resolutions_to_runnables`, but one resolution at a time
+
+    :param resolutions: possible multiple resolutions for multiple
+                        references
+    :type resolutions: iterable of :class:`avocado.core.resolver.ReferenceResolution`
+    :param config: job configuration
+    :type config: dict
+    :returns: the resolutions converted to runnables, as they are consumed
+    :rtype: iterator of :class:`avocado.core.nrunner.Runnable`
+    """
     filter_by_tags = config.get("filter.by_tags.tags")
     include_empty = config.get("filter.by_tags.include_empty")
     include_empty_key = config.get("filter.by_tags.include_empty_key")
-    if filter_by_tags:
-        return filter_tags_on_runnables(
-            resolutions, filter_by_tags, include_empty, include_empty_key
-        )
-    result = []
+    # the configuration depends only on the kind, so it's shared by all
+    # runnables of the same kind
+    default_configs = {}
     for resolution in resolutions:
+        if filter_by_tags:
+            yield from filter_tags_on_runnables(
+                [resolution], filter_by_tags, include_empty, include_empty_key
+            )
+            continue
         if resolution.result != ReferenceResolutionResult.SUCCESS:
             continue
         for runnable in resolution.resolutions:
-            runnable.default_config = runnable.filter_runnable_config(
-                runnable.kind, config
-            )
-            result.append(runnable)
-    return result
+            default_config = default_configs.get(runnable.kind)
+            if default_config is None:
+                default_config = runnable.filter_runnable_config(runnable.kind, config)
+                default_configs[runnable.kind] = default_config
+            runnable.default_config = default_config
+            yield runnable
+
+
+class TestStream:
+    """
+    Tests of a suite that are produced as they are iterated over
+
+    Instead of having all references resolved, and all tests expanded
+    into their variants, before a suite runs, the tests are produced one
+    at a time, as the suite runner consumes them.  Every iteration
+    produces the tests again, so they can also be looked at (but not
+    changed, other than with :meth:`apply`) before the suite runs.
+    """
+
+    def __init__(self, produce):
+        """
+        :param produce: gives a new iterator over the tests when called
+        :type produce: callable
+        """
+        self._produce = produce
+        self._transforms = []
+        #: The number of tests known to be on this stream, that is, the
+        #: most tests produced by any iteration so far.  This is the
+        #: actual number of tests after a complete iteration.
+        self.known_size = 0
+
+    def __iter__(self):
+        count = 0
+        for test in self._produce():
+            for transform in self._transforms:
+                transform(test)
+            count += 1
+            self.known_size = max(self.known_size, count)
+            yield test
+
+    def apply(self, transform):
+        """
+        Changes the tests, as they are produced, with the given function
+
+        :param transform: called with every test produced from now on
+        :type transform: callable
+        """
+        self._transforms.append(transform)
 
 
 class TestSuite:
@@ -147,9 +208,15 @@ class TestSuite:
         return self.size
 
     def _convert_to_dry_run(self):
+        def convert(runnable):
+            runnable.kind = "dry-run"
+
         if self.config.get("run.suite_runner") == "nrunner":
+            if self.streaming:
+                self.tests.apply(convert)
+                return
             for runnable in self.tests:
-                runnable.kind = "dry-run"
+                convert(runnable)
 
     @classmethod
     def _from_config_with_resolver(cls, config, name=None):
@@ -172,6 +239,35 @@ class TestSuite:
             name = str(uuid4())
         return cls(name=name, config=config, tests=runnables, resolutions=resolutions)
 
+    @classmethod
+    def _from_config_streaming(cls, config, name=None):
+        ignore_missing = config.get("run.ignore_missing_references")
+        references = config.get("resolver.references")
+        hint = None
+        hint_filepath = ".avocado.hint"
+        if os.path.exists(hint_filepath):
+            hint = HintParser(hint_filepath)
+
+        def produce():
+            resolutions = iter_resolve(
+                references, hint=hint, ignore_missing=ignore_missing, config=config
+            )
+            return iter_runnables(resolutions, config)
+
+        if name is None:
+            name = str(uuid4())
+        suite = cls(name=name, config=config, tests=TestStream(produce))
+        if suite.test_parameters or suite.variants:
+            runnables = suite.tests
+            suite.tests = TestStream(lambda: suite._iter_test_variants(runnables))
+        # looks for the first test, so that references are known to
+        # resolve into tests (at least up to it) before the suite runs
+        try:
+            next(iter(suite.tests), None)
+        except JobTestSuiteReferenceResolutionError as details:
+            raise TestSuiteError(details)
+        return suite
+
     def _get_stats_from_nrunner(self):
         stats = {}
         for test in self.tests:
@@ -214,9 +310,14 @@ class TestSuite:
 
     @property
     def size(self):
-        """The overall length/size of this test suite."""
+        """The overall length/size of this test suite.
+
+        On streaming suites, this is the number of tests known so far.
+        """
         if self.tests is None:
             return 0
+        if self.streaming:
+            return self.tests.known_size
         return len(self.tests)
 
     @property
@@ -238,6 +339,14 @@ class TestSuite:
         else:
             return TestSuiteStatus.UNKNOWN
 
+    @property
+    def streaming(self):
+        """Whether the tests are produced as the suite runs.
+
+        The tests of streaming suites are given by a :class:`TestStream`.
+        """
+        return isinstance(self.tests, TestStream)
+
     @property
     def tags_stats(self):
         """Return a statistics dict with the current tests tags."""
@@ -274,33 +383,48 @@ class TestSuite:
             self._variants = variants
         return self._variants
 
-    def _get_test_variants(self):
-        def add_variant(runnable, variant):
+    def _iter_test_variants(self, tests):
+        # each variant is dumped once, and shared by the runnables with it
+        def with_variant(runnable, dumped_variant):
             runnable = deepcopy(runnable)
-            runnable.variant = dump_variant(variant)
-            runnable_with_variant.append(runnable)
+            runnable.variant = dumped_variant
+            return runnable
 
-        runnable_with_variant = []
         if self.test_parameters:
             paths = ["/"]
             tree_nodes = TreeNode().get_node(paths[0], True)
             tree_nodes.value = self.test_parameters
-            variant = {"variant": tree_nodes, "variant_id": None, "paths": paths}
-            for runnable in self.tests:
-                add_variant(runnable, variant)
+            variant = dump_variant(
+                {"variant": tree_nodes, "variant_id": None, "paths": paths}
+            )
+            for runnable in tests:
+                yield with_variant(runnable, variant)
         elif self.variants:
             # let's use variants when parameters are not available
             # define execution order
             execution_order = self.config.get("run.execution_order")
             if execution_order == "variants-per-test":
-                for runnable in self.tests:
-                    for variant in self.variants.itertests():
-                        add_variant(runnable, variant)
+                # variants are dumped as produced for the first test, so
+                # that it does not wait for all of them, and reused after
+                variants = None
+                for runnable in tests:
+                    if variants is None:
+                        variants = []
+                        for variant in self.variants.itertests():
+                            variant = dump_variant(variant)
+                            variants.append(variant)
+                            yield with_variant(runnable, variant)
+                        continue
+                    for variant in variants:
+                        yield with_variant(runnable, variant)
             elif execution_order == "tests-per-variant":
                 for variant in self.variants.itertests():
-                    for runnable in self.tests:
-                        add_variant(runnable, variant)
-        return runnable_with_variant
+                    variant = dump_variant(variant)
+                    for runnable in tests:
+                        yield with_variant(runnable, variant)
+
+    def _get_test_variants(self):
+        return list(self._iter_test_variants(self.tests))
 
     def get_test_variants(self):
         """Computes test variants based on the parameters"""
@@ -342,12 +466,15 @@ class TestSuite:
         if job_config:
             config.update(job_config)
         config.update(suite_config)
-        suite = cls._from_config_with_resolver(config, name)
-        if suite.test_parameters or suite.variants:
-            suite.tests = suite._get_test_variants()
+        if config.get("run.streaming"):
+            suite = cls._from_config_streaming(config, name)
+        else:
+            suite = cls._from_config_with_resolver(config, name)
+            if suite.test_parameters or suite.variants:
+                suite.tests = suite._get_test_variants()
 
         if not config.get("run.ignore_missing_references"):
-            if not suite.tests:
+            if not suite.size:
                 msg = (
                     "Test Suite could not be created. No test references "
                     "provided nor any other arguments resolved into tests"
@@ -63,31 +63,106 @@ def _must_split_flat_key_val(must):
     return flat, key_val
 
 
-def _must_key_val_matches(must_key_vals, test_tags, include_empty_key):
+class TagIndex:
     """
-    Checks if the required key:vals are fulfilled by the test_tags
+    Inverted index of the tags of runnables
 
-    :rtype: bool
+    It maps every tag (and every key:val tag) to the runnables that have
+    it, so that the tag filters given to "-t/--filter-by-tags" can be
+    evaluated as unions, intersections and differences of sets, instead
+    of being evaluated against the tags of every runnable.
     """
-    key_val_test_tags = {}
-    for k, v in test_tags.items():
-        if v is None:
-            continue
-        key_val_test_tags[k] = v
-
-    for k, v in must_key_vals.items():
-        if k not in test_tags:
-            if include_empty_key:
+
+    def __init__(self, runnables):
+        """
+        :param runnables: the runnables to be indexed, in the order they
+                          are given back when filtering
+        :type runnables: list of :class:`avocado.core.nrunner.Runnable`
+        """
+        self._runnables = list(runnables)
+        #: Positions of the runnables by tag (or key of key:val tags)
+        self._by_tag = {}
+        #: Positions of the runnables by (key, val) of key:val tags
+        self._by_key_val = {}
+        #: Positions of the runnables with any tag
+        self._tagged = set()
+        #: Positions of the runnables without any tag
+        self._untagged = set()
+        for position, runnable in enumerate(self._runnables):
+            test_tags = runnable.tags or {}
+            if not test_tags:
+                self._untagged.add(position)
                 continue
+            self._tagged.add(position)
+            for key, vals in test_tags.items():
+                self._by_tag.setdefault(key, set()).add(position)
+                for val in vals or ():
+                    self._by_key_val.setdefault((key, val), set()).add(position)
+
+    def _match(self, must, must_not, include_empty_key, candidates):
+        """
+        Gives the positions of the candidates matching one tag filter
+
+        :param candidates: positions of the runnables to be considered
+        :type candidates: set
+        :rtype: set
+        """
+        must_flat, must_key_val = _must_split_flat_key_val(must)
+        required = [self._by_tag.get(tag, set()) for tag in must_flat]
+        optional = []
+        excluded = [self._by_tag.get(tag, set()) for tag in must_not]
+        for key, val in must_key_val.items():
+            with_key = self._by_tag.get(key, set())
+            if val.startswith("-"):
+                if not include_empty_key:
+                    required.append(with_key)
+                excluded.append(self._by_key_val.get((key, val[1:]), set()))
+            elif include_empty_key:
+                optional.append((with_key, self._by_key_val.get((key, val), set())))
             else:
-                return False
-        if v.startswith("-"):
-            abs_v = v[1:]
-            if abs_v in key_val_test_tags.get(k, set()):
-                return False
-        elif v not in key_val_test_tags.get(k, set()):
-            return False
-    return True
+                required.append(self._by_key_val.get((key, val), set()))
+
+        # starting from the smallest set makes the following operations
+        # proportional to the runnables that may match, and not to all
+        required.sort(key=len)
+        if required:
+            matched = candidates.intersection(required[0])
+        else:
+            matched = set(candidates)
+        for positions in required[1:]:
+            matched.intersection_update(positions)
+        for positions in excluded:
+            matched.difference_update(positions)
+        for with_key, with_val in optional:
+            matched = {
+                position
+                for position in matched
+                if position in with_val or position not in with_key
+            }
+        return matched
+
+    def filter(self, filter_by_tags, include_empty=False, include_empty_key=False):
+        """
+        Gives the runnables that match the tags criteria given
+
+        See :func:`filter_tags_on_runnables` for the parameters.
+
+        :returns: the runnables matching any of the filters, in the order
+                  they were indexed
+        :rtype: list of :class:`avocado.core.nrunner.Runnable`
+        """
+        matched = set()
+        if include_empty:
+            matched.update(self._untagged)
+        # runnables matching a filter are not evaluated by the next ones
+        remaining = set(self._tagged)
+        for must, must_not in _parse_filter_by_tags(filter_by_tags):
+            if not remaining:
+                break
+            positions = self._match(must, must_not, include_empty_key, remaining)
+            matched.update(positions)
+            remaining.difference_update(positions)
+        return [self._runnables[position] for position in sorted(matched)]
 
 
 def filter_tags_on_runnables(
@@ -114,36 +189,10 @@ def filter_tags_on_runnables(
     :returns: the resolutions converted to runnables filtered by tags
     :rtype: list of :class:`avocado.core.nrunner.Runnable`
     """
-    filtered = []
-    must_must_nots = _parse_filter_by_tags(filter_by_tags)
-
-    for resolution in resolutions:
-        if resolution.result != ReferenceResolutionResult.SUCCESS:
-            continue
-
-        for runnable in resolution.resolutions:
-            test_tags = runnable.tags or {}
-            if not test_tags:
-                if include_empty:
-                    filtered.append(runnable)
-                continue
-
-            for must, must_not in must_must_nots:
-                if must_not.intersection(test_tags):
-                    continue
-
-                must_flat, must_key_val = _must_split_flat_key_val(must)
-                if must_key_val:
-                    if not _must_key_val_matches(
-                        must_key_val, test_tags, include_empty_key
-                    ):
-                        continue
-
-                if must_flat:
-                    if not must_flat.issubset(test_tags):
-                        continue
-
-                filtered.append(runnable)
-                break
-
-    return filtered
+    index = TagIndex(
+        runnable
+        for resolution in resolutions
+        if resolution.result == ReferenceResolutionResult.SUCCESS
+        for runnable in resolution.resolutions
+    )
+    return index.filter(filter_by_tags, include_empty, include_empty_key)
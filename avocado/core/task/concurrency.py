@@ -0,0 +1,268 @@
+"""
+Adaptive limit on the number of tasks running in parallel
+
+A fixed number of parallel tasks is rarely right for every suite: I/O
+bound tasks leave the CPUs mostly idle, while memory hungry tasks may
+exhaust the system memory.  The :class:`ConcurrencyController` samples
+the system load average, the available memory and, when supported by
+the kernel, the pressure stall information (``/proc/pressure/*``), and
+adjusts the limit on the number of running tasks accordingly.
+
+The limit grows by one task at a time, and only while it is actually
+being reached and the system has resources to spare.  It shrinks by a
+quarter as soon as the system shows signs of saturation.  Running tasks
+are never interrupted: a smaller limit only delays new tasks.
+"""
+
+import asyncio
+import multiprocessing
+import os
+
+from avocado.core.output import LOG_JOB
+
+#: Default interval, in seconds, between samples of the system load
+SAMPLE_INTERVAL = 2.0
+
+#: The limit shrinks if the 1 minute load average per CPU is above this
+LOAD_SHRINK = 2.0
+
+#: The limit may only grow if the 1 minute load average per CPU is below this
+LOAD_GROW = 1.0
+
+#: The limit shrinks if the fraction of available memory is below this
+MEMORY_SHRINK = 0.10
+
+#: The limit may only grow if, after one more task (estimated to use as
+#: much memory as the ones running), this fraction of memory is available
+MEMORY_GROW = 0.25
+
+#: Thresholds on the "some avg10" pressure stall information, that is,
+#: the percentage of time in which at least one task was stalled on the
+#: given resource, as (shrink above, may only grow below) pairs
+PRESSURE_THRESHOLDS = {
+    "cpu": (60.0, 20.0),
+    "memory": (10.0, 1.0),
+    "io": (60.0, 20.0),
+}
+
+
+def read_pressure(resource, path="/proc/pressure"):
+    """Reads the "some avg10" pressure stall information of a resource.
+
+    :param resource: one of "cpu", "memory" or "io"
+    :type resource: str
+    :param path: the directory with the pressure files
+    :type path: str
+    :returns: the percentage, or None if not supported by the system
+    :rtype: float
+    """
+    try:
+        with open(os.path.join(path, resource), "r", encoding="utf-8") as pressure:
+            for line in pressure:
+                kind, *values = line.split()
+                if kind != "some":
+                    continue
+                for value in values:
+                    name, _, number = value.partition("=")
+                    if name == "avg10":
+                        return float(number)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def read_memory(path="/proc/meminfo"):
+    """Reads the total and the available memory of the system.
+
+    :param path: the meminfo file
+    :type path: str
+    :returns: the total and available memory, in kB, or (None, None)
+              if not supported by the system
+    :rtype: tuple
+    """
+    values = {}
+    try:
+        with open(path, "r", encoding="utf-8") as meminfo:
+            for line in meminfo:
+                name, _, value = line.partition(":")
+                if name in ("MemTotal", "MemAvailable"):
+                    values[name] = int(value.split()[0])
+    except (OSError, ValueError, IndexError):
+        pass
+    return values.get("MemTotal"), values.get("MemAvailable")
+
+
+class SystemLoad:
+    """A sample of the resources usage of the system.
+
+    Any of the attributes may be None, if not supported by the system.
+    """
+
+    def __init__(
+        self, load=None, memory_total=None, memory_available=None, pressure=None
+    ):
+        #: The 1 minute load average per CPU
+        self.load = load
+        #: The total memory, in kB
+        self.memory_total = memory_total
+        #: The available memory, in kB
+        self.memory_available = memory_available
+        #: The "some avg10" pressure stall information, by resource
+        self.pressure = pressure or {}
+
+    def __repr__(self):
+        items = []
+        if self.load is not None:
+            items.append(f"load={self.load:.2f}")
+        if self.memory_fraction is not None:
+            items.append(f"memory_available={self.memory_fraction:.0%}")
+        for resource, value in sorted(self.pressure.items()):
+            if value is not None:
+                items.append(f"{resource}_pressure={value:.1f}")
+        return f'<SystemLoad {" ".join(items)}>'
+
+    @property
+    def memory_fraction(self):
+        if not self.memory_total or self.memory_available is None:
+            return None
+        return self.memory_available / self.memory_total
+
+    @classmethod
+    def sample(cls):
+        """Samples the current resources usage of the system."""
+        try:
+            load = os.getloadavg()[0] / multiprocessing.cpu_count()
+        except OSError:
+            load = None
+        memory_total, memory_available = read_memory()
+        pressure = {
+            resource: read_pressure(resource) for resource in PRESSURE_THRESHOLDS
+        }
+        return cls(load, memory_total, memory_available, pressure)
+
+
+class ConcurrencyController:
+    """Adjusts the limit on running tasks according to the system load."""
+
+    def __init__(
+        self, minimum, maximum, initial=None, interval=SAMPLE_INTERVAL, name=None
+    ):
+        """
+        :param minimum: the lowest value the limit may take
+        :type minimum: int
+        :param maximum: the highest value the limit may take
+        :type maximum: int
+        :param initial: the limit before any sample is taken, defaults to
+                        the minimum
+        :type initial: int
+        :param interval: the time, in seconds, between samples
+        :type interval: float
+        :param name: identifies the controller on the log messages
+        :type name: str
+        """
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        if initial is None:
+            initial = self.minimum
+        #: The current maximum number of tasks running at once
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.interval = interval
+        self._name = name
+        #: The available memory, in kB, on the first sample
+        self._baseline_memory = None
+
+    def __repr__(self):
+        return (
+            f"<ConcurrencyController limit={self.limit} minimum={self.minimum} "
+            f"maximum={self.maximum} interval={self.interval}>"
+        )
+
+    def _estimate_task_memory(self, load, running):
+        """Estimates the memory, in kB, used by each running task.
+
+        This is based on how much less memory is available, compared to
+        the first sample, divided by the number of running tasks.
+        """
+        if load.memory_available is None:
+            return 0
+        if self._baseline_memory is None:
+            self._baseline_memory = load.memory_available
+        if not running:
+            return 0
+        return max(self._baseline_memory - load.memory_available, 0) / running
+
+    def _shrink_reasons(self, load):
+        reasons = []
+        if load.load is not None and load.load > LOAD_SHRINK:
+            reasons.append(f"load per CPU {load.load:.2f} > {LOAD_SHRINK}")
+        fraction = load.memory_fraction
+        if fraction is not None and fraction < MEMORY_SHRINK:
+            reasons.append(f"available memory {fraction:.0%} < {MEMORY_SHRINK:.0%}")
+        for resource, (shrink, _) in PRESSURE_THRESHOLDS.items():
+            value = load.pressure.get(resource)
+            if value is not None and value > shrink:
+                reasons.append(f"{resource} pressure {value:.1f} > {shrink}")
+        return reasons
+
+    def _can_grow(self, load, task_memory):
+        if load.load is not None and load.load >= LOAD_GROW:
+            return False
+        if load.memory_fraction is not None:
+            available = load.memory_available - task_memory
+            if available / load.memory_total < MEMORY_GROW:
+                return False
+        for resource, (_, grow) in PRESSURE_THRESHOLDS.items():
+            value = load.pressure.get(resource)
+            if value is not None and value >= grow:
+                return False
+        return True
+
+    def update(self, load, running):
+        """Adjusts the limit given a sample of the system load.
+
+        :param load: the sample of the system load
+        :type load: :class:`SystemLoad`
+        :param running: the number of tasks currently running
+        :type running: int
+        :returns: whether the limit has changed
+        :rtype: bool
+        """
+        task_memory = self._estimate_task_memory(load, running)
+        previous = self.limit
+        reasons = self._shrink_reasons(load)
+        if reasons:
+            self.limit = max(self.limit - max(self.limit // 4, 1), self.minimum)
+        elif running >= self.limit and self._can_grow(load, task_memory):
+            self.limit = min(self.limit + 1, self.maximum)
+            reasons = ["resources to spare"]
+        if self.limit == previous:
+            return False
+        prefix = f"{self._name}: " if self._name else ""
+        LOG_JOB.info(
+            "%sMaximum number of parallel tasks changed from %u to %u "
+            "(%u running, %s): %s",
+            prefix,
+            previous,
+            self.limit,
+            running,
+            load,
+            ", ".join(reasons),
+        )
+        return True
+
+    async def run(self, state_machine):
+        """Periodically adjusts the limit, until cancelled.
+
+        Workers waiting on the state machine are notified when the limit
+        changes.
+
+        :param state_machine: the state machine with the running tasks
+        :type state_machine: :class:`avocado.core.task.statemachine.TaskStateMachine`
+        """
+        if self._baseline_memory is None:
+            self._baseline_memory = read_memory()[1]
+        while True:
+            await asyncio.sleep(self.interval)
+            running = len(state_machine.started) + len(state_machine.monitored)
+            if self.update(SystemLoad.sample(), running):
+                state_machine.notify_change()
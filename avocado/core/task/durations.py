@@ -0,0 +1,119 @@
+"""
+Ordering of tasks based on the durations of tests on previous jobs
+
+Tasks are run, as much as possible, in the order they are given to the
+state machine.  With tests of very different durations, running a long
+test last means that, near the end of the job, a single task is running
+while all other workers are idle.  Running the longest tests first
+("longest processing time first") shortens the time to run the whole
+suite in parallel.
+
+The durations are taken from the ``results.json`` files of previous jobs.
+"""
+
+import glob
+import json
+import os
+
+from avocado.core.task.shards import partition
+
+
+def find_results(logs_dir, jobs, exclude=None):
+    """Finds the results of the most recent jobs on a logs directory.
+
+    :param logs_dir: the directory with the results of jobs
+    :type logs_dir: str
+    :param jobs: the maximum number of jobs
+    :type jobs: int
+    :param exclude: a job results directory to be skipped, such as the
+                    one of the current job
+    :type exclude: str
+    :returns: the paths to the "results.json" files, the most recent last
+    :rtype: list
+    """
+    if jobs <= 0:
+        return []
+    results = []
+    if exclude is not None:
+        exclude = os.path.abspath(exclude)
+    for path in glob.glob(os.path.join(logs_dir, "*", "results.json")):
+        if os.path.abspath(os.path.dirname(path)) == exclude:
+            continue
+        try:
+            results.append((os.path.getmtime(path), path))
+        except OSError:
+            continue
+    results.sort()
+    return [path for _, path in results[-jobs:]]
+
+
+def load_durations(results_paths):
+    """Loads the average duration of each test on the given results.
+
+    Tests that have not run, such as skipped or interrupted ones, are
+    not taken into account.
+
+    :param results_paths: paths to "results.json" files
+    :type results_paths: list
+    :returns: the duration, in seconds, by test name (including variant)
+    :rtype: dict
+    """
+    totals = {}
+    for path in results_paths:
+        try:
+            with open(path, "r", encoding="utf-8") as results_file:
+                results = json.load(results_file)
+        except (OSError, ValueError):
+            continue
+        for test in results.get("tests", []):
+            if test.get("status") in ("SKIP", "CANCEL", "INTERRUPTED"):
+                continue
+            elapsed = test.get("time_elapsed", -1)
+            if not isinstance(elapsed, (int, float)) or elapsed < 0:
+                continue
+            total, count = totals.get(test.get("name"), (0, 0))
+            totals[test.get("name")] = (total + elapsed, count + 1)
+    return {name: total / count for name, (total, count) in totals.items()}
+
+
+def get_test_name(runtime_task):
+    """Gets the name of the test, as in "results.json", of a runtime task.
+
+    :rtype: str or None if the task is not a test
+    """
+    if runtime_task.task.category != "test":
+        return None
+    identifier = runtime_task.task.identifier
+    return f"{identifier.name}{identifier.str_variant}"
+
+
+def order_longest_first(runtime_tasks, durations):
+    """Orders the tasks so that the longest ones are run first.
+
+    Tasks that depend on each other are kept together, in their original
+    order, and those groups are ordered by the sum of the durations of
+    their tests.  Tests without a known duration are assumed to take the
+    average of the known durations.  Groups with the same duration are
+    kept in their original order.
+
+    :param runtime_tasks: the runtime tasks, in topological order
+    :type runtime_tasks: list
+    :param durations: the duration, in seconds, by test name, as given
+                      by :func:`load_durations`
+    :type durations: dict
+    :returns: the reordered runtime tasks
+    :rtype: list
+    """
+    names = [get_test_name(runtime_task) for runtime_task in runtime_tasks]
+    known = [durations[name] for name in names if name in durations]
+    default = sum(known) / len(known) if known else 0
+    costs = {}
+    for runtime_task, name in zip(runtime_tasks, names):
+        if name is not None:
+            costs[runtime_task] = durations.get(name, default)
+
+    def unit_cost(unit):
+        return sum(costs.get(runtime_task, 0) for runtime_task in unit)
+
+    units = sorted(partition(runtime_tasks), key=unit_cost, reverse=True)
+    return [runtime_task for unit in units for runtime_task in unit]
@@ -326,42 +326,59 @@ class RuntimeTaskGraph:
         :type suite_config: dict
         """
         self.graph = {}
+        self._test_suite_name = test_suite_name
+        self._status_server_uri = status_server_uri
+        self._job_id = job_id
+        self._base_dir = base_dir
+        self._suite_config = suite_config
         # create graph
         no_digits = len(str(len(tests)))
         for index, runnable in enumerate(tests, start=1):
-            runtime_test = RuntimeTask.from_runnable(
-                runnable,
+            self.add_test(runnable, index, no_digits)
+
+    def add_test(self, runnable, index, no_digits):
+        """Adds the runtime task of a test, and of its dependencies, to the graph.
+
+        :param runnable: the test
+        :type runnable: :class:`avocado.core.nrunner.Runnable`
+        :param index: index of the test inside the test suite
+        :type index: int
+        :param no_digits: number of digits of the test uid
+        :type no_digits: int
+        """
+        runtime_test = RuntimeTask.from_runnable(
+            runnable,
+            no_digits,
+            index,
+            self._base_dir,
+            self._test_suite_name,
+            self._status_server_uri,
+            self._job_id,
+        )
+        self.graph[runtime_test] = runtime_test
+
+        # with --dry-run we don't want to run dependencies
+        if runnable.kind != "dry-run":
+            pre_tasks = PreRuntimeTask.get_tasks_from_test_task(
+                runtime_test,
                 no_digits,
-                index,
-                base_dir,
-                test_suite_name,
-                status_server_uri,
-                job_id,
+                self._base_dir,
+                self._test_suite_name,
+                self._status_server_uri,
+                self._job_id,
+                self._suite_config,
             )
-            self.graph[runtime_test] = runtime_test
-
-            # with --dry-run we don't want to run dependencies
-            if runnable.kind != "dry-run":
-                pre_tasks = PreRuntimeTask.get_tasks_from_test_task(
-                    runtime_test,
-                    no_digits,
-                    base_dir,
-                    test_suite_name,
-                    status_server_uri,
-                    job_id,
-                    suite_config,
-                )
-                post_tasks = PostRuntimeTask.get_tasks_from_test_task(
-                    runtime_test,
-                    no_digits,
-                    base_dir,
-                    test_suite_name,
-                    status_server_uri,
-                    job_id,
-                    suite_config,
-                )
-                if pre_tasks or post_tasks:
-                    self._connect_tasks(pre_tasks, [runtime_test], post_tasks)
+            post_tasks = PostRuntimeTask.get_tasks_from_test_task(
+                runtime_test,
+                no_digits,
+                self._base_dir,
+                self._test_suite_name,
+                self._status_server_uri,
+                self._job_id,
+                self._suite_config,
+            )
+            if pre_tasks or post_tasks:
+                self._connect_tasks(pre_tasks, [runtime_test], post_tasks)
 
     def _connect_tasks(self, pre_tasks, tasks, post_tasks):
         connections = list(itertools.product(pre_tasks, tasks))
@@ -392,3 +409,32 @@ class RuntimeTaskGraph:
             if not visited[vertex]:
                 topological_order_util(vertex, visited, topological_order)
         return topological_order
+
+
+def iter_runtime_tasks(
+    tests,
+    test_suite_name,
+    status_server_uri,
+    job_id,
+    base_dir,
+    suite_config=None,
+):
+    """Creates the runtime tasks of the tests, one test at a time.
+
+    This is the streaming counterpart of :class:`RuntimeTaskGraph`, in
+    which the tasks of a test are only created when the ones of the
+    previous tests have been consumed.  As the number of tests is not
+    known beforehand, their uids are not padded with zeros.
+
+    Parameters are the same as the ones of :class:`RuntimeTaskGraph`.
+
+    :returns: the runtime tasks of each test (the test itself, and its
+              dependencies), in topological order
+    :rtype: iterator of list of :class:`RuntimeTask`
+    """
+    for index, runnable in enumerate(tests, start=1):
+        graph = RuntimeTaskGraph(
+            [], test_suite_name, status_server_uri, job_id, base_dir, suite_config
+        )
+        graph.add_test(runnable, index, None)
+        yield graph.get_tasks_in_topological_order()
@@ -0,0 +1,543 @@
+"""
+Execution of tasks by multiple scheduler processes ("shards")
+
+On the default execution mode, a single process schedules all tasks,
+receives and handles all of their status messages.  For large suites on
+hosts with many CPUs, that process can become a bottleneck, so the
+tasks can instead be run by a number of shards, each one a process with
+its own state machine, workers, status server and status repository.
+
+The tasks are partitioned into units of work (tasks that depend on each
+other are always kept in the same unit), and the units are evenly
+distributed among work queues, one per shard.  Those queues are kept by
+a :class:`Coordinator`, on the job process, which hands units from a
+shard's own queue whenever the shard asks for more work.  When a shard's
+queue is empty, it steals half of the units left on the fullest queue.
+
+Shards handle the bulk of the status messages, that is, the logs and
+outputs that go into the task files, themselves.  Everything else,
+including the "started" and "finished" messages, is forwarded to the
+job's status server, so that results are aggregated by the job.
+
+When a shard interrupts the job because of a failure (failfast), the
+coordinator tells all other shards to stop, so that none of them starts
+any more tasks.
+"""
+
+import asyncio
+import collections
+import multiprocessing
+import os
+import signal
+import time
+
+from avocado.core.exceptions import JobFailFast
+from avocado.core.messages import (
+    TASK_FILES_FLUSH_INTERVAL,
+    RunningMessageHandler,
+    TaskFiles,
+)
+from avocado.core.nrunner.task import TaskStatusService
+from avocado.core.output import LOG_JOB
+from avocado.core.status.repo import StatusRepo
+from avocado.core.status.server import StatusServer
+from avocado.core.task.runtime import RuntimeTaskStatus
+from avocado.core.task.statemachine import TaskStateMachine, Worker
+
+#: The types of running messages that are handled by the shards, instead
+#: of being forwarded to the job, as they are only saved to task files
+LOCAL_MESSAGE_TYPES = ("log", "stdout", "stderr", "file")
+
+#: Maximum time (in seconds) that a shard waits, after its work is done,
+#: for tasks that have started but have not yet sent a "finished" message
+STATUS_DRAIN_TIMEOUT = 5
+
+
+def partition(runtime_tasks):
+    """Splits tasks into units of work that can be scheduled independently.
+
+    Tasks that depend on each other, directly or not, are put in the same
+    unit.  The order of the given tasks is kept, both within units, and
+    among units (by their first task).
+
+    :param runtime_tasks: the tasks to be partitioned
+    :type runtime_tasks: list of :class:`avocado.core.task.runtime.RuntimeTask`
+    :rtype: list of list of :class:`avocado.core.task.runtime.RuntimeTask`
+    """
+    parents = {}
+
+    def find(runtime_task):
+        root = parents.setdefault(runtime_task, runtime_task)
+        while root is not parents[root]:
+            root = parents[root]
+        while runtime_task is not root:
+            parents[runtime_task], runtime_task = root, parents[runtime_task]
+        return root
+
+    for runtime_task in runtime_tasks:
+        for dependency in runtime_task.dependencies:
+            root, dependency_root = find(runtime_task), find(dependency)
+            if root is not dependency_root:
+                parents[dependency_root] = root
+
+    units = collections.OrderedDict()
+    for runtime_task in runtime_tasks:
+        units.setdefault(find(runtime_task), []).append(runtime_task)
+    return list(units.values())
+
+
+class WorkQueues:
+    """Work queues, one per shard, from which idle shards steal work."""
+
+    def __init__(self, units, shards):
+        """
+        :param units: the indexes of the units of work, in order
+        :type units: list of int
+        :param shards: the number of shards
+        :type shards: int
+        """
+        self._queues = []
+        for shard in range(shards):
+            start = len(units) * shard // shards
+            end = len(units) * (shard + 1) // shards
+            self._queues.append(collections.deque(units[start:end]))
+        #: The number of units that were stolen from other shards' queues
+        self.stolen = 0
+
+    def __len__(self):
+        return sum(len(queue) for queue in self._queues)
+
+    def _steal(self, thief):
+        victim = max(self._queues, key=len)
+        stolen = [victim.pop() for _ in range((len(victim) + 1) // 2)]
+        stolen.reverse()
+        self._queues[thief].extend(stolen)
+        self.stolen += len(stolen)
+
+    def take(self, shard, count):
+        """Takes units of work for a shard, stealing them if necessary.
+
+        :param shard: the index of the shard
+        :type shard: int
+        :param count: the maximum number of units to take
+        :type count: int
+        :returns: the units taken, which are only empty if there are no
+                  more units of work on any of the queues
+        :rtype: list of int
+        """
+        queue = self._queues[shard]
+        if not queue:
+            self._steal(shard)
+        return [queue.popleft() for _ in range(min(count, len(queue)))]
+
+    def clear(self):
+        """Drops all units of work that have not been taken."""
+        for queue in self._queues:
+            queue.clear()
+
+
+class Shard:
+    """A scheduler process, running the tasks handed to it by the job.
+
+    Shards are instantiated on the job process, and started by the
+    :class:`Coordinator`, which forks them.  Everything given to a shard,
+    including the tasks and the spawner, is thus inherited by it.
+    """
+
+    def __init__(
+        self,
+        index,
+        uri,
+        job_uri,
+        job_id,
+        units,
+        spawner,
+        max_running,
+        task_timeout=None,
+        failfast=False,
+        deadline=None,
+        concurrency=None,
+    ):
+        """
+        :param index: the index of the shard
+        :type index: int
+        :param uri: the URI for the status server of the shard
+        :type uri: str
+        :param job_uri: the URI for the status server of the job
+        :type job_uri: str
+        :param job_id: the job unique identification
+        :type job_id: str
+        :param units: all units of work, as given by :func:`partition`
+        :type units: list
+        :param spawner: the spawner used to run the tasks
+        :param max_running: the maximum number of tasks running at once
+        :type max_running: int
+        :param task_timeout: the maximum time, in seconds, for each task
+        :type task_timeout: int
+        :param failfast: whether the job should be interrupted on the
+                         first test failure
+        :type failfast: bool
+        :param deadline: the time (as given by :func:`time.monotonic`) at
+                         which all running tasks should be terminated
+        :type deadline: float
+        :param concurrency: adapts the maximum number of tasks running at
+                            once to the system load, if given
+        :type concurrency: :class:`avocado.core.task.concurrency.ConcurrencyController`
+        """
+        self.index = index
+        self.uri = uri
+        self._job_uri = job_uri
+        self._job_id = job_id
+        self._units = units
+        self._spawner = spawner
+        self._max_running = max_running
+        self._task_timeout = task_timeout
+        self._failfast = failfast
+        self._deadline = deadline
+        self._concurrency = concurrency
+        self._connection = None
+        self._reply = None
+        self._stopped = False
+        self._interrupted = False
+        self._status_repo = None
+        self._forwarder = None
+        self._tsm = None
+
+    def __repr__(self):
+        return f'<Shard index={self.index} uri="{self.uri}">'
+
+    def _receive(self):
+        """Handles a message from the coordinator."""
+        try:
+            kind, content = self._connection.recv()
+        except EOFError:
+            asyncio.get_event_loop().remove_reader(self._connection.fileno())
+            kind, content = "units", []
+        if kind == "units":
+            if self._reply is not None and not self._reply.done():
+                self._reply.set_result(content)
+        elif kind == "stop":
+            asyncio.ensure_future(self._stop())
+
+    async def _request(self, count):
+        """Asks the coordinator for up to count units of work."""
+        self._reply = asyncio.get_event_loop().create_future()
+        self._connection.send(("request", count))
+        return await self._reply
+
+    async def _stop(self):
+        """Drops the tasks not yet started, as the job is failing fast."""
+        self._stopped = True
+        self._tsm.stop_expecting_tasks()
+        await self._tsm.abort(RuntimeTaskStatus.FAILFAST)
+
+    @property
+    def _limit(self):
+        if self._concurrency is None:
+            return self._max_running
+        return self._concurrency.limit
+
+    async def _feed(self):
+        """Keeps the state machine fed with tasks, until there is no work."""
+        while not self._stopped:
+            generation = self._tsm.generation
+            queued = sum(
+                len(queue)
+                for queue in (self._tsm.requested, self._tsm.triaging, self._tsm.ready)
+            )
+            if queued >= self._limit:
+                await self._tsm.wait_for_change(generation)
+                continue
+            units = await self._request(self._limit - queued)
+            if not units or self._stopped:
+                break
+            runtime_tasks = [
+                runtime_task for unit in units for runtime_task in self._units[unit]
+            ]
+            for runtime_task in runtime_tasks:
+                runtime_task.task.status_services = [TaskStatusService(self.uri)]
+            await self._tsm.extend(runtime_tasks)
+        self._tsm.stop_expecting_tasks()
+
+    def _forward(self, task_id, message):
+        message = dict(message, id=task_id, job_id=self._job_id)
+        if not self._forwarder.post(message):
+            LOG_JOB.error(
+                'Failed to forward status message of task "%s" to the job', task_id
+            )
+
+    def _handle(self, task_id, message, handler, files):
+        task = self._tsm.tasks_by_id.get(task_id)
+        status = message.get("status")
+        if status == "running":
+            message_type = message.get("type")
+            if message_type in LOCAL_MESSAGE_TYPES:
+                handler.process_message(message, task, None)
+                return
+            if message_type is None:
+                return
+        elif status == "started":
+            task.metadata["task_path"] = task.runnable.output_dir
+        elif status == "finished":
+            files.close_task(task.identifier)
+        self._forward(task_id, message)
+
+    async def _update_status(self, status_updates):
+        files = TaskFiles()
+        handler = RunningMessageHandler(files)
+        try:
+            while True:
+                try:
+                    task_id, message = await asyncio.wait_for(
+                        status_updates.get(), TASK_FILES_FLUSH_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    files.flush()
+                    continue
+                try:
+                    self._handle(task_id, message, handler, files)
+                except Exception as details:  # pylint: disable=W0703
+                    LOG_JOB.error(
+                        'Failed to handle status message of task "%s": %s',
+                        task_id,
+                        details,
+                    )
+                finally:
+                    status_updates.task_done()
+        finally:
+            files.close()
+
+    def _worker(self, event_driven=True):
+        return Worker(
+            state_machine=self._tsm,
+            spawner=self._spawner,
+            max_running=self._max_running,
+            task_timeout=self._task_timeout,
+            failfast=self._failfast,
+            event_driven=event_driven,
+            concurrency=self._concurrency,
+        )
+
+    def _run_tasks(self, loop):
+        """Runs the tasks, until there is no work, or the shard is interrupted.
+
+        :returns: the reason for the interruption, if any
+        :rtype: str
+        """
+        feeder = asyncio.ensure_future(self._feed())
+        # the workers must wait for notifications, as they would
+        # otherwise busy loop while waiting for new tasks
+        number_of_workers = self._max_running
+        adapter = None
+        if self._concurrency is not None:
+            number_of_workers = self._concurrency.maximum
+            adapter = asyncio.ensure_future(self._concurrency.run(self._tsm))
+        workers = [self._worker().run() for _ in range(number_of_workers)]
+        timeout = None
+        if self._deadline is not None:
+            timeout = max(self._deadline - time.monotonic(), 0)
+        try:
+            loop.run_until_complete(
+                asyncio.wait_for(
+                    asyncio.shield(asyncio.gather(feeder, *workers)), timeout
+                )
+            )
+        except asyncio.TimeoutError:
+            feeder.cancel()
+            self._tsm.stop_expecting_tasks()
+            loop.run_until_complete(self._worker(False).terminate_tasks_timeout())
+            return "Timeout reached"
+        except KeyboardInterrupt:
+            feeder.cancel()
+            self._tsm.stop_expecting_tasks()
+            loop.run_until_complete(self._worker(False).terminate_tasks_interrupted())
+            return "Interrupted by user"
+        except JobFailFast as details:
+            feeder.cancel()
+            self._tsm.stop_expecting_tasks()
+            self._connection.send(("failfast", str(details)))
+            return None
+        finally:
+            if adapter is not None:
+                adapter.cancel()
+                loop.run_until_complete(asyncio.gather(adapter, return_exceptions=True))
+        return None
+
+    def _interrupt(self, signum, frame):  # pylint: disable=W0613
+        # the shard may be interrupted both by the user, and by the job
+        # itself, but it should only start terminating its tasks once
+        if not self._interrupted:
+            self._interrupted = True
+            raise KeyboardInterrupt
+
+    def run(self, connection):
+        """Runs the shard, on the shard process.
+
+        :param connection: the connection to the coordinator
+        :type connection: :class:`multiprocessing.connection.Connection`
+        """
+        self._connection = connection
+        signal.signal(signal.SIGINT, self._interrupt)
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._status_repo = StatusRepo(self._job_id)
+        status_server = StatusServer(self.uri, self._status_repo)
+        loop.run_until_complete(status_server.create_server())
+        asyncio.ensure_future(status_server.serve_forever())
+        self._forwarder = TaskStatusService(self._job_uri)
+        self._tsm = TaskStateMachine([], self._status_repo)
+        self._tsm.expecting_tasks = True
+
+        status_updates = self._status_repo.subscribe()
+        status_updater = asyncio.ensure_future(self._update_status(status_updates))
+        loop.add_reader(self._connection.fileno(), self._receive)
+        try:
+            reason = self._run_tasks(loop)
+        finally:
+            loop.remove_reader(self._connection.fileno())
+            self._spawner.shutdown()
+        if reason is not None:
+            self._connection.send(("interrupted", reason))
+
+        finished = loop.run_until_complete(
+            self._status_repo.wait_tasks_finished(
+                self._tsm.tasks_by_id, STATUS_DRAIN_TIMEOUT
+            )
+        )
+        if not finished:
+            LOG_JOB.warning(
+                "Some tasks on %s have not reported being finished, their "
+                "results may be incomplete",
+                self,
+            )
+        loop.run_until_complete(status_updates.join())
+        status_updater.cancel()
+        loop.run_until_complete(asyncio.gather(status_updater, return_exceptions=True))
+        self._forwarder.close()
+        status_server.close()
+        self._connection.close()
+
+
+class Coordinator:
+    """Starts the shards, on the job process, and hands them work."""
+
+    def __init__(self, shards, units):
+        """
+        :param shards: the shards, not yet started
+        :type shards: list of :class:`Shard`
+        :param units: all units of work, as given by :func:`partition`
+        :type units: list
+        """
+        self._shards = shards
+        self._queues = WorkQueues(list(range(len(units))), len(shards))
+        self._connections = []
+        self._processes = []
+        #: The reasons the shards have given for being interrupted
+        self.interrupted_reasons = []
+
+    @property
+    def stolen(self):
+        """The number of units of work that were stolen by idle shards."""
+        return self._queues.stolen
+
+    def start(self):
+        """Forks the shard processes."""
+        context = multiprocessing.get_context("fork")
+        for shard in self._shards:
+            connection, shard_connection = context.Pipe()
+            process = context.Process(
+                target=shard.run,
+                args=(shard_connection,),
+                name=f"avocado-shard-{shard.index}",
+            )
+            process.start()
+            shard_connection.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    def _on_message(self, index):
+        """Handles a message from a shard.
+
+        :returns: whether there was a message, instead of the end of the
+                  connection
+        :rtype: bool
+        """
+        connection = self._connections[index]
+        try:
+            message = connection.recv()
+        except EOFError:
+            asyncio.get_event_loop().remove_reader(connection.fileno())
+            return False
+        kind = message[0]
+        if kind == "request":
+            connection.send(("units", self._queues.take(index, message[1])))
+        elif kind == "failfast":
+            self._queues.clear()
+            self.interrupted_reasons.append(message[1])
+            self._stop_others(index)
+        elif kind == "interrupted":
+            self.interrupted_reasons.append(message[1])
+        return True
+
+    def _stop_others(self, index):
+        """Tells all shards but the given one to stop starting tasks."""
+        for other, connection in enumerate(self._connections):
+            if other == index or connection.closed:
+                continue
+            try:
+                connection.send(("stop", None))
+            except OSError:
+                # the shard has already exited
+                pass
+
+    async def wait(self):
+        """Hands work to the shards until all of them have exited."""
+        loop = asyncio.get_event_loop()
+
+        def on_exit(process, exited):
+            loop.remove_reader(process.sentinel)
+            if not exited.done():
+                exited.set_result(process.pid)
+
+        exits = []
+        for index, (connection, process) in enumerate(
+            zip(self._connections, self._processes)
+        ):
+            if connection.closed:
+                continue
+            loop.add_reader(connection.fileno(), self._on_message, index)
+            exited = loop.create_future()
+            loop.add_reader(process.sentinel, on_exit, process, exited)
+            exits.append(exited)
+        try:
+            await asyncio.gather(*exits)
+        finally:
+            for connection, process in zip(self._connections, self._processes):
+                if not connection.closed:
+                    loop.remove_reader(connection.fileno())
+                loop.remove_reader(process.sentinel)
+        for index, (connection, process) in enumerate(
+            zip(self._connections, self._processes)
+        ):
+            # pick up the messages sent right before the shard exited
+            while not connection.closed and connection.poll():
+                if not self._on_message(index):
+                    break
+            connection.close()
+            process.join()
+            if process.exitcode != 0:
+                LOG_JOB.error(
+                    "Shard %s exited with code %s, the results of its tasks "
+                    "may be incomplete",
+                    process.name,
+                    process.exitcode,
+                )
+
+    def interrupt(self):
+        """Interrupts all shards, which terminate their running tasks."""
+        for process in self._processes:
+            if process.is_alive():
+                try:
+                    os.kill(process.pid, signal.SIGINT)
+                except ProcessLookupError:
+                    pass
@@ -5,6 +5,7 @@ import multiprocessing
 import time
 
 from avocado.core.exceptions import JobFailFast
+from avocado.core.spawners.common import SpawnCapabilities
 from avocado.core.task.runtime import RuntimeTaskStatus
 from avocado.core.teststatus import STATUSES_NOT_OK
 from avocado.core.utils import messages
@@ -26,6 +27,14 @@ class TaskStateMachine:
         self._lock = asyncio.Lock()
         self._cache_lock = asyncio.Lock()
         self._task_size = len(tasks)
+        #: Incremented on every change that may allow a task to move
+        #: forward, such as a queue transition or a task finishing
+        self._generation = 0
+        self._changed = asyncio.Event()
+        #: While set, the state machine is not complete even if there are
+        #: no pending tasks, because more are expected to be added with
+        #: :meth:`extend`
+        self.expecting_tasks = False
 
         self._tasks_by_id = {
             str(runtime_task.task.identifier): runtime_task.task
@@ -72,18 +81,65 @@ class TaskStateMachine:
     async def complete(self):
         async with self._lock:
             pending = any([self._requested, self._triaging, self._ready, self._started])
-        return not pending
+        return not (pending or self.expecting_tasks)
 
     @property
     def tasks_by_id(self):
         return self._tasks_by_id
 
+    @property
+    def generation(self):
+        return self._generation
+
+    def notify_change(self):
+        """Wakes up all the workers waiting for a change on the queues."""
+        self._generation += 1
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_change(self, generation, timeout=None):
+        """Waits until the state machine changes after a given generation.
+
+        :param generation: the value of :attr:`generation` that the
+                           caller has already seen.  If there have been
+                           changes since then, this returns immediately.
+        :type generation: int
+        :param timeout: maximum amount of time, in seconds, to wait for
+                        a change.  Optional.
+        :type timeout: float
+        """
+        if generation != self._generation:
+            return
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
     async def add_new_task(self, runtime_task):
         async with self.lock:
             self._requested.appendleft(runtime_task)
             self._tasks_by_id[str(runtime_task.task.identifier)] = runtime_task.task
+            self.notify_change()
         return
 
+    async def extend(self, runtime_tasks):
+        """Adds tasks to be run after the ones already requested.
+
+        :param runtime_tasks: the new tasks, in the order they should run
+        :type runtime_tasks: list
+        """
+        async with self.lock:
+            self._requested.extend(runtime_tasks)
+            for runtime_task in runtime_tasks:
+                self._tasks_by_id[str(runtime_task.task.identifier)] = runtime_task.task
+            self._task_size += len(runtime_tasks)
+            self.notify_change()
+
+    def stop_expecting_tasks(self):
+        """Lets the state machine complete once its tasks are finished."""
+        self.expecting_tasks = False
+        self.notify_change()
+
     async def abort(self, status_reason=None):
         """Abort all non-started tasks.
 
@@ -151,6 +207,7 @@ class TaskStateMachine:
                 else:
                     LOG.debug('Task "%s" finished', runtime_task.task.identifier)
                 self.finished.append(runtime_task)
+                self.notify_change()
 
 
 class Worker:
@@ -162,6 +219,8 @@ class Worker:
         max_running=None,
         task_timeout=None,
         failfast=False,
+        event_driven=False,
+        concurrency=None,
     ):
         self._state_machine = state_machine
         self._spawner = spawner
@@ -173,14 +232,47 @@ class Worker:
         self._max_running = max_running
         self._task_timeout = task_timeout
         self._failfast = failfast
+        #: When set, instead of periodically polling the queues and the
+        #: status repository, the worker waits to be notified of changes
+        self._event_driven = event_driven
+        #: When set, a :class:`avocado.core.task.concurrency.ConcurrencyController`
+        #: whose (adaptive) limit on running tasks is used instead of max_running
+        self._concurrency = concurrency
         LOG.debug("%s has been initialized", self)
 
     def __repr__(self):
-        fmt = '<Worker spawner="{}" max_triaging={} max_running={} task_timeout={}>'
+        fmt = (
+            '<Worker spawner="{}" max_triaging={} max_running={} task_timeout={} '
+            "event_driven={} concurrency={}>"
+        )
         return fmt.format(
-            self._spawner, self._max_triaging, self._max_running, self._task_timeout
+            self._spawner,
+            self._max_triaging,
+            self._max_running,
+            self._task_timeout,
+            self._event_driven,
+            self._concurrency,
         )
 
+    def _is_running_limit_reached(self):
+        """Checks whether no more tasks should be started at this time.
+
+        Must be called with the state machine lock held.
+        """
+        if self._concurrency is None:
+            return len(self._state_machine.started) >= self._max_running
+        running = len(self._state_machine.started) + len(self._state_machine.monitored)
+        return running >= self._concurrency.limit
+
+    async def _wait(self):
+        """Backs off when a task can not move forward at this time.
+
+        On the event driven mode, this is a no-op, because the worker will
+        wait for changes on the state machine when no progress is made.
+        """
+        if not self._event_driven:
+            await asyncio.sleep(0.1)
+
     async def _send_finished_tasks_message(self, terminate_tasks, reason):
         """Sends messages related to tasks being terminated to status repository.
 
@@ -221,28 +313,37 @@ class Worker:
                 self._state_machine._status_repo.process_message(finish_message)
 
     async def bootstrap(self):
-        """Reads from requested, moves into triaging."""
+        """Reads from requested, moves into triaging.
+
+        :returns: whether a task has been moved forward
+        :rtype: bool
+        """
         try:
             async with self._state_machine.lock:
                 if len(self._state_machine.triaging) < self._max_triaging:
                     runtime_task = self._state_machine.requested.popleft()
                     self._state_machine.triaging.append(runtime_task)
+                    self._state_machine.notify_change()
                     LOG.debug(
                         'Task "%s": requested -> triaging', runtime_task.task.identifier
                     )
-                else:
-                    return
+                    return True
+                return False
         except IndexError:
-            return
+            return False
 
     async def triage(self):
-        """Reads from triaging, moves into either: ready or finished."""
+        """Reads from triaging, moves into either: ready or finished.
+
+        :returns: whether a task has been moved forward
+        :rtype: bool
+        """
 
         try:
             async with self._state_machine.lock:
                 runtime_task = self._state_machine.triaging.pop(0)
         except IndexError:
-            return
+            return False
 
         # a task waiting requirements already checked its requirements
         if runtime_task.status != RuntimeTaskStatus.WAIT_DEPENDENCIES:
@@ -258,7 +359,7 @@ class Worker:
                 await self._state_machine.finish_task(
                     runtime_task, RuntimeTaskStatus.FAIL_TRIAGE
                 )
-                return
+                return True
 
         # handle task dependencies
         if runtime_task.dependencies:
@@ -267,8 +368,8 @@ class Worker:
                 async with self._state_machine.lock:
                     self._state_machine.triaging.append(runtime_task)
                     runtime_task.status = RuntimeTaskStatus.WAIT_DEPENDENCIES
-                await asyncio.sleep(0.1)
-                return
+                await self._wait()
+                return False
 
             # dependencies finished, let's check if they finished
             # successfully, so we can move on with the parent task
@@ -300,7 +401,7 @@ class Worker:
                 await self._state_machine.finish_task(
                     runtime_task, RuntimeTaskStatus.FAIL_TRIAGE
                 )
-                return
+                return True
         if runtime_task.task.category != "test":
             # save or retrieve task from cache
             if runtime_task.is_cacheable:
@@ -312,8 +413,8 @@ class Worker:
                         async with self._state_machine.lock:
                             self._state_machine.triaging.append(runtime_task)
                             runtime_task.status = RuntimeTaskStatus.WAIT
-                            await asyncio.sleep(0.1)
-                        return
+                            await self._wait()
+                        return False
 
                     if is_task_in_cache:
                         task_id = str(runtime_task.task.identifier)
@@ -339,21 +440,27 @@ class Worker:
                             runtime_task, RuntimeTaskStatus.IN_CACHE
                         )
                         runtime_task.result = "pass"
-                        return
+                        return True
 
                     await self._spawner.save_requirement_in_cache(runtime_task)
 
         # the task is ready to run
         async with self._state_machine.lock:
             self._state_machine.ready.append(runtime_task)
+            self._state_machine.notify_change()
+        return True
 
     async def start(self):
-        """Reads from ready, moves into either: started or finished."""
+        """Reads from ready, moves into either: started or finished.
+
+        :returns: whether a task has been moved forward
+        :rtype: bool
+        """
         try:
             async with self._state_machine.lock:
                 runtime_task = self._state_machine.ready.pop(0)
         except IndexError:
-            return
+            return False
 
         # enforce a rate limit on the number of started (currently
         # running) tasks.  this is a global limit, but the spawners
@@ -361,19 +468,23 @@ class Worker:
         # new tasks
         should_wait = False
         async with self._state_machine.lock:
-            if len(self._state_machine.started) >= self._max_running:
+            if self._is_running_limit_reached():
                 self._state_machine.ready.insert(0, runtime_task)
                 runtime_task.status = RuntimeTaskStatus.WAIT
                 should_wait = True
         if should_wait:
-            await asyncio.sleep(0.1)
-            return
+            await self._wait()
+            return False
 
         LOG.debug(
             'Task "%s": about to be spawned with "%s"',
             runtime_task.task.identifier,
             self._spawner,
         )
+        if SpawnCapabilities.FILESYSTEM_SHARING in getattr(
+            self._spawner, "CAPABILITIES", []
+        ):
+            runtime_task.task.runnable.output_dir_shared = True
         start_ok = await self._spawner.spawn_task(runtime_task)
         if start_ok:
             LOG.debug('Task "%s": spawned successfully', runtime_task.task.identifier)
@@ -382,18 +493,24 @@ class Worker:
                 runtime_task.execution_timeout = time.monotonic() + self._task_timeout
             async with self._state_machine.lock:
                 self._state_machine.started.append(runtime_task)
+                self._state_machine.notify_change()
         else:
             await self._state_machine.finish_task(
                 runtime_task, RuntimeTaskStatus.FAIL_START
             )
+        return True
 
     async def monitor(self):
-        """Reads from started, moves into finished."""
+        """Reads from started, moves into finished.
+
+        :returns: whether a task has been moved forward
+        :rtype: bool
+        """
         try:
             async with self._state_machine.lock:
                 runtime_task = self._state_machine.started.pop(0)
         except IndexError:
-            return
+            return False
 
         if self._spawner.is_task_alive(runtime_task):
             LOG.debug(
@@ -417,7 +534,7 @@ class Worker:
                     self._state_machine.monitored.remove(runtime_task)
                 except ValueError:
                     # runtime_task has been terminated, there is no need to continue
-                    return
+                    return True
         else:
             LOG.debug(
                 'Task "%s" was very short lived, this may be '
@@ -428,35 +545,41 @@ class Worker:
 
         # from here, this `task` ran, so, let's check
         # its latest data in the status repo
-        latest_task_data = (
-            self._state_machine._status_repo.get_latest_task_data(
-                str(runtime_task.task.identifier)
-            )
-            or {}
-        )
-        # or maybe its results are not available yet
-        while latest_task_data.get("result") is None:
-            await asyncio.sleep(0.1)
-            latest_task_data = (
-                self._state_machine._status_repo.get_latest_task_data(
-                    str(runtime_task.task.identifier)
-                )
-                or {}
-            )
+        latest_task_data = await self._get_task_result_data(runtime_task)
         if runtime_task.task.category != "test":
             async with self._state_machine.cache_lock:
                 await self._spawner.update_requirement_cache(
                     runtime_task, latest_task_data["result"].upper()
                 )
         runtime_task.result = latest_task_data["result"]
-        result_stats = set(
-            key.upper() for key in self._state_machine._status_repo.result_stats.keys()
-        )
-        if self._failfast and not result_stats.isdisjoint(STATUSES_NOT_OK):
+        if self._failfast and self._has_failed_results():
             await self._state_machine.abort(RuntimeTaskStatus.FAILFAST)
             raise JobFailFast("Interrupting job (failfast).")
 
         await self._state_machine.finish_task(runtime_task, RuntimeTaskStatus.FINISHED)
+        return True
+
+    def _has_failed_results(self):
+        """Checks whether any task has finished with a not ok result."""
+        result_stats = self._state_machine._status_repo.result_stats
+        return any(
+            key is not None and key.upper() in STATUSES_NOT_OK for key in result_stats
+        )
+
+    async def _get_task_result_data(self, runtime_task):
+        """Returns the task data from the status repo that contains its result."""
+        task_id = str(runtime_task.task.identifier)
+        status_repo = self._state_machine._status_repo
+        if self._event_driven:
+            latest_task_data = await status_repo.wait_task_finished(task_id)
+            if latest_task_data.get("result") is not None:
+                return latest_task_data
+        latest_task_data = status_repo.get_latest_task_data(task_id) or {}
+        # or maybe its results are not available yet
+        while latest_task_data.get("result") is None:
+            await asyncio.sleep(0.1)
+            latest_task_data = status_repo.get_latest_task_data(task_id) or {}
+        return latest_task_data
 
     async def _terminate_task(self, runtime_task, task_status):
         runtime_task.status = task_status
@@ -495,6 +618,9 @@ class Worker:
 
     async def run(self):
         """Pushes Tasks forward and makes them do something with their lives."""
+        if self._event_driven:
+            await self._run_event_driven()
+            return
         while True:
             is_complete = await self._state_machine.complete
             if is_complete:
@@ -503,3 +629,28 @@ class Worker:
             await self.triage()
             await self.start()
             await self.monitor()
+
+    async def _run_event_driven(self):
+        """Same as :meth:`run`, but sleeps only until something changes.
+
+        When none of the phases is able to move a task forward, instead of
+        backing off for a fixed amount of time, the worker waits until the
+        state machine is notified of a change, such as a queue transition or
+        a task (possibly a dependency) finishing.
+        """
+        while True:
+            generation = self._state_machine.generation
+            is_complete = await self._state_machine.complete
+            if is_complete:
+                break
+            progress = await self.bootstrap()
+            # give every task waiting on triage a chance, as the first
+            # ones may be waiting on dependencies
+            for _ in range(max(len(self._state_machine.triaging), 1)):
+                if await self.triage():
+                    progress = True
+                    break
+            progress = await self.start() or progress
+            progress = await self.monitor() or progress
+            if not progress:
+                await self._state_machine.wait_for_change(generation)
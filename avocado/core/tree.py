@@ -61,23 +61,84 @@ class FilterSet(set):
         return f"FilterSet([{fs}])"
 
 
-class TreeEnvironment(dict):
-    """TreeNode environment with values, origins and filters"""
+class _Layers(collections.ChainMap):
+    """ChainMap looking up (and iterating) the layers faster"""
 
-    def __init__(self):
-        super().__init__()  # values
-        self.origin = {}  # origins of the values
+    def __getitem__(self, key):
+        for mapping in self.maps:
+            if key in mapping:
+                return mapping[key]
+        return self.__missing__(key)
+
+    def flatten(self):
+        """
+        Flattens the layers into a dict, with the same items (in the same
+        order) as this mapping
+
+        :rtype: dict
+        """
+        items = {}
+        for mapping in reversed(self.maps):
+            items.update(mapping)
+        return items
+
+    def items(self):
+        return self.flatten().items()
+
+    def __repr__(self):
+        return repr(self.flatten())
+
+
+class TreeEnvironment(_Layers):
+    """TreeNode environment with values, origins and filters
+
+    The values (and their origins) are kept in layers, one per node,
+    each one with the values set on that node, on top of the (shared,
+    not copied) layers of the environment of its parent, as in
+    :meth:`new_child`.  Values are always set on the top layer.
+    """
+
+    def __init__(self, *maps):
+        super().__init__(*maps)  # values
+        self.origin = _Layers()  # origins of the values
         self.filter_only = FilterSet()  # list of filter_only
         self.filter_out = FilterSet()  # list of filter_out
 
+    def new_child(self, m=None, **kwargs):
+        """
+        Environment with a new (empty) layer on top of the ones of this
+        environment, which are shared, along with the filters
+
+        Filters are only copied when extended with :meth:`add_filters`.
+        """
+        child = super().new_child(m, **kwargs)
+        child.origin = self.origin.new_child()
+        child.filter_only = self.filter_only
+        child.filter_out = self.filter_out
+        return child
+
     def copy(self):
-        cpy = TreeEnvironment()
-        cpy.update(self)
-        cpy.origin = copy.copy(self.origin)
+        cpy = super().copy()
+        cpy.origin = self.origin.copy()
         cpy.filter_only = copy.copy(self.filter_only)
         cpy.filter_out = copy.copy(self.filter_out)
         return cpy
 
+    def add_filters(self, filter_only, filter_out):
+        """
+        Extends the filters, without changing the sets shared with other
+        environments
+
+        :param filter_only: paths to add to :attr:`filter_only`
+        :param filter_out: paths to add to :attr:`filter_out`
+        """
+        if filter_only:
+            self.filter_only = copy.copy(self.filter_only)
+            self.filter_only.update(filter_only)
+        if filter_out:
+            self.filter_out = copy.copy(self.filter_out)
+            self.filter_out.update(filter_out)
+
     def __str__(self):
         """
         String representation using __str__ on items to improve readability
@@ -337,7 +398,9 @@ class TreeNode:
         """Get node environment (values + preceding envs)"""
         if self._environment is None:
             self._environment = (
-                self.parent.environment.copy() if self.parent else TreeEnvironment()
+                self.parent.environment.new_child()
+                if self.parent
+                else TreeEnvironment()
             )
             for key, value in self.value.items():
                 if isinstance(value, list):
@@ -350,8 +413,7 @@ class TreeNode:
                 else:
                     self._environment[key] = value
                 self._environment.origin[key] = self
-            self._environment.filter_only.update(self.filters[0])
-            self._environment.filter_out.update(self.filters[1])
+            self._environment.add_filters(self.filters[0], self.filters[1])
         return self._environment
 
     def set_environment_dirty(self):
@@ -3,8 +3,6 @@ import logging
 import sys
 import time
 
-from avocado.core.output import split_loggers_and_levels
-
 
 class GenericMessage:
     message_status = None
@@ -245,6 +243,8 @@ def start_logging(config, queue):
     :param queue: queue for the runner messages
     :type queue: multiprocessing.SimpleQueue
     """
+    # pylint: disable=C0415
+    from avocado.core.output import split_loggers_and_levels
 
     log_level = config.get("job.output.loglevel", logging.DEBUG)
     log_handler = RunnerLogHandler(queue, "log")
@@ -1,14 +1,14 @@
 import os
 import platform
 
-from pkg_resources import get_distribution
+#: The location of the "avocado" package
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 def prepend_base_path(value):
     expanded = os.path.expanduser(value)
     if not expanded.startswith(("/", "~", ".")):
-        dist = get_distribution("avocado-framework")
-        return os.path.join(dist.location, "avocado", expanded)
+        return os.path.join(BASE_PATH, expanded)
     return expanded
 
 
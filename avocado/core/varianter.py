@@ -236,8 +236,23 @@ class Varianter:
                        line parser, etc.
         :type config: dict
         """
+        cache = None
+        # debug information of the nodes is not kept on the dumped variants
+        debug = self.debug or config.get("variants.debug")
+        if config.get("variants.cache") and not debug:
+            # pylint: disable=C0415
+            from avocado.core.varianter_cache import VariantsCache
+
+            cache = VariantsCache(self._variant_plugins.extensions, config)
+            state = cache.get()
+            if state is not None:
+                self.load(state)
+                return
         self._variant_plugins.map_method_with_return("initialize", config)
         self._no_variants = sum(self._variant_plugins.map_method_with_return("__len__"))
+        if cache is not None and self._no_variants:
+            files = self._variant_plugins.map_method_with_return("get_cache_files")
+            cache.put([path for paths in files for path in paths], self.dump())
 
     def is_parsed(self):
         """
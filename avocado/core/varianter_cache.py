@@ -0,0 +1,209 @@
+"""
+Persistent cache of test variants.
+
+Producing the variants may mean parsing (and multiplexing) YAML files,
+computing combinations of parameters, or even running external tools.
+For unchanged input files, the variants are kept on a database in the
+data directory, in the format given by
+:meth:`avocado.core.varianter.Varianter.dump`, along with the hashes of
+the files they were produced from, so that they can be reused until any
+of those files change.
+
+The cache is only used with the same avocado version, varianter plugins
+and varianter configuration (as reported by each plugin) that produced
+the cached variants, and only if all varianter plugins support it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+
+from avocado.core.data_dir import get_datafile_path
+from avocado.core.version import VERSION
+
+LOG = logging.getLogger(__name__)
+
+#: Version of the format of the cache, to be changed whenever the
+#: format of the entries (or the meaning of the context) changes
+CACHE_VERSION = 1
+
+#: The definition of the database schema
+SCHEMA = [
+    (
+        "CREATE TABLE IF NOT EXISTS variants ("
+        "context TEXT PRIMARY KEY,"
+        "files TEXT,"
+        "variants BLOB"
+        ")"
+    ),
+]
+
+
+def get_database_path():
+    """Returns the location of the varianter cache database."""
+    return get_datafile_path("cache", "varianter.sqlite")
+
+
+def get_file_hash(path):
+    """Returns the hash of the contents of a file.
+
+    :returns: the hex digest, or None if the file can not be read
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as input_file:
+            for chunk in iter(lambda: input_file.read(65536), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def get_context(extensions, config):
+    """Returns a digest of everything, besides files, variants depend on.
+
+    :param extensions: the (enabled and ordered) varianter extensions
+    :param config: the configuration
+    :type config: dict
+    :returns: the digest, or None if any of the plugins does not support
+              caching its variants (with the given configuration)
+    :rtype: str
+    """
+    plugins = []
+    for ext in extensions:
+        get_cache_key = getattr(ext.obj, "get_cache_key", None)
+        if get_cache_key is None:
+            return None
+        key = get_cache_key(config)
+        if key is None:
+            return None
+        module = sys.modules.get(ext.plugin.__module__)
+        module_file = getattr(module, "__file__", None)
+        plugins.append(
+            [
+                ext.name,
+                str(ext.entry_point),
+                getattr(ext.entry_point, "version", None),
+                module_file and get_file_hash(module_file),
+                key,
+            ]
+        )
+    context = [CACHE_VERSION, VERSION, os.getcwd(), plugins]
+    return hashlib.sha256(
+        json.dumps(context, default=str, sort_keys=True).encode()
+    ).hexdigest()
+
+
+class VariantsCache:
+    """Gets the variants from, and saves them to, the persistent cache."""
+
+    def __init__(self, extensions, config, path=None):
+        """
+        :param extensions: the (enabled and ordered) varianter extensions
+        :param config: the configuration
+        :type config: dict
+        :param path: the location of the cache database, defaults to
+                     :func:`get_database_path`
+        :type path: str
+        """
+        #: The digest of what, besides files, the variants depend on, or
+        #: None if they can not be cached
+        self.context = get_context(extensions, config)
+        if path is None:
+            path = get_database_path()
+        self.path = path
+
+    def get(self):
+        """Returns the cached variants.
+
+        :returns: the loadable Varianter representation, or None if it is
+                  not in the cache, or if any of the files the variants
+                  were produced from has changed
+        :rtype: list
+        """
+        if self.context is None or not os.path.exists(self.path):
+            return None
+        try:
+            with sqlite3.connect(self.path) as conn:
+                entry = conn.execute(
+                    "SELECT files, variants FROM variants WHERE context = ?",
+                    (self.context,),
+                ).fetchone()
+        except sqlite3.Error as details:
+            LOG.warning(
+                'Failed to load the varianter cache "%s": %s', self.path, details
+            )
+            return None
+        if entry is None:
+            return None
+        files, variants = entry
+        for path, file_hash in json.loads(files):
+            if get_file_hash(path) != file_hash:
+                LOG.debug('Varianter cache: "%s" has changed', path)
+                return None
+        try:
+            return pickle.loads(variants)
+        except Exception:  # pylint: disable=W0703
+            return None
+
+    def put(self, files, state):
+        """Saves the variants to the cache.
+
+        :param files: the paths of the files the variants were produced
+                      from
+        :type files: list of str
+        :param state: the loadable Varianter representation
+        :type state: list
+        """
+        if self.context is None:
+            return
+        try:
+            data = pickle.dumps(state)
+        except Exception:  # pylint: disable=W0703
+            return
+        files = {os.path.abspath(path): get_file_hash(path) for path in files}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with sqlite3.connect(self.path) as conn:
+                for entry in SCHEMA:
+                    conn.execute(entry)
+                conn.execute(
+                    "INSERT OR REPLACE INTO variants (context, files, variants) "
+                    "VALUES (?, ?, ?)",
+                    (self.context, json.dumps(sorted(files.items())), data),
+                )
+        except (OSError, sqlite3.Error) as details:
+            LOG.warning(
+                'Failed to save the varianter cache "%s": %s', self.path, details
+            )
+
+
+def clear(path=None):
+    """Removes the varianter cache database."""
+    if path is None:
+        path = get_database_path()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def list_entries(path=None):
+    """Returns the files the cached variants were produced from, by context.
+
+    :rtype: dict
+    """
+    if path is None:
+        path = get_database_path()
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+    with sqlite3.connect(path) as conn:
+        for context, files in conn.execute(
+            "SELECT context, files FROM variants ORDER BY context"
+        ):
+            entries[context] = [path for path, _ in json.loads(files)]
+    return entries
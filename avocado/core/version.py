@@ -14,11 +14,8 @@
 
 __all__ = ["MAJOR", "MINOR", "VERSION"]
 
-import pkg_resources
+from avocado.core.entry_points import get_version
 
-try:
-    VERSION = pkg_resources.get_distribution("avocado-framework").version
-except pkg_resources.DistributionNotFound:
-    VERSION = "unknown.unknown"
+VERSION = get_version("avocado-framework") or "unknown.unknown"
 
 MAJOR, MINOR = VERSION.split(".")
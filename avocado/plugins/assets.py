@@ -277,6 +277,10 @@ class FetchAssetJob(JobPreTests):  # pylint: disable=R0903
             logger = None
         candidates = []
         for suite in job.test_suites:
+            if suite.streaming:
+                # producing the tests here would defeat streaming, so
+                # their assets are left to be fetched as they run
+                continue
             for test in suite.tests:
                 # nrunner/resolver based test should describe their requirements
                 # explicitly using docstring statements.  But, they can still
@@ -87,6 +87,15 @@ class SuiteDependency(JobPre):
                 dependencies = []
                 for dependency in dependencies_dict:
                     dependencies.append(Dependency.from_dictionary(dependency))
+
+                if suite.streaming:
+                    # the tests are produced again on every iteration, so
+                    # each one gets its own list of dependencies
+                    def add_dependencies(runnable, dependencies=dependencies):
+                        runnable.dependencies = dependencies + runnable.dependencies
+
+                    suite.tests.apply(add_dependencies)
+                    continue
                 for runnable in suite.tests:
                     dependencies.extend(runnable.dependencies)
                     runnable.dependencies = dependencies
@@ -64,6 +64,12 @@ class DictVariants(Varianter):
             if not self.headers_for_id:
                 self.headers_for_id = self.headers
 
+    def get_cache_key(self, config):
+        # variants given as Python objects are not worth caching
+        if config.get("run.dict_variants"):
+            return None
+        return []
+
     def __iter__(self):
         if self.variants is None:
             return
@@ -16,10 +16,9 @@ Libexec PATHs modifier
 
 import os
 
-from pkg_resources import resource_filename
-
 from avocado.core.output import LOG_UI
 from avocado.core.plugin_interfaces import CLICmd
+from avocado.core.utils.path import prepend_base_path
 
 
 class ExecPath(CLICmd):
@@ -40,4 +39,4 @@ class ExecPath(CLICmd):
         if os.path.isdir(system_wide):
             LOG_UI.debug(system_wide)
         else:
-            LOG_UI.debug(resource_filename("avocado", "libexec"))
+            LOG_UI.debug(prepend_base_path("libexec"))
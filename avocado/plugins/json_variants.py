@@ -91,6 +91,12 @@ class JsonVariants(Varianter):
             else:
                 sys.exit(exit_codes.AVOCADO_FAIL)
 
+    def get_cache_key(self, config):
+        # the loaded variants are already dumped ones
+        if config.get("json.variants.load") is not None:
+            return None
+        return []
+
     def __iter__(self):
         if self.variants == _NO_VARIANTS:
             return
@@ -13,13 +13,17 @@
 # Author: Lucas Meneghel Rodrigues <lmr@redhat.com>
 # Author: Beraldo Leal <bleal@redhat.com>
 
+import hashlib
 import json
 import os
+import time
 
 from avocado.core import exit_codes, parser_common_args
+from avocado.core.data_dir import get_datafile_path
 from avocado.core.output import LOG_UI, TERM_SUPPORT
 from avocado.core.plugin_interfaces import CLICmd
 from avocado.core.resolver import ReferenceResolutionResult
+from avocado.core.resolver_cache import get_file_signature, get_reference_path
 from avocado.core.settings import settings
 from avocado.core.suite import TestSuite
 from avocado.core.tags import filter_tags_on_runnables
@@ -37,6 +41,91 @@ def _get_tags_as_string(tags):
     return ",".join(tags_repr)
 
 
+def _get_index_path(config):
+    """Returns the location of the tests last listed with the same config.
+
+    Listings of different references, or with different resolver or tag
+    filtering options, are kept apart.
+    """
+    key = [
+        os.getcwd(),
+        sorted(
+            (key, value)
+            for key, value in config.items()
+            if key.startswith(("resolver.", "filter.by_tags."))
+        ),
+    ]
+    digest = hashlib.sha256(
+        json.dumps(key, default=str, sort_keys=True).encode()
+    ).hexdigest()
+    return get_datafile_path("cache", "list", f"{digest}.json")
+
+
+def _load_index(path):
+    """Returns the tests last listed, or an empty list if there are none."""
+    try:
+        with open(path, encoding="utf-8") as index:
+            return [tuple(test) for test in json.load(index)]
+    except (OSError, ValueError, TypeError):
+        return []
+
+
+def _save_index(path, tests):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as index:
+            json.dump(tests, index)
+    except OSError as details:
+        LOG_UI.warning('Failed to save the list of tests to "%s": %s', path, details)
+
+
+def _get_tests_diff(previous, current):
+    """Returns the tests added and removed, as (kind, identifier) tuples.
+
+    :rtype: dict
+    """
+    previous_set = set(previous)
+    current_set = set(current)
+    return {
+        "added": [
+            {"Type": kind, "Test": test}
+            for kind, test in current
+            if (kind, test) not in previous_set
+        ],
+        "removed": [
+            {"Type": kind, "Test": test}
+            for kind, test in previous
+            if (kind, test) not in current_set
+        ],
+    }
+
+
+def _get_tree_signatures(references):
+    """Returns the signatures of the files the references point to.
+
+    Directories are walked, skipping hidden ones and Python caches.
+
+    :rtype: dict
+    """
+    signatures = {}
+    for reference in references:
+        path = get_reference_path(reference) or reference
+        if not os.path.isdir(path):
+            signatures[path] = get_file_signature(path)
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [
+                dirname
+                for dirname in dirnames
+                if not (dirname.startswith(".") or dirname == "__pycache__")
+            ]
+            signatures[dirpath] = get_file_signature(dirpath)
+            for filename in filenames:
+                filepath = os.path.join(dirpath, filename)
+                signatures[filepath] = get_file_signature(filepath)
+    return signatures
+
+
 class List(CLICmd):
     """
     Implements the avocado 'list' subcommand
@@ -197,6 +286,57 @@ class List(CLICmd):
             with open(filename, "w", encoding="utf-8") as fp:
                 json.dump(result, fp, indent=4)
 
+    @staticmethod
+    def _save_diff(diff, filename):
+        if filename == "-":
+            # one line per diff, as many are written when watching
+            LOG_UI.debug(json.dumps(diff))
+        else:
+            with open(filename, "w", encoding="utf-8") as fp:
+                json.dump(diff, fp, indent=4)
+
+    def _list(self, config):
+        suite = TestSuite.from_config(config)
+        return suite, self._get_resolution_matrix(suite)
+
+    @staticmethod
+    def _update_index(config, matrix):
+        """Saves the tests listed, comparing them to the last ones listed.
+
+        :returns: the tests added and removed, as given by
+                  :func:`_get_tests_diff`
+        :rtype: dict
+        """
+        path = _get_index_path(config)
+        tests = [(item[0], item[1]) for item in matrix]
+        diff = _get_tests_diff(_load_index(path), tests)
+        if diff["added"] or diff["removed"]:
+            _save_index(path, tests)
+        return diff
+
+    def _watch(self, config, diff_file, signatures):
+        """Lists the tests again whenever the files referenced change.
+
+        :param signatures: the signatures of the files when last listed,
+                           as given by :func:`_get_tree_signatures`
+        :type signatures: dict
+        """
+        interval = config.get("list.watch.interval")
+        references = config.get("resolver.references") or [os.curdir]
+        try:
+            while True:
+                time.sleep(interval)
+                current = _get_tree_signatures(references)
+                if current == signatures:
+                    continue
+                signatures = current
+                _, matrix = self._list(config)
+                diff = self._update_index(config, matrix)
+                if diff["added"] or diff["removed"]:
+                    self._save_diff(diff, diff_file)
+        except KeyboardInterrupt:
+            return exit_codes.AVOCADO_ALL_OK
+
     @staticmethod
     def save_recipes(suite, directory, matrix_len):
         fmt = f"%0{len(str(matrix_len))}u.json"
@@ -232,6 +372,21 @@ class List(CLICmd):
             allow_multiple=True,
         )
 
+        settings.add_argparser_to_option(
+            namespace="resolver.cache",
+            parser=parser,
+            long_arg="--resolver-cache",
+            allow_multiple=True,
+        )
+
+        settings.add_argparser_to_option(
+            namespace="resolver.processes",
+            metavar="PROCESSES",
+            parser=parser,
+            long_arg="--resolver-processes",
+            allow_multiple=True,
+        )
+
         settings.add_argparser_to_option(
             namespace="resolver.exec_runnables_recipe.arguments",
             metavar="ARGS",
@@ -262,15 +417,89 @@ class List(CLICmd):
             long_arg="--json",
         )
 
+        help_msg = (
+            "Only resolves again the references to files changed since "
+            "they were last resolved (using the resolver cache), and keeps "
+            "the tests listed, so that the ones added or removed since the "
+            "last listing of the same references can be written with "
+            '"--json-diff".'
+        )
+        settings.register_option(
+            section="list",
+            key="incremental",
+            default=False,
+            key_type=bool,
+            help_msg=help_msg,
+            parser=parser,
+            long_arg="--incremental",
+        )
+
+        help_msg = (
+            "Writes the tests added and removed since the last listing of "
+            'the same references to a json file ("-" for the output). '
+            'Implies "--incremental".'
+        )
+        settings.register_option(
+            section="list",
+            key="write_diff_to_json_file",
+            default=None,
+            metavar="JSON_FILE",
+            help_msg=help_msg,
+            parser=parser,
+            long_arg="--json-diff",
+        )
+
+        help_msg = (
+            "After listing the tests, keeps looking for changes on the "
+            "files referenced (or on the files within the directories "
+            "referenced), listing the tests again when they change, and "
+            "writing the tests added and removed to the json file given "
+            'with "--json-diff" (or to the output, one line per change). '
+            'Implies "--incremental".'
+        )
+        settings.register_option(
+            section="list",
+            key="watch",
+            default=False,
+            key_type=bool,
+            help_msg=help_msg,
+            parser=parser,
+            long_arg="--watch",
+        )
+
+        help_msg = "Interval, in seconds, between looking for changes with --watch."
+        settings.register_option(
+            section="list.watch",
+            key="interval",
+            default=1.0,
+            key_type=float,
+            metavar="SECONDS",
+            help_msg=help_msg,
+            parser=parser,
+            long_arg="--watch-interval",
+        )
+
         parser_common_args.add_tag_filter_args(parser)
 
     def run(self, config):
         verbose = config.get("core.verbose")
         write_to_json_file = config.get("list.write_to_json_file")
+        diff_file = config.get("list.write_diff_to_json_file")
+        watch = config.get("list.watch")
+        if watch and diff_file is None:
+            diff_file = "-"
+        incremental = config.get("list.incremental") or diff_file is not None
         config["run.ignore_missing_references"] = True
+        # all tests are listed at once, so there's nothing to gain
+        config["run.streaming"] = False
+        if incremental:
+            config["resolver.cache"] = True
+        if watch:
+            signatures = _get_tree_signatures(
+                config.get("resolver.references") or [os.curdir]
+            )
         try:
-            suite = TestSuite.from_config(config)
-            matrix = self._get_resolution_matrix(suite)
+            suite, matrix = self._list(config)
             self._display(suite, matrix)
 
             directory = config.get("list.recipes.write_to_directory")
@@ -278,6 +507,12 @@ class List(CLICmd):
                 self.save_recipes(suite, directory, len(matrix))
             if write_to_json_file:
                 self._save_to_json(matrix, write_to_json_file, verbose)
+            if incremental:
+                diff = self._update_index(config, matrix)
+                if diff_file is not None:
+                    self._save_diff(diff, diff_file)
+            if watch:
+                return self._watch(config, diff_file, signatures)
         except KeyboardInterrupt:
             LOG_UI.error("Command interrupted by user...")
             return exit_codes.AVOCADO_FAIL
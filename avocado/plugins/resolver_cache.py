@@ -0,0 +1,31 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+
+from avocado.core import resolver_cache
+from avocado.core.plugin_interfaces import Cache
+
+
+class ResolverCache(Cache):
+
+    name = "resolver"
+    description = "Provides resolver cache entries"
+
+    def list(self):
+        resolver_list = ""
+        for context, references in resolver_cache.list_entries().items():
+            resolver_list += f"{context}:\n"
+            for reference in references:
+                resolver_list += f"\t{reference}\n"
+            resolver_list += "\n"
+        return resolver_list
+
+    def clear(self):
+        resolver_cache.clear()
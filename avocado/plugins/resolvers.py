@@ -238,6 +238,11 @@ class ExecRunnablesRecipeResolver(BaseExec, Resolver):
     description = "Test resolver for executables that output JSON runnable recipes"
     priority = PluginPriority.LOW
 
+    @property
+    def cacheable(self):
+        # the output of executables can not be cached
+        return not self.config.get("resolver.run_executables")
+
     def resolve(self, reference):
         if not self.config.get("resolver.run_executables"):
             return ReferenceResolution(
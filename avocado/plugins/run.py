@@ -274,6 +274,28 @@ class Run(CLICmd):
             allow_multiple=True,
         )
 
+        settings.add_argparser_to_option(
+            namespace="resolver.cache",
+            parser=parser,
+            long_arg="--resolver-cache",
+            allow_multiple=True,
+        )
+
+        settings.add_argparser_to_option(
+            namespace="variants.cache",
+            parser=parser,
+            long_arg="--variants-cache",
+            allow_multiple=True,
+        )
+
+        settings.add_argparser_to_option(
+            namespace="resolver.processes",
+            metavar="PROCESSES",
+            parser=parser,
+            long_arg="--resolver-processes",
+            allow_multiple=True,
+        )
+
         settings.add_argparser_to_option(
             namespace="resolver.exec_runnables_recipe.arguments",
             metavar="ARGS",
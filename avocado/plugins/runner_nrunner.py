@@ -17,26 +17,41 @@ nrunner based implementation of job compliant runner
 """
 
 import asyncio
+import concurrent.futures
+import math
 import multiprocessing
 import os
 import platform
 import random
 import tempfile
+import time
 
 from avocado.core.dispatcher import SpawnerDispatcher
 from avocado.core.exceptions import JobError, JobFailFast
-from avocado.core.messages import MessageHandler
+from avocado.core.messages import TASK_FILES_FLUSH_INTERVAL, MessageHandler
 from avocado.core.nrunner.runner import check_runnables_runner_requirements
 from avocado.core.output import LOG_JOB
 from avocado.core.plugin_interfaces import CLI, Init, SuiteRunner
 from avocado.core.settings import settings
 from avocado.core.status.repo import StatusRepo
 from avocado.core.status.server import StatusServer
-from avocado.core.task.runtime import RuntimeTaskGraph
+from avocado.core.task.concurrency import SAMPLE_INTERVAL, ConcurrencyController
+from avocado.core.task.durations import (
+    find_results,
+    get_test_name,
+    load_durations,
+    order_longest_first,
+)
+from avocado.core.task.runtime import RuntimeTaskGraph, iter_runtime_tasks
+from avocado.core.task.shards import Coordinator, Shard, partition
 from avocado.core.task.statemachine import TaskStateMachine, Worker
 
 DEFAULT_SERVER_URI = "127.0.0.1:8888"
 
+#: Maximum time (in seconds) to wait, at the end of a suite, for tasks
+#: that have started but have not yet sent a "finished" message
+STATUS_DRAIN_TIMEOUT = 5
+
 
 class RunnerInit(Init):
 
@@ -126,6 +141,86 @@ class RunnerInit(Init):
             help_msg=help_msg,
         )
 
+        help_msg = (
+            "Run the tasks of the tests that took the longest on previous "
+            "jobs first, so that long tests do not hold the end of the job "
+            "while other tasks could run in parallel. Tasks that depend on "
+            "each other are kept together. Durations are read from the "
+            "results of previous jobs on the job results directory."
+        )
+        settings.register_option(
+            section=section,
+            key="longest_first",
+            default=False,
+            key_type=bool,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "Number of most recent jobs, on the job results directory, "
+            "whose test durations are averaged when running the longest "
+            "tasks first."
+        )
+        settings.register_option(
+            section=section,
+            key="longest_first_history",
+            default=5,
+            key_type=int,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "Adapt the number of tasks running in parallel to the system "
+            "load, available memory and pressure stall information. The "
+            "limit starts at the maximum number of parallel tasks, and "
+            "grows or shrinks within the adaptive bounds. Changes are "
+            "recorded in the job log."
+        )
+        settings.register_option(
+            section=section,
+            key="adaptive_parallel_tasks",
+            default=False,
+            key_type=bool,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "Lowest number of tasks running in parallel when adapting it "
+            "to the system load."
+        )
+        settings.register_option(
+            section=section,
+            key="adaptive_parallel_tasks_min",
+            default=1,
+            key_type=int,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "Highest number of tasks running in parallel when adapting it "
+            "to the system load. Defaults to four times the amount of CPUs "
+            "on this machine."
+        )
+        settings.register_option(
+            section=section,
+            key="adaptive_parallel_tasks_max",
+            default=4 * multiprocessing.cpu_count(),
+            key_type=int,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "Interval, in seconds, between samples of the system load when "
+            "adapting the number of tasks running in parallel."
+        )
+        settings.register_option(
+            section=section,
+            key="adaptive_parallel_tasks_interval",
+            default=SAMPLE_INTERVAL,
+            key_type=float,
+            help_msg=help_msg,
+        )
+
         help_msg = (
             "Spawn tasks in a specific spawner. Available spawners: "
             "'process' and 'podman'"
@@ -134,6 +229,58 @@ class RunnerInit(Init):
             section=section, key="spawner", default="process", help_msg=help_msg
         )
 
+        help_msg = (
+            "Instead of periodically polling for changes, have the "
+            "workers that move tasks through the state machine wait "
+            "until they are notified of queue transitions, dependency "
+            "completion and finished status messages. This reduces "
+            "the idle time between tasks, which is specially noticeable "
+            "on suites with a large number of short lived tests."
+        )
+        settings.register_option(
+            section=section,
+            key="event_driven_scheduler",
+            default=False,
+            key_type=bool,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "Number of scheduler processes (shards) that run the tasks of a "
+            "suite, each one with its own workers, spawner and status server, "
+            "and stealing work from each other when idle. The number of "
+            "tasks running in parallel is split among them. The default, 1, "
+            "runs all tasks from the job process. Requires the status server "
+            "to be automatically configured."
+        )
+        settings.register_option(
+            section=section,
+            key="scheduler_shards",
+            default=1,
+            key_type=int,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "Produce the tests of a suite (resolving their references, and "
+            "expanding their variants) and create their tasks as the suite "
+            "runs, instead of before it, so that tests start running right "
+            "after the first reference is resolved, and memory use does not "
+            "grow with the size of the suite. The total number of tests is "
+            "only known at the end, and test IDs are not zero padded. Not "
+            "used along with shuffling, running the longest tasks first, or "
+            "multiple scheduler shards, which need all tasks beforehand. "
+            'With the "tests-per-variant" execution order, references are '
+            "resolved again for every variant."
+        )
+        settings.register_option(
+            section=section,
+            key="streaming",
+            default=False,
+            key_type=bool,
+            help_msg=help_msg,
+        )
+
         help_msg = "The amount of time a test has to complete in seconds."
         settings.register_option(
             section="task.timeout",
@@ -191,6 +338,41 @@ class RunnerCLI(CLI):
             metavar="NUMBER_OF_TASKS",
         )
 
+        settings.add_argparser_to_option(
+            namespace="run.longest_first",
+            parser=parser,
+            long_arg="--longest-first",
+            action="store_true",
+        )
+
+        settings.add_argparser_to_option(
+            namespace="run.longest_first_history",
+            parser=parser,
+            long_arg="--longest-first-history",
+            metavar="NUMBER_OF_JOBS",
+        )
+
+        settings.add_argparser_to_option(
+            namespace="run.adaptive_parallel_tasks",
+            parser=parser,
+            long_arg="--adaptive-parallel-tasks",
+            action="store_true",
+        )
+
+        settings.add_argparser_to_option(
+            namespace="run.adaptive_parallel_tasks_min",
+            parser=parser,
+            long_arg="--adaptive-parallel-tasks-min",
+            metavar="NUMBER_OF_TASKS",
+        )
+
+        settings.add_argparser_to_option(
+            namespace="run.adaptive_parallel_tasks_max",
+            parser=parser,
+            long_arg="--adaptive-parallel-tasks-max",
+            metavar="NUMBER_OF_TASKS",
+        )
+
         settings.add_argparser_to_option(
             namespace="run.spawner",
             parser=parser,
@@ -198,6 +380,27 @@ class RunnerCLI(CLI):
             metavar="SPAWNER",
         )
 
+        settings.add_argparser_to_option(
+            namespace="run.event_driven_scheduler",
+            parser=parser,
+            long_arg="--event-driven-scheduler",
+            action="store_true",
+        )
+
+        settings.add_argparser_to_option(
+            namespace="run.scheduler_shards",
+            parser=parser,
+            long_arg="--scheduler-shards",
+            metavar="NUMBER_OF_SHARDS",
+        )
+
+        settings.add_argparser_to_option(
+            namespace="run.streaming",
+            parser=parser,
+            long_arg="--streaming",
+            action="store_true",
+        )
+
     def run(self, config):
         pass
 
@@ -245,19 +448,260 @@ class Runner(SuiteRunner):
         # pylint: disable=W0201
         self.status_server = StatusServer(listen, self.status_repo)
 
-    async def _update_status(self, job):
+    async def _update_status(self, job, status_updates):
         message_handler = MessageHandler()
-        while True:
+        try:
+            while True:
+                try:
+                    task_id, message = await asyncio.wait_for(
+                        status_updates.get(), TASK_FILES_FLUSH_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    message_handler.flush()
+                    continue
+                task = self.tsm.tasks_by_id.get(task_id)
+                try:
+                    message_handler.process_message(message, task, job)
+                except Exception as details:  # pylint: disable=W0703
+                    LOG_JOB.error(
+                        'Failed to handle status message of task "%s": %s',
+                        task_id,
+                        details,
+                    )
+                finally:
+                    status_updates.task_done()
+        finally:
+            message_handler.close()
+
+    async def _drain_status_updates(self, status_updates):
+        """Waits until the messages from all started tasks are handled."""
+        finished = await self.status_repo.wait_tasks_finished(
+            self.tsm.tasks_by_id, STATUS_DRAIN_TIMEOUT
+        )
+        if not finished:
+            LOG_JOB.warning(
+                "Some tasks have not reported being finished, their "
+                "results may be incomplete"
+            )
+        await status_updates.join()
+
+    def _run_workers(
+        self,
+        job,
+        spawner,
+        max_running,
+        timeout,
+        failfast,
+        event_driven,
+        summary,
+        concurrency=None,
+        feeder=None,
+    ):
+        """Runs the tasks with workers on the job process.
+
+        When given, the feeder is a coroutine that adds the tasks to the
+        state machine while they run.
+        """
+        number_of_workers = max_running
+        if concurrency is not None:
+            number_of_workers = concurrency.maximum
+        workers = [
+            Worker(
+                state_machine=self.tsm,
+                spawner=spawner,
+                max_running=max_running,
+                task_timeout=timeout,
+                failfast=failfast,
+                event_driven=event_driven,
+                concurrency=concurrency,
+            ).run()
+            for _ in range(number_of_workers)
+        ]
+        adapter = None
+        if concurrency is not None:
+            adapter = asyncio.ensure_future(concurrency.run(self.tsm))
+        if feeder is not None:
+            feeder = asyncio.ensure_future(feeder)
+            workers.append(feeder)
+        loop = asyncio.get_event_loop()
+        try:
             try:
-                (_, task_id, _, index) = self.status_repo.status_journal_summary_pop()
+                loop.run_until_complete(
+                    asyncio.wait_for(
+                        asyncio.shield(asyncio.gather(*workers)), job.timeout or None
+                    )
+                )
+            except asyncio.TimeoutError:
+                self._stop_feeding(feeder)
+                terminate_worker = Worker(
+                    state_machine=self.tsm,
+                    spawner=spawner,
+                    max_running=max_running,
+                    task_timeout=timeout,
+                    failfast=failfast,
+                )
+                loop.run_until_complete(
+                    asyncio.wait_for(terminate_worker.terminate_tasks_timeout(), None)
+                )
+                raise
+            except KeyboardInterrupt:
+                self._stop_feeding(feeder)
+                terminate_worker = Worker(
+                    state_machine=self.tsm,
+                    spawner=spawner,
+                    max_running=max_running,
+                    task_timeout=timeout,
+                    failfast=failfast,
+                )
+                loop.run_until_complete(
+                    asyncio.wait_for(
+                        terminate_worker.terminate_tasks_interrupted(), None
+                    )
+                )
+                raise
+        except (KeyboardInterrupt, asyncio.TimeoutError, JobFailFast) as ex:
+            self._stop_feeding(feeder)
+            LOG_JOB.info(str(ex))
+            job.interrupted_reason = str(ex)
+            summary.add("INTERRUPTED")
+        finally:
+            if adapter is not None:
+                adapter.cancel()
+                loop.run_until_complete(asyncio.gather(adapter, return_exceptions=True))
+
+    def _stop_feeding(self, feeder):
+        if feeder is not None:
+            feeder.cancel()
+            self.tsm.stop_expecting_tasks()
+
+    def _order_longest_first(self, job, config):
+        results = find_results(
+            os.path.dirname(job.logdir),
+            config.get("run.longest_first_history"),
+            exclude=job.logdir,
+        )
+        durations = load_durations(results)
+        # pylint: disable=W0201
+        self.runtime_tasks = order_longest_first(self.runtime_tasks, durations)
+        known = sum(
+            1
+            for runtime_task in self.runtime_tasks
+            if get_test_name(runtime_task) in durations
+        )
+        LOG_JOB.info(
+            "Running the longest tasks first, with known durations for "
+            "%u tests from %u previous jobs",
+            known,
+            len(results),
+        )
 
-            except IndexError:
-                await asyncio.sleep(0.05)
-                continue
+    def _get_concurrency(self, config, max_running, number_of_tasks=None):
+        if not config.get("run.adaptive_parallel_tasks"):
+            return None
+        maximum = config.get("run.adaptive_parallel_tasks_max")
+        if number_of_tasks is not None:
+            maximum = min(maximum, number_of_tasks)
+        concurrency = ConcurrencyController(
+            config.get("run.adaptive_parallel_tasks_min"),
+            maximum,
+            max_running,
+            config.get("run.adaptive_parallel_tasks_interval"),
+        )
+        LOG_JOB.info(
+            "Adapting the number of parallel tasks to the system load, "
+            "between %u and %u, starting at %u",
+            concurrency.minimum,
+            concurrency.maximum,
+            concurrency.limit,
+        )
+        return concurrency
 
-            message = self.status_repo.get_task_data(task_id, index)
-            task = self.tsm.tasks_by_id.get(task_id)
-            message_handler.process_message(message, task, job)
+    @staticmethod
+    def _split_concurrency(concurrency, shards, index):
+        if concurrency is None:
+            return None
+        return ConcurrencyController(
+            math.ceil(concurrency.minimum / shards),
+            math.ceil(concurrency.maximum / shards),
+            math.ceil(concurrency.limit / shards),
+            concurrency.interval,
+            f"Shard {index}",
+        )
+
+    def _get_scheduler_shards(self, test_suite):
+        shards = test_suite.config.get("run.scheduler_shards")
+        can_shard = (
+            test_suite.config.get("run.status_server_auto")
+            and self.status_server_dir is not None
+            and hasattr(os, "fork")
+        )
+        if shards > 1 and not can_shard:
+            LOG_JOB.warning(
+                "Running tasks with multiple scheduler shards requires an "
+                "automatically configured status server, and process forking "
+                "support. Running all tasks from the job process."
+            )
+            return 1
+        return shards
+
+    def _run_shards(
+        self,
+        job,
+        spawner,
+        shards,
+        max_running,
+        timeout,
+        failfast,
+        summary,
+        concurrency=None,
+    ):
+        """Runs the tasks on scheduler processes (shards).
+
+        When adapting the number of parallel tasks, each shard gets its
+        own controller, with its share of the limits.
+        """
+        units = partition(self.runtime_tasks)
+        deadline = None
+        if job.timeout:
+            deadline = time.monotonic() + job.timeout
+        coordinator = Coordinator(
+            [
+                Shard(
+                    index,
+                    os.path.join(
+                        self.status_server_dir.name, f".status_server_{index}.sock"
+                    ),
+                    self.status_server.uri,
+                    job.unique_id,
+                    units,
+                    spawner,
+                    max(math.ceil(max_running / shards), 1),
+                    timeout,
+                    failfast,
+                    deadline,
+                    self._split_concurrency(concurrency, shards, index),
+                )
+                for index in range(shards)
+            ],
+            units,
+        )
+        coordinator.start()
+        loop = asyncio.get_event_loop()
+        try:
+            loop.run_until_complete(coordinator.wait())
+        except KeyboardInterrupt:
+            coordinator.interrupt()
+            loop.run_until_complete(coordinator.wait())
+        LOG_JOB.debug(
+            "%u units of work, out of %u, were stolen by idle shards",
+            coordinator.stolen,
+            len(units),
+        )
+        if coordinator.interrupted_reasons:
+            reason = coordinator.interrupted_reasons[0]
+            LOG_JOB.info(reason)
+            job.interrupted_reason = reason
+            summary.add("INTERRUPTED")
 
     @staticmethod
     def _abort_if_missing_runners(runnables):
@@ -269,6 +713,82 @@ class Runner(SuiteRunner):
             )
             raise JobError(msg)
 
+    @staticmethod
+    def _iter_checked_runnables(runnables):
+        """Checks the runner requirements of runnables as they are consumed."""
+        for runnable in runnables:
+            _, missing_requirements = check_runnables_runner_requirements([runnable])
+            Runner._abort_if_missing_runners(missing_requirements)
+            yield runnable
+
+    async def _feed(self, job, units, test_ids, limit):
+        """Keeps the state machine fed with the tasks of a streaming suite.
+
+        The tasks of more tests are only created when there are less than
+        limit tasks waiting to be started.  They are created by a thread,
+        one test ahead of the ones taken, so that resolving the tests and
+        creating their tasks does not hold up the event loop (and with
+        it, the status server and the workers).
+
+        :param units: the tasks of each test, as given by
+                      :func:`avocado.core.task.runtime.iter_runtime_tasks`
+        :type units: iterator
+        :param test_ids: where the identifiers of the test tasks are added
+        :type test_ids: list
+        :param limit: the number of tasks waiting to be started
+        :type limit: int
+        """
+        loop = asyncio.get_event_loop()
+        producer = concurrent.futures.ThreadPoolExecutor(
+            1, thread_name_prefix="avocado-feeder"
+        )
+        upcoming = loop.run_in_executor(producer, next, units, None)
+        try:
+            while True:
+                generation = self.tsm.generation
+                queued = sum(
+                    len(queue)
+                    for queue in (self.tsm.requested, self.tsm.triaging, self.tsm.ready)
+                )
+                if queued >= limit:
+                    await self.tsm.wait_for_change(generation)
+                    continue
+                runtime_tasks = await upcoming
+                if runtime_tasks is None:
+                    break
+                upcoming = loop.run_in_executor(producer, next, units, None)
+                for runtime_task in runtime_tasks:
+                    if runtime_task.task.category == "test":
+                        test_ids.append(runtime_task.task.identifier)
+                job.result.tests_total = len(test_ids)
+                await self.tsm.extend(runtime_tasks)
+        except Exception as details:  # pylint: disable=W0703
+            # the tasks already started are left to finish
+            self._feed_error = details
+            LOG_JOB.error("Failed to create the tasks of the suite: %s", details)
+        finally:
+            upcoming.cancel()
+            # the test being produced, if any, is not waited for
+            producer.shutdown(wait=False, cancel_futures=True)
+            self.tsm.stop_expecting_tasks()
+
+    def _can_stream(self, test_suite):
+        """Checks whether the tests of a streaming suite can be run as so."""
+        features = [
+            (test_suite.config.get("run.shuffle"), "shuffling"),
+            (test_suite.config.get("run.longest_first"), "the longest tasks first"),
+            (test_suite.config.get("run.scheduler_shards") > 1, "multiple shards"),
+        ]
+        not_streaming = [name for enabled, name in features if enabled]
+        if not_streaming:
+            LOG_JOB.warning(
+                "Running tasks with %s requires all of them beforehand, so "
+                "the tests of the suite will not be produced as it runs",
+                ", ".join(not_streaming),
+            )
+            return False
+        return True
+
     def run_suite(self, job, test_suite):
         summary = set()
 
@@ -286,6 +806,17 @@ class Runner(SuiteRunner):
             summary.add("INTERRUPTED")
             return summary
 
+        try:
+            return self._run_suite(job, test_suite, spawner, summary)
+        finally:
+            spawner.shutdown()
+
+    def _run_suite(self, job, test_suite, spawner, summary):
+        if test_suite.streaming:
+            if self._can_stream(test_suite):
+                return self._run_streaming_suite(job, test_suite, spawner, summary)
+            test_suite.tests = list(test_suite.tests)
+
         test_suite.tests, missing_requirements = check_runnables_runner_requirements(
             test_suite.tests
         )
@@ -308,11 +839,12 @@ class Runner(SuiteRunner):
         self.runtime_tasks = graph.get_tasks_in_topological_order()
 
         # Start the status server
-        asyncio.set_event_loop(asyncio.new_event_loop())
-        asyncio.ensure_future(self.status_server.serve_forever())
+        self._start_status_server()
 
         if test_suite.config.get("run.shuffle"):
             random.shuffle(self.runtime_tasks)
+        if test_suite.config.get("run.longest_first"):
+            self._order_longest_first(job, test_suite.config)
         test_ids = [
             rt.task.identifier
             for rt in self.runtime_tasks
@@ -324,63 +856,94 @@ class Runner(SuiteRunner):
         )
         timeout = test_suite.config.get("task.timeout.running")
         failfast = test_suite.config.get("run.failfast")
-        workers = [
-            Worker(
-                state_machine=self.tsm,
-                spawner=spawner,
-                max_running=max_running,
-                task_timeout=timeout,
-                failfast=failfast,
-            ).run()
-            for _ in range(max_running)
-        ]
-        asyncio.ensure_future(self._update_status(job))
+        event_driven = test_suite.config.get("run.event_driven_scheduler")
+        shards = self._get_scheduler_shards(test_suite)
+        concurrency = self._get_concurrency(
+            test_suite.config, max_running, len(self.runtime_tasks)
+        )
+        status_updates = self.status_repo.subscribe()
+        status_updater = asyncio.ensure_future(self._update_status(job, status_updates))
+        if shards > 1:
+            self._run_shards(
+                job,
+                spawner,
+                shards,
+                max_running,
+                timeout,
+                failfast,
+                summary,
+                concurrency,
+            )
+        else:
+            self._run_workers(
+                job,
+                spawner,
+                max_running,
+                timeout,
+                failfast,
+                event_driven,
+                summary,
+                concurrency,
+            )
+
+        self._finish_suite(job, status_updates, status_updater, test_ids, summary)
+        return summary
+
+    def _start_status_server(self):
+        asyncio.set_event_loop(asyncio.new_event_loop())
         loop = asyncio.get_event_loop()
-        try:
-            try:
-                loop.run_until_complete(
-                    asyncio.wait_for(
-                        asyncio.shield(asyncio.gather(*workers)), job.timeout or None
-                    )
-                )
-            except asyncio.TimeoutError:
-                terminate_worker = Worker(
-                    state_machine=self.tsm,
-                    spawner=spawner,
-                    max_running=max_running,
-                    task_timeout=timeout,
-                    failfast=failfast,
-                )
-                loop.run_until_complete(
-                    asyncio.wait_for(terminate_worker.terminate_tasks_timeout(), None)
-                )
-                raise
-            except KeyboardInterrupt:
-                terminate_worker = Worker(
-                    state_machine=self.tsm,
-                    spawner=spawner,
-                    max_running=max_running,
-                    task_timeout=timeout,
-                    failfast=failfast,
-                )
-                loop.run_until_complete(
-                    asyncio.wait_for(
-                        terminate_worker.terminate_tasks_interrupted(), None
-                    )
-                )
-                raise
-        except (KeyboardInterrupt, asyncio.TimeoutError, JobFailFast) as ex:
-            LOG_JOB.info(str(ex))
-            job.interrupted_reason = str(ex)
-            summary.add("INTERRUPTED")
+        loop.run_until_complete(self.status_server.create_server())
+        asyncio.ensure_future(self.status_server.serve_forever())
+
+    def _run_streaming_suite(self, job, test_suite, spawner, summary):
+        """Runs a suite whose tasks are created as it runs."""
+        job.result.tests_total = 0
+        self._create_status_server(test_suite, job)
+        units = iter_runtime_tasks(
+            self._iter_checked_runnables(test_suite.tests),
+            test_suite.name,
+            self._determine_status_server(test_suite, "run.status_server_uri"),
+            job.unique_id,
+            job.test_results_path,
+            test_suite.config,
+        )
+        self._start_status_server()
+
+        # pylint: disable=W0201
+        self.tsm = TaskStateMachine([], self.status_repo)
+        self.tsm.expecting_tasks = True
+        self._feed_error = None  # pylint: disable=W0201
+        test_ids = []
+        max_running = test_suite.config.get("run.max_parallel_tasks")
+        concurrency = self._get_concurrency(test_suite.config, max_running)
+        status_updates = self.status_repo.subscribe()
+        status_updater = asyncio.ensure_future(self._update_status(job, status_updates))
+        # the workers must wait for notifications, as they would
+        # otherwise busy loop while waiting for new tasks
+        self._run_workers(
+            job,
+            spawner,
+            max_running,
+            test_suite.config.get("task.timeout.running"),
+            test_suite.config.get("run.failfast"),
+            True,
+            summary,
+            concurrency,
+            self._feed(job, units, test_ids, max_running),
+        )
+        self._finish_suite(job, status_updates, status_updater, test_ids, summary)
+        if self._feed_error is not None:
+            raise self._feed_error
+        return summary
 
-        # Wait until all messages may have been processed by the
-        # status_updater. This should be replaced by a mechanism
-        # that only waits if there are missing status messages to
-        # be processed, and, only for a given amount of time.
-        # Tests with non received status will always show as SKIP
-        # because of result reconciliation.
-        loop.run_until_complete(asyncio.sleep(0.05))
+    def _finish_suite(self, job, status_updates, status_updater, test_ids, summary):
+        loop = asyncio.get_event_loop()
+        # Wait until all received messages have been handled, so that
+        # results are not missing (and reconciled as SKIP) at the end
+        loop.run_until_complete(self._drain_status_updates(status_updates))
+        status_updater.cancel()
+        loop.run_until_complete(asyncio.gather(status_updater, return_exceptions=True))
+        self.status_repo.unsubscribe(status_updates)
 
         job.result.end_tests()
         self.status_server.close()
@@ -395,4 +958,3 @@ class Runner(SuiteRunner):
                 for status in self.status_repo.get_result_set_for_tasks(test_ids)
             ]
         )
-        return summary
@@ -9,11 +9,7 @@ import traceback
 from avocado.core.exceptions import TestInterrupt
 from avocado.core.nrunner.app import BaseRunnerApp
 from avocado.core.nrunner.runner import RUNNER_RUN_CHECK_INTERVAL, BaseRunner
-from avocado.core.test import TestID
-from avocado.core.tree import TreeNodeEnvOnly
-from avocado.core.utils import loader, messages
-from avocado.core.varianter import is_empty_variant
-from avocado.utils.deprecation import log_deprecation
+from avocado.core.utils import messages
 
 
 class AvocadoInstrumentedTestRunner(BaseRunner):
@@ -52,6 +48,10 @@ class AvocadoInstrumentedTestRunner(BaseRunner):
         if runnable.variant is None:
             return None
 
+        # pylint: disable=C0415
+        from avocado.core.tree import TreeNodeEnvOnly
+        from avocado.core.varianter import is_empty_variant
+
         # rebuild the variant tree
         variant_tree_nodes = [
             TreeNodeEnvOnly(path, env) for path, env in runnable.variant["variant"]
@@ -64,6 +64,13 @@ class AvocadoInstrumentedTestRunner(BaseRunner):
 
     @staticmethod
     def _run_avocado(runnable, queue):
+        # the test machinery is only imported by the process running the
+        # test, so that the runner itself starts faster
+        # pylint: disable=C0415
+        from avocado.core.test import TestID
+        from avocado.core.utils import loader
+        from avocado.utils.deprecation import log_deprecation
+
         def load_and_run_test(test_factory):
             instance = loader.load_test(test_factory)
             early_state = instance.get_state()
@@ -1,15 +1,122 @@
-import multiprocessing
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
 
-import pkg_resources
-
+from avocado.core import entry_points
 from avocado.core.nrunner.app import BaseRunnerApp
 from avocado.core.nrunner.runner import BaseRunner
 
+#: Maximum size (in bytes) of the output sent in a single message
+OUTPUT_CHUNK_SIZE = 64 * 1024
+
+
+class _Output:
+    """
+    Reads the standard output or error of a test process incrementally.
+
+    When the output goes to a pipe, its content is sent in chunks of at
+    most :data:`OUTPUT_CHUNK_SIZE` bytes.  When it goes to a file in the
+    task output directory, and that directory is shared with the job,
+    only a reference to the new content (its offset and size in the file)
+    is sent.  Otherwise, the new content of the file is also sent in
+    chunks.
+    """
+
+    def __init__(self, name, pipe=None, path=None, keep=False, shared=False):
+        """
+        :param name: either "stdout" or "stderr"
+        :type name: str
+        :param pipe: the pipe the output goes to, if any
+        :param path: the path of the file the output goes to, if not a pipe
+        :type path: str
+        :param keep: whether to keep the whole content, so that it can be
+                     used after the process finishes
+        :type keep: bool
+        :param shared: whether the file the output goes to can be read by
+                       the job
+        :type shared: bool
+        """
+        self.name = name
+        self._pipe = pipe
+        self._path = path
+        self._shared = shared
+        self._file = None
+        self._offset = 0
+        self._kept = bytearray() if keep and pipe is not None else None
+        if pipe is not None:
+            os.set_blocking(pipe.fileno(), False)
+
+    def _read_pipe(self):
+        try:
+            data = os.read(self._pipe.fileno(), OUTPUT_CHUNK_SIZE)
+        except BlockingIOError:
+            return b""
+        if self._kept is not None:
+            self._kept += data
+        return data
+
+    def _read_file(self):
+        if self._file is None:
+            self._file = open(self._path, "rb")  # pylint: disable=R1732
+        return self._file.read(OUTPUT_CHUNK_SIZE)
+
+    def _reference(self):
+        size = os.stat(self._path).st_size
+        reference = {
+            "type": self.name,
+            "log": b"",
+            "log_only": True,
+            "log_file": self.name,
+            "log_offset": self._offset,
+            "log_size": size - self._offset,
+        }
+        self._offset = size
+        return reference
+
+    def read(self, final=False):
+        """
+        Produces messages with the output written since the last read.
+
+        :param final: whether the process has finished, in which case all
+                      the remaining output is read, and at least one
+                      message is produced
+        :type final: bool
+        :rtype: iterator of dict
+        """
+        if self._pipe is None and self._shared:
+            reference = self._reference()
+            if reference["log_size"] or final:
+                yield reference
+            return
+        read_chunk = self._read_pipe if self._pipe is not None else self._read_file
+        produced = False
+        while True:
+            data = read_chunk()
+            if not data:
+                break
+            produced = True
+            yield {"type": self.name, "log": data}
+            if not final:
+                return
+        if final:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if not produced:
+                yield {"type": self.name, "log": b""}
+
+    @property
+    def content(self):
+        """The whole output, if it was kept."""
+        if self._pipe is None:
+            with open(self._path, "rb") as output_file:
+                return output_file.read()
+        if self._kept is not None:
+            return bytes(self._kept)
+        return None
+
 
 class ExecTestRunner(BaseRunner):
     """
@@ -39,6 +146,10 @@ class ExecTestRunner(BaseRunner):
         "runner.exectest.clear_env",
     ]
 
+    #: Whether the whole stdout and stderr of the process are given to
+    #: :meth:`_process_final_status`, instead of just being streamed
+    KEEP_OUTPUT = False
+
     def _process_final_status(
         self, process, runnable, stdout=None, stderr=None
     ):  # pylint: disable=W0613
@@ -83,12 +194,7 @@ class ExecTestRunner(BaseRunner):
     @staticmethod
     def _get_avocado_version():
         """Return the Avocado package version, if installed"""
-        version = "unknown.unknown"
-        try:
-            version = pkg_resources.get_distribution("avocado-framework").version
-        except pkg_resources.DistributionNotFound:
-            pass
-        return version
+        return entry_points.get_version("avocado-framework") or "unknown.unknown"
 
     def _get_env_variables(self, runnable):
         """Get the default AVOCADO_* environment variables
@@ -192,30 +298,31 @@ class ExecTestRunner(BaseRunner):
         def poll_proc():
             return process.poll() is not None
 
-        yield from self.running_loop(poll_proc)
-
-        if process.stdout is not None:
-            stdout = process.stdout.read()
-            yield self.prepare_status("running", {"type": "stdout", "log": stdout})
-        else:
-            stdout_path = os.path.join(runnable.output_dir, "stdout")
-            with open(stdout_path, "rb") as stdout_file:
-                stdout = stdout_file.read()
-            yield self.prepare_status(
-                "running", {"type": "stdout", "log": stdout, "log_only": True}
+        outputs = [
+            _Output(
+                name,
+                pipe,
+                os.path.join(runnable.output_dir, name) if pipe is None else None,
+                self.KEEP_OUTPUT,
+                runnable.output_dir_shared,
             )
+            for name, pipe in (("stdout", process.stdout), ("stderr", process.stderr))
+        ]
 
-        if process.stderr is not None:
-            stderr = process.stderr.read()
-            yield self.prepare_status("running", {"type": "stderr", "log": stderr})
-        else:
-            stderr_path = os.path.join(runnable.output_dir, "stderr")
-            with open(stderr_path, "rb") as stderr_file:
-                stderr = stderr_file.read()
-            yield self.prepare_status(
-                "running", {"type": "stderr", "log": stderr, "log_only": True}
-            )
+        def pending():
+            for output in outputs:
+                for message in output.read():
+                    yield self.prepare_status("running", message)
 
+        yield from self.running_loop(poll_proc, pending)
+
+        for output in outputs:
+            for message in output.read(final=True):
+                yield self.prepare_status("running", message)
+
+        stdout, stderr = [
+            output.content if self.KEEP_OUTPUT else None for output in outputs
+        ]
         yield self._process_final_status(process, runnable, stdout, stderr)
         self._cleanup(runnable)
 
@@ -228,6 +335,9 @@ class RunnerApp(BaseRunnerApp):
 
 def main():
     if sys.platform == "darwin":
+        # pylint: disable=C0415
+        import multiprocessing
+
         multiprocessing.set_start_method("fork")
     app = RunnerApp(print)
     app.run()
@@ -35,6 +35,8 @@ class TAPRunner(ExecTestRunner):
     name = "tap"
     description = "Runner for standalone executables treated as TAP"
 
+    KEEP_OUTPUT = True
+
     @staticmethod
     def _get_tap_result(stdout):
         parser = TapParser(io.StringIO(stdout.decode()))
@@ -0,0 +1,29 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+
+from avocado.core.nrunner.capabilities import CapabilitiesRegistry
+from avocado.core.plugin_interfaces import Cache
+
+
+class RunnersCache(Cache):
+
+    name = "runners"
+    description = "Provides the registry of runners capabilities"
+
+    def list(self):
+        runners_list = ""
+        for command, entry in sorted(CapabilitiesRegistry().entries.items()):
+            runnables = ", ".join(entry.get("capabilities", {}).get("runnables", []))
+            runners_list += f"{command}:\n\t{runnables}\n"
+        return runners_list
+
+    def clear(self):
+        CapabilitiesRegistry().clear()
@@ -1,17 +1,89 @@
 import asyncio
+import logging
 import os
 import socket
 
+from avocado.core import entry_points
 from avocado.core.dependencies.requirements import cache
-from avocado.core.plugin_interfaces import Spawner
+from avocado.core.nrunner.zygote import Zygote
+from avocado.core.plugin_interfaces import CLI, Init, Spawner
+from avocado.core.settings import settings
 from avocado.core.spawners.common import SpawnCapabilities, SpawnerMixin, SpawnMethod
 from avocado.core.teststatus import STATUSES_NOT_OK
 from avocado.core.utils.eggenv import get_python_path_env_if_egg
 
+LOG = logging.getLogger(__name__)
+
 ENVIRONMENT_TYPE = "local"
 ENVIRONMENT = socket.gethostname()
 
 
+class ProcessSpawnerInit(Init):
+
+    description = "Process based spawner initialization"
+
+    def initialize(self):
+        section = "spawner.process"
+
+        help_msg = (
+            "Keeps a pre-forked (zygote) runner process per kind of "
+            "runnable, which already has the runner application imported, "
+            "and forks it for every task, instead of starting a new "
+            "runner process from scratch. This saves the Python "
+            "interpreter startup and import time of every task. Runners "
+            "that are not Python entry points are spawned as usual."
+        )
+        settings.register_option(
+            section=section,
+            key="zygote",
+            default=False,
+            key_type=bool,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "The number of tasks a zygote will fork before being "
+            "replaced by a new one"
+        )
+        settings.register_option(
+            section=section,
+            key="zygote_max_tasks",
+            default=100,
+            key_type=int,
+            help_msg=help_msg,
+        )
+
+
+class ProcessCLI(CLI):
+
+    name = "process"
+    description = 'process spawner command line options for "run"'
+
+    def configure(self, parser):
+        super().configure(parser)
+        parser = parser.subcommands.choices.get("run", None)
+        if parser is None:
+            return
+
+        parser = parser.add_argument_group("process spawner specific options")
+        settings.add_argparser_to_option(
+            namespace="spawner.process.zygote",
+            parser=parser,
+            long_arg="--spawner-process-zygote",
+            action="store_true",
+        )
+
+        settings.add_argparser_to_option(
+            namespace="spawner.process.zygote_max_tasks",
+            parser=parser,
+            long_arg="--spawner-process-zygote-max-tasks",
+            metavar="NUMBER_OF_TASKS",
+        )
+
+    def run(self, config):
+        pass
+
+
 class ProcessSpawnerHandle:
     def __init__(self, process):
         self.process = process
@@ -38,9 +110,65 @@ class ProcessSpawner(Spawner, SpawnerMixin):
         SpawnCapabilities.FILESYSTEM_SHARING,
     ]
 
+    def __init__(self, config=None, job=None):
+        super().__init__(config, job)
+        #: Zygotes keyed by runnable kind, or False for kinds whose
+        #: runners can not be spawned by a zygote
+        self._zygotes = {}
+        #: Zygotes that were replaced, which may still have children
+        self._retired_zygotes = []
+
     def is_operational(self):
         return True
 
+    @property
+    def _use_zygote(self):
+        # zygotes depend on fork(), so they are not available everywhere
+        return bool(self.config.get("spawner.process.zygote")) and hasattr(os, "fork")
+
+    @staticmethod
+    def _get_runner_entry_point(kind):
+        """Returns the "module:callable" runner entry point for a kind."""
+        name = f"avocado-runner-{kind}"
+        for ep in entry_points.iter_entry_points("console_scripts", name):
+            return f"{ep.module_name}:{ep.attrs[0]}"
+        return None
+
+    def _get_zygote(self, kind):
+        """Returns a running zygote for a kind, or None if not possible."""
+        zygote = self._zygotes.get(kind)
+        if zygote is False:
+            return None
+        if zygote is not None:
+            max_tasks = self.config.get("spawner.process.zygote_max_tasks")
+            if zygote.is_alive and zygote.spawned < max_tasks:
+                return zygote
+            zygote.retire()
+            self._retired_zygotes.append(zygote)
+        entry_point = self._get_runner_entry_point(kind)
+        if entry_point is None:
+            self._zygotes[kind] = False
+            return None
+        zygote = Zygote(kind, entry_point, env=get_python_path_env_if_egg())
+        try:
+            zygote.start()
+        except (FileNotFoundError, PermissionError):
+            self._zygotes[kind] = False
+            return None
+        LOG.debug("Started %s", zygote)
+        self._zygotes[kind] = zygote
+        return zygote
+
+    def shutdown(self):
+        """Retires all the zygotes, and waits for them to exit."""
+        zygotes = self._retired_zygotes + [
+            zygote for zygote in self._zygotes.values() if zygote
+        ]
+        self._zygotes.clear()
+        self._retired_zygotes = []
+        for zygote in zygotes:
+            zygote.stop()
+
     @staticmethod
     def is_task_alive(runtime_task):
         if runtime_task.spawner_handle is None:
@@ -56,6 +184,17 @@ class ProcessSpawner(Spawner, SpawnerMixin):
         args = runner[1:] + ["task-run"] + task.get_command_args()
         runner = runner[0]
 
+        if self._use_zygote:
+            zygote = self._get_zygote(task.runnable.kind)
+            if zygote is not None:
+                try:
+                    proc = await zygote.spawn(["task-run"] + task.get_command_args())
+                except OSError as details:
+                    LOG.error("Failed to spawn task with %s: %s", zygote, details)
+                    return False
+                runtime_task.spawner_handle = ProcessSpawnerHandle(proc)
+                return True
+
         # pylint: disable=E1133
         try:
             proc = await asyncio.create_subprocess_exec(
@@ -0,0 +1,31 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+
+from avocado.core import varianter_cache
+from avocado.core.plugin_interfaces import Cache
+
+
+class VarianterCache(Cache):
+
+    name = "varianter"
+    description = "Provides varianter cache entries"
+
+    def list(self):
+        varianter_list = ""
+        for context, files in varianter_cache.list_entries().items():
+            varianter_list += f"{context}:\n"
+            for path in files:
+                varianter_list += f"\t{path}\n"
+            varianter_list += "\n"
+        return varianter_list
+
+    def clear(self):
+        varianter_cache.clear()
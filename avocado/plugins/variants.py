@@ -102,6 +102,13 @@ class Variants(CLICmd):
             metavar="FILE",
         )
 
+        settings.add_argparser_to_option(
+            namespace="variants.cache",
+            parser=parser,
+            long_arg="--variants-cache",
+            allow_multiple=True,
+        )
+
         env_parser = parser.add_argument_group("environment view options")
 
         help_msg = "Use debug implementation to gather more information."
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks the computation of the combinations of the "cit" varianter.
+
+It creates a synthetic set of parameters, all with the same number of
+values, and computes the combinations of a given order that cover all of
+them, with a fixed seed.  The time to compute them is reported for the
+current implementation, which scores each candidate row by the
+difference it would make in the coverage, and for one that scores it by
+covering it and uncovering it back, as it used to.  The combinations
+found by both are checked to cover all the combinations of the given
+order (they are not the same ones, even with the same seed, as covering
+and uncovering rows changes the order in which the missing combinations
+are picked).
+"""
+
+import argparse
+import time
+
+from avocado_varianter_cit.Cit import Cit
+from avocado_varianter_cit.CombinationMatrix import CombinationMatrix
+from avocado_varianter_cit.Solver import Solver
+
+
+class CoveringCit(Cit):
+    """Scores each candidate row by covering it, and uncovering it back."""
+
+    def _get_uncover(self, row, solution, parameters):
+        self.combination_matrix.uncover_combination(row, parameters)
+        self.combination_matrix.cover_combination(solution, parameters)
+        uncover = self.combination_matrix.total_uncovered
+        self.combination_matrix.uncover_combination(solution, parameters)
+        self.combination_matrix.cover_combination(row, parameters)
+        return uncover
+
+    def cover_missing_combination(self, matrix):
+        parameters, combination = self.get_missing_combination_random()
+        best_uncover = float("inf")
+        best_solution = []
+        best_row_index = 0
+        for row_index in range(len(matrix)):
+            solution = [x for x in matrix[row_index]]
+            for index, item in enumerate(parameters):
+                solution[item] = combination[index]
+            if self.combination_matrix.is_valid_combination(solution, parameters):
+                uncover = self._get_uncover(matrix[row_index], solution, parameters)
+                if uncover < best_uncover:
+                    best_uncover = uncover
+                    best_solution = solution
+                    best_row_index = row_index
+                if best_uncover == 0:
+                    break
+        return best_solution, best_row_index, parameters
+
+    def change_one_column(self, matrix):
+        column_index = self.random.randint(0, len(self.data) - 1)
+        best_uncover = float("inf")
+        best_solution = []
+        best_row_index = 0
+        for row_index in range(len(matrix)):
+            try:
+                solution, row_index, parameters = self.change_one_value(
+                    matrix, row_index, column_index
+                )
+            except ValueError:
+                continue
+            uncover = self._get_uncover(matrix[row_index], solution, parameters)
+            if uncover < best_uncover:
+                best_uncover = uncover
+                best_solution = solution
+                best_row_index = row_index
+            if best_uncover == 0:
+                break
+        return best_solution, best_row_index, [column_index]
+
+
+def check_coverage(input_data, t_value, matrix):
+    combination_matrix = CombinationMatrix(input_data, t_value)
+    Solver(input_data, set()).clean_hash_table(combination_matrix, t_value)
+    for row in matrix:
+        combination_matrix.cover_solution_row(row)
+    assert combination_matrix.total_uncovered == 0
+
+
+def measure(cit_class, input_data, t_value, seed):
+    start = time.monotonic()
+    matrix = cit_class(input_data, t_value, set(), seed).compute()
+    return time.monotonic() - start, matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--parameters",
+        type=int,
+        nargs="+",
+        default=[5, 10, 15],
+        help="Numbers of parameters",
+    )
+    parser.add_argument(
+        "--values", type=int, default=4, help="Number of values of each parameter"
+    )
+    parser.add_argument(
+        "--order", type=int, default=2, help="Order of the combinations"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    for parameters in args.parameters:
+        input_data = [args.values] * parameters
+        computed, matrix = measure(Cit, input_data, args.order, args.seed)
+        covering, covered = measure(CoveringCit, input_data, args.order, args.seed)
+        check_coverage(input_data, args.order, matrix)
+        check_coverage(input_data, args.order, covered)
+        print(
+            f"{parameters:>3} parameters ({len(matrix)} combinations): "
+            f"computed in {computed:.3f}s, covering ({len(covered)} "
+            f"combinations) {covering:.3f}s "
+            f"({covering / computed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
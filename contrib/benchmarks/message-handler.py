@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks the throughput, in messages per second, of the job side
+:class:`MessageHandler`, that is, the persistence of the running messages
+(logs, stdout and stderr) of many parallel tasks into their task files.
+
+It compares opening and closing the task files for every message with
+keeping them open, buffered, in a :class:`TaskFiles` cache.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from avocado.core import messages as message_handlers
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.utils import messages
+
+
+class UnbufferedMessageHandler(message_handlers.MessageHandler):
+    """Message handler that opens the task files for every message."""
+
+    def __init__(self):
+        super().__init__()
+        self._handlers["running"] = [message_handlers.RunningMessageHandler()]
+
+
+def run(buffered, number_of_tasks, number_of_messages, payload):
+    with tempfile.TemporaryDirectory(prefix="avocado_benchmark_") as tmp_dir:
+        tasks = []
+        for index in range(number_of_tasks):
+            task = Task(Runnable("noop", "noop"), str(index))
+            task.metadata["task_path"] = os.path.join(tmp_dir, str(index))
+            os.mkdir(task.metadata["task_path"])
+            tasks.append(task)
+        klass = (
+            message_handlers.MessageHandler if buffered else UnbufferedMessageHandler
+        )
+        handler = klass()
+        started = time.monotonic()
+        for index in range(number_of_messages):
+            task = tasks[index % number_of_tasks]
+            for message_class in (
+                messages.StdoutMessage,
+                messages.StderrMessage,
+                messages.LogMessage,
+            ):
+                handler.process_message(message_class.get(payload), task, None)
+        handler.close()
+        return time.monotonic() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=64)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument(
+        "--payload-size", type=int, default=80, help="Size of each message log"
+    )
+    args = parser.parse_args()
+    payload = b"x" * (args.payload_size - 1) + b"\n"
+    total = args.messages * 3
+
+    for buffered in (False, True):
+        elapsed = run(buffered, args.tasks, args.messages, payload)
+        name = "buffered" if buffered else "unbuffered"
+        print(
+            f"{name:>10}: {total} messages in {elapsed:.2f}s "
+            f"({total / elapsed:.1f} messages/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
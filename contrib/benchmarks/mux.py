@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks the variants of large multiplex trees ("yaml_to_mux" plugin).
+
+It creates a synthetic YAML file with a number of multiplex domains, each
+one with a number of children, where every child of a domain is only
+allowed ("!filter-only") along with two of the children of the next
+domain.  Out of the (children ** domains) raw combinations, only
+(children * 2 ** (domains - 1)) variants are valid.
+
+The time to count the valid variants, to iterate through them, and to
+get the one in the middle by index are reported.  The same is done by
+producing all raw combinations and checking each one against the
+internal filters, as it used to be done, as long as the number of raw
+combinations is under a given limit.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from avocado_varianter_yaml_to_mux import mux
+from avocado_varianter_yaml_to_mux.varianter_yaml_to_mux import create_from_yaml
+
+
+def create_yaml(path, domains, children):
+    lines = []
+    for domain in range(domains):
+        lines.append(f"d{domain}: !mux")
+        for child in range(children):
+            lines.append(f"    c{child}:")
+            if domain + 1 < domains:
+                for allowed in (child, (child + 1) % children):
+                    lines.append(
+                        f"        !filter-only : /run/d{domain + 1}/c{allowed}"
+                    )
+            lines.append(f"        value{domain}: {child}")
+    with open(path, "w", encoding="utf-8") as yaml_file:
+        yaml_file.write("\n".join(lines) + "\n")
+
+
+def measure(function):
+    start = time.monotonic()
+    result = function()
+    return time.monotonic() - start, result
+
+
+def old_variants(tree):
+    # pylint: disable=W0212
+    return [
+        variant
+        for variant in tree.iter_variants()
+        if mux.MuxTree._valid_variant(variant)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--domains",
+        type=int,
+        nargs="+",
+        default=[4, 6, 8],
+        help="Numbers of multiplex domains",
+    )
+    parser.add_argument(
+        "--children", type=int, default=10, help="Number of children of each domain"
+    )
+    parser.add_argument(
+        "--old-limit",
+        type=int,
+        default=10**6,
+        help="Maximum number of raw combinations to check one by one",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="avocado-mux-benchmark-") as tmp:
+        for domains in args.domains:
+            path = os.path.join(tmp, f"mux-{domains}.yaml")
+            create_yaml(path, domains, args.children)
+            root = create_from_yaml([path])
+            raw = args.children**domains
+
+            tree = mux.MuxTree(root)
+            counted, size = measure(lambda: len(tree))  # pylint: disable=W0640
+            iterated, variants = measure(lambda: list(tree))  # pylint: disable=W0640
+            middle = size // 2
+            indexed, variant = measure(lambda: tree[middle])  # pylint: disable=W0640
+            assert variant == variants[middle]
+            print(
+                f"{raw:>12} raw, {size:>6} valid: counted in {counted:.4f}s, "
+                f"iterated in {iterated:.4f}s, indexed in {indexed:.4f}s"
+            )
+            if raw > args.old_limit:
+                continue
+            checked, old = measure(lambda: old_variants(mux.MuxTree(root)))
+            assert old == variants
+            print(f"{'':>26}checked one by one in {checked:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks the retrieval of test parameters ("self.params.get()").
+
+It creates a synthetic variant, with a number of multiplex domains, each
+one contributing a leaf with a number of keys (along with keys inherited
+from their parents), and a number of tests with the params of the same
+variant.  Each test gets a mix of parameters (from relative and absolute
+paths, with unhashable defaults, and missing ones) a number of times, as
+tests do in loops.
+
+The time to create the params of all tests, and to get the parameters,
+are reported for the current implementation, which compiles an index of
+the values of each key, and for one that looks for the matching leaves
+on every query, as it used to.  Both are checked to give the same values.
+"""
+
+import argparse
+import time
+
+from avocado.core import parameters, tree
+
+
+class ScanningAvocadoParam(parameters.AvocadoParam):
+    """Looks for the leaves with the key on every query."""
+
+    def __init__(self, leaves, name):  # pylint: disable=W0231
+        self._leaves = leaves
+        self._leaf_names = [leaf.path + "/" for leaf in leaves]
+        self.name = name
+
+    def get_or_die(self, path, key):
+        leaves = [
+            self._leaves[i]
+            for i in range(len(self._leaf_names))
+            if path.search(self._leaf_names[i])
+        ]
+        ret = [
+            (leaf.environment[key], leaf.environment.origin[key])
+            for leaf in leaves
+            if key in leaf.environment
+        ]
+        if not ret:
+            raise parameters.NoMatchError(key)
+        if len(set([_[1].path for _ in ret])) == 1:
+            return ret[0][0]
+        raise ValueError(key)
+
+
+class ScanningAvocadoParams(parameters.AvocadoParams):
+    """Creates the params slices of every test, and caches (key, path,
+    default) queries, unless the default is unhashable."""
+
+    def __init__(self, leaves, paths):  # pylint: disable=W0231
+        self._rel_paths = []
+        leaves = list(leaves)
+        for i, path in enumerate(paths):
+            path_leaves = self._get_matching_leaves(path, leaves)
+            self._rel_paths.append(ScanningAvocadoParam(path_leaves, f"{i}: {path}"))
+        path_leaves = self._get_matching_leaves("/*", leaves)
+        self._abs_path = ScanningAvocadoParam(path_leaves, "*: *")
+        self._cache = {}
+        self._logger_name = None
+
+    @staticmethod
+    def _greedy_path_to_re(path):
+        return parameters.AvocadoParams._greedy_path_to_re.__wrapped__(path)
+
+    def get(self, key, path=None, default=None):
+        if path is None:
+            path = "*"
+        try:
+            return self._cache[(key, path, default)]
+        except (KeyError, TypeError):
+            found, value = self._get(key, path)
+            if not found:
+                value = default
+            try:
+                self._cache[(key, path, default)] = value
+            except TypeError:
+                pass
+            return value
+
+
+def create_leaves(domains, keys):
+    root = tree.TreeNode()
+    root.value = {f"root_key{key}": key for key in range(keys)}
+    run = root.get_node("/run", True)
+    leaves = []
+    for domain in range(domains):
+        node = run.get_node(f"domain{domain}", True)
+        node.value = {f"domain_key{key}": f"{domain}-{key}" for key in range(keys)}
+        leaf = node.get_node("leaf", True)
+        leaf.value = {f"key{domain}_{key}": key for key in range(keys)}
+        leaves.append(leaf)
+    return leaves
+
+
+def create_queries(domains, keys):
+    queries = []
+    for key in range(keys):
+        queries.append((f"root_key{key}", None, None))
+        queries.append((f"key{key % domains}_{key}", None, []))
+        queries.append((f"domain_key{key}", f"/run/domain{key % domains}/*", "default"))
+        queries.append((f"missing{key}", None, {}))
+    return queries
+
+
+def measure(params_class, leaves, queries, tests, loops):
+    start = time.monotonic()
+    params = [params_class(leaves, ["/run/*"]) for _ in range(tests)]
+    created = time.monotonic()
+    values = []
+    for test_params in params:
+        for _ in range(loops):
+            values = [
+                test_params.get(key, path, default) for key, path, default in queries
+            ]
+    return created - start, time.monotonic() - created, values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--domains", type=int, default=20, help="Number of multiplex domains"
+    )
+    parser.add_argument(
+        "--keys", type=int, default=50, help="Number of keys of each node"
+    )
+    parser.add_argument(
+        "--tests",
+        type=int,
+        default=100,
+        help="Number of tests with the params of the variant",
+    )
+    parser.add_argument(
+        "--loops",
+        type=int,
+        default=[1, 100],
+        nargs="+",
+        help="Numbers of times each test gets the parameters",
+    )
+    args = parser.parse_args()
+
+    leaves = create_leaves(args.domains, args.keys)
+    queries = create_queries(args.domains, args.keys)
+    for loops in args.loops:
+        gets = args.tests * loops * len(queries)
+        created, got, values = measure(
+            parameters.AvocadoParams, leaves, queries, args.tests, loops
+        )
+        old_created, old_got, old_values = measure(
+            ScanningAvocadoParams, leaves, queries, args.tests, loops
+        )
+        assert values == old_values
+        print(
+            f"{gets:>9} gets ({loops} per test): created in {created:.4f}s, "
+            f"got in {got:.4f}s ({gets / got:.0f}/s); "
+            f"scanning created in {old_created:.4f}s, got in {old_got:.4f}s "
+            f"({gets / old_got:.0f}/s, {old_got / got:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
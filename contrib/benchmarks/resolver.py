@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks the resolution of test references with a number of processes.
+
+It creates a synthetic tree of avocado-instrumented and Python unittest
+files, and measures the time to resolve the tree (given as a single
+directory reference) serially, and on pools with the given numbers of
+processes, checking that all of them produce the same resolutions.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from avocado.core import resolver
+from avocado.core.settings import settings
+
+INSTRUMENTED = """from avocado import Test
+
+
+class Instrumented{index}(Test):
+    def test_one(self):
+        pass
+
+    def test_two(self):
+        pass
+"""
+
+UNITTEST = """import unittest
+
+
+class Unit{index}(unittest.TestCase):
+    def test_one(self):
+        pass
+
+    def test_two(self):
+        pass
+"""
+
+
+def create_tree(base_dir, files, per_directory):
+    for index in range(files):
+        directory = os.path.join(base_dir, f"dir_{index // per_directory:04}")
+        os.makedirs(directory, exist_ok=True)
+        if index % 2:
+            name, content = f"unit_{index:06}.py", UNITTEST
+        else:
+            name, content = f"instrumented_{index:06}.py", INSTRUMENTED
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as test:
+            test.write(content.format(index=index))
+
+
+def summarize(resolutions):
+    return [
+        (
+            resolution.reference,
+            resolution.result.name,
+            resolution.origin,
+            [runnable.uri for runnable in resolution.resolutions],
+        )
+        for resolution in resolutions
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000, help="Number of test files")
+    parser.add_argument(
+        "--per-directory",
+        type=int,
+        default=100,
+        help="Number of test files on each directory",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=[2, 4, os.cpu_count() or 1],
+        help="Numbers of processes to compare to the serial resolution",
+    )
+    args = parser.parse_args()
+
+    config = dict(settings.as_dict())
+    with tempfile.TemporaryDirectory(prefix="avocado-resolver-benchmark-") as tree:
+        create_tree(tree, args.files, args.per_directory)
+        expected = None
+        for processes in [1] + sorted(set(args.processes) - {1}):
+            config["resolver.processes"] = processes
+            start = time.monotonic()
+            resolutions = resolver.resolve([tree], config=config)
+            elapsed = time.monotonic() - start
+            summary = summarize(resolutions)
+            if expected is None:
+                expected = summary
+            assert summary == expected, "resolutions differ from the serial ones"
+            print(
+                f"{processes:>3} processes: {len(resolutions)} resolutions in "
+                f"{elapsed:.3f}s ({args.files / elapsed:.0f} files/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
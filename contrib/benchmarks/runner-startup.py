@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks the startup of the runners, when running a task ("task-run").
+
+Each runner is run a number of times on a new Python interpreter, with
+the same command line arguments (including the configuration) given by
+the spawners, on a task that takes as little time as possible.  The
+shortest wall time is reported, along with the shortest wall time of an
+interpreter that does nothing (as a reference for the speed of the
+machine), and the number of Avocado modules imported.
+
+With "--record", the results are written to the baseline used by the
+"selftests/functional/serial/runner_startup.py" tests.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.settings import settings
+
+BASEDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+BASELINE = os.path.join(BASEDIR, "selftests", ".data", "runner_startup.json")
+
+#: Runs a runner module, writing the Avocado modules imported to the standard error
+BOOTSTRAP = """
+import atexit, json, runpy, sys
+
+def dump():
+    modules = [name for name in sys.modules if name.split(".")[0] == "avocado"]
+    sys.stderr.write(json.dumps(sorted(modules)))
+
+atexit.register(dump)
+sys.argv = sys.argv[1:]
+runpy.run_module(sys.argv[0], run_name="__main__", alter_sys=True)
+"""
+
+#: The runners, and the (quick) tests they're benchmarked with
+RUNNERS = {
+    "exec-test": "/bin/true",
+    "noop": "noop",
+    "avocado-instrumented": os.path.join(
+        BASEDIR, "examples", "tests", "passtest.py:PassTest.test"
+    ),
+}
+
+
+def get_task_args(kind, uri):
+    config = Runnable.filter_runnable_config(kind, settings.as_dict())
+    runnable = Runnable(kind, uri, config=config)
+    task = Task(runnable, identifier=f"1-{kind}", status_uris=[])
+    return (
+        [runnable.pick_runner_module_from_entry_point_kind(kind)]
+        + ["task-run"]
+        + task.get_command_args()
+    )
+
+
+def get_shortest_time(args, runs):
+    env = os.environ.copy()
+    env["PYTHONPATH"] = BASEDIR
+    times = []
+    for _ in range(runs):
+        start = time.monotonic()
+        subprocess.run(
+            [sys.executable] + args,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        times.append(time.monotonic() - start)
+    return min(times) * 1000
+
+
+def get_modules(args):
+    env = os.environ.copy()
+    env["PYTHONPATH"] = BASEDIR
+    result = subprocess.run(
+        [sys.executable, "-c", BOOTSTRAP] + args,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stderr.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--runners",
+        nargs="+",
+        choices=list(RUNNERS),
+        default=list(RUNNERS),
+        help="Runners to benchmark",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=10, help="Number of runs of each runner"
+    )
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help=f"Record the results as the baseline at {BASELINE}",
+    )
+    args = parser.parse_args()
+
+    interpreter = get_shortest_time(["-c", "pass"], args.runs)
+    print(f"{'interpreter':>20}: {interpreter:7.1f}ms")
+    baseline = {"interpreter": round(interpreter, 1), "runners": {}}
+    for kind in args.runners:
+        task_args = get_task_args(kind, RUNNERS[kind])
+        elapsed = get_shortest_time(["-m"] + task_args, args.runs)
+        modules = get_modules(task_args)
+        print(
+            f"{kind:>20}: {elapsed:7.1f}ms "
+            f"({elapsed / interpreter:.1f}x the interpreter), "
+            f"{len(modules)} Avocado modules"
+        )
+        baseline["runners"][kind] = {"startup": round(elapsed, 1), "modules": modules}
+
+    if args.record:
+        with open(BASELINE, "w", encoding="utf-8") as baseline_file:
+            json.dump(baseline, baseline_file, indent=2)
+            baseline_file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
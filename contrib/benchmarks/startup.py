@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks the startup of Avocado commands, with and without lazy plugins.
+
+Each command is run a number of times (after a warm up run, which builds
+the index of entry points) on a new Python interpreter with
+"-X importtime", with "plugins.lazy" disabled and enabled on a user
+configuration file of a temporary home directory.  The wall time, the
+number of modules imported (along with the number of plugin modules) and
+the imports that took longer are reported.
+
+Avocado commands take over the standard error when they start, so the
+modules imported are taken from "sys.modules" on exit, and the import
+times reported only cover what was imported up to that point.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+#: Runs a command, given as arguments, writing the modules imported to a file
+BOOTSTRAP = """
+import atexit, json, runpy, sys
+modules_path, module, *args = sys.argv[1:]
+
+def dump():
+    with open(modules_path, "w", encoding="utf-8") as modules:
+        json.dump(sorted(sys.modules), modules)
+
+atexit.register(dump)
+sys.argv = [module] + args
+if module == "-c":
+    exec(args[0])
+else:
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
+"""
+
+COMMANDS = {
+    "import": ["-c", "import avocado"],
+    "version": ["avocado", "--version"],
+    "help": ["avocado", "--help"],
+    "list": ["avocado", "list", "/bin/true"],
+    "runner": ["avocado.plugins.runners.exec_test", "capabilities"],
+}
+
+
+def parse_importtime(stderr):
+    """Returns the self import time, in microseconds, by module."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        times[fields[2].strip()] = int(fields[0])
+    return times
+
+
+def run(command, home, modules_path):
+    env = os.environ.copy()
+    env["HOME"] = home
+    env.pop("XDG_CACHE_HOME", None)
+    start = time.monotonic()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOTSTRAP, modules_path] + command,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    elapsed = time.monotonic() - start
+    with open(modules_path, encoding="utf-8") as modules:
+        return elapsed, json.load(modules), parse_importtime(result.stderr)
+
+
+def create_home(base_dir, lazy):
+    home = os.path.join(base_dir, "lazy" if lazy else "eager")
+    config_dir = os.path.join(home, ".config", "avocado")
+    os.makedirs(config_dir)
+    with open(
+        os.path.join(config_dir, "avocado.conf"), "w", encoding="utf-8"
+    ) as config:
+        config.write(f"[plugins]\nlazy = {lazy}\n")
+    return home
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--commands",
+        nargs="+",
+        choices=list(COMMANDS),
+        default=list(COMMANDS),
+        help="Commands to benchmark",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Number of runs of each command"
+    )
+    parser.add_argument(
+        "--top", type=int, default=5, help="Number of slowest imports reported"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="avocado-startup-benchmark-") as tmp:
+        modules_path = os.path.join(tmp, "modules.json")
+        for name in args.commands:
+            for lazy in (False, True):
+                home = os.path.join(tmp, "lazy" if lazy else "eager")
+                if not os.path.isdir(home):
+                    create_home(tmp, lazy)
+                run(COMMANDS[name], home, modules_path)
+                times = []
+                for _ in range(args.runs):
+                    elapsed, modules, importtime = run(
+                        COMMANDS[name], home, modules_path
+                    )
+                    times.append(elapsed)
+                plugins = [mod for mod in modules if mod.startswith("avocado.plugins.")]
+                print(
+                    f"{name:>8} (lazy={str(lazy):<5}): "
+                    f"{statistics.median(times) * 1000:7.1f}ms, "
+                    f"{len(modules)} modules ({len(plugins)} plugin modules)"
+                )
+                slowest = sorted(importtime.items(), key=lambda item: -item[1])
+                for module, self_time in slowest[: args.top]:
+                    print(f"{'':>20}{self_time / 1000:7.1f}ms {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks how the status repository scales with the number of tasks.
+
+For each number of (synthetic) tasks, it measures the time to process
+their "started" and "finished" messages, checking the result stats after
+each finished task (as the workers do when failfast is enabled), and the
+time to get the set of results for all tasks (as the runner does at the
+end of a suite).
+
+It compares the current implementation, with its indexes and counters,
+to one that scans the lists of task IDs by result, as it used to.  The
+latter grows quadratically, so it's only run up to a given number of
+tasks.
+"""
+
+import argparse
+import time
+
+from avocado.core.status.repo import StatusRepo
+from avocado.core.utils import messages
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+RESULTS = ("pass", "fail", "skip", "error")
+
+
+class ScanningStatusRepo(StatusRepo):
+    """Status repository that scans lists of task IDs by result."""
+
+    def _set_by_result(self, message):
+        result = message.get("result")
+        if result not in self._by_result:
+            self._by_result[result] = []
+        if message["id"] not in self._by_result[result]:
+            self._by_result[result].append(message["id"])
+
+    @property
+    def result_stats(self):
+        return {key: len(value) for key, value in self._by_result.items()}
+
+    def get_result_set_for_tasks(self, task_ids):
+        return set(
+            key
+            for key, value in self._by_result.items()
+            if any([True for task_id in task_ids if task_id in value])
+        )
+
+
+def run(klass, number_of_tasks):
+    status_repo = klass(JOB_ID)
+    task_ids = [f"{index}-test" for index in range(1, number_of_tasks + 1)]
+    start = time.monotonic()
+    for index, task_id in enumerate(task_ids):
+        status_repo.process_message(
+            messages.StartedMessage.get(output_dir="/fake", id=task_id, job_id=JOB_ID)
+        )
+        status_repo.process_message(
+            messages.FinishedMessage.get(
+                RESULTS[index % len(RESULTS)], id=task_id, job_id=JOB_ID
+            )
+        )
+        set(key.upper() for key in status_repo.result_stats)
+    processing = time.monotonic() - start
+    start = time.monotonic()
+    results = status_repo.get_result_set_for_tasks(task_ids)
+    result_set = time.monotonic() - start
+    assert results == set(RESULTS)
+    return processing, result_set
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--tasks",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="Numbers of tasks",
+    )
+    parser.add_argument(
+        "--scanning-max-tasks",
+        type=int,
+        default=10000,
+        help="Maximum number of tasks for the scanning implementation",
+    )
+    args = parser.parse_args()
+
+    for number_of_tasks in args.tasks:
+        for name, klass in (("indexed", StatusRepo), ("scanning", ScanningStatusRepo)):
+            if (
+                klass is ScanningStatusRepo
+                and number_of_tasks > args.scanning_max_tasks
+            ):
+                continue
+            processing, result_set = run(klass, number_of_tasks)
+            print(
+                f"{name:>8}: {number_of_tasks:>6} tasks: messages processed in "
+                f"{processing:.3f}s ({number_of_tasks / processing:.0f} tasks/s), "
+                f"result set in {result_set:.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
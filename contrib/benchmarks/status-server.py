@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks the throughput, in messages per second, of the status pipeline,
+that is, tasks posting messages with :class:`TaskStatusService` and the
+:class:`StatusServer` processing them into a :class:`StatusRepo`.
+
+It compares the JSON lines protocol with the framed protocol, in which
+messages are batched and, if possible, coalesced.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+
+from avocado.core.nrunner.task import TaskStatusService
+from avocado.core.status.repo import StatusRepo
+from avocado.core.status.server import StatusServer
+from avocado.core.utils import messages
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+
+class JSONLinesTaskStatusService(TaskStatusService):
+    """Status service that never negotiates the framed protocol."""
+
+    def _negotiate(self):
+        return False
+
+
+def post_messages(uri, framed, task_id, number_of_messages, payload):
+    klass = TaskStatusService if framed else JSONLinesTaskStatusService
+    service = klass(uri)
+    service.post(
+        messages.StartedMessage.get(output_dir="/fake", id=task_id, job_id=JOB_ID)
+    )
+    for _ in range(number_of_messages):
+        service.post(messages.StdoutMessage.get(payload, id=task_id, job_id=JOB_ID))
+    service.post(messages.FinishedMessage.get("pass", id=task_id, job_id=JOB_ID))
+    service.close()
+
+
+async def wait_finished(status_repo, task_ids):
+    for task_id in task_ids:
+        await status_repo.wait_task_finished(task_id)
+
+
+def run(framed, number_of_tasks, number_of_messages, payload):
+    with tempfile.TemporaryDirectory(prefix="avocado_benchmark_") as tmp_dir:
+        uri = os.path.join(tmp_dir, ".status_server.sock")
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        status_repo = StatusRepo(JOB_ID)
+        status_server = StatusServer(uri, status_repo)
+        loop.run_until_complete(status_server.create_server())
+        task_ids = [str(index) for index in range(number_of_tasks)]
+        start = time.monotonic()
+        clients = [
+            multiprocessing.Process(
+                target=post_messages,
+                args=(uri, framed, task_id, number_of_messages, payload),
+            )
+            for task_id in task_ids
+        ]
+        for client in clients:
+            client.start()
+        loop.run_until_complete(wait_finished(status_repo, task_ids))
+        elapsed = time.monotonic() - start
+        for client in clients:
+            client.join()
+        # let the connection handlers notice the clients are gone
+        loop.run_until_complete(asyncio.sleep(0.1))
+        status_server.close()
+        loop.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=4)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument(
+        "--payload-size", type=int, default=80, help="Size of each message log"
+    )
+    args = parser.parse_args()
+    payload = b"x" * (args.payload_size - 1) + b"\n"
+    total = args.tasks * args.messages
+
+    for framed in (False, True):
+        elapsed = run(framed, args.tasks, args.messages, payload)
+        name = "framed" if framed else "JSON lines"
+        print(
+            f"{name:>10}: {total} messages in {elapsed:.2f}s "
+            f"({total / elapsed:.1f} messages/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks the creation of test suites with a large number of tests.
+
+It creates a synthetic tree of avocado-instrumented test files, each
+one with a number of test methods, and measures the time to create a
+test suite out of it with TestSuite.from_config(), optionally tracing
+the memory allocated while doing so.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from avocado.core.settings import settings
+from avocado.core.suite import TestSuite
+
+HEADER = """from avocado import Test
+
+
+class Synthetic{index}(Test):
+"""
+
+METHOD = """
+    def test_{index}(self):
+        pass
+"""
+
+
+def create_tree(base_dir, files, methods):
+    body = "".join(METHOD.format(index=index) for index in range(methods))
+    for index in range(files):
+        path = os.path.join(base_dir, f"synthetic_{index:06}.py")
+        with open(path, "w", encoding="utf-8") as test:
+            test.write(HEADER.format(index=index) + body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100, help="Number of test files")
+    parser.add_argument(
+        "--methods",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="Numbers of test methods on each file",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        default=False,
+        help="Trace the memory allocated (which makes it slower)",
+    )
+    args = parser.parse_args()
+
+    for methods in args.methods:
+        with tempfile.TemporaryDirectory(prefix="avocado-suite-benchmark-") as tree:
+            create_tree(tree, args.files, methods)
+            config = dict(settings.as_dict())
+            config["resolver.references"] = [tree]
+            if args.trace_memory:
+                tracemalloc.start()
+            start = time.monotonic()
+            suite = TestSuite.from_config(config)
+            elapsed = time.monotonic() - start
+            memory = ""
+            if args.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                memory = f", {peak / 2 ** 20:.1f} MiB peak"
+            print(
+                f"{args.files * methods:>7} tests: suite created in "
+                f"{elapsed:.3f}s ({len(suite.tests) / elapsed:.0f} tests/s){memory}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks the filtering of runnables by tags ("-t/--filter-by-tags").
+
+For each number of (synthetic) runnables, with random flat and key:val
+tags, it measures the time to filter them with a number of random tag
+filters, using the current implementation, which evaluates the filters
+on an inverted index of the tags, and one that evaluates every filter
+against the tags of every runnable, as it used to.  Both are checked to
+give the same runnables.
+"""
+
+import argparse
+import random
+import time
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.resolver import ReferenceResolution, ReferenceResolutionResult
+from avocado.core.tags import (
+    _must_split_flat_key_val,
+    _parse_filter_by_tags,
+    filter_tags_on_runnables,
+)
+
+FLAT_TAGS = [f"tag{index}" for index in range(20)]
+
+KEYS = [f"key{index}" for index in range(5)]
+
+VALS = [f"val{index}" for index in range(5)]
+
+
+def _must_key_val_matches(must_key_vals, test_tags, include_empty_key):
+    key_val_test_tags = {}
+    for k, v in test_tags.items():
+        if v is None:
+            continue
+        key_val_test_tags[k] = v
+
+    for k, v in must_key_vals.items():
+        if k not in test_tags:
+            if include_empty_key:
+                continue
+            else:
+                return False
+        if v.startswith("-"):
+            abs_v = v[1:]
+            if abs_v in key_val_test_tags.get(k, set()):
+                return False
+        elif v not in key_val_test_tags.get(k, set()):
+            return False
+    return True
+
+
+def scanning_filter_tags_on_runnables(
+    resolutions, filter_by_tags, include_empty=False, include_empty_key=False
+):
+    """Evaluates every filter against the tags of every runnable."""
+    filtered = []
+    must_must_nots = _parse_filter_by_tags(filter_by_tags)
+
+    for resolution in resolutions:
+        if resolution.result != ReferenceResolutionResult.SUCCESS:
+            continue
+
+        for runnable in resolution.resolutions:
+            test_tags = runnable.tags or {}
+            if not test_tags:
+                if include_empty:
+                    filtered.append(runnable)
+                continue
+
+            for must, must_not in must_must_nots:
+                if must_not.intersection(test_tags):
+                    continue
+
+                must_flat, must_key_val = _must_split_flat_key_val(must)
+                if must_key_val:
+                    if not _must_key_val_matches(
+                        must_key_val, test_tags, include_empty_key
+                    ):
+                        continue
+
+                if must_flat:
+                    if not must_flat.issubset(test_tags):
+                        continue
+
+                filtered.append(runnable)
+                break
+
+    return filtered
+
+
+def create_resolutions(tests, rand):
+    runnables = []
+    for index in range(tests):
+        tags = {tag: None for tag in rand.sample(FLAT_TAGS, rand.randint(0, 4))}
+        for key in rand.sample(KEYS, rand.randint(0, 2)):
+            tags[key] = set(rand.sample(VALS, rand.randint(1, 2)))
+        runnables.append(Runnable("noop", f"test{index}", tags=tags))
+    return [
+        ReferenceResolution("synthetic", ReferenceResolutionResult.SUCCESS, runnables)
+    ]
+
+
+def create_filters(filters, rand):
+    atoms = (
+        FLAT_TAGS
+        + [f"-{tag}" for tag in FLAT_TAGS]
+        + [f"{key}:{val}" for key in KEYS for val in VALS]
+        + [f"{key}:-{val}" for key in KEYS for val in VALS]
+    )
+    return [",".join(rand.sample(atoms, rand.randint(1, 3))) for _ in range(filters)]
+
+
+def measure(function, resolutions, filter_by_tags, include_empty_key):
+    start = time.monotonic()
+    filtered = function(resolutions, filter_by_tags, True, include_empty_key)
+    return time.monotonic() - start, filtered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--tests",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="Numbers of runnables",
+    )
+    parser.add_argument("--filters", type=int, default=20, help="Number of tag filters")
+    parser.add_argument(
+        "--include-empty-key",
+        action="store_true",
+        help="Include runnables without the keys of key:val filters",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    rand = random.Random(args.seed)
+    filter_by_tags = create_filters(args.filters, rand)
+    for tests in args.tests:
+        resolutions = create_resolutions(tests, rand)
+        indexed, filtered = measure(
+            filter_tags_on_runnables,
+            resolutions,
+            filter_by_tags,
+            args.include_empty_key,
+        )
+        scanning, expected = measure(
+            scanning_filter_tags_on_runnables,
+            resolutions,
+            filter_by_tags,
+            args.include_empty_key,
+        )
+        assert filtered == expected
+        print(
+            f"{tests:>7} tests ({len(filtered)} filtered): "
+            f"indexed {indexed:.3f}s, scanning {scanning:.3f}s "
+            f"({scanning / indexed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks the throughput, in tasks per second, of the nrunner task
+state machine, comparing the polling and the event driven workers.
+
+Tasks are "spawned" by a mock spawner that sends the started and finished
+status messages directly to the status repository, so that the numbers
+reflect the scheduling overhead alone.  Just like with real runners, the
+finished message may arrive a little after the task process is gone.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.spawners.mock import MockSpawner
+from avocado.core.status.repo import StatusRepo
+from avocado.core.task.runtime import RuntimeTask
+from avocado.core.task.statemachine import TaskStateMachine, Worker
+from avocado.core.utils import messages
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+
+class TrivialTaskSpawner(MockSpawner):
+    """Spawner whose tasks report themselves finished after a while."""
+
+    def __init__(self, status_repo, duration, message_lag):
+        super().__init__()
+        self._status_repo = status_repo
+        self._duration = duration
+        self._message_lag = message_lag
+
+    async def spawn_task(self, runtime_task):
+        await super().spawn_task(runtime_task)
+        task_id = str(runtime_task.task.identifier)
+        self._status_repo.process_message(
+            messages.StartedMessage.get(output_dir="/fake", id=task_id, job_id=JOB_ID)
+        )
+        loop = asyncio.get_event_loop()
+        loop.call_later(self._duration, self._finish, runtime_task)
+        return True
+
+    def _finish(self, runtime_task):
+        self._known_tasks[runtime_task] = False
+        loop = asyncio.get_event_loop()
+        loop.call_later(self._message_lag, self._send_finished, runtime_task)
+
+    def _send_finished(self, runtime_task):
+        self._status_repo.process_message(
+            messages.FinishedMessage.get(
+                "pass", id=str(runtime_task.task.identifier), job_id=JOB_ID
+            )
+        )
+
+    def is_task_alive(self, runtime_task):
+        return self._known_tasks.get(runtime_task, False)
+
+    async def wait_task(self, runtime_task):
+        while self.is_task_alive(runtime_task):
+            await asyncio.sleep(self._duration)
+
+
+def run(number_of_tasks, number_of_workers, duration, message_lag, event_driven):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    status_repo = StatusRepo(JOB_ID)
+    spawner = TrivialTaskSpawner(status_repo, duration, message_lag)
+    runnable = Runnable("noop", "noop")
+    runtime_tasks = [
+        RuntimeTask(Task(runnable, str(index))) for index in range(number_of_tasks)
+    ]
+    state_machine = TaskStateMachine(runtime_tasks, status_repo)
+    workers = [
+        Worker(
+            state_machine,
+            spawner,
+            max_running=number_of_workers,
+            event_driven=event_driven,
+        ).run()
+        for _ in range(number_of_workers)
+    ]
+    start = time.monotonic()
+    loop.run_until_complete(asyncio.gather(*workers))
+    elapsed = time.monotonic() - start
+    loop.close()
+    assert len(state_machine.finished) == number_of_tasks
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=0.005,
+        help="Time, in seconds, that each trivial task takes",
+    )
+    parser.add_argument(
+        "--message-lag",
+        type=float,
+        default=0.001,
+        help="Time, in seconds, between a task ending and its finished message",
+    )
+    args = parser.parse_args()
+
+    for event_driven in (False, True):
+        elapsed = run(
+            args.tasks, args.workers, args.duration, args.message_lag, event_driven
+        )
+        mode = "event driven" if event_driven else "polling"
+        print(
+            f"{mode:>12}: {args.tasks} tasks in {elapsed:.2f}s "
+            f"({args.tasks / elapsed:.1f} tasks/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks the memory used by the environments of deep multiplex trees
+("yaml_to_mux" plugin).
+
+It creates a synthetic YAML file with a tree of a given depth, where
+every node has a number of children and sets a number of keys (some of
+them also set by its parent), and computes the environment of all of
+its nodes, as done when producing the variants.
+
+The memory allocated for the environments (as traced by tracemalloc),
+and the time to compute them and to get all of their values, are
+reported for the current implementation, where each environment only
+keeps the values set by its node, on top of the (shared) ones of its
+parent, and for one that copies the environment of the parent into
+every node, as it used to.  Both are checked to give the same values,
+and origins, in the same order.
+"""
+
+import argparse
+import copy
+import os
+import tempfile
+import time
+import tracemalloc
+
+from avocado_varianter_yaml_to_mux.varianter_yaml_to_mux import create_from_yaml
+
+from avocado.core import tree
+
+
+class CopyingTreeEnvironment(dict):
+    """Environment with copies of all the values of the parent one."""
+
+    def __init__(self):
+        super().__init__()
+        self.origin = {}
+        self.filter_only = tree.FilterSet()
+        self.filter_out = tree.FilterSet()
+
+    def copy(self):
+        cpy = CopyingTreeEnvironment()
+        cpy.update(self)
+        cpy.origin = copy.copy(self.origin)
+        cpy.filter_only = copy.copy(self.filter_only)
+        cpy.filter_out = copy.copy(self.filter_out)
+        return cpy
+
+
+def get_copying_environment(node, environments):
+    environment = environments.get(id(node))
+    if environment is not None:
+        return environment
+    if node.parent:
+        environment = get_copying_environment(node.parent, environments).copy()
+    else:
+        environment = CopyingTreeEnvironment()
+    for key, value in node.value.items():
+        if isinstance(value, list):
+            if key in environment and isinstance(environment[key], list):
+                environment[key] = environment[key] + value
+            else:
+                environment[key] = value
+        else:
+            environment[key] = value
+        environment.origin[key] = node
+    environment.filter_only.update(node.filters[0])
+    environment.filter_out.update(node.filters[1])
+    environments[id(node)] = environment
+    return environment
+
+
+def create_yaml(path, depth, children, keys):
+    lines = []
+
+    def add_node(level, indent):
+        for key in range(keys):
+            # half of the keys override the ones of the parent
+            name = f"key{key}" if key % 2 else f"key{level}_{key}"
+            lines.append(f"{indent}{name}: {level}-{key}")
+        if level == depth:
+            return
+        for child in range(children):
+            lines.append(f"{indent}n{level}_{child}:")
+            add_node(level + 1, indent + "    ")
+
+    add_node(0, "")
+    with open(path, "w", encoding="utf-8") as yaml_file:
+        yaml_file.write("\n".join(lines) + "\n")
+
+
+def measure(get_environment, nodes):
+    tracemalloc.start()
+    start = time.monotonic()
+    environments = [get_environment(node) for node in nodes]
+    computed = time.monotonic() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.monotonic()
+    values = [
+        [(key, value, id(env.origin[key])) for key, value in env.items()]
+        for env in environments
+    ]
+    got = time.monotonic() - start
+    return size, computed, got, values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--depth", type=int, nargs="+", default=[4, 8, 12], help="Depths of the tree"
+    )
+    parser.add_argument(
+        "--children", type=int, default=2, help="Number of children of each node"
+    )
+    parser.add_argument(
+        "--keys", type=int, default=20, help="Number of keys set on each node"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="avocado-env-benchmark-") as tmp:
+        for depth in args.depth:
+            path = os.path.join(tmp, f"tree-{depth}.yaml")
+            create_yaml(path, depth, args.children, args.keys)
+            nodes = list(create_from_yaml([path]).iter_children_preorder())
+
+            size, computed, got, values = measure(lambda node: node.environment, nodes)
+            environments = {}
+            old_size, old_computed, old_got, old_values = measure(
+                lambda node: get_copying_environment(  # pylint: disable=W0640
+                    node, environments
+                ),
+                nodes,
+            )
+            assert values == old_values
+            print(
+                f"depth {depth:>2}, {len(nodes):>6} nodes: "
+                f"{size / 2**20:.1f}MiB, computed in {computed:.3f}s, "
+                f"got in {got:.3f}s; copying {old_size / 2**20:.1f}MiB "
+                f"({old_size / size:.1f}x), computed in {old_computed:.3f}s, "
+                f"got in {old_got:.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
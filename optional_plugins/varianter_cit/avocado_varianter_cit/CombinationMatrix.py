@@ -1,8 +1,20 @@
 import itertools
+import operator
 
 from avocado_varianter_cit.CombinationRow import CombinationRow as Row
 
 
+def _get_combination_getter(parameters):
+    """
+    :param parameters: parameters of a combination
+    :return: function getting the combination from a solution row
+    """
+    if len(parameters) == 1:
+        parameter = parameters[0]
+        return lambda row: (row[parameter],)
+    return operator.itemgetter(*parameters)
+
+
 class CombinationMatrix:
     """
     CombinationMatrix object stores Rows of combinations into dictionary.
@@ -10,6 +22,10 @@ class CombinationMatrix:
     of combinations and values are CombinationRow objects. CombinationMatrix object
     has information about how many combinations are uncovered and how many of them
     are covered more than ones.
+
+    The rows with combinations of (any of) the given parameters, and the
+    rows with disabled combinations, are kept apart, so that only the
+    rows affected by a change of a solution row are looked at.
     """
 
     def __init__(self, input_data, t_value):
@@ -21,12 +37,43 @@ class CombinationMatrix:
         self.uncovered_rows = {}
         self.total_uncovered = 0
         self.total_covered_more_than_ones = 0
+        # (row, getter of the combination from a solution) of each key
+        self._rows = {}
+        # rows of each set of parameters (and the ones with disabled
+        # combinations)
+        self._rows_by_parameters = {}
+        self._constrained_rows_by_parameters = {}
         # Creation of rows
         for c in itertools.combinations(range(len(input_data)), t_value):
             row = Row(input_data, t_value, c)
             self.total_uncovered += row.uncovered
             self.hash_table[c] = row
             self.uncovered_rows[c] = c
+            self._rows[c] = (row, _get_combination_getter(c))
+
+    def _get_rows(self, parameters, constrained=False):
+        """
+        :param parameters: parameters of the rows
+        :param constrained: only the rows with disabled combinations
+        :return: key, row and getter of the combination from a solution of
+                 the rows with combinations of any of the parameters
+        """
+        parameters = tuple(parameters)
+        if constrained:
+            cache = self._constrained_rows_by_parameters
+        else:
+            cache = self._rows_by_parameters
+        try:
+            return cache[parameters]
+        except KeyError:
+            rows = [
+                (key, row, getter)
+                for key, (row, getter) in self._rows.items()
+                if any(parameter in key for parameter in parameters)
+                and (not constrained or None in row.hash_table.values())
+            ]
+            cache[parameters] = rows
+            return rows
 
     def cover_solution_row(self, row):
         """
@@ -35,14 +82,10 @@ class CombinationMatrix:
         :param row: one row from solution
         :return: number of still uncovered combinations
         """
-        for key, value in self.hash_table.items():
-            val = []
+        for key, (value, getter) in self._rows.items():
             # Getting combination from solution
-            for i in key:
-                val.append(row[i])
-
             uncovered_difference, covered_more_than_ones_difference = value.cover_cell(
-                val
+                getter(row)
             )
             # Deleting covered row from uncovered rows
             if value.uncovered == 0:
@@ -60,26 +103,16 @@ class CombinationMatrix:
         :param parameters: parameters which has to be covered
         :return: number of still uncovered combinations
         """
-        for key, value in self.hash_table.items():
-            for parameter in parameters:
-                if parameter in key:
-                    val = []
-                    # Getting combination from solution
-                    for i in key:
-                        val.append(row[i])
-
-                    (
-                        uncovered_difference,
-                        covered_more_than_ones_difference,
-                    ) = value.cover_cell(val)
-                    # Deleting covered row from uncovered rows
-                    if value.uncovered == 0:
-                        self.uncovered_rows.pop(key, None)
-                    self.total_uncovered += uncovered_difference
-                    self.total_covered_more_than_ones += (
-                        covered_more_than_ones_difference
-                    )
-                    break
+        for key, value, getter in self._get_rows(parameters):
+            (
+                uncovered_difference,
+                covered_more_than_ones_difference,
+            ) = value.cover_cell(getter(row))
+            # Deleting covered row from uncovered rows
+            if value.uncovered == 0:
+                self.uncovered_rows.pop(key, None)
+            self.total_uncovered += uncovered_difference
+            self.total_covered_more_than_ones += covered_more_than_ones_difference
         return self.total_uncovered
 
     def uncover_solution_row(self, row):
@@ -89,16 +122,12 @@ class CombinationMatrix:
         :param row: one row from solution
         :return: number of uncovered combinations
         """
-        for key, value in self.hash_table.items():
-            val = []
+        for key, (value, getter) in self._rows.items():
             # Getting combination from solution
-            for i in key:
-                val.append(row[i])
-
             (
                 uncovered_difference,
                 covered_more_than_ones_difference,
-            ) = value.uncover_cell(val)
+            ) = value.uncover_cell(getter(row))
             # Adding uncovered row to uncovered rows
             if value.uncovered != 0:
                 self.uncovered_rows[key] = key
@@ -115,28 +144,41 @@ class CombinationMatrix:
         :param parameters: parameters which has to be covered
         :return: number of uncovered combinations
         """
-        for key, value in self.hash_table.items():
-            for parameter in parameters:
-                if parameter in key:
-                    val = []
-                    # Getting combination from solution
-                    for i in key:
-                        val.append(row[i])
-
-                    (
-                        uncovered_difference,
-                        covered_more_than_ones_difference,
-                    ) = value.uncover_cell(val)
-                    # Adding uncovered row to uncovered rows
-                    if value.uncovered != 0:
-                        self.uncovered_rows[key] = key
-                    self.total_uncovered += uncovered_difference
-                    self.total_covered_more_than_ones += (
-                        covered_more_than_ones_difference
-                    )
-                    break
+        for key, value, getter in self._get_rows(parameters):
+            (
+                uncovered_difference,
+                covered_more_than_ones_difference,
+            ) = value.uncover_cell(getter(row))
+            # Adding uncovered row to uncovered rows
+            if value.uncovered != 0:
+                self.uncovered_rows[key] = key
+            self.total_uncovered += uncovered_difference
+            self.total_covered_more_than_ones += covered_more_than_ones_difference
         return self.total_uncovered
 
+    def get_uncovered_difference(self, row, new_row, parameters):
+        """
+        Number of combinations which would become uncovered (or covered,
+        when negative) by replacing a row from solution with a new one,
+        without changing the coverage
+
+        :param row: one row from solution
+        :param new_row: row which would replace it
+        :param parameters: parameters whose values differ between the rows
+        :return: difference of the number of uncovered combinations
+        """
+        difference = 0
+        for _, value, getter in self._get_rows(parameters):
+            combination = getter(row)
+            new_combination = getter(new_row)
+            if combination == new_combination:
+                continue
+            if value.hash_table[combination] == 1:
+                difference += 1
+            if value.hash_table[new_combination] == 0:
+                difference -= 1
+        return difference
+
     def uncover(self):
         """
         Uncover all combinations
@@ -153,12 +195,8 @@ class CombinationMatrix:
 
         :param row: one row from solution
         """
-        for key, value in self.hash_table.items():
-            val = []
-            for i in key:
-                val.append(row[i])
-
-            if not value.is_valid(val):
+        for _, value, getter in self._get_rows(range(len(row)), True):
+            if not value.is_valid(getter(row)):
                 return False
 
         return True
@@ -170,16 +208,9 @@ class CombinationMatrix:
         :param row: one row from solution
         :param parameters: parameters from row
         """
-        for key, value in self.hash_table.items():
-            for parameter in parameters:
-                if parameter in key:
-                    val = []
-                    for i in key:
-                        val.append(row[i])
-
-                    if not value.is_valid(val):
-                        return False
-                    break
+        for _, value, getter in self._get_rows(parameters, True):
+            if not value.is_valid(getter(row)):
+                return False
         return True
 
     def del_cell(self, parameters, combination):
@@ -192,6 +223,7 @@ class CombinationMatrix:
         """
         row = self.hash_table[tuple(parameters)]
         uncovered_difference = row.del_cell(combination)
+        self._constrained_rows_by_parameters.clear()
         if row.uncovered == 0:
             self.uncovered_rows.pop(tuple(parameters), None)
         self.total_uncovered += uncovered_difference
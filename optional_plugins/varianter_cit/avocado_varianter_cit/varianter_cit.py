@@ -66,6 +66,22 @@ class VarianterCitCLI(CLI):
                 long_arg="--cit-order-of-combinations",
             )
 
+            help_msg = (
+                "Seed of the random choices made when computing the "
+                "combinations, so that the same variants are produced "
+                "every time"
+            )
+            settings.register_option(
+                section=f"{name}.cit",
+                key="seed",
+                key_type=int,
+                parser=subparser,
+                help_msg=help_msg,
+                metavar="SEED",
+                default=None,
+                long_arg="--cit-seed",
+            )
+
     def run(self, config):
         if config.get("variants.debug"):
             LOG.setLevel(logging.DEBUG)
@@ -82,6 +98,7 @@ class VarianterCit(Varianter):
     def initialize(self, config):
         subcommand = config.get("subcommand")
         self.variants = None  # pylint: disable=W0201
+        self.parameter_files = []  # pylint: disable=W0201
         order = config.get(f"{subcommand}.cit.combination_order")
         if order and order > 6:
             LOG_UI.error("The order of combinations is bigger then 6")
@@ -93,6 +110,7 @@ class VarianterCit(Varianter):
             return
         else:
             cit_parameter_file = os.path.expanduser(cit_parameter_file)
+            self.parameter_files.append(cit_parameter_file)
             if not os.access(cit_parameter_file, os.R_OK):
                 LOG_UI.error(
                     "parameter file '%s' could not be found or is not readable",
@@ -110,7 +128,7 @@ class VarianterCit(Varianter):
 
         input_data = [len(parameter[1]) for parameter in parameters]
 
-        cit = Cit(input_data, order, constraints)
+        cit = Cit(input_data, order, constraints, config.get(f"{subcommand}.cit.seed"))
         final_list = cit.compute()
         self.headers = [  # pylint: disable=W0201
             parameter[0] for parameter in parameters
@@ -123,6 +141,18 @@ class VarianterCit(Varianter):
         for combination in results:
             self.variants.append(dict(zip(self.headers, combination)))
 
+    def get_cache_key(self, config):
+        # without a seed, the cached combinations (found at random) are
+        # reused, as any other combinations covering the parameters
+        subcommand = config.get("subcommand")
+        return {
+            key: config.get(f"{subcommand}.cit.{key}")
+            for key in ("parameter_file", "combination_order", "seed")
+        }
+
+    def get_cache_files(self):
+        return self.parameter_files
+
     @staticmethod
     def error_exit(config):
         if config.get("subcommand") == "run":
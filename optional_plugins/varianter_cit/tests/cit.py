@@ -23,6 +23,41 @@ class CitInitialization(unittest.TestCase):
         )
 
 
+class CitCompute(unittest.TestCase):
+    def setUp(self):
+        self.parameters = [3, 3, 3, 3]
+        self.constraints = {
+            ((0, 0), (2, 0)),
+            ((0, 1), (1, 1), (2, 0)),
+            ((0, 2), (3, 2)),
+        }
+        self.t_value = 2
+
+    def test_compute(self):
+        final_matrix = Cit(self.parameters, self.t_value, self.constraints).compute()
+        solver = Solver(self.parameters, self.constraints)
+        combination_matrix = CombinationMatrix(self.parameters, self.t_value)
+        solver.clean_hash_table(combination_matrix, self.t_value)
+        for row in final_matrix:
+            self.assertTrue(
+                combination_matrix.is_valid_solution(row), "Row is not valid"
+            )
+            combination_matrix.cover_solution_row(row)
+        self.assertEqual(
+            0,
+            combination_matrix.total_uncovered,
+            "Final matrix don't cover all combinations",
+        )
+
+    def test_compute_seed(self):
+        final_matrix = Cit(self.parameters, self.t_value, self.constraints, 1).compute()
+        self.assertEqual(
+            final_matrix,
+            Cit(self.parameters, self.t_value, self.constraints, 1).compute(),
+            "Same seed gives different final matrix",
+        )
+
+
 class CitTests(unittest.TestCase):
     def setUp(self):
         parameters = [3, 3, 3, 3]
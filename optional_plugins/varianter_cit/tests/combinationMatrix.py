@@ -303,3 +303,26 @@ class CombinationMatrixTest(unittest.TestCase):
                 self.assertTrue(
                     combination_row_equals(value, self.excepted_hash_table[key])
                 )
+
+    def test_get_uncovered_difference(self):
+        self.matrix.cover_solution_row([1, 0, 2, 3])
+        self.matrix.cover_solution_row([1, 1, 2, 0])
+        row = [1, 0, 2, 3]
+        for new_row, parameters in (
+            ([2, 0, 2, 3], (0,)),
+            ([1, 1, 2, 3], (1,)),
+            ([0, 2, 2, 3], (0, 1)),
+            ([1, 0, 1, 0], (2, 3)),
+        ):
+            with self.subTest(new_row=new_row):
+                excepted_uncovered = self.matrix.total_uncovered
+                self.matrix.uncover_combination(row, parameters)
+                self.matrix.cover_combination(new_row, parameters)
+                excepted_uncovered -= self.matrix.total_uncovered
+                self.matrix.uncover_combination(new_row, parameters)
+                self.matrix.cover_combination(row, parameters)
+                self.assertEqual(
+                    -excepted_uncovered,
+                    self.matrix.get_uncovered_difference(row, new_row, parameters),
+                    "Uncovered difference is wrong.",
+                )
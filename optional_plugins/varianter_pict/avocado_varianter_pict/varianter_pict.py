@@ -129,6 +129,7 @@ class VarianterPict(Varianter):
 
     def initialize(self, config):
         self.variants = None  # pylint: disable=W0201
+        self.pict_files = []  # pylint: disable=W0201
         error = False
 
         subcommand = config.get("subcommand", "run")
@@ -173,10 +174,27 @@ class VarianterPict(Varianter):
         path_namespace = f"{subcommand}.pict_parameter_path"
         self.parameter_path = config.get(path_namespace)  # pylint: disable=W0201
 
+        # a different binary may give different combinations
+        self.pict_files = [pict_parameter_file, pict_binary]  # pylint: disable=W0201
         order_namespace = f"{subcommand}.pict_combinations_order"
         output = run_pict(pict_binary, pict_parameter_file, config.get(order_namespace))
         self.headers, self.variants = parse_pict_output(output)  # pylint: disable=W0201
 
+    def get_cache_key(self, config):
+        subcommand = config.get("subcommand", "run")
+        return {
+            key: config.get(f"{subcommand}.{key}")
+            for key in (
+                "pict_parameter_file",
+                "pict_binary",
+                "pict_combinations_order",
+                "pict_parameter_path",
+            )
+        }
+
+    def get_cache_files(self):
+        return self.pict_files
+
     def __iter__(self):
         if self.variants is None:
             return
@@ -23,6 +23,7 @@ a custom Varianter plugin.
 
 import collections
 import itertools
+import math
 import re
 
 from avocado.core import output, tree, varianter
@@ -34,11 +35,96 @@ REMOVE_NODE = 0
 REMOVE_VALUE = 1
 
 
+def _get_prefixes(paths):
+    """All the prefixes (ending with "/") of the given paths"""
+    prefixes = set()
+    for path in paths:
+        index = path.find("/", 1)
+        while index != -1:
+            prefixes.add(path[: index + 1])
+            index = path.find("/", index + 1)
+    return frozenset(prefixes)
+
+
+class _Filters:
+    """Internal filters of a (partial) variant"""
+
+    def __init__(self, filter_only=frozenset(), filter_out=frozenset()):
+        self.filter_only = filter_only
+        self.filter_out = filter_out
+        self._only_prefixes = None
+        #: filter-only filters by their parent paths (the root one keeps
+        #: everything, and is left out)
+        self._only_by_parent = {}
+        for only in filter_only:
+            if only == "/":
+                continue
+            parent = only.rsplit("/", 2)[0] + "/"
+            self._only_by_parent.setdefault(parent, []).append(only)
+
+    def __bool__(self):
+        return bool(self.filter_only or self.filter_out)
+
+    def extend(self, filter_only, filter_out):
+        """Returns the filters along with the given ones"""
+        if filter_only <= self.filter_only and filter_out <= self.filter_out:
+            return self
+        return _Filters(self.filter_only | filter_only, self.filter_out | filter_out)
+
+    @property
+    def only_prefixes(self):
+        """All the prefixes of the filter-only filters"""
+        if self._only_prefixes is None:
+            self._only_prefixes = _get_prefixes(self.filter_only)
+        return self._only_prefixes
+
+    def is_filtered_out(self, path):
+        """Whether a path (ending with "/") is filtered out"""
+        for out in self.filter_out:
+            if path.startswith(out):
+                return True
+        return False
+
+    def get_removing_level(self, path):
+        """
+        Level of the filter-only filters removing a path (ending with "/")
+
+        A path is removed when the filter-only filters of the highest
+        level among the ones about its siblings (or the siblings of its
+        parents) do not include it.
+
+        :return: the level, or 0 when the path is not removed
+        :rtype: int
+        """
+        ppath = path.rsplit("/", 2)[0] + "/"
+        end = len(ppath)
+        while end:
+            siblings = self._only_by_parent.get(ppath[:end])
+            if siblings:
+                if any(path.startswith(only) for only in siblings):
+                    return 0
+                return ppath.count("/", 0, end) + 1
+            end = ppath.rfind("/", 0, end - 1) + 1
+        return 0
+
+    def is_valid(self, path):
+        """Whether a path (ending with "/") is allowed by the filters"""
+        return not (self.is_filtered_out(path) or self.get_removing_level(path))
+
+
 class MuxTree:
     """
     Object representing part of the tree from the root to leaves or another
     multiplex domain. Recursively it creates multiplexed variants of the full
     tree.
+
+    Without internal filters, variants are counted, and got by index,
+    from the sizes of the pools, without producing them.  Otherwise, the
+    valid variants are searched for, in order, choosing a leaf (or a
+    multiplexed subtree) at a time, and leaving out the choices that are
+    already filtered out by the leaves chosen before them, along with
+    all the variants that would follow from them.  The variants found
+    are kept, so they're only searched for once.
     """
 
     def __init__(self, root):
@@ -51,6 +137,13 @@ class MuxTree:
                 self.pools.append(node)
             else:
                 self.pools.append([MuxTree(child) for child in node.children])
+        self.path = root.path + "/"
+        self._has_filters = None
+        self._sizes = None
+        self._leaves = {}
+        self._future_only = None
+        self._found = []
+        self._search = None
 
     @staticmethod
     def _iter_mux_leaves(node):
@@ -66,15 +159,219 @@ class MuxTree:
             except IndexError:
                 return
 
+    def has_filters(self):
+        """Whether any of the leaves has internal filters"""
+        if self._has_filters is None:
+            self._has_filters = any(
+                (
+                    any(child.has_filters() for child in pool)
+                    if isinstance(pool, list)
+                    else pool.environment.filter_only or pool.environment.filter_out
+                )
+                for pool in self.pools
+            )
+        return self._has_filters
+
+    def _get_sizes(self):
+        """Numbers of variants of each pool, without internal filters"""
+        if self._sizes is None:
+            self._sizes = [
+                sum(len(child) for child in pool) if isinstance(pool, list) else 1
+                for pool in self.pools
+            ]
+        return self._sizes
+
+    def _get_leaf(self, index):
+        """Path (ending with "/") and internal filters of a leaf pool"""
+        if index not in self._leaves:
+            leaf = self.pools[index]
+            environment = leaf.environment
+            self._leaves[index] = (
+                leaf.path + "/",
+                frozenset(environment.filter_only),
+                frozenset(environment.filter_out),
+            )
+        return self._leaves[index]
+
+    def _get_future_only(self, index):
+        """
+        Filter-only filters of the leaves of the pools from index onwards
+
+        :return: the filters, and all their prefixes
+        :rtype: tuple
+        """
+        if self._future_only is None:
+            future_only = [frozenset()]
+            for index_pool in reversed(range(len(self.pools))):
+                pool = self.pools[index_pool]
+                if isinstance(pool, list):
+                    pool_only = frozenset().union(
+                        *(child._get_future_only(0)[0] for child in pool)
+                    )
+                else:
+                    pool_only = self._get_leaf(index_pool)[1]
+                future_only.insert(0, future_only[0] | pool_only)
+            self._future_only = [(only, _get_prefixes(only)) for only in future_only]
+        return self._future_only[index]
+
+    @staticmethod
+    def _is_dead(path, filters, agenda):
+        """
+        Whether the leaves at (or under) a path are filtered out, no
+        matter what is chosen next
+
+        :param agenda: the pools still to be chosen from, as given by
+                       :meth:`_search_variants`
+        """
+        if filters.is_filtered_out(path):
+            return True
+        level = filters.get_removing_level(path)
+        if not level:
+            return False
+        # filter-only filters about the leaves under the path (at, or
+        # above, the removing level), or still to come, may let them in
+        prefixes = [
+            prefix for prefix in _get_prefixes((path,)) if prefix.count("/") >= level
+        ]
+        candidates = [(filters.filter_only, filters.only_prefixes)]
+        while agenda is not None:
+            tree, index, agenda = agenda
+            candidates.append(tree._get_future_only(index))
+        for only, only_prefixes in candidates:
+            if path in only_prefixes:
+                return False
+            if any(prefix in only for prefix in prefixes):
+                return False
+        return True
+
+    def _search_variants(self):
+        """
+        Searches for the valid variants, in order
+
+        The search goes through (partial) variants, made of the leaves
+        chosen so far (and their paths), their filters, and an agenda of
+        the pools still to be chosen from, as (tree, index of the pool,
+        rest of agenda).
+        """
+        stack = [iter([((), (), _Filters(), (self, 0, None))])]
+        while stack:
+            try:
+                leaves, paths, filters, agenda = next(stack[-1])
+            except StopIteration:
+                stack.pop()
+                continue
+            while agenda is not None and agenda[1] == len(agenda[0].pools):
+                agenda = agenda[2]
+            if agenda is None:
+                if all(filters.is_valid(path) for path in paths):
+                    yield list(leaves)
+                continue
+            tree, index, rest = agenda
+            pool = tree.pools[index]
+            agenda = (tree, index + 1, rest)
+            if isinstance(pool, list):
+                children = []
+                for child in pool:
+                    child_agenda = (child, 0, agenda)
+                    if filters and self._is_dead(child.path, filters, child_agenda):
+                        continue
+                    children.append((leaves, paths, filters, child_agenda))
+                stack.append(iter(children))
+                continue
+            path, filter_only, filter_out = tree._get_leaf(index)
+            paths += (path,)
+            extended = filters.extend(filter_only, filter_out)
+            if extended:
+                if extended is not filters:
+                    # new filters may leave out the leaves chosen before
+                    checked = paths
+                else:
+                    checked = (path,)
+                if any(self._is_dead(path, extended, agenda) for path in checked):
+                    continue
+            stack.append(iter([(leaves + (pool,), paths, extended, agenda)]))
+
+    def _get_found(self, index):
+        """
+        Returns the valid variant at index, searching for it if needed
+
+        :return: the variant, or None if there's no variant at index
+        """
+        while index >= len(self._found):
+            if self._search is None:
+                self._search = self._search_variants()
+            try:
+                self._found.append(next(self._search))
+            except StopIteration:
+                self._search = iter(())
+                return None
+        return self._found[index]
+
+    def _locate(self, index):
+        """Returns the variant at index, without internal filters"""
+        variant = []
+        sizes = self._get_sizes()
+        following = math.prod(sizes)
+        for pool, size in zip(self.pools, sizes):
+            following //= size
+            choice, index = divmod(index, following)
+            if not isinstance(pool, list):
+                variant.append(pool)
+                continue
+            for child in pool:
+                child_size = len(child)
+                if choice < child_size:
+                    variant.extend(child._locate(choice))
+                    break
+                choice -= child_size
+        return variant
+
+    def __len__(self):
+        """Number of variants, after processing the internal filters"""
+        if not self.has_filters():
+            return math.prod(self._get_sizes())
+        index = len(self._found)
+        while self._get_found(index) is not None:
+            index += 1
+        return len(self._found)
+
+    def __getitem__(self, index):
+        """
+        Variant at a given index, after processing the internal filters
+
+        :param index: index of the variant, as yielded by :meth:`__iter__`
+        :type index: int
+        :return: the leaves of the variant
+        :rtype: list
+        """
+        if index < 0:
+            index += len(self)
+        if index >= 0:
+            if not self.has_filters():
+                if index < len(self):
+                    return self._locate(index)
+            else:
+                variant = self._get_found(index)
+                if variant is not None:
+                    return list(variant)
+        raise IndexError("variant index out of range")
+
     def __iter__(self):
         """
         Iterates through variants and process the internal filters
 
         :yield valid variants
         """
-        for variant in self.iter_variants():
-            if self._valid_variant(variant):
-                yield variant
+        if not self.has_filters():
+            yield from self.iter_variants()
+            return
+        index = 0
+        while True:
+            variant = self._get_found(index)
+            if variant is None:
+                return
+            yield list(variant)
+            index += 1
 
     def iter_variants(self):
         """
@@ -103,39 +400,13 @@ class MuxTree:
 
         :return: whether the variant is valid or should be ignored/filtered
         """
-        _filter_out = set()
-        _filter_only = set()
+        filters = _Filters()
         for node in variant:
-            _filter_only.update(node.environment.filter_only)
-            _filter_out.update(node.environment.filter_out)
-        if not (_filter_only or _filter_out):
+            environment = node.environment
+            filters = filters.extend(environment.filter_only, environment.filter_out)
+        if not filters:
             return True
-        filter_only = tuple(_filter_only)
-        filter_out = tuple(_filter_out)
-        filter_only_parents = [str(_).rsplit("/", 2)[0] + "/" for _ in filter_only if _]
-
-        for out in filter_out:
-            for node in variant:
-                path = node.path + "/"
-                if path.startswith(out):
-                    return False
-        for node in variant:
-            keep = 0
-            remove = 0
-            path = node.path + "/"
-            ppath = path.rsplit("/", 2)[0] + "/"
-            for i in range(len(filter_only)):
-                level = filter_only[i].count("/")
-                if level < max(keep, remove):
-                    continue
-                if ppath.startswith(filter_only_parents[i]):
-                    if path.startswith(filter_only[i]):
-                        keep = level
-                    else:
-                        remove = level
-            if remove > keep:
-                return False
-        return True
+        return all(filters.is_valid(node.path + "/") for node in variant)
 
 
 class MuxPlugin:
@@ -148,7 +419,6 @@ class MuxPlugin:
     root = None
     variants = None
     paths = None
-    variant_ids = []
 
     def initialize_mux(self, root, paths):
         """
@@ -160,11 +430,22 @@ class MuxPlugin:
         self.root = root
         self.paths = paths
         if self.root is not None:
-            self.variant_ids = [
-                varianter.generate_variant_id(variant) for variant in MuxTree(self.root)
-            ]
             self.variants = MuxTree(self.root)
 
+    @property
+    def variant_ids(self):
+        """The ids of all variants, in order"""
+        if self.variants is None:
+            return []
+        return [varianter.generate_variant_id(variant) for variant in self.variants]
+
+    def _to_variant(self, variant):
+        return {
+            "variant_id": varianter.generate_variant_id(variant),
+            "variant": variant,
+            "paths": self.paths,
+        }
+
     def __iter__(self):
         """
         See :meth:`avocado.core.plugin_interfaces.Varianter.__iter__`
@@ -172,14 +453,26 @@ class MuxPlugin:
         if self.root is None:
             return
 
-        for vid, variant in zip(self.variant_ids, self.variants):
-            yield {"variant_id": vid, "variant": variant, "paths": self.paths}
+        for variant in self.variants:
+            yield self._to_variant(variant)
+
+    def get_variant(self, index):
+        """
+        Returns the variant at a given index, without producing the others
+
+        :param index: index of the variant, as yielded by :meth:`__iter__`
+        :type index: int
+        :raises IndexError: when there is no variant at the index
+        """
+        if self.root is None:
+            raise IndexError("variant index out of range")
+        return self._to_variant(self.variants[index])
 
     def to_str(self, summary, variants, **kwargs):
         """
         See :meth:`avocado.core.plugin_interfaces.Varianter.to_str`
         """
-        if not self.variants:
+        if self.variants is None:
             return ""
         out = []
         if summary:
@@ -206,7 +499,7 @@ class MuxPlugin:
         """
         if self.root is None:
             return 0
-        return sum(1 for _ in self)
+        return len(self.variants)
 
 
 class OutputValue:  # only container pylint: disable=R0903
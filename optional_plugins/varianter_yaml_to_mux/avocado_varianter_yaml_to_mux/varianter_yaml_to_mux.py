@@ -16,6 +16,7 @@
 
 import ast
 import collections
+import contextlib
 import os
 import re
 import sys
@@ -48,6 +49,28 @@ __RE_FILE_SPLIT = re.compile(r"(?<!\\):")  # split by ':' but not '\\:'
 __RE_FILE_SUBS = re.compile(r"(?<!\\)\\:")  # substitute '\\:' but not '\\\\:'
 
 
+#: Sets that, while registered by :func:`record_loaded_paths`, receive
+#: the path of every YAML file loaded
+_LOADED_PATHS_RECORDERS = []
+
+
+@contextlib.contextmanager
+def record_loaded_paths():
+    """Records the paths of all YAML files loaded within the context.
+
+    Those are the given files, and the ones included by them.
+
+    :returns: the (absolute) paths of the loaded files
+    :rtype: set
+    """
+    paths = set()
+    _LOADED_PATHS_RECORDERS.append(paths)
+    try:
+        yield paths
+    finally:
+        _LOADED_PATHS_RECORDERS.remove(paths)
+
+
 class ListOfNodeObjects(list):  # Few methods pylint: disable=R0903
     """
     Used to mark list as list of objects from whose node is going to be created
@@ -302,6 +325,8 @@ def _create_from_yaml(path):
         _BaseLoader.using = using
 
     # Load the tree
+    for recorder in _LOADED_PATHS_RECORDERS:
+        recorder.add(os.path.abspath(path))
     with open(path, encoding="utf-8") as stream:
         loaded_tree = yaml.load(stream, Loader)  # nosec
         if loaded_tree is None:
@@ -484,13 +509,15 @@ class YamlToMux(mux.MuxPlugin, Varianter):
     def initialize(self, config):
         subcommand = config.get("subcommand")
         data = None
+        self.loaded_files = set()  # pylint: disable=W0201
 
         # Merge the multiplex
         multiplex_files = config.get("yaml_to_mux.files")
         if multiplex_files:
             data = mux.MuxTreeNode()
             try:
-                data.merge(create_from_yaml(multiplex_files))
+                with record_loaded_paths() as self.loaded_files:
+                    data.merge(create_from_yaml(multiplex_files))
             except IOError as details:
                 error_msg = f"{details.strerror} : {details.filename}"
                 LOG_UI.error(error_msg)
@@ -521,3 +548,18 @@ class YamlToMux(mux.MuxPlugin, Varianter):
             data = mux.apply_filters(data, mux_filter_only, mux_filter_out)
             paths = config.get("yaml_to_mux.parameter_paths")
             self.initialize_mux(data, paths)
+
+    def get_cache_key(self, config):
+        return {
+            key: config.get(f"yaml_to_mux.{key}")
+            for key in (
+                "files",
+                "filter_only",
+                "filter_out",
+                "parameter_paths",
+                "inject",
+            )
+        }
+
+    def get_cache_files(self):
+        return sorted(self.loaded_files)
@@ -360,6 +360,47 @@ class TestMultiplex(unittest.TestCase):
         self.assertNotIn("intel", str_act)
         self.assertNotIn("fedora", str_act)
 
+    @staticmethod
+    def _create_os_arch_tree():
+        root = mux.MuxTreeNode()
+        for name, children in (
+            ("os", ("linux", "windows")),
+            ("arch", ("x86", "arm", "ppc")),
+        ):
+            node = mux.MuxTreeNode(name)
+            node.multiplex = True
+            for child in children:
+                node.add_child(mux.MuxTreeNode(child))
+            root.add_child(node)
+        return root
+
+    def test_index(self):
+        tree = mux.MuxTree(self._create_os_arch_tree())
+        variants = tuple(tree)
+        self.assertEqual(len(variants), 6)
+        self.assertEqual(len(tree), 6)
+        self.assertEqual(tuple(tree[index] for index in range(6)), variants)
+        self.assertEqual(tree[-1], ["windows", "ppc"])
+        with self.assertRaises(IndexError):
+            tree[6]  # pylint: disable=W0104
+
+    def test_index_internal_filters(self):
+        root = self._create_os_arch_tree()
+        root.children[0].children[0].filters = [["/arch/x86"], []]
+        root.children[0].children[1].filters = [[], ["/arch/arm"]]
+        tree = mux.MuxTree(root)
+        exp = (
+            ["linux", "x86"],
+            ["windows", "x86"],
+            ["windows", "ppc"],
+        )
+        self.assertEqual(tuple(tree), exp)
+        self.assertEqual(len(tree), 3)
+        self.assertEqual(tuple(tree[index] for index in range(3)), exp)
+        self.assertEqual(tree[-1], ["windows", "ppc"])
+        with self.assertRaises(IndexError):
+            tree[3]  # pylint: disable=W0104
+
 
 class TestAvocadoParams(unittest.TestCase):
     def setUp(self):
@@ -690,6 +731,24 @@ class TestCreateFromYaml(unittest.TestCase):
         node = yaml_to_mux._apply_using("bar", "foo", mux.MuxTreeNode())
         self.assertEqual(node.path, "/foo")
 
+    def test_record_loaded_paths(self):
+        data_dir = os.path.join(BASEDIR, "tests", ".data")
+        with yaml_to_mux.record_loaded_paths() as paths:
+            yaml_to_mux.create_from_yaml(
+                [f"/:{os.path.join(data_dir, 'mux-selftest-advanced.yaml')}"]
+            )
+        self.assertEqual(
+            paths,
+            {
+                os.path.join(data_dir, name)
+                for name in (
+                    "mux-selftest-advanced.yaml",
+                    "mux-selftest.yaml",
+                    "mux-šelftest-distro.yaml",
+                )
+            },
+        )
+
 
 class TestFingerprint(unittest.TestCase):
     def test_fingerprint(self):
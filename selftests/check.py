@@ -27,16 +27,16 @@ TEST_SIZE = {
     "job-api-check-tmp-directory-exists": 1,
     "nrunner-interface": 90,
     "nrunner-requirement": 28,
-    "unit": 1005,
+    "unit": 1123,
     "jobs": 11,
-    "functional-parallel": 368,
-    "functional-serial": 7,
+    "functional-parallel": 372,
+    "functional-serial": 9,
     "optional-plugins": 0,
     "optional-plugins-golang": 2,
     "optional-plugins-html": 3,
     "optional-plugins-robot": 3,
-    "optional-plugins-varianter_cit": 40,
-    "optional-plugins-varianter_yaml_to_mux": 50,
+    "optional-plugins-varianter_cit": 43,
+    "optional-plugins-varianter_yaml_to_mux": 53,
     "vmimage-variants": 256,
     "vmimage-tests": 35,
     "pre-release": 18,
@@ -1,5 +1,6 @@
 import json
 import os
+import shlex
 import signal
 import stat
 import subprocess
@@ -8,7 +9,13 @@ import unittest
 
 from avocado.core import exit_codes
 from avocado.utils import process, script
-from selftests.utils import AVOCADO, BASEDIR, TestCaseTmpDir, skipOnLevelsInferiorThan
+from selftests.utils import (
+    AVOCADO,
+    BASEDIR,
+    TestCaseTmpDir,
+    get_temporary_config,
+    skipOnLevelsInferiorThan,
+)
 
 AVOCADO_TEST_OK = """from avocado import Test
 
@@ -316,5 +323,79 @@ class ListTestFunctional(TestCaseTmpDir):
         self.assertEqual(expected, result.stdout)
 
 
+class ListIncremental(unittest.TestCase):
+    def setUp(self):
+        self.base_dir, self.mapping, self.config_file = get_temporary_config(self)
+        self.tests_dir = self.mapping["test_dir"]
+        self.diff_path = os.path.join(self.base_dir.name, "diff.json")
+
+    def _write_test(self, name, content=AVOCADO_TEST_OK):
+        path = os.path.join(self.tests_dir, name)
+        with open(path, "w", encoding="utf-8") as test:
+            test.write(content)
+        return f"{path}:PassTest.test"
+
+    def _list_diff(self):
+        cmd_line = (
+            f"{AVOCADO} --config {self.config_file.name} list "
+            f"--json-diff {self.diff_path} {self.tests_dir}"
+        )
+        process.run(cmd_line)
+        with open(self.diff_path, encoding="utf-8") as diff:
+            return json.load(diff)
+
+    def test_json_diff(self):
+        first = self._write_test("first.py")
+        self.assertEqual(
+            self._list_diff(),
+            {
+                "added": [{"Type": "avocado-instrumented", "Test": first}],
+                "removed": [],
+            },
+        )
+        self.assertEqual(self._list_diff(), {"added": [], "removed": []})
+        second = self._write_test("second.py")
+        os.unlink(os.path.join(self.tests_dir, "first.py"))
+        self.assertEqual(
+            self._list_diff(),
+            {
+                "added": [{"Type": "avocado-instrumented", "Test": second}],
+                "removed": [{"Type": "avocado-instrumented", "Test": first}],
+            },
+        )
+
+    def test_watch(self):
+        first = self._write_test("first.py")
+        cmd_line = (
+            f"{AVOCADO} --config {self.config_file.name} list --watch "
+            f"--watch-interval 0.1 {self.tests_dir}"
+        )
+        watch = subprocess.Popen(
+            shlex.split(cmd_line), stdout=subprocess.PIPE, text=True
+        )
+        try:
+            self.assertEqual(
+                watch.stdout.readline().split(), ["avocado-instrumented", first]
+            )
+            diff = json.loads(watch.stdout.readline())
+            self.assertEqual(len(diff["added"]), 1)
+            second = self._write_test("second.py")
+            diff = json.loads(watch.stdout.readline())
+            self.assertEqual(
+                diff,
+                {
+                    "added": [{"Type": "avocado-instrumented", "Test": second}],
+                    "removed": [],
+                },
+            )
+        finally:
+            watch.send_signal(signal.SIGINT)
+            self.assertEqual(watch.wait(timeout=10), exit_codes.AVOCADO_ALL_OK)
+            watch.stdout.close()
+
+    def tearDown(self):
+        self.base_dir.cleanup()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -43,6 +43,34 @@ class NRunnerFeatures(TestCaseTmpDir):
             self.assertEqual(job.result.failed, 1)
             self.assertEqual(job.result.skipped, 2)
 
+    def test_failfast_shards(self):
+        config = {
+            "run.results_dir": self.tmpdir.name,
+            "resolver.references": [
+                os.path.join(BASEDIR, "examples", "tests", "failtest.py"),
+                os.path.join(BASEDIR, "examples", "tests", "passtest.py"),
+                os.path.join(BASEDIR, "examples", "tests", "sleeptest.py"),
+                os.path.join(BASEDIR, "examples", "tests", "sleeptest.py"),
+            ],
+            "run.failfast": True,
+            "run.shuffle": False,
+            "run.max_parallel_tasks": 2,
+            "run.scheduler_shards": 2,
+        }
+        with Job.from_config(job_config=config) as job:
+            self.assertEqual(job.run(), 9)
+            # the second shard is running the first sleeptest when the
+            # first shard fails, and should not start the other one
+            self.assertEqual(job.result.passed, 1)
+            self.assertEqual(job.result.failed, 1)
+            self.assertEqual(job.result.skipped, 2)
+            failed = [test for test in job.result.tests if test["status"] == "FAIL"]
+            for test in job.result.tests:
+                if test["status"] != "SKIP":
+                    self.assertLess(
+                        test["actual_time_start"], failed[0]["actual_time_end"]
+                    )
+
 
 class RunnableRun(unittest.TestCase):
     def test_noop(self):
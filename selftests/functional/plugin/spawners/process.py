@@ -16,6 +16,24 @@ class LogdirTest(Test):
 """
 
 
+def get_zygote_children():
+    """Returns the PIDs of the zygote processes children of this process."""
+    children = []
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as stat_file:
+                ppid = int(stat_file.read().rsplit(b")", 1)[1].split()[1])
+            with open(f"/proc/{pid}/cmdline", "rb") as cmdline_file:
+                cmdline = cmdline_file.read().split(b"\0")
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == os.getpid() and b"avocado.core.nrunner.zygote" in cmdline:
+            children.append(int(pid))
+    return children
+
+
 class ProcessSpawnerTest(TestCaseTmpDir):
     def test_logdir_path(self):
         test = script.Script(
@@ -34,6 +52,24 @@ class ProcessSpawnerTest(TestCaseTmpDir):
             expected = f"logdir is: {testdir}"
             self.assertIn(expected, debug_file.read())
 
+    @unittest.skipUnless(
+        hasattr(os, "fork") and os.path.isdir("/proc"),
+        "Zygotes depend on fork(), and processes are found on /proc",
+    )
+    def test_zygotes_stopped(self):
+        config = {
+            "resolver.references": ["/bin/true", "/bin/false"],
+            "run.results_dir": self.tmpdir.name,
+            "spawner.process.zygote": True,
+            "sysinfo.collect.enabled": False,
+        }
+        for _ in range(2):
+            with Job.from_config(job_config=config) as job:
+                job.run()
+            self.assertEqual(job.result.passed, 1)
+            self.assertEqual(job.result.failed, 1)
+            self.assertEqual(get_zygote_children(), [])
+
     @unittest.skipUnless(
         python_module_available("avocado-rogue"), "avocado-rogue not available"
     )
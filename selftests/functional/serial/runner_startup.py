@@ -0,0 +1,110 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.settings import settings
+from selftests.utils import BASEDIR, skipUnlessPathExists
+
+#: Recorded with "contrib/benchmarks/runner-startup.py --record"
+BASELINE = os.path.join(BASEDIR, "selftests", ".data", "runner_startup.json")
+
+#: How much slower, relative to the interpreter, the startup can get
+TOLERANCE = 1.5
+
+#: Runs a runner module, writing the Avocado modules imported to the standard error
+BOOTSTRAP = """
+import atexit, json, runpy, sys
+
+def dump():
+    modules = [name for name in sys.modules if name.split(".")[0] == "avocado"]
+    sys.stderr.write(json.dumps(sorted(modules)))
+
+atexit.register(dump)
+sys.argv = sys.argv[1:]
+runpy.run_module(sys.argv[0], run_name="__main__", alter_sys=True)
+"""
+
+RUNNERS = {
+    "exec-test": "/bin/true",
+    "noop": "noop",
+    "avocado-instrumented": os.path.join(
+        BASEDIR, "examples", "tests", "passtest.py:PassTest.test"
+    ),
+}
+
+
+def get_task_args(kind):
+    config = Runnable.filter_runnable_config(kind, settings.as_dict())
+    runnable = Runnable(kind, RUNNERS[kind], config=config)
+    task = Task(runnable, identifier=f"1-{kind}", status_uris=[])
+    return [
+        runnable.pick_runner_module_from_entry_point_kind(kind),
+        "task-run",
+    ] + task.get_command_args()
+
+
+def get_shortest_time(args, runs=5):
+    env = os.environ.copy()
+    env["PYTHONPATH"] = BASEDIR
+    times = []
+    for _ in range(runs):
+        start = time.monotonic()
+        subprocess.run(
+            [sys.executable] + args,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        times.append(time.monotonic() - start)
+    return min(times) * 1000
+
+
+class RunnerStartup(unittest.TestCase):
+    def setUp(self):
+        with open(BASELINE, encoding="utf-8") as baseline:
+            self.baseline = json.load(baseline)
+
+    def test_modules(self):
+        env = os.environ.copy()
+        env["PYTHONPATH"] = BASEDIR
+        for kind, baseline in self.baseline["runners"].items():
+            with self.subTest(kind=kind):
+                result = subprocess.run(
+                    [sys.executable, "-c", BOOTSTRAP] + get_task_args(kind),
+                    env=env,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    check=True,
+                )
+                self.assertIn("'status': 'finished'", result.stdout)
+                modules = json.loads(result.stderr.splitlines()[-1])
+                self.assertEqual(
+                    sorted(set(modules) - set(baseline["modules"])),
+                    [],
+                    f"The {kind} runner imports modules not in the baseline",
+                )
+
+    @skipUnlessPathExists("/bin/true")
+    def test_exec_test(self):
+        interpreter = get_shortest_time(["-c", "pass"])
+        startup = get_shortest_time(["-m"] + get_task_args("exec-test"))
+        baseline = self.baseline["runners"]["exec-test"]["startup"]
+        limit = baseline / self.baseline["interpreter"] * TOLERANCE
+        self.assertLessEqual(
+            startup / interpreter,
+            limit,
+            f"The startup of the exec-test runner took {startup:.1f}ms, "
+            f"{startup / interpreter:.1f}x the interpreter, when up to "
+            f"{limit:.1f}x is expected",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import unittest.mock
+
+from avocado.core import entry_points
+from avocado.core.dispatcher import CLICmdDispatcher
+from avocado.core.extension_manager import ExtensionManager, LazyExtension
+from avocado.core.settings import settings
+
+PLUGIN = """class Plugin:
+    name = "{name}"
+    description = "A plugin named {name}"
+    priority = 70
+"""
+
+
+class EntryPoint(unittest.TestCase):
+    def test_attributes(self):
+        ep = entry_points.EntryPoint(
+            "json", "avocado.plugins.result", "avocado.plugins.jsonresult:JSONResult"
+        )
+        self.assertEqual(ep.module_name, "avocado.plugins.jsonresult")
+        self.assertEqual(ep.attrs, ("JSONResult",))
+        self.assertEqual(str(ep), "json = avocado.plugins.jsonresult:JSONResult")
+        self.assertEqual(ep.key, "avocado.plugins.result:json")
+
+    def test_load(self):
+        ep = entry_points.EntryPoint("path", "test", "os:path.join")
+        self.assertIs(ep.load(), os.path.join)
+
+
+class Index(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+        self.path = os.path.join(self.tmpdir.name, "cache", "entry_points.json")
+        patcher = unittest.mock.patch("avocado.core.entry_points.atexit")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write_plugin(self, module_name, name):
+        with open(
+            os.path.join(self.tmpdir.name, f"{module_name}.py"), "w", encoding="utf-8"
+        ) as module:
+            module.write(PLUGIN.format(name=name))
+
+    def test_iter_entry_points(self):
+        index = entry_points.Index(self.path)
+        names = [ep.name for ep in index.iter_entry_points("avocado.plugins.cli.cmd")]
+        self.assertIn("run", names)
+        self.assertIn("list", names)
+        eps = list(index.iter_entry_points("console_scripts", "avocado"))
+        self.assertEqual(len(eps), 1)
+        self.assertEqual(eps[0].module_name, "avocado.core.main")
+        self.assertEqual(eps[0].version, index.get_version("avocado-framework"))
+        self.assertEqual(list(index.iter_entry_points("console_scripts", "pip")), [])
+
+    def test_distribution(self):
+        index = entry_points.Index(self.path)
+        self.assertIsNotNone(index.get_version("avocado-framework"))
+        self.assertEqual(
+            index.get_version("avocado_framework"),
+            index.get_version("avocado-framework"),
+        )
+        self.assertIn("avocado.plugins.cli.cmd", index.get_groups("avocado-framework"))
+        self.assertIsNone(index.get_version("avocado-no-such-distribution"))
+
+    def test_saved(self):
+        index = entry_points.Index(self.path)
+        expected = list(map(str, index.iter_entry_points("avocado.plugins.init")))
+        index.save()
+        self.assertTrue(os.path.exists(self.path))
+        with unittest.mock.patch(
+            "avocado.core.entry_points._build_index", side_effect=AssertionError
+        ):
+            index = entry_points.Index(self.path)
+            self.assertEqual(
+                list(map(str, index.iter_entry_points("avocado.plugins.init"))),
+                expected,
+            )
+
+    def test_other_distributions(self):
+        index = entry_points.Index(self.path)
+        index.data  # pylint: disable=W0104
+        index.save()
+        with open(self.path, encoding="utf-8") as index_file:
+            data = json.load(index_file)
+        self.assertEqual(list(data["indexes"]), [index.signature])
+        with unittest.mock.patch(
+            "avocado.core.entry_points.get_distributions_signature",
+            return_value="other",
+        ):
+            other = entry_points.Index(self.path)
+            self.assertIsNotNone(other.data)
+            other.save()
+        with open(self.path, encoding="utf-8") as index_file:
+            data = json.load(index_file)
+        self.assertEqual(list(data["indexes"]), [index.signature, "other"])
+
+    def test_plugin_metadata(self):
+        self._write_plugin("avocado_ep_plugin", "first")
+        sys.path.insert(0, self.tmpdir.name)
+        try:
+            ep = entry_points.EntryPoint(
+                "first", "avocado.plugins.test", "avocado_ep_plugin:Plugin"
+            )
+            index = entry_points.Index(self.path)
+            self.assertIsNone(index.get_plugin_metadata(ep))
+            index.record_plugin_metadata(ep, ep.load())
+            self.assertEqual(
+                index.get_plugin_metadata(ep),
+                {
+                    "name": "first",
+                    "priority": 70,
+                    "description": "A plugin named first",
+                },
+            )
+            index.save()
+            self.assertEqual(
+                entry_points.Index(self.path).get_plugin_metadata(ep)["name"], "first"
+            )
+            self._write_plugin("avocado_ep_plugin", "changed")
+            self.assertIsNone(index.get_plugin_metadata(ep))
+        finally:
+            sys.path.remove(self.tmpdir.name)
+            sys.modules.pop("avocado_ep_plugin", None)
+
+
+class Lazy(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+        index = entry_points.Index(os.path.join(self.tmpdir.name, "entry_points.json"))
+        for patcher in (
+            unittest.mock.patch("avocado.core.entry_points._INDEX", index),
+            unittest.mock.patch("avocado.core.entry_points.atexit"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_extension_manager(self):
+        namespace = "avocado.plugins.result"
+        lazy = ExtensionManager(namespace, lazy=True)
+        self.assertFalse(any(isinstance(ext, LazyExtension) for ext in lazy))
+        eager = ExtensionManager(namespace)
+        lazy = ExtensionManager(namespace, lazy=True)
+        self.assertTrue(all(isinstance(ext, LazyExtension) for ext in lazy))
+        self.assertFalse(any(ext.loaded for ext in lazy))
+        self.assertEqual(
+            [(ext.name, ext.priority) for ext in lazy],
+            [(ext.name, ext.priority) for ext in eager],
+        )
+        ext = lazy.extensions[0]
+        self.assertIsInstance(ext.obj, eager.extensions[0].plugin)
+        self.assertTrue(ext.loaded)
+
+    def test_commands(self):
+        ExtensionManager("avocado.plugins.cli.cmd")
+        settings.update_option("plugins.lazy", True)
+        try:
+            dispatcher = CLICmdDispatcher()
+        finally:
+            settings.update_option("plugins.lazy", False)
+        expected = [ext.metadata["name"] for ext in dispatcher.extensions]
+        parser = unittest.mock.Mock()
+        parser.subcommands = argparse.ArgumentParser().add_subparsers()
+        parser.requested_subcommand = "exec-path"
+        dispatcher.configure(parser)
+        self.assertEqual(list(parser.subcommands.choices), ["exec-path"])
+        dispatcher.configure_placeholders(parser)
+        self.assertEqual(list(parser.subcommands.choices), expected)
+        self.assertEqual(
+            [action.dest for action in parser.subcommands._choices_actions], expected
+        )
+        self.assertEqual(
+            [ext.name for ext in dispatcher.extensions if ext.loaded], ["exec-path"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+
+from avocado.core import messages
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+
+
+class TaskFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def _read(self, name):
+        with open(self._path(name), "rb") as fp:
+            return fp.read()
+
+    def test_lru(self):
+        files = messages.TaskFiles(max_open=2, flush_interval=3600)
+        files.write(self._path("a"), b"a1\n", "1-a")
+        files.write(self._path("b"), b"b1\n", "1-a")
+        files.write(self._path("a"), b"a2\n", "1-a")
+        # "b" is the least recently used, so it is closed (and flushed)
+        files.write(self._path("c"), b"c1\n", "2-c")
+        self.assertEqual(len(files), 2)
+        self.assertEqual(self._read("b"), b"b1\n")
+        files.write(self._path("b"), b"b2\n", "1-a")
+        files.close()
+        self.assertEqual(len(files), 0)
+        self.assertEqual(self._read("a"), b"a1\na2\n")
+        self.assertEqual(self._read("b"), b"b1\nb2\n")
+        self.assertEqual(self._read("c"), b"c1\n")
+
+    def test_close_task(self):
+        files = messages.TaskFiles(flush_interval=3600)
+        files.write(self._path("a"), b"a\n", "1-a")
+        files.write(self._path("b"), b"b\n", "2-b")
+        files.close_task("1-a")
+        self.assertEqual(len(files), 1)
+        self.assertEqual(self._read("a"), b"a\n")
+        files.close()
+
+    def test_flush_interval(self):
+        files = messages.TaskFiles(flush_interval=0)
+        files.write(self._path("a"), b"a\n", "1-a")
+        self.assertEqual(self._read("a"), b"a\n")
+        files.close()
+
+
+class RunningMessageHandler(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+        self.task = Task(Runnable("noop", "noop"), "1-noop")
+        self.task.metadata["task_path"] = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _read(self, name):
+        with open(os.path.join(self.tmpdir.name, name), "rb") as fp:
+            return fp.read()
+
+    def _handle(self, handler):
+        for message in (
+            {"type": "stdout", "log": b"out\n"},
+            {"type": "log", "log": b"log", "encoding": "utf-8"},
+            {"type": "stderr", "log": b"err\n", "log_only": True},
+        ):
+            message["status"] = "running"
+            handler.process_message(message, self.task, None)
+
+    def test_shared_files(self):
+        files = messages.TaskFiles(flush_interval=3600)
+        self._handle(messages.RunningMessageHandler(files))
+        files.close_task(self.task.identifier)
+        self.assertEqual(
+            self._read("debug.log"), b"[stdout] out\n[stdlog] log\n[stderr] err\n"
+        )
+        self.assertEqual(self._read("stdout"), b"out\n")
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir.name, "stderr")))
+
+    def test_log_file_reference(self):
+        with open(os.path.join(self.tmpdir.name, "stdout"), "wb") as fp:
+            fp.write(b"foo\nbar\nbaz\n")
+        message = {
+            "status": "running",
+            "type": "stdout",
+            "log": b"",
+            "log_only": True,
+            "log_file": "stdout",
+            "log_offset": 4,
+            "log_size": 4,
+        }
+        messages.RunningMessageHandler().process_message(message, self.task, None)
+        self.assertEqual(self._read("debug.log"), b"[stdout] bar\n")
+
+    def test_log_file_reference_missing(self):
+        message = {
+            "status": "running",
+            "type": "stdout",
+            "log": b"",
+            "log_only": True,
+            "log_file": "stdout",
+            "log_offset": 0,
+            "log_size": 4,
+        }
+        with self.assertLogs("avocado.job", "WARNING"):
+            messages.RunningMessageHandler().process_message(message, self.task, None)
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir.name, "debug.log")))
+
+    def test_no_files(self):
+        self._handle(messages.RunningMessageHandler())
+        self.assertEqual(
+            self._read("debug.log"), b"[stdout] out\n[stdlog] log\n[stderr] err\n"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+import tempfile
+import unittest.mock
+
+import avocado.core.nrunner.runnable as runnable_mod
+from avocado.core.nrunner import capabilities
+from avocado.core.nrunner.runnable import Runnable
+from selftests.utils import skipUnlessPathExists
+
+RUNNER = """#!/bin/sh
+echo probed >> {counter}
+echo '{{"runnables": ["mykind"], "configuration_used": ["mykind.key"]}}'
+"""
+
+
+@skipUnlessPathExists("/bin/sh")
+class Registry(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+        self.path = os.path.join(self.tmpdir.name, "cache", "runners.json")
+        self.counter = os.path.join(self.tmpdir.name, "counter")
+        self.runner = os.path.join(self.tmpdir.name, "avocado-runner-mykind")
+        self._write_runner(RUNNER)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write_runner(self, content):
+        with open(self.runner, "w", encoding="utf-8") as runner:
+            runner.write(content.format(counter=self.counter))
+        os.chmod(self.runner, 0o755)
+
+    def _probes(self):
+        if not os.path.exists(self.counter):
+            return 0
+        with open(self.counter, encoding="utf-8") as counter:
+            return len(counter.readlines())
+
+    def test_put_get(self):
+        registry = capabilities.CapabilitiesRegistry(self.path)
+        self.assertIsNone(registry.get([self.runner]))
+        registry.put([self.runner], {"runnables": ["mykind"]})
+        registry = capabilities.CapabilitiesRegistry(self.path)
+        self.assertEqual(registry.get([self.runner]), {"runnables": ["mykind"]})
+
+    def test_changed_runner(self):
+        registry = capabilities.CapabilitiesRegistry(self.path)
+        registry.put([self.runner], {"runnables": ["mykind"]})
+        self._write_runner(RUNNER + "exit 0\n")
+        self.assertIsNone(registry.get([self.runner]))
+
+    def test_not_found(self):
+        registry = capabilities.CapabilitiesRegistry(self.path)
+        registry.put(["avocado-runner-non-existing"], {"runnables": ["mykind"]})
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_other_version(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as registry_file:
+            json.dump({"version": 0, "runners": {self.runner: {}}}, registry_file)
+        self.assertEqual(capabilities.CapabilitiesRegistry(self.path).entries, {})
+
+    def _get_capabilities(self, config):
+        registry = capabilities.CapabilitiesRegistry(self.path)
+        with unittest.mock.patch.object(
+            runnable_mod, "_CAPABILITIES_REGISTRY", registry
+        ), unittest.mock.patch.object(
+            runnable_mod.settings, "as_dict", return_value=config
+        ):
+            return Runnable.get_registered_capabilities_from_runner_command(
+                [self.runner]
+            )
+
+    def test_disabled(self):
+        for _ in range(2):
+            self.assertEqual(self._get_capabilities({})["runnables"], ["mykind"])
+        self.assertEqual(self._probes(), 2)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_probed_once(self):
+        config = {"runner.capabilities_registry": True}
+        for _ in range(2):
+            registry = capabilities.CapabilitiesRegistry(self.path)
+            with unittest.mock.patch.object(
+                runnable_mod, "_CAPABILITIES_REGISTRY", registry
+            ), unittest.mock.patch.object(
+                runnable_mod.settings, "as_dict", return_value=config
+            ), unittest.mock.patch.dict(
+                runnable_mod.STANDALONE_EXECUTABLE_CONFIG_USED, clear=True
+            ):
+                self.assertTrue(
+                    Runnable.is_kind_supported_by_runner_command(
+                        "mykind",
+                        [self.runner],
+                        Runnable.get_registered_capabilities_from_runner_command(
+                            [self.runner]
+                        ),
+                    )
+                )
+                self.assertEqual(
+                    runnable_mod.STANDALONE_EXECUTABLE_CONFIG_USED[self.runner],
+                    ["mykind.key"],
+                )
+        self.assertEqual(self._probes(), 1)
+
+
+class EntryPoints(unittest.TestCase):
+    def test_pick(self):
+        runner_cmd = Runnable.pick_runner_command_from_entry_points("noop")
+        self.assertIn(
+            runner_cmd,
+            (
+                ["avocado-runner-noop"],
+                [sys.executable, "-m", "avocado.plugins.runners.noop"],
+            ),
+        )
+
+    def test_pick_unknown_kind(self):
+        self.assertIsNone(
+            Runnable.pick_runner_command_from_entry_points("non-existing-kind")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import pickle
 import unittest
 
 from avocado.core import parameters, tree
@@ -42,6 +43,28 @@ class Parameters(unittest.TestCase):
         # Note: Different origin of the same value, which should produce
         # a crash, are tested in yaml2mux selftest
 
+    def test_same_variant(self):
+        node = tree.TreeNode().get_node("/foo", True)
+        node.value = {"timeout": 1}
+        params1 = parameters.AvocadoParams([node], ["/*"])
+        params2 = parameters.AvocadoParams([node], ["/*"])
+        self.assertEqual(params1, params2)
+        self.assertEqual(params1.get("timeout", default=[]), 1)
+        self.assertEqual(params1.get("timeout", "/bar/", default=[]), [])
+        self.assertEqual(params1.get("timeout", "/bar/", default=[3]), [3])
+        self.assertEqual(params2.get("timeout", default=[]), 1)
+        self.assertEqual(params2.get("timeout", "/bar/", default=[]), [])
+        params3 = parameters.AvocadoParams([node], ["/bar/*"])
+        self.assertNotEqual(params1, params3)
+        self.assertEqual(params3.get("timeout", default=2), 2)
+        self.assertEqual(params3.get("timeout", "/foo/", default=2), 1)
+
+    def test_pickle_not_found(self):
+        params = parameters.AvocadoParams([tree.TreeNode()], ["/run"])
+        self.assertEqual(params.get("timeout", default=1), 1)
+        params = pickle.loads(pickle.dumps(params))
+        self.assertEqual(params.get("timeout", default=2), 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,70 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.status.repo import StatusRepo
+from avocado.core.task.runtime import RuntimeTask
+from avocado.core.task.statemachine import TaskStateMachine
+from avocado.plugins.runner_nrunner import Runner
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+
+def slow_units(number, delay):
+    for index in range(number):
+        time.sleep(delay)
+        yield [RuntimeTask(Task(Runnable("noop", "noop"), f"{index}"))]
+
+
+class Feed(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.runner = Runner()
+        self.runner.tsm = TaskStateMachine([], StatusRepo(JOB_ID))
+        self.runner.tsm.expecting_tasks = True
+        self.runner._feed_error = None
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    async def _tick(self, ticks):
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    def test_feed(self):
+        test_ids = []
+        job = MagicMock()
+        ticks = []
+        ticker = self.loop.create_task(self._tick(ticks))
+        self.loop.run_until_complete(
+            self.runner._feed(job, slow_units(3, 0.1), test_ids, 10)
+        )
+        ticker.cancel()
+        self.assertEqual(len(self.runner.tsm.requested), 3)
+        self.assertEqual(job.result.tests_total, 3)
+        self.assertFalse(self.runner.tsm.expecting_tasks)
+        self.assertIsNone(self.runner._feed_error)
+        # the event loop was not held while the units were produced
+        self.assertGreater(len(ticks), 10)
+
+    def test_feed_error(self):
+        def failing_units():
+            yield from slow_units(1, 0)
+            raise ValueError("resolution failed")
+
+        self.loop.run_until_complete(
+            self.runner._feed(MagicMock(), failing_units(), [], 10)
+        )
+        self.assertEqual(len(self.runner.tsm.requested), 1)
+        self.assertIsInstance(self.runner._feed_error, ValueError)
+        self.assertFalse(self.runner.tsm.expecting_tasks)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,12 @@
 import asyncio
+import os
+import tempfile
 import unittest
 
 from avocado.core.nrunner.runnable import Runnable
 from avocado.core.nrunner.task import Task
+from avocado.core.nrunner.zygote import Zygote
+from avocado.core.settings import settings
 from avocado.core.spawners.mock import MockRandomAliveSpawner, MockSpawner
 from avocado.core.task.runtime import RuntimeTask
 from avocado.plugins.spawners.process import ProcessSpawner, ProcessSpawnerHandle
@@ -63,6 +67,93 @@ class ProcessHandle(unittest.TestCase):
             handle.wait_task.result()
 
 
+@unittest.skipUnless(hasattr(os, "fork"), "Zygotes depend on fork()")
+class ZygoteTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.zygote = Zygote("noop", "avocado.plugins.runners.noop:main")
+        self.zygote.start()
+
+    def tearDown(self):
+        self.zygote.retire()
+        self.zygote._process.wait()
+        self.loop.close()
+
+    def _spawn_and_wait(self, args):
+        async def spawn_and_wait():
+            child = await self.zygote.spawn(args)
+            return await child.wait()
+
+        return self.loop.run_until_complete(asyncio.wait_for(spawn_and_wait(), 30))
+
+    def test_returncode(self):
+        self.assertEqual(self._spawn_and_wait(["capabilities"]), 0)
+        # invalid command, causes a command line parsing error
+        self.assertEqual(self._spawn_and_wait(["bogus-command"]), 2)
+        self.assertEqual(self.zygote.spawned, 2)
+
+    def test_retire(self):
+        self.assertTrue(self.zygote.is_alive)
+        self.zygote.retire()
+        self.zygote._process.wait(30)
+        self.assertFalse(self.zygote.is_alive)
+        with self.assertRaises(OSError):
+            self._spawn_and_wait(["capabilities"])
+
+    def test_stop(self):
+        self.assertEqual(self._spawn_and_wait(["capabilities"]), 0)
+        self.zygote.stop()
+        self.assertFalse(self.zygote.is_alive)
+        self.assertIsNotNone(self.zygote._process.returncode)
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "Zygotes depend on fork()")
+class ProcessZygote(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+        config = settings.as_dict()
+        config["spawner.process.zygote"] = True
+        config["spawner.process.zygote_max_tasks"] = 2
+        self.spawner = ProcessSpawner(config)
+
+    def tearDown(self):
+        self.spawner.shutdown()
+        self.loop.close()
+        self.tmpdir.cleanup()
+
+    def _spawn(self, count):
+        async def spawn_and_wait(index):
+            runnable = Runnable("noop", "uri")
+            runnable.output_dir = os.path.join(self.tmpdir.name, str(index))
+            runtime_task = RuntimeTask(Task(runnable, str(index), status_uris=[]))
+            self.assertTrue(await self.spawner.spawn_task(runtime_task))
+            await self.spawner.wait_task(runtime_task)
+            return runtime_task.spawner_handle.process
+
+        zygotes = []
+        for index in range(count):
+            process = self.loop.run_until_complete(
+                asyncio.wait_for(spawn_and_wait(index), 30)
+            )
+            self.assertEqual(process.returncode, 0)
+            if self.spawner._zygotes["noop"] not in zygotes:
+                zygotes.append(self.spawner._zygotes["noop"])
+        return zygotes
+
+    def test_recycle(self):
+        self.assertEqual(len(self._spawn(3)), 2)
+
+    def test_shutdown(self):
+        zygotes = self._spawn(3)
+        self.spawner.shutdown()
+        self.assertEqual(self.spawner._zygotes, {})
+        for zygote in zygotes:
+            self.assertFalse(zygote.is_alive)
+
+
 class Mock(Process):
     def setUp(self):
         runnable = Runnable("noop", "uri")
@@ -1,8 +1,10 @@
 import os
+import pickle
 import stat
 import unittest.mock
 
 from avocado.core import resolver
+from avocado.core.exceptions import JobTestSuiteReferenceResolutionError
 from avocado.utils import script
 
 #: What is commonly known as "0664" or "u=rw,g=rw,o=r"
@@ -309,3 +311,78 @@ class Resolver(unittest.TestCase):
             "selftests/.data/safeloader/data/double_import.py:Test4.test4",
         ]
         self._check(exps, result[0].resolutions)
+
+
+class ParallelResolution(unittest.TestCase):
+    @staticmethod
+    def _summarize(resolutions):
+        return [
+            (
+                resolution.reference,
+                resolution.result,
+                resolution.origin,
+                [runnable.uri for runnable in resolution.resolutions],
+            )
+            for resolution in resolutions
+        ]
+
+    def test_same_as_serial(self):
+        references = [
+            os.path.join("selftests", ".data", "safeloader", "data"),
+            os.path.join("selftests", ".data", "safeloader", "data", "missing.py"),
+        ]
+        serial = resolver.resolve(references, config={"resolver.processes": 1})
+        parallel = resolver.resolve(references, config={"resolver.processes": 2})
+        self.assertGreater(len(serial), 2)
+        self.assertEqual(self._summarize(parallel), self._summarize(serial))
+
+    def test_get_resolver_processes(self):
+        self.assertEqual(resolver.get_resolver_processes({}), 1)
+        self.assertEqual(resolver.get_resolver_processes({"resolver.processes": 3}), 3)
+        self.assertEqual(
+            resolver.get_resolver_processes({"resolver.processes": 0}),
+            os.cpu_count() or 1,
+        )
+
+    def test_pickle_result(self):
+        for result in resolver.ReferenceResolutionResult:
+            self.assertIs(pickle.loads(pickle.dumps(result)), result)
+
+
+class StreamingResolution(unittest.TestCase):
+    def setUp(self):
+        self.references = [
+            os.path.join("selftests", ".data", "safeloader", "data"),
+            "/bin/true",
+        ]
+
+    def test_same_as_resolve(self):
+        summarize = ParallelResolution._summarize
+        self.assertEqual(
+            summarize(resolver.iter_resolve(self.references)),
+            summarize(resolver.resolve(self.references)),
+        )
+
+    def test_lazy(self):
+        resolutions = resolver.iter_resolve(["/bin/true", "/bin/false"])
+        with unittest.mock.patch(
+            "avocado.core.resolver.Resolver.resolve",
+            side_effect=resolver.Resolver.resolve,
+            autospec=True,
+        ) as resolve:
+            self.assertEqual(next(resolutions).reference, "/bin/true")
+            self.assertEqual(resolve.call_count, 1)
+            references = [res.reference for res in resolutions]
+            self.assertEqual(references[-1], "/bin/false")
+            self.assertEqual(resolve.call_count, 2)
+
+    def test_missing(self):
+        resolutions = resolver.iter_resolve(
+            ["/bin/true", "/this/does/not/exist"], ignore_missing=False
+        )
+        references = []
+        with self.assertRaises(JobTestSuiteReferenceResolutionError):
+            for res in resolutions:
+                references.append(res.reference)
+        self.assertIn("/bin/true", references)
+        self.assertIn("/this/does/not/exist", references)
@@ -0,0 +1,187 @@
+import os
+import tempfile
+import unittest
+
+from avocado.core import resolver, resolver_cache
+from avocado.core.safeloader import find_avocado_tests
+
+BASE = """from avocado import Test
+
+class Base(Test):
+    pass
+"""
+
+TEST = """from base import Base
+
+class Derived(Base):
+    def test_one(self):
+        pass
+"""
+
+
+class FakeEntryPoint:
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return f"{self.name} = fake:Fake"
+
+
+class FakeExtension:
+    def __init__(self, name, obj):
+        self.name = name
+        self.entry_point = FakeEntryPoint(name)
+        self.plugin = type(obj)
+        self.obj = obj
+
+
+class CountingResolver:
+    """Resolves Python files into the names of their test methods."""
+
+    cacheable = True
+
+    def __init__(self, name="counting"):
+        self.calls = 0
+        self.extensions = [FakeExtension(name, self)]
+
+    def resolve(self, reference):
+        self.calls += 1
+        try:
+            tests, _ = find_avocado_tests(reference)
+        except OSError:
+            return [
+                resolver.ReferenceResolution(
+                    reference,
+                    resolver.ReferenceResolutionResult.NOTFOUND,
+                    origin=self.extensions[0].name,
+                )
+            ]
+        return [
+            resolver.ReferenceResolution(
+                reference,
+                resolver.ReferenceResolutionResult.SUCCESS,
+                [
+                    f"{klass}.{method}"
+                    for klass, methods in sorted(tests.items())
+                    for method, _, _ in methods
+                ],
+                origin=self.extensions[0].name,
+            )
+        ]
+
+
+class ResolutionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+        self.database = os.path.join(self.tmpdir.name, "cache", "resolver.sqlite")
+        self.base = self._write("base.py", BASE)
+        self.test = self._write("test.py", TEST)
+        self.resolver = CountingResolver()
+        self.config = {"resolver.cache": True}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(content)
+        return path
+
+    def _resolve(self, reference):
+        cache = resolver_cache.ResolutionCache(
+            self.resolver, self.config, self.database
+        )
+        resolutions = cache.resolve(reference)
+        cache.save()
+        return resolutions
+
+    def test_hit(self):
+        first = self._resolve(self.test)
+        second = self._resolve(self.test)
+        self.assertEqual(self.resolver.calls, 1)
+        self.assertEqual(second[0].resolutions, ["Derived.test_one"])
+        self.assertEqual(first[0].resolutions, second[0].resolutions)
+        self.assertEqual(second[0].result, resolver.ReferenceResolutionResult.SUCCESS)
+
+    def test_changed_file(self):
+        self._resolve(self.test)
+        self._write("test.py", TEST + "\n    def test_two(self):\n        pass\n")
+        resolutions = self._resolve(self.test)
+        self.assertEqual(self.resolver.calls, 2)
+        self.assertEqual(
+            resolutions[0].resolutions, ["Derived.test_one", "Derived.test_two"]
+        )
+
+    def test_changed_dependency(self):
+        self._resolve(self.test)
+        self._write("base.py", BASE + "\n    def test_base(self):\n        pass\n")
+        resolutions = self._resolve(self.test)
+        self.assertEqual(self.resolver.calls, 2)
+        self.assertEqual(
+            resolutions[0].resolutions, ["Derived.test_one", "Derived.test_base"]
+        )
+
+    def test_changed_mode(self):
+        self._resolve(self.test)
+        os.chmod(self.test, 0o755)
+        self._resolve(self.test)
+        self.assertEqual(self.resolver.calls, 2)
+
+    def test_changed_data_dir(self):
+        self._resolve(self.test)
+        os.mkdir(f"{self.test}.data")
+        self._resolve(self.test)
+        self.assertEqual(self.resolver.calls, 2)
+
+    def test_changed_config(self):
+        self._resolve(self.test)
+        self.config["resolver.run_executables"] = True
+        self._resolve(self.test)
+        self.assertEqual(self.resolver.calls, 2)
+
+    def test_not_a_file(self):
+        reference = os.path.join(self.tmpdir.name, "missing.py")
+        self._resolve(reference)
+        self._resolve(reference)
+        self.assertEqual(self.resolver.calls, 2)
+
+    def test_not_cacheable(self):
+        self.resolver.cacheable = False
+        self._resolve(self.test)
+        self._resolve(self.test)
+        self.assertEqual(self.resolver.calls, 2)
+        self.assertEqual(resolver_cache.list_entries(self.database), {})
+
+    def test_parallel(self):
+        references = [self.base, self.test, self.test]
+        cache = resolver_cache.ResolutionCache(
+            self.resolver, self.config, self.database
+        )
+        first = resolver._resolve_parallel(self.resolver, references, {}, cache, 2)
+        cache.save()
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+        cache = resolver_cache.ResolutionCache(
+            self.resolver, self.config, self.database
+        )
+        second = resolver._resolve_parallel(self.resolver, references, {}, cache, 2)
+        self.assertEqual((cache.hits, cache.misses), (3, 0))
+        self.assertEqual(
+            [resolution.resolutions for resolution in first],
+            [[], ["Derived.test_one"], ["Derived.test_one"]],
+        )
+        self.assertEqual(
+            [resolution.resolutions for resolution in second],
+            [resolution.resolutions for resolution in first],
+        )
+
+    def test_clear(self):
+        self._resolve(self.test)
+        (references,) = resolver_cache.list_entries(self.database).values()
+        self.assertEqual(references, [self.test])
+        resolver_cache.clear(self.database)
+        self.assertFalse(os.path.exists(self.database))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -75,6 +75,21 @@ class RunnableFromAPI(unittest.TestCase):
         ]
         self.assertEqual(actual_args, exp_args)
 
+    def test_command_args_output_dir_shared(self):
+        runnable = Runnable("noop", "uri", output_dir="/out", output_dir_shared=True)
+        args = runnable.get_command_args()
+        self.assertEqual(args[-2:], ["output_dir=/out", "output_dir_shared=json:true"])
+        clone = Runnable.from_args(
+            {
+                "kind": "noop",
+                "uri": "uri",
+                "kwargs": [arg.split("=", 1) for arg in args[-2:]],
+            }
+        )
+        self.assertEqual(clone.output_dir, "/out")
+        self.assertTrue(clone.output_dir_shared)
+        self.assertEqual(clone.kwargs, {})
+
     def test_get_dict(self):
         runnable = Runnable("noop", "_uri_", "arg1", "arg2")
         self.assertEqual(
@@ -177,6 +192,21 @@ class RunnableFromRecipe(unittest.TestCase):
             runnable.default_config.get("runner.identifier_format"), "{uri}"
         )
 
+    def test_default_config_lazy(self):
+        with unittest.mock.patch.object(
+            Runnable, "filter_runnable_config", return_value={}
+        ) as filter_mock:
+            runnable = Runnable("noop", "noop")
+            filter_mock.assert_not_called()
+            self.assertEqual(runnable.config, {})
+        filter_mock.assert_called_once_with("noop", {})
+
+    def test_filter_runnable_config(self):
+        config = Runnable.filter_runnable_config(
+            "noop", {"runner.identifier_format": "noop", "other": "value"}
+        )
+        self.assertEqual(config, {"runner.identifier_format": "noop"})
+
     def test_default_and_actual_config(self):
         runnable = Runnable("noop", "noop", config={"runner.identifier_format": "noop"})
         self.assertEqual(runnable.config.get("runner.identifier_format"), "noop")
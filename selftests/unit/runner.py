@@ -1,7 +1,9 @@
 import sys
+import tempfile
 import unittest
 
 from avocado.core.nrunner.runnable import Runnable
+from avocado.plugins.runners import exec_test
 from selftests.utils import skipUnlessPathExists
 
 
@@ -70,6 +72,67 @@ class Runner(unittest.TestCase):
         self.assertEqual(last_result["returncode"], 1)
         self.assertIn("time", last_result)
 
+    def test_runner_exec_test_output_chunks(self):
+        size = exec_test.OUTPUT_CHUNK_SIZE * 4
+        runnable = Runnable(
+            "exec-test",
+            sys.executable,
+            "-c",
+            f"import sys; sys.stdout.write('x' * {size})",
+        )
+        runner = runnable.pick_runner_class()()
+        results = [status for status in runner.run(runnable)]
+        stdout = [result["log"] for result in results if result.get("type") == "stdout"]
+        self.assertGreater(len(stdout), 1)
+        self.assertTrue(
+            all(len(chunk) <= exec_test.OUTPUT_CHUNK_SIZE for chunk in stdout)
+        )
+        self.assertEqual(b"".join(stdout), b"x" * size)
+        self.assertEqual(results[-1]["result"], "pass")
+
+    def test_runner_exec_test_output_reference(self):
+        with tempfile.TemporaryDirectory(prefix="avocado_" + __name__) as output_dir:
+            runnable = Runnable(
+                "exec-test", sys.executable, "-c", "print('foo'); print('bar')"
+            )
+            runnable.output_dir = output_dir
+            runnable.output_dir_shared = True
+            runner = runnable.pick_runner_class()()
+            results = [status for status in runner.run(runnable)]
+        stdout = [result for result in results if result.get("type") == "stdout"]
+        offset = 0
+        for reference in stdout:
+            self.assertTrue(reference["log_only"])
+            self.assertEqual(reference["log_file"], "stdout")
+            self.assertEqual(reference["log_offset"], offset)
+            offset += reference["log_size"]
+        self.assertEqual(offset, len(b"foo\nbar\n"))
+        self.assertEqual(results[-3]["type"], "stdout")
+        self.assertEqual(results[-2]["type"], "stderr")
+        self.assertEqual(results[-2]["log_size"], 0)
+
+    def test_runner_exec_test_output_not_shared(self):
+        size = exec_test.OUTPUT_CHUNK_SIZE * 2
+        with tempfile.TemporaryDirectory(prefix="avocado_" + __name__) as output_dir:
+            runnable = Runnable(
+                "exec-test",
+                sys.executable,
+                "-c",
+                f"import sys; sys.stdout.write('x' * {size})",
+            )
+            runnable.output_dir = output_dir
+            runner = runnable.pick_runner_class()()
+            results = [status for status in runner.run(runnable)]
+        stdout = [result for result in results if result.get("type") == "stdout"]
+        self.assertFalse(any("log_file" in result for result in stdout))
+        self.assertTrue(
+            all(len(result["log"]) <= exec_test.OUTPUT_CHUNK_SIZE for result in stdout)
+        )
+        self.assertEqual(b"".join(result["log"] for result in stdout), b"x" * size)
+        self.assertEqual(results[-2]["type"], "stderr")
+        self.assertEqual(results[-2]["log"], b"")
+        self.assertEqual(results[-1]["result"], "pass")
+
     def test_runner_python_unittest_ok(self):
         runnable = Runnable(
             "python-unittest", "selftests/.data/unittests.py:First.test_pass"
@@ -0,0 +1,94 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from avocado.core.safeloader import find_avocado_tests, memo
+from avocado.core.safeloader.imported import ImportedSymbol
+
+BASE = """from avocado import Test
+
+class Base(Test):
+    def test_base(self):
+        pass
+
+class Middle(Base):
+    def test_middle(self):
+        pass
+"""
+
+TEST = """from base import Middle
+
+class Test{index}(Middle):
+    def test_{index}(self):
+        pass
+"""
+
+
+class Memoize(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(content)
+        return path
+
+    def test_parse(self):
+        path = self._write("module.py", "import os\n")
+        self.assertIsNot(memo.parse(path), memo.parse(path))
+        with memo.memoize():
+            tree = memo.parse(path)
+            self.assertIs(memo.parse(path), tree)
+            self._write("module.py", "import os\nimport sys\n")
+            changed = memo.parse(path)
+            self.assertIsNot(changed, tree)
+            self.assertEqual(len(changed.body), 2)
+        self.assertIsNot(memo.parse(path), changed)
+
+    def test_find_spec(self):
+        paths = [self.tmpdir.name] + sys.path
+        with memo.memoize():
+            spec = memo.find_spec("avocado", paths)
+            self.assertIs(memo.find_spec("avocado", paths), spec)
+            self.assertIsNone(memo.find_spec("non_existing_module", paths))
+        self.assertIsNot(memo.find_spec("avocado", paths), spec)
+
+    def test_nested(self):
+        path = self._write("module.py", "import os\n")
+        with memo.memoize():
+            tree = memo.parse(path)
+            with memo.memoize():
+                self.assertIs(memo.parse(path), tree)
+            self.assertIs(memo.parse(path), tree)
+
+    def test_shared_base_module(self):
+        self._write("base.py", BASE)
+        paths = [
+            self._write(f"test{index}.py", TEST.format(index=index))
+            for index in range(3)
+        ]
+        expected = [find_avocado_tests(path)[0] for path in paths]
+        with memo.memoize():
+            found = [find_avocado_tests(path)[0] for path in paths]
+        self.assertEqual(found, expected)
+        for index, tests in enumerate(found):
+            self.assertEqual(
+                [method for method, _, _ in tests[f"Test{index}"]],
+                [f"test_{index}", "test_middle", "test_base"],
+            )
+
+    def test_importable_keeps_sys_path(self):
+        sys_path = list(sys.path)
+        ImportedSymbol(
+            "base", "Base", os.path.join(self.tmpdir.name, "test.py")
+        ).is_importable()
+        self.assertEqual(sys.path, sys_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
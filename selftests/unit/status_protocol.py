@@ -0,0 +1,155 @@
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+from unittest import TestCase
+
+from avocado.core.nrunner.task import TaskStatusService
+from avocado.core.status import protocol
+from avocado.core.status.repo import StatusRepo
+from avocado.core.status.server import StatusServer
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+
+class Frame(TestCase):
+    def test_encode_decode(self):
+        messages = [
+            {"status": "running", "type": "stdout", "log": b"\x00\xffbinary\n"},
+            {"status": "running", "nested": {"log": b"nested"}, "text": "café"},
+            {"status": "finished", "result": "pass"},
+        ]
+        frame = protocol.encode_frame(messages)
+        (size,) = protocol.SIZE.unpack_from(frame)
+        self.assertEqual(size, len(frame) - protocol.SIZE.size)
+        payload = frame[protocol.SIZE.size :]
+        self.assertEqual(protocol.decode_frame_payload(payload), messages)
+
+
+class Coalesce(TestCase):
+    def setUp(self):
+        self.previous = {
+            "status": "running",
+            "type": "stdout",
+            "log": b"foo\n",
+            "time": 1.0,
+            "id": "1-test",
+        }
+
+    def _message(self, **kwargs):
+        message = dict(self.previous, time=2.0, log=b"bar\n")
+        message.update(kwargs)
+        return message
+
+    def test_same_stream(self):
+        self.assertTrue(protocol.can_coalesce(self.previous, self._message()))
+
+    def test_different_type(self):
+        message = self._message(type="stderr")
+        self.assertFalse(protocol.can_coalesce(self.previous, message))
+
+    def test_not_running(self):
+        message = self._message(status="finished")
+        self.assertFalse(protocol.can_coalesce(self.previous, message))
+
+    def test_named_logger(self):
+        message = self._message(type="log", log_name="avocado.test")
+        self.previous.update({"type": "log", "log_name": "avocado.test"})
+        self.assertFalse(protocol.can_coalesce(self.previous, message))
+
+    def test_encoded_incomplete_line(self):
+        self.previous.update({"encoding": "utf-8", "log": b"foo"})
+        message = self._message(encoding="utf-8")
+        self.assertFalse(protocol.can_coalesce(self.previous, message))
+        self.previous["log"] = b"foo\n"
+        self.assertTrue(protocol.can_coalesce(self.previous, message))
+
+
+class Negotiation(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+        self.uri = os.path.join(self.tmpdir.name, ".status_server.sock")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_fallback(self):
+        """A server that does not answer the hello gets JSON lines."""
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.uri)
+        server.listen(1)
+        service = TaskStatusService(self.uri)
+        service.NEGOTIATION_TIMEOUT = 0.1
+        self.assertTrue(service.post({"status": "running", "id": "1-test"}))
+        self.assertFalse(service.framed)
+        connection, _ = server.accept()
+        service.close()
+        received = b""
+        while True:
+            data = connection.recv(4096)
+            if not data:
+                break
+            received += data
+        connection.close()
+        server.close()
+        lines = received.splitlines(True)
+        self.assertEqual(lines[0], protocol.HELLO)
+        self.assertEqual(lines[1], b'{"status": "running", "id": "1-test"}\n')
+
+    def test_framed(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        status_repo = StatusRepo(JOB_ID)
+        status_server = StatusServer(self.uri, status_repo)
+        loop.run_until_complete(status_server.create_server())
+        result = {}
+
+        def post():
+            service = TaskStatusService(self.uri)
+            for line in (b"foo\n", b"bar\n"):
+                service.post(
+                    {
+                        "status": "running",
+                        "type": "stdout",
+                        "log": line,
+                        "time": 1.0,
+                        "id": "1-test",
+                        "job_id": JOB_ID,
+                    }
+                )
+            service.post(
+                {
+                    "status": "finished",
+                    "result": "pass",
+                    "time": 2.0,
+                    "id": "1-test",
+                    "job_id": JOB_ID,
+                }
+            )
+            result["framed"] = service.framed
+            service.close()
+
+        client = threading.Thread(target=post)
+        client.start()
+        loop.run_until_complete(
+            asyncio.wait_for(status_repo.wait_task_finished("1-test"), 10)
+        )
+        client.join()
+        # let the connection handler notice the client is gone
+        loop.run_until_complete(asyncio.sleep(0.1))
+        status_server.close()
+        loop.close()
+        self.assertTrue(result["framed"])
+        self.assertEqual(
+            status_repo.get_all_task_data("1-test"),
+            [
+                {
+                    "status": "running",
+                    "type": "stdout",
+                    "log": b"foo\nbar\n",
+                    "time": 1.0,
+                },
+                {"status": "finished", "result": "pass", "time": 2.0},
+            ],
+        )
@@ -1,6 +1,8 @@
+import asyncio
 from unittest import TestCase
 
 from avocado.core.status import repo, utils
+from avocado.core.test_id import TestID
 
 
 class StatusRepo(TestCase):
@@ -63,6 +65,39 @@ class StatusRepo(TestCase):
         )
         self.assertEqual(self.status_repo._by_result.get("pass"), ["1-foo"])
 
+    def test_result_stats(self):
+        for task_id, result in (
+            ("1-foo", "pass"),
+            ("2-bar", "fail"),
+            ("3-baz", "pass"),
+            ("3-baz", "pass"),
+        ):
+            msg = {"id": task_id, "status": "finished", "result": result}
+            self.status_repo._handle_task_finished(msg)
+        self.assertEqual(self.status_repo.result_stats, {"pass": 2, "fail": 1})
+        self.assertEqual(self.status_repo._by_result.get("pass"), ["1-foo", "3-baz"])
+
+    def test_get_result_set_for_tasks(self):
+        for task_id, result in (("1-foo", "pass"), ("2-bar", "fail"), ("3-baz", None)):
+            msg = {"id": task_id, "status": "finished", "result": result}
+            self.status_repo._handle_task_finished(msg)
+        self.assertEqual(
+            self.status_repo.get_result_set_for_tasks(["1-foo", "3-baz", "4-new"]),
+            {"pass", None},
+        )
+        self.assertEqual(self.status_repo.get_result_set_for_tasks([]), set())
+
+    def test_get_result_set_for_tasks_test_id(self):
+        for task_id, result in (("1-foo", "pass"), ("2-bar", "fail")):
+            msg = {"id": task_id, "status": "finished", "result": result}
+            self.status_repo._handle_task_finished(msg)
+        self.assertEqual(
+            self.status_repo.get_result_set_for_tasks(
+                [TestID(1, "foo"), TestID(2, "bar"), TestID(3, "baz")]
+            ),
+            {"pass", "fail"},
+        )
+
     def test_process_message_running(self):
         msg = {
             "id": "1-foo",
@@ -211,3 +246,47 @@ class StatusRepo(TestCase):
         )
         with self.assertRaises(IndexError):
             self.status_repo.status_journal_summary_pop()
+
+    def test_subscribe(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        queue = self.status_repo.subscribe()
+        msg = {
+            "id": "1-foo",
+            "status": "started",
+            "time": 1000000001.0,
+            "output_dir": "/fake/path",
+            "job_id": "0000000000000000000000000000000000000000",
+        }
+        self.status_repo.process_message(msg)
+        # messages without a status are not status updates
+        msg = {
+            "id": "1-foo",
+            "log": "foo",
+            "job_id": "0000000000000000000000000000000000000000",
+        }
+        self.status_repo.process_message(msg)
+        msg = {
+            "id": "1-foo",
+            "status": "finished",
+            "time": 1000000002.0,
+            "result": "pass",
+            "job_id": "0000000000000000000000000000000000000000",
+        }
+        self.status_repo.process_message(msg)
+        self.assertEqual(
+            loop.run_until_complete(queue.get()),
+            (
+                "1-foo",
+                {"status": "started", "time": 1000000001.0, "output_dir": "/fake/path"},
+            ),
+        )
+        self.assertEqual(
+            loop.run_until_complete(queue.get()),
+            ("1-foo", {"status": "finished", "time": 1000000002.0, "result": "pass"}),
+        )
+        self.assertTrue(queue.empty())
+        with self.assertRaises(IndexError):
+            self.status_repo.status_journal_summary_pop()
+        self.status_repo.unsubscribe(queue)
+        loop.close()
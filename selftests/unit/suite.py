@@ -1,7 +1,9 @@
 import tempfile
 import unittest.mock
 
+from avocado.core.nrunner.runnable import Runnable
 from avocado.core.suite import TestSuite
+from avocado.core.tree import TreeNode
 from avocado.utils import path as utils_path
 from selftests.utils import setup_avocado_loggers, temp_dir_prefix
 
@@ -96,6 +98,81 @@ class TestSuiteTest(unittest.TestCase):
         runnable = suite.tests[0]
         self.assertEqual(runnable.config.get("runner.identifier_format"), "nothing-op")
 
+    def test_config_runnable_shared(self):
+        config = {
+            "resolver.references": [
+                "examples/nrunner/recipes/runnable/noop.json",
+                "examples/nrunner/recipes/runnable/noop.json",
+            ],
+            "runner.identifier_format": "NOT FOO",
+        }
+        suite = TestSuite.from_config(config)
+        first, second = suite.tests
+        self.assertIsNot(first, second)
+        self.assertIs(first.default_config, second.default_config)
+        self.assertEqual(first.config.get("runner.identifier_format"), "NOT FOO")
+
+    def test_streaming(self):
+        config = {
+            "resolver.references": [
+                "examples/nrunner/recipes/runnable/noop.json",
+                "examples/nrunner/recipes/runnable/noop_config.json",
+            ],
+            "run.streaming": True,
+        }
+        suite = TestSuite.from_config(config)
+        self.assertTrue(suite.streaming)
+        self.assertEqual(suite.size, 1)
+        self.assertEqual([test.kind for test in suite.tests], ["noop", "noop"])
+        self.assertEqual(suite.size, 2)
+
+    def test_streaming_same_as_materialized(self):
+        config = {
+            "resolver.references": ["examples/tests/passtest.py", "/bin/true"],
+            "run.test_parameters": [("foo", "bar")],
+        }
+        expected = TestSuite.from_config(config).tests
+        config["run.streaming"] = True
+        tests = list(TestSuite.from_config(config).tests)
+        self.assertEqual(
+            [(test.uri, test.variant) for test in tests],
+            [(test.uri, test.variant) for test in expected],
+        )
+
+    def test_streaming_apply(self):
+        config = {
+            "resolver.references": ["/bin/true", "/bin/false"],
+            "run.streaming": True,
+            "run.dry_run.enabled": True,
+        }
+        suite = TestSuite.from_config(config)
+        self.assertEqual([test.kind for test in suite.tests], ["dry-run", "dry-run"])
+
+    def test_variants_per_test_lazy(self):
+        produced = []
+
+        def itertests():
+            for index in range(3):
+                node = TreeNode().get_node(f"/run/variant{index}", True)
+                node.value = {"index": index}
+                produced.append(index)
+                yield {"variant": [node], "variant_id": index, "paths": ["/run/*"]}
+
+        tests = [Runnable("noop", "first"), Runnable("noop", "second")]
+        suite = TestSuite("variants", {"run.execution_order": "variants-per-test"})
+        suite._variants = unittest.mock.Mock(itertests=itertests)
+        test_variants = suite._iter_test_variants(tests)
+        first = next(test_variants)
+        self.assertEqual(produced, [0])
+        self.assertEqual(first.uri, "first")
+        rest = list(test_variants)
+        self.assertEqual(produced, [0, 1, 2])
+        self.assertEqual(
+            [(test.uri, test.variant["variant_id"]) for test in [first] + rest],
+            [(uri, index) for uri in ("first", "second") for index in range(3)],
+        )
+        self.assertIs(rest[2].variant, first.variant)
+
     def tearDown(self):
         self.tmpdir.cleanup()
 
@@ -3,6 +3,7 @@ import stat
 import unittest
 
 from avocado.core import resolver, tags
+from avocado.core.nrunner.runnable import Runnable
 from avocado.utils import script
 from selftests.utils import BASEDIR
 
@@ -357,6 +358,50 @@ class TagInheritance(unittest.TestCase):
         self.assertEqual(boo_tag[2].uri, f"{self.input_file_path}:DerivedTwo.test_two")
 
 
+class TagIndex(unittest.TestCase):
+    def setUp(self):
+        self.runnables = [
+            Runnable("noop", "arch-x86_64", tags={"arch": {"x86_64"}}),
+            Runnable("noop", "no-tags"),
+            Runnable("noop", "arch", tags={"arch": None, "fast": None}),
+            Runnable("noop", "fast", tags={"fast": None}),
+            Runnable("noop", "arch-aarch64", tags={"arch": {"aarch64"}}),
+        ]
+        self.index = tags.TagIndex(self.runnables)
+
+    def _filter(self, filter_by_tags, include_empty=False, include_empty_key=False):
+        return [
+            runnable.uri
+            for runnable in self.index.filter(
+                filter_by_tags, include_empty, include_empty_key
+            )
+        ]
+
+    def test_order(self):
+        self.assertEqual(
+            self._filter(["fast", "arch:aarch64", "arch:x86_64"], True),
+            ["arch-x86_64", "no-tags", "arch", "fast", "arch-aarch64"],
+        )
+
+    def test_key_val(self):
+        self.assertEqual(self._filter(["arch:-x86_64"]), ["arch", "arch-aarch64"])
+        self.assertEqual(
+            self._filter(["arch:-x86_64"], include_empty_key=True),
+            ["arch", "fast", "arch-aarch64"],
+        )
+        self.assertEqual(
+            self._filter(["arch:x86_64"], include_empty_key=True),
+            ["arch-x86_64", "fast"],
+        )
+        self.assertEqual(
+            self._filter(["arch:x86_64,-fast", "fast,-arch"]),
+            [
+                "arch-x86_64",
+                "fast",
+            ],
+        )
+
+
 class ParseFilterByTags(unittest.TestCase):
     def test_must(self):
         self.assertEqual(
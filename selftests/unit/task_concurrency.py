@@ -0,0 +1,161 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.spawners.mock import MockSpawner
+from avocado.core.status.repo import StatusRepo
+from avocado.core.task import concurrency, statemachine
+from avocado.core.task.runtime import RuntimeTask, RuntimeTaskStatus
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+PRESSURE = """some avg10=12.50 avg60=3.00 avg300=1.00 total=123456
+full avg10=1.25 avg60=0.30 avg300=0.10 total=12345
+"""
+
+MEMINFO = """MemTotal:       16000000 kB
+MemFree:         2000000 kB
+MemAvailable:    8000000 kB
+"""
+
+
+def idle(memory_available=8000000):
+    return concurrency.SystemLoad(
+        load=0.1,
+        memory_total=16000000,
+        memory_available=memory_available,
+        pressure={"cpu": 0.0, "memory": 0.0, "io": 0.0},
+    )
+
+
+class Readings(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(content)
+        return path
+
+    def test_pressure(self):
+        self._write("memory", PRESSURE)
+        self.assertEqual(concurrency.read_pressure("memory", self.tmpdir.name), 12.5)
+
+    def test_pressure_unsupported(self):
+        self.assertIsNone(concurrency.read_pressure("memory", self.tmpdir.name))
+
+    def test_memory(self):
+        path = self._write("meminfo", MEMINFO)
+        self.assertEqual(concurrency.read_memory(path), (16000000, 8000000))
+
+    def test_memory_unsupported(self):
+        path = os.path.join(self.tmpdir.name, "meminfo")
+        self.assertEqual(concurrency.read_memory(path), (None, None))
+
+
+class Controller(unittest.TestCase):
+    def test_bounds(self):
+        controller = concurrency.ConcurrencyController(2, 8, 16)
+        self.assertEqual(controller.limit, 8)
+        controller = concurrency.ConcurrencyController(2, 8, 1)
+        self.assertEqual(controller.limit, 2)
+        controller = concurrency.ConcurrencyController(0, 0)
+        self.assertEqual((controller.minimum, controller.maximum), (1, 1))
+
+    def test_grow(self):
+        controller = concurrency.ConcurrencyController(1, 3, 2)
+        self.assertTrue(controller.update(idle(), 2))
+        self.assertEqual(controller.limit, 3)
+        self.assertFalse(controller.update(idle(), 3))
+        self.assertEqual(controller.limit, 3)
+
+    def test_grow_only_when_saturated(self):
+        controller = concurrency.ConcurrencyController(1, 8, 4)
+        self.assertFalse(controller.update(idle(), 3))
+        self.assertEqual(controller.limit, 4)
+
+    def test_grow_unknown_load(self):
+        controller = concurrency.ConcurrencyController(1, 8, 4)
+        self.assertTrue(controller.update(concurrency.SystemLoad(), 4))
+        self.assertEqual(controller.limit, 5)
+
+    def test_shrink(self):
+        controller = concurrency.ConcurrencyController(1, 16, 16)
+        load = idle()
+        load.load = concurrency.LOAD_SHRINK + 1
+        self.assertTrue(controller.update(load, 16))
+        self.assertEqual(controller.limit, 12)
+
+    def test_shrink_pressure(self):
+        controller = concurrency.ConcurrencyController(3, 16, 4)
+        load = idle()
+        load.pressure["memory"] = 50.0
+        self.assertTrue(controller.update(load, 0))
+        self.assertEqual(controller.limit, 3)
+        self.assertFalse(controller.update(load, 0))
+        self.assertEqual(controller.limit, 3)
+
+    def test_shrink_memory(self):
+        controller = concurrency.ConcurrencyController(1, 16, 8)
+        self.assertTrue(controller.update(idle(memory_available=1000000), 8))
+        self.assertEqual(controller.limit, 6)
+
+    def test_hold_busy(self):
+        controller = concurrency.ConcurrencyController(1, 16, 8)
+        load = idle()
+        load.pressure["io"] = 30.0
+        self.assertFalse(controller.update(load, 8))
+        self.assertEqual(controller.limit, 8)
+
+    def test_task_memory(self):
+        controller = concurrency.ConcurrencyController(1, 16, 4)
+        self.assertFalse(controller.update(idle(memory_available=14000000), 0))
+        # each of the 4 tasks is estimated to use 1500000 kB, so there's
+        # room for one more while keeping 25% of the memory available
+        self.assertTrue(controller.update(idle(memory_available=8000000), 4))
+        self.assertEqual(controller.limit, 5)
+        # but not after they grow to 1800000 kB each
+        self.assertFalse(controller.update(idle(memory_available=5000000), 5))
+        self.assertEqual(controller.limit, 5)
+
+
+class WorkerLimit(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.status_repo = StatusRepo(JOB_ID)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_running_limit(self):
+        runnable = Runnable("noop", "noop")
+        monitored, ready = [RuntimeTask(Task(runnable, name)) for name in "ab"]
+        state_machine = statemachine.TaskStateMachine([], self.status_repo)
+        state_machine.monitored.append(monitored)
+        state_machine.ready.append(ready)
+        controller = concurrency.ConcurrencyController(1, 2, 1)
+        worker = statemachine.Worker(
+            state_machine,
+            MockSpawner(),
+            max_running=8,
+            event_driven=True,
+            concurrency=controller,
+        )
+        self.assertFalse(self.loop.run_until_complete(worker.start()))
+        self.assertEqual(ready.status, RuntimeTaskStatus.WAIT)
+        self.assertEqual(state_machine.ready, [ready])
+        controller.limit = 2
+        self.assertTrue(self.loop.run_until_complete(worker.start()))
+        self.assertEqual(state_machine.started, [ready])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import json
+import os
+import tempfile
+import unittest
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.task import durations
+from avocado.core.task.runtime import RuntimeTask
+from avocado.core.test_id import TestID
+
+
+def get_runtime_task(uid, name, variant=None, category="test"):
+    if variant is not None:
+        variant = {"variant_id": variant}
+    return RuntimeTask(
+        Task(
+            Runnable("noop", "noop"),
+            TestID(uid, name, variant),
+            category=category,
+        )
+    )
+
+
+class Results(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write_results(self, job, tests, mtime):
+        job_dir = os.path.join(self.tmpdir.name, job)
+        os.mkdir(job_dir)
+        path = os.path.join(job_dir, "results.json")
+        with open(path, "w", encoding="utf-8") as results_file:
+            json.dump({"tests": tests}, results_file)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_find_results(self):
+        oldest = self._write_results("job-1", [], 1000)
+        newer = self._write_results("job-2", [], 2000)
+        newest = self._write_results("job-3", [], 3000)
+        self.assertEqual(
+            durations.find_results(self.tmpdir.name, 5), [oldest, newer, newest]
+        )
+        self.assertEqual(durations.find_results(self.tmpdir.name, 2), [newer, newest])
+        self.assertEqual(
+            durations.find_results(
+                self.tmpdir.name, 2, exclude=os.path.dirname(newest)
+            ),
+            [oldest, newer],
+        )
+        self.assertEqual(durations.find_results(self.tmpdir.name, 0), [])
+
+    def test_load_durations(self):
+        first = self._write_results(
+            "job-1",
+            [
+                {"name": "a", "status": "PASS", "time_elapsed": 10.0},
+                {"name": "b;v1", "status": "FAIL", "time_elapsed": 4.0},
+                {"name": "c", "status": "SKIP", "time_elapsed": 0},
+            ],
+            1000,
+        )
+        second = self._write_results(
+            "job-2",
+            [
+                {"name": "a", "status": "PASS", "time_elapsed": 20.0},
+                {"name": "d", "status": "ERROR", "time_elapsed": -1},
+            ],
+            2000,
+        )
+        broken = os.path.join(self.tmpdir.name, "broken.json")
+        with open(broken, "w", encoding="utf-8") as broken_file:
+            broken_file.write("{")
+        self.assertEqual(
+            durations.load_durations([first, second, broken]),
+            {"a": 15.0, "b;v1": 4.0},
+        )
+
+
+class Order(unittest.TestCase):
+    def test_get_test_name(self):
+        self.assertEqual(durations.get_test_name(get_runtime_task(1, "a")), "a")
+        self.assertEqual(
+            durations.get_test_name(get_runtime_task(1, "a", "v1")), "a;v1"
+        )
+        requirement = get_runtime_task(1, "a", category="requirement")
+        self.assertIsNone(durations.get_test_name(requirement))
+
+    def test_longest_first(self):
+        short, unknown, long = [
+            get_runtime_task(uid, name)
+            for uid, name in enumerate(("short", "unknown", "long"), start=1)
+        ]
+        ordered = durations.order_longest_first(
+            [short, unknown, long], {"short": 1.0, "long": 9.0}
+        )
+        # unknown tests are assumed to take the average
+        self.assertEqual(ordered, [long, unknown, short])
+
+    def test_dependencies(self):
+        requirement = get_runtime_task(1, "requirement", category="requirement")
+        short, medium, long = [
+            get_runtime_task(uid, name)
+            for uid, name in enumerate(("short", "medium", "long"), start=2)
+        ]
+        short.dependencies.append(requirement)
+        long.dependencies.append(requirement)
+        ordered = durations.order_longest_first(
+            [requirement, short, medium, long],
+            {"short": 1.0, "medium": 8.0, "long": 9.0},
+        )
+        # the requirement, and the tests depending on it, are kept
+        # together, and on their original order
+        self.assertEqual(ordered, [requirement, short, long, medium])
+
+    def test_no_durations(self):
+        runtime_tasks = [get_runtime_task(uid, "test") for uid in range(5)]
+        self.assertEqual(
+            durations.order_longest_first(runtime_tasks, {}), runtime_tasks
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,11 @@ from unittest import TestCase
 from avocado.core.nrunner.runnable import Runnable
 from avocado.core.nrunner.task import Task
 from avocado.core.suite import TestSuite
-from avocado.core.task.runtime import RuntimeTask, RuntimeTaskGraph
+from avocado.core.task.runtime import (
+    RuntimeTask,
+    RuntimeTaskGraph,
+    iter_runtime_tasks,
+)
 from avocado.utils import script
 from selftests.utils import TestCaseTmpDir
 
@@ -90,3 +94,29 @@ class DependencyGraph(TestCaseTmpDir):
             self.assertTrue(runtime_tests[3].task.identifier.name.endswith("hello"))
             self.assertTrue(runtime_tests[4].task.identifier.name.endswith("-foo-bar-"))
             self.assertTrue(runtime_tests[5].task.identifier.name.endswith("test_c"))
+
+    def test_iter_runtime_tasks(self):
+        with script.Script(
+            os.path.join(self.tmpdir.name, "test_multiple_dependencies.py"),
+            MULTIPLE_REQUIREMENT,
+        ) as test:
+            config = {"resolver.references": [test.path]}
+            suite = TestSuite.from_config(config=config)
+            graph = RuntimeTaskGraph(suite.tests, suite.name, 1, "", "")
+            units = iter_runtime_tasks(suite.tests, suite.name, 1, "", "")
+            self.assertEqual(
+                [len(unit) for unit in units],
+                [2, 1, 3],
+            )
+            streamed = [
+                str(runtime_task.task.identifier)
+                for unit in iter_runtime_tasks(suite.tests, suite.name, 1, "", "")
+                for runtime_task in unit
+            ]
+            self.assertEqual(
+                streamed,
+                [
+                    str(runtime_task.task.identifier)
+                    for runtime_task in graph.get_tasks_in_topological_order()
+                ],
+            )
@@ -0,0 +1,161 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.spawners.mock import MockSpawner
+from avocado.core.status.repo import StatusRepo
+from avocado.core.status.server import StatusServer
+from avocado.core.task import shards
+from avocado.core.task.runtime import RuntimeTask
+from avocado.core.utils import messages
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+
+class MockPostingSpawner(MockSpawner):
+    """Spawner whose tasks post their messages to their status services."""
+
+    async def spawn_task(self, runtime_task):
+        await super().spawn_task(runtime_task)
+        # just like a task process, the messages are not posted from the
+        # event loop that runs the status server
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._post_messages, runtime_task)
+        return True
+
+    @staticmethod
+    def _post_messages(runtime_task):
+        task_id = str(runtime_task.task.identifier)
+        for message in (
+            messages.StartedMessage.get(
+                output_dir=runtime_task.task.runnable.output_dir
+            ),
+            messages.StdoutMessage.get(b"output\n"),
+            messages.WhiteboardMessage.get(b"whiteboard"),
+            messages.FinishedMessage.get("pass"),
+        ):
+            message.update(id=task_id, job_id=JOB_ID)
+            for status_service in runtime_task.task.status_services:
+                status_service.post(message)
+        for status_service in runtime_task.task.status_services:
+            status_service.close()
+
+    async def wait_task(self, runtime_task):
+        pass
+
+
+def get_runtime_tasks(number):
+    return [
+        RuntimeTask(Task(Runnable("noop", "noop"), f"{index:03}"))
+        for index in range(number)
+    ]
+
+
+class Partition(unittest.TestCase):
+    def test_independent(self):
+        runtime_tasks = get_runtime_tasks(3)
+        units = shards.partition(runtime_tasks)
+        self.assertEqual(units, [[runtime_task] for runtime_task in runtime_tasks])
+
+    def test_dependencies(self):
+        first, second, third, fourth = get_runtime_tasks(4)
+        # "first" and "third" are only related through "fourth"
+        first.dependencies.append(fourth)
+        third.dependencies.append(fourth)
+        units = shards.partition([fourth, first, second, third])
+        self.assertEqual(units, [[fourth, first, third], [second]])
+
+
+class WorkQueues(unittest.TestCase):
+    def test_own_queue(self):
+        queues = shards.WorkQueues(list(range(6)), 2)
+        self.assertEqual(queues.take(0, 2), [0, 1])
+        self.assertEqual(queues.take(1, 2), [3, 4])
+        self.assertEqual(queues.stolen, 0)
+        self.assertEqual(len(queues), 2)
+
+    def test_steal(self):
+        queues = shards.WorkQueues(list(range(8)), 2)
+        self.assertEqual(queues.take(0, 4), [0, 1, 2, 3])
+        # half of the fullest queue, from its end, is stolen
+        self.assertEqual(queues.take(0, 4), [6, 7])
+        self.assertEqual(queues.stolen, 2)
+        self.assertEqual(queues.take(1, 4), [4, 5])
+        self.assertEqual(queues.take(0, 4), [])
+        self.assertEqual(queues.take(1, 4), [])
+
+    def test_clear(self):
+        queues = shards.WorkQueues(list(range(4)), 2)
+        queues.clear()
+        self.assertEqual(queues.take(0, 1), [])
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "Shards require process forking")
+class Coordinator(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+        self.tmpdir.cleanup()
+
+    def test_run(self):
+        runtime_tasks = get_runtime_tasks(20)
+        for runtime_task in runtime_tasks:
+            runtime_task.task.setup_output_dir(
+                os.path.join(self.tmpdir.name, str(runtime_task.task.identifier))
+            )
+            os.makedirs(runtime_task.task.runnable.output_dir)
+        status_repo = StatusRepo(JOB_ID)
+        status_server = StatusServer(
+            os.path.join(self.tmpdir.name, ".status_server.sock"), status_repo
+        )
+        self.loop.run_until_complete(status_server.create_server())
+        units = shards.partition(runtime_tasks)
+        coordinator = shards.Coordinator(
+            [
+                shards.Shard(
+                    index,
+                    os.path.join(self.tmpdir.name, f".status_server_{index}.sock"),
+                    status_server.uri,
+                    JOB_ID,
+                    units,
+                    MockPostingSpawner(),
+                    2,
+                )
+                for index in range(3)
+            ],
+            units,
+        )
+        coordinator.start()
+        self.loop.run_until_complete(asyncio.wait_for(coordinator.wait(), 30))
+        self.loop.run_until_complete(
+            asyncio.wait_for(
+                status_repo.wait_tasks_finished(
+                    [str(rt.task.identifier) for rt in runtime_tasks]
+                ),
+                10,
+            )
+        )
+        status_server.close()
+        self.assertEqual(coordinator.interrupted_reasons, [])
+        for runtime_task in runtime_tasks:
+            task_id = str(runtime_task.task.identifier)
+            self.assertEqual(status_repo.get_task_status(task_id), "finished")
+            # only the messages that are not saved by the shards are forwarded
+            self.assertEqual(
+                [data["status"] for data in status_repo.get_all_task_data(task_id)],
+                ["started", "running", "finished"],
+            )
+            debug_log = os.path.join(runtime_task.task.runnable.output_dir, "debug.log")
+            with open(debug_log, "rb") as log:
+                self.assertEqual(log.read(), b"[stdout] output\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import asyncio
+import unittest
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.spawners.mock import MockSpawner
+from avocado.core.status.repo import StatusRepo
+from avocado.core.task import statemachine
+from avocado.core.task.runtime import RuntimeTask, RuntimeTaskStatus
+from avocado.core.utils import messages
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+
+class MockFinishingSpawner(MockSpawner):
+    """Spawner whose tasks immediately report being finished to a repo."""
+
+    def __init__(self, status_repo):
+        super().__init__()
+        self._status_repo = status_repo
+
+    async def spawn_task(self, runtime_task):
+        await super().spawn_task(runtime_task)
+        loop = asyncio.get_event_loop()
+        loop.call_soon(self._finish, runtime_task)
+        return True
+
+    def _finish(self, runtime_task):
+        task_id = str(runtime_task.task.identifier)
+        self._status_repo.process_message(
+            messages.StartedMessage.get(output_dir="/fake", id=task_id, job_id=JOB_ID)
+        )
+        self._status_repo.process_message(
+            messages.FinishedMessage.get("pass", id=task_id, job_id=JOB_ID)
+        )
+
+    async def wait_task(self, runtime_task):
+        pass
+
+
+class EventDriven(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.status_repo = StatusRepo(JOB_ID)
+        self.spawner = MockFinishingSpawner(self.status_repo)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def _run(self, runtime_tasks, number_of_workers=4):
+        state_machine = statemachine.TaskStateMachine(runtime_tasks, self.status_repo)
+        workers = [
+            statemachine.Worker(
+                state_machine,
+                self.spawner,
+                max_triaging=len(runtime_tasks),
+                max_running=2,
+                event_driven=True,
+            ).run()
+            for _ in range(number_of_workers)
+        ]
+        self.loop.run_until_complete(asyncio.wait_for(asyncio.gather(*workers), 10))
+        return state_machine
+
+    def test_all_finished(self):
+        runnable = Runnable("noop", "noop")
+        runtime_tasks = [RuntimeTask(Task(runnable, f"{i:03}")) for i in range(50)]
+        state_machine = self._run(runtime_tasks)
+        self.assertEqual(len(state_machine.finished), 50)
+        for runtime_task in runtime_tasks:
+            self.assertEqual(runtime_task.status, RuntimeTaskStatus.FINISHED)
+            self.assertEqual(runtime_task.result, "pass")
+
+    def test_dependencies(self):
+        runnable = Runnable("noop", "noop")
+        dependency = RuntimeTask(Task(runnable, "dependency"))
+        runtime_tasks = [RuntimeTask(Task(runnable, f"{i:03}")) for i in range(10)]
+        for runtime_task in runtime_tasks:
+            runtime_task.dependencies.append(dependency)
+        # dependent tasks are requested first, so they have to wait
+        state_machine = self._run(runtime_tasks + [dependency], number_of_workers=2)
+        self.assertEqual(len(state_machine.finished), 11)
+        self.assertIs(state_machine.finished[0], dependency)
+
+    def test_wait_for_change(self):
+        state_machine = statemachine.TaskStateMachine([], self.status_repo)
+        generation = state_machine.generation
+
+        async def change_later():
+            await asyncio.sleep(0)
+            state_machine.notify_change()
+
+        self.loop.create_task(change_later())
+        self.loop.run_until_complete(
+            asyncio.wait_for(state_machine.wait_for_change(generation), 10)
+        )
+        self.assertNotEqual(generation, state_machine.generation)
+        # an already seen change should not block
+        self.loop.run_until_complete(
+            asyncio.wait_for(state_machine.wait_for_change(generation), 10)
+        )
+
+    def test_extend(self):
+        runnable = Runnable("noop", "noop")
+        runtime_tasks = [RuntimeTask(Task(runnable, f"{i:03}")) for i in range(10)]
+        state_machine = statemachine.TaskStateMachine([], self.status_repo)
+        state_machine.expecting_tasks = True
+
+        async def feed():
+            for runtime_task in runtime_tasks:
+                await asyncio.sleep(0)
+                await state_machine.extend([runtime_task])
+            state_machine.stop_expecting_tasks()
+
+        workers = [
+            statemachine.Worker(state_machine, self.spawner, event_driven=True).run()
+            for _ in range(2)
+        ]
+        self.loop.run_until_complete(
+            asyncio.wait_for(asyncio.gather(feed(), *workers), 10)
+        )
+        self.assertEqual(state_machine.task_size, 10)
+        self.assertEqual(len(state_machine.finished), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
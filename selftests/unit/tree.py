@@ -71,3 +71,18 @@ class TreeNode(unittest.TestCase):
         self.assertTrue(tree.TreeNode().is_leaf)
         self.assertTrue(tree.TreeNode(value={"foo": "bar"}).is_leaf)
         self.assertFalse(tree.TreeNode(children=[tree.TreeNode()]).is_leaf)
+
+    def test_environment_shares_parent(self):
+        child = tree.TreeNode(name="child", value={"foo": "child", "baz": 1})
+        parent = tree.TreeNode(
+            name="parent", value={"foo": "parent", "bar": 2}, children=[child]
+        )
+        child.filters[1].append("/out")
+        env = child.environment
+        self.assertIs(env.maps[1], parent.environment.maps[0])
+        self.assertEqual(list(env.items()), [("foo", "child"), ("bar", 2), ("baz", 1)])
+        self.assertIs(env.origin["foo"], child)
+        self.assertIs(env.origin["bar"], parent)
+        self.assertEqual(parent.environment, {"foo": "parent", "bar": 2})
+        self.assertEqual(env.filter_out, {"/out/"})
+        self.assertEqual(parent.environment.filter_out, set())
@@ -0,0 +1,156 @@
+import os
+import tempfile
+import unittest.mock
+
+from avocado.core import tree, varianter, varianter_cache
+
+
+class FakeEntryPoint:
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return f"{self.name} = fake:Fake"
+
+
+class FakeExtension:
+    def __init__(self, name, obj):
+        self.name = name
+        self.entry_point = FakeEntryPoint(name)
+        self.plugin = type(obj)
+        self.obj = obj
+
+
+class FakeDispatcher:
+    def __init__(self, *plugins):
+        self.extensions = [FakeExtension(plugin.name, plugin) for plugin in plugins]
+
+    def map_method_with_return(self, method_name, *args, **kwargs):
+        return [
+            getattr(ext.obj, method_name)(*args, **kwargs)
+            for ext in self.extensions
+            if hasattr(ext.obj, method_name)
+        ]
+
+
+class CountingVarianter:
+    """Produces one variant per line of a file, with the line as value."""
+
+    name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+        self.lines = []
+        self.path = None
+
+    def initialize(self, config):
+        self.calls += 1
+        self.path = config.get("counting.file")
+        with open(self.path, encoding="utf-8") as input_file:
+            self.lines = input_file.read().splitlines()
+
+    def get_cache_key(self, config):
+        return config.get("counting.file")
+
+    def get_cache_files(self):
+        return [self.path]
+
+    def __iter__(self):
+        for index, line in enumerate(self.lines):
+            node = tree.TreeNode().get_node(f"/run/line{index}", True)
+            node.value = {"line": line}
+            yield {"variant_id": line, "variant": [node], "paths": ["/run/*"]}
+
+    def __len__(self):
+        return len(self.lines)
+
+
+class NotCacheableVarianter(CountingVarianter):
+
+    name = "not_cacheable"
+
+    def get_cache_key(self, config):
+        return None
+
+
+class VariantsCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+        self.database = os.path.join(self.tmpdir.name, "cache", "varianter.sqlite")
+        self.path = self._write("variants.txt", "foo\nbar\n")
+        self.config = {"variants.cache": True, "counting.file": self.path}
+        self.plugin = CountingVarianter()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(content)
+        return path
+
+    def _parse(self, *plugins):
+        variants = varianter.Varianter()
+        variants._variant_plugins = FakeDispatcher(*(plugins or [self.plugin]))
+        with unittest.mock.patch(
+            "avocado.core.varianter_cache.get_database_path",
+            return_value=self.database,
+        ):
+            variants.parse(self.config)
+        return variants
+
+    def test_hit(self):
+        first = self._parse()
+        second = self._parse()
+        self.assertEqual(self.plugin.calls, 1)
+        self.assertEqual(len(second), 2)
+        self.assertEqual(second.dump(), first.dump())
+        self.assertEqual(
+            [variant["variant_id"] for variant in second.itertests()], ["foo", "bar"]
+        )
+
+    def test_changed_file(self):
+        self._parse()
+        self._write("variants.txt", "foo\nbar\nbaz\n")
+        variants = self._parse()
+        self.assertEqual(self.plugin.calls, 2)
+        self.assertEqual(len(variants), 3)
+
+    def test_changed_config(self):
+        self._parse()
+        self.config["counting.file"] = self._write("other.txt", "foo\nbar\n")
+        self._parse()
+        self.assertEqual(self.plugin.calls, 2)
+
+    def test_disabled(self):
+        self.config["variants.cache"] = False
+        self._parse()
+        self._parse()
+        self.assertEqual(self.plugin.calls, 2)
+        self.assertFalse(os.path.exists(self.database))
+
+    def test_not_cacheable(self):
+        not_cacheable = NotCacheableVarianter()
+        self._parse(self.plugin, not_cacheable)
+        self._parse(self.plugin, not_cacheable)
+        self.assertEqual(self.plugin.calls, 2)
+        self.assertEqual(varianter_cache.list_entries(self.database), {})
+
+    def test_no_variants(self):
+        self._write("variants.txt", "")
+        self._parse()
+        variants = self._parse()
+        self.assertEqual(self.plugin.calls, 2)
+        self.assertEqual(len(variants), 0)
+
+    def test_clear(self):
+        self._parse()
+        (files,) = varianter_cache.list_entries(self.database).values()
+        self.assertEqual(files, [self.path])
+        varianter_cache.clear(self.database)
+        self.assertFalse(os.path.exists(self.database))
+
+
+if __name__ == "__main__":
+    unittest.main()
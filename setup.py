@@ -393,6 +393,7 @@ if __name__ == "__main__":
                 "dict_variants = avocado.plugins.dict_variants:DictVariantsInit",
                 "json_variants = avocado.plugins.json_variants:JsonVariantsInit",
                 "run = avocado.plugins.run:RunInit",
+                "process = avocado.plugins.spawners.process:ProcessSpawnerInit",
                 "podman = avocado.plugins.spawners.podman:PodmanSpawnerInit",
                 "lxc = avocado.plugins.spawners.lxc:LXCSpawnerInit",
                 "nrunner = avocado.plugins.runner_nrunner:RunnerInit",
@@ -410,6 +411,7 @@ if __name__ == "__main__":
                 "json_variants = avocado.plugins.json_variants:JsonVariantsCLI",
                 "nrunner = avocado.plugins.runner_nrunner:RunnerCLI",
                 "podman = avocado.plugins.spawners.podman:PodmanCLI",
+                "process = avocado.plugins.spawners.process:ProcessCLI",
             ],
             "avocado.plugins.cli.cmd": [
                 "config = avocado.plugins.config:Config",
@@ -497,6 +499,9 @@ if __name__ == "__main__":
             ],
             "avocado.plugins.cache": [
                 "requirement = avocado.plugins.requirement_cache:RequirementCache",
+                "resolver = avocado.plugins.resolver_cache:ResolverCache",
+                "varianter = avocado.plugins.varianter_cache:VarianterCache",
+                "runners = avocado.plugins.runners_cache:RunnersCache",
             ],
         },
         zip_safe=False,